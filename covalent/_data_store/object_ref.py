@@ -0,0 +1,85 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""References to task inputs and outputs in an object store"""
+
+import io
+from pathlib import Path
+
+from .._workflow.transportable_object import TransportableObject
+from .storage_backends import LocalStorageBackend
+
+
+class ObjectRef:
+    """Reference to a serialized transportable object in an object store.
+
+    When task inputs and outputs are passed by reference, executors
+    load the inputs of a task and store its output directly in the
+    object store, and only references go through the dispatcher.
+
+    Attributes:
+        base_dir: Root directory of the local object store.
+        bucket_name: Bucket containing the object.
+        object_name: Name of the object.
+        size: Size of the serialized object in bytes, 0 until it is stored.
+
+    """
+
+    def __init__(self, base_dir: str, bucket_name: str, object_name: str, size: int = 0):
+        self.base_dir = str(base_dir)
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.size = size
+
+    def __repr__(self) -> str:
+        return f"ObjectRef({self.base_dir!r}, {self.bucket_name!r}, {self.object_name!r})"
+
+    def _get_backend(self) -> LocalStorageBackend:
+        return LocalStorageBackend(Path(self.base_dir))
+
+    def load(self) -> TransportableObject:
+        """Load the referenced object from the object store.
+
+        Returns:
+            The transportable object.
+
+        """
+        data = self._get_backend().get(self.bucket_name, self.object_name)
+        if data is None:
+            raise FileNotFoundError(f"{self} not found in the object store")
+        return TransportableObject.deserialize(b"".join(data))
+
+    def store(self, obj: TransportableObject) -> "ObjectRef":
+        """Write an object to the referenced location in the object store.
+
+        Args:
+            obj: The transportable object to store.
+
+        Returns:
+            A reference to the stored object.
+
+        """
+        data = obj.serialize()
+        bucket_name, object_name = self._get_backend().put(
+            io.BytesIO(data), self.bucket_name, self.object_name, len(data), overwrite=True
+        )
+        if not object_name:
+            raise RuntimeError(f"Unable to write {self} to the object store")
+        return ObjectRef(self.base_dir, bucket_name, object_name, len(data))
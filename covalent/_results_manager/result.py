@@ -23,6 +23,7 @@ import os
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Set, Union
 
+from .._data_store import ObjectRef
 from .._shared_files import logger
 from .._shared_files.config import get_config
 from .._shared_files.context_managers import active_lattice_manager
@@ -370,7 +371,9 @@ Node Outputs
         Returns:
             The output of said node. Will return None if error occurred in execution.
         """
-        return self._lattice.transport_graph.get_node_value(node_id, "output")
+        output = self._lattice.transport_graph.get_node_value(node_id, "output")
+        # Outputs passed by reference are loaded from the object store
+        return output.load() if isinstance(output, ObjectRef) else output
 
     def _get_node_error(self, node_id: int) -> Union[None, str]:
         """
@@ -0,0 +1,113 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+Compression codecs of archived transportable objects
+
+The codec compressing an archive is named in its header, so a codec must
+be registered under the same name wherever the archive is read. The
+stdlib `zlib`, `lzma` and `bz2` codecs are always available, and `zstd`
+is available if the `zstandard` package is installed. Other codecs can
+be plugged in with `register_codec`.
+"""
+
+import bz2
+import lzma
+import zlib
+from typing import Callable, Dict, List
+
+# Codec name which disables compression
+NO_COMPRESSION = "none"
+
+
+class Codec:
+    """
+    Compression codec
+
+    Attributes:
+        name: Name of the codec in the archive headers.
+        compress: Function compressing bytes.
+        decompress: Function decompressing the output of `compress`.
+    """
+
+    def __init__(
+        self, name: str, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]
+    ):
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+
+_codecs: Dict[str, Codec] = {
+    "zlib": Codec("zlib", zlib.compress, zlib.decompress),
+    "lzma": Codec("lzma", lzma.compress, lzma.decompress),
+    "bz2": Codec("bz2", bz2.compress, bz2.decompress),
+}
+
+try:
+    import zstandard
+except ImportError:
+    pass
+else:
+    _codecs["zstd"] = Codec(
+        "zstd",
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+
+def register_codec(
+    name: str, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]
+) -> None:
+    """
+    Register a compression codec, replacing any codec with the same name
+
+    Arg(s)
+        name: Name of the codec
+        compress: Function compressing bytes
+        decompress: Function decompressing the output of `compress`
+
+    Return(s)
+        None
+    """
+    if name == NO_COMPRESSION:
+        raise ValueError(f"{NO_COMPRESSION!r} is not a valid codec name")
+    _codecs[name] = Codec(name, compress, decompress)
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Return a registered compression codec
+
+    Arg(s)
+        name: Name of the codec
+
+    Return(s)
+        The codec
+    """
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(f"Unknown compression codec {name!r}")
+
+
+def list_codecs() -> List[str]:
+    """Return the names of the registered codecs."""
+    return list(_codecs)
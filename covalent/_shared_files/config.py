@@ -21,6 +21,7 @@
 import fcntl
 import os
 import shutil
+import threading
 from dataclasses import asdict
 from functools import reduce
 from operator import getitem
@@ -31,6 +32,10 @@ import toml
 
 """Configuration manager."""
 
+# fcntl locks don't exclude threads of the same process, so config file
+# access is also serialized between threads
+_config_file_lock = threading.RLock()
+
 
 class ConfigManager:
     """
@@ -113,7 +118,7 @@ class ConfigManager:
                         else:
                             old_dict.setdefault(key, value)
 
-        with open(self.config_file, "r+") as f:
+        with _config_file_lock, open(self.config_file, "r+") as f:
             fcntl.lockf(f, fcntl.LOCK_EX)
             file_config = toml.load(f)
 
@@ -135,7 +140,8 @@ class ConfigManager:
             None
         """
 
-        self.config_data = toml.load(self.config_file)
+        with _config_file_lock:
+            self.config_data = toml.load(self.config_file)
 
     def write_config(self) -> None:
         """
@@ -147,7 +153,7 @@ class ConfigManager:
         Returns:
             None
         """
-        with open(self.config_file, "w") as f:
+        with _config_file_lock, open(self.config_file, "w") as f:
             fcntl.lockf(f, fcntl.LOCK_EX)
             toml.dump(self.config_data, f)
 
@@ -63,6 +63,7 @@ def get_default_sdk_config():
         ),
         "no_cluster": "true" if os.environ.get("COVALENT_DISABLE_DASK") == "1" else "false",
         "exhaustive_postprocess": "true",
+        "deserialization_cache_size": os.environ.get("COVALENT_DESERIALIZATION_CACHE_SIZE", "0"),
     }
 
 
@@ -81,6 +82,34 @@ def get_default_dispatcher_config():
             (os.environ.get("XDG_DATA_HOME") or (os.environ["HOME"] + "/.local/share"))
             + "/covalent/dispatcher_db.sqlite"
         ),
+        "status_batch_size": 1000,
+        "executor_concurrency_limit": 0,
+        "executor_concurrency_limits": {},
+        "executor_instance_concurrency_limit": 0,
+        "runtime_weighted_priorities": "true",
+        "executor_pool_idle_timeout": 600,
+        "task_packing": "false",
+        "persistence_workers": 4,
+        "write_behind": "false",
+        "journal_path": (os.environ.get("XDG_DATA_HOME") or (os.environ["HOME"] + "/.local/share"))
+        + "/covalent/dispatcher_journal.pkl",
+        "journal_flush_interval_ms": 50,
+        "journal_flush_records": 1000,
+        "output_memory_budget": 0,
+        "inline_structural_nodes": "false",
+        "inline_max_input_size": 10000000,
+        "pass_by_reference": "false",
+        "object_store_dir": os.path.join(os.environ["HOME"], ".local/share/covalent/objects"),
+        "num_shards": 1,
+        "resume_dispatches": "true",
+        "webhook_debounce_ms": 100,
+        "tracing": "false",
+        "trace_file": "",
+        "result_cache": "false",
+        "result_cache_dir": os.path.join(os.environ["HOME"], ".local/share/covalent/result_cache"),
+        "result_cache_max_size": 1073741824,
+        "compression": "none",
+        "compression_threshold": 1048576,
     }
 
 
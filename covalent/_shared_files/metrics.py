@@ -19,6 +19,7 @@
 # Relief from the License may be granted by purchasing a commercial license.
 
 import platform
+from typing import Any, Dict
 
 from pydantic import BaseModel
 
@@ -52,6 +53,8 @@ class PerformanceMetrics(BaseModel):
     covalent_total_db_writes: float = 0.0
     covalent_electron_throughput: float = 0.0
     covalent_electron_latency: float = 0.0
+    covalent_peak_rss: float = 0.0
+    covalent_phase_timings: Dict[str, float] = {}
 
 
 class WorkflowBenchmarkResult(BaseModel):
@@ -60,4 +63,5 @@ class WorkflowBenchmarkResult(BaseModel):
     run_id: int
     workflow_name: str
     metadata: PlatformMetadata = PlatformMetadata()
+    parameters: Dict[str, Any] = {}
     metrics: PerformanceMetrics
@@ -0,0 +1,377 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+Per-phase tracing of the dispatcher
+
+Spans time the phases of a dispatch (queue wait, input resolution,
+executor instantiation and run, persistence, ...) and are aggregated
+into a global and a per-dispatch latency histogram of each phase. The
+histograms can be rendered in the Prometheus text format, and the spans
+can also be written to a Chrome trace file.
+
+Tracing is enabled by the `dispatcher.tracing` setting. When it is
+disabled, `span` returns a shared no-op context manager.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .config import get_config
+
+# Upper bounds (in seconds) of the histogram buckets
+BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Number of most recent dispatches whose histograms are kept
+MAX_TRACED_DISPATCHES = 100
+
+
+class Histogram:
+    """Latency histogram with the fixed buckets `BUCKETS`."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        # The last count is for the values above the last bucket
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+        self.count += other.count
+
+    def to_dict(self) -> Dict:
+        return {"counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+    @staticmethod
+    def from_dict(data: Dict) -> "Histogram":
+        histogram = Histogram()
+        histogram.counts = list(data["counts"])
+        histogram.sum = data["sum"]
+        histogram.count = data["count"]
+        return histogram
+
+
+def _get_track_id() -> int:
+    """Return the id of the asyncio task or thread running a span."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Tracer:
+    """
+    Aggregates the spans of the dispatcher
+
+    Spans may be recorded from the event loop and from worker threads.
+
+    Attributes:
+        trace_file: Chrome trace file the spans are written to, if any.
+        max_dispatches: Number of dispatches whose histograms are kept.
+    """
+
+    def __init__(self, trace_file: str = "", max_dispatches: int = MAX_TRACED_DISPATCHES):
+        self.trace_file = trace_file
+        self.max_dispatches = max_dispatches
+        self._lock = threading.Lock()
+        self._global: Dict[str, Histogram] = {}
+        self._dispatches: Dict[str, Dict[str, Histogram]] = OrderedDict()
+
+        self._trace = None
+        if trace_file:
+            os.makedirs(os.path.dirname(os.path.abspath(trace_file)), exist_ok=True)
+            # Chrome's JSON array format doesn't require the closing bracket,
+            # so events can be appended as they are recorded
+            self._trace = open(trace_file, "w")
+            self._trace.write("[\n")
+
+    def record(self, phase: str, dispatch_id: Optional[str], start: float) -> None:
+        """
+        Record a span which ends now
+
+        Arg(s)
+            phase: Name of the phase
+            dispatch_id: Dispatch the span belongs to, if any
+            start: Start of the span, from `time.perf_counter()`
+
+        Return(s)
+            None
+        """
+        duration = time.perf_counter() - start
+        with self._lock:
+            if phase not in self._global:
+                self._global[phase] = Histogram()
+            self._global[phase].observe(duration)
+
+            if dispatch_id is not None:
+                histograms = self._dispatches.get(dispatch_id)
+                if histograms is None:
+                    histograms = self._dispatches[dispatch_id] = {}
+                    if len(self._dispatches) > self.max_dispatches:
+                        self._dispatches.popitem(last=False)
+                if phase not in histograms:
+                    histograms[phase] = Histogram()
+                histograms[phase].observe(duration)
+
+            if self._trace is not None:
+                event = {
+                    "name": phase,
+                    "cat": "dispatcher",
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": _get_track_id(),
+                    "args": {"dispatch_id": dispatch_id},
+                }
+                self._trace.write(json.dumps(event) + ",\n")
+
+    def get_snapshot(self) -> Dict:
+        """Return the histograms as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "global": {phase: h.to_dict() for phase, h in self._global.items()},
+                "dispatches": {
+                    dispatch_id: {phase: h.to_dict() for phase, h in histograms.items()}
+                    for dispatch_id, histograms in self._dispatches.items()
+                },
+            }
+
+    def close(self) -> None:
+        """Close the trace file."""
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+
+
+class _Span:
+    __slots__ = ("tracer", "phase", "dispatch_id", "start")
+
+    def __init__(self, tracer: Tracer, phase: str, dispatch_id: Optional[str]):
+        self.tracer = tracer
+        self.phase = phase
+        self.dispatch_id = dispatch_id
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.phase, self.dispatch_id, self.start)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+_tracer: Optional[Tracer] = None
+_configured = False
+
+
+def configure(enabled: bool, trace_file: str = "") -> None:
+    """
+    Enable or disable tracing
+
+    Arg(s)
+        enabled: Whether to record spans
+        trace_file: Chrome trace file to write the spans to, if any
+
+    Return(s)
+        None
+    """
+    global _tracer, _configured
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(trace_file) if enabled else None
+    _configured = True
+
+
+def load_config(trace_file_suffix: str = "") -> None:
+    """Configure tracing from the dispatcher config."""
+    try:
+        enabled = get_config("dispatcher.tracing") == "true"
+        trace_file = get_config("dispatcher.trace_file")
+    except KeyError:
+        enabled, trace_file = False, ""
+    configure(enabled, trace_file + trace_file_suffix if trace_file else "")
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the tracer, or None if tracing is disabled."""
+    if not _configured:
+        load_config()
+    return _tracer
+
+
+def span(phase: str, dispatch_id: Optional[str] = None):
+    """
+    Return a context manager timing a phase of the dispatcher
+
+    Arg(s)
+        phase: Name of the phase
+        dispatch_id: Dispatch the span belongs to, if any
+
+    Return(s)
+        The span
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, phase, dispatch_id)
+
+
+def now() -> Optional[float]:
+    """Return the start of a span recorded later with `record`, or None if disabled."""
+    return None if get_tracer() is None else time.perf_counter()
+
+
+def record(phase: str, dispatch_id: Optional[str], start: Optional[float]) -> None:
+    """Record a span started at `now()` which ends now."""
+    tracer = get_tracer()
+    if tracer is not None and start is not None:
+        tracer.record(phase, dispatch_id, start)
+
+
+def close() -> None:
+    """Close the trace file, if any."""
+    if _tracer is not None:
+        _tracer.close()
+
+
+def get_snapshot() -> Dict:
+    """Return the histograms recorded so far, see `Tracer.get_snapshot`."""
+    tracer = get_tracer()
+    if tracer is None:
+        return {"global": {}, "dispatches": {}}
+    return tracer.get_snapshot()
+
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict:
+    """Merge the histograms of several processes."""
+    merged = {"global": {}, "dispatches": {}}
+
+    def _merge(target: Dict, histograms: Dict) -> None:
+        for phase, data in histograms.items():
+            if phase in target:
+                target[phase].merge(Histogram.from_dict(data))
+            else:
+                target[phase] = Histogram.from_dict(data)
+
+    for snapshot in snapshots:
+        _merge(merged["global"], snapshot["global"])
+        for dispatch_id, histograms in snapshot["dispatches"].items():
+            _merge(merged["dispatches"].setdefault(dispatch_id, {}), histograms)
+
+    return {
+        "global": {phase: h.to_dict() for phase, h in merged["global"].items()},
+        "dispatches": {
+            dispatch_id: {phase: h.to_dict() for phase, h in histograms.items()}
+            for dispatch_id, histograms in merged["dispatches"].items()
+        },
+    }
+
+
+def _render_histogram(name: str, labels: str, data: Dict) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BUCKETS, data["counts"]):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {data["count"]}')
+    lines.append(f"{name}_sum{{{labels}}} {data['sum']}")
+    lines.append(f"{name}_count{{{labels}}} {data['count']}")
+    return lines
+
+
+def render_prometheus(snapshot: Dict) -> str:
+    """
+    Render a snapshot of the histograms in the Prometheus text format
+
+    Arg(s)
+        snapshot: Histograms returned by `get_snapshot`
+
+    Return(s)
+        The metrics in the Prometheus text exposition format
+    """
+    lines = [
+        "# HELP covalent_dispatcher_phase_seconds Time spent in each phase of the dispatcher.",
+        "# TYPE covalent_dispatcher_phase_seconds histogram",
+    ]
+    for phase, data in sorted(snapshot["global"].items()):
+        lines.extend(
+            _render_histogram("covalent_dispatcher_phase_seconds", f'phase="{phase}"', data)
+        )
+
+    lines.extend(
+        [
+            "# HELP covalent_dispatch_phase_seconds Time spent in the phases of a dispatch.",
+            "# TYPE covalent_dispatch_phase_seconds histogram",
+        ]
+    )
+    for dispatch_id, histograms in snapshot["dispatches"].items():
+        for phase, data in sorted(histograms.items()):
+            labels = f'dispatch_id="{dispatch_id}",phase="{phase}"'
+            lines.extend(_render_histogram("covalent_dispatch_phase_seconds", labels, data))
+
+    return "\n".join(lines) + "\n"
@@ -49,7 +49,7 @@ from .._shared_files.utils import (
 from .depsbash import DepsBash
 from .depscall import RESERVED_RETVAL_KEY__FILES, DepsCall
 from .depspip import DepsPip
-from .lattice import Lattice
+from .lattice import Lattice, SublatticePayload
 from .transport import TransportableObject, encode_metadata
 
 consumable_constraints = ["budget", "time_limit"]
@@ -66,7 +66,7 @@ log_stack_info = logger.log_stack_info
 
 def _build_sublattice_graph(
     sub: Lattice, json_parent_metadata: str, *args: List, **kwargs: Dict
-) -> dict:
+) -> SublatticePayload:
     """Build sublattice graph.
 
     Args:
@@ -74,7 +74,7 @@ def _build_sublattice_graph(
         json_parent_metadata: Sublattice electron parent metadata.
 
     Returns:
-        Serialized sublattice graph.
+        The built sublattice in the binary lattice format.
 
     """
     parent_metadata = json.loads(json_parent_metadata)
@@ -83,7 +83,7 @@ def _build_sublattice_graph(
             sub.metadata[k] = parent_metadata[k]
 
     sub.build_graph(*args, **kwargs)
-    return sub.serialize_to_json()
+    return SublatticePayload(sub)
 
 
 class Electron:
@@ -650,6 +650,8 @@ def electron(
     deps_pip: Union[DepsPip, list] = None,
     call_before: Union[List[DepsCall], DepsCall] = [],
     call_after: Union[List[DepsCall], DepsCall] = [],
+    cache: bool = True,
+    compression: Optional[str] = None,
 ) -> Callable:
     """Electron decorator to be called upon a function. Returns the wrapper function with the same functionality as `_func`.
 
@@ -665,6 +667,8 @@ def electron(
         call_before: An optional list of DepsCall objects specifying python functions to invoke before the electron
         call_after: An optional list of DepsCall objects specifying python functions to invoke after the electron
         files: An optional list of FileTransfer objects which copy files to/from remote or local filesystems.
+        cache: Whether the output of the electron may be reused from previous dispatches when the dispatcher's result cache is enabled. Set to False for electrons with side effects or nondeterministic outputs.
+        compression: Codec compressing the outputs and inputs of the electron in the results directory, e.g. "zlib", "lzma", "bz2", or "none" to disable compression. Defaults to the compression of the lattice.
 
     Returns:
         :obj:`Electron <covalent._workflow.electron.Electron>` : Electron object inside which the decorated function exists.
@@ -725,6 +729,10 @@ def electron(
         "call_before": call_before,
         "call_after": call_after,
     }
+    if not cache:
+        constraints["cache"] = False
+    if compression:
+        constraints["compression"] = compression
 
     constraints = encode_metadata(constraints)
 
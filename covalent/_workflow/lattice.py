@@ -20,8 +20,10 @@
 
 """Class corresponding to computation workflow."""
 
+import io
 import json
 import os
+import pickle
 import warnings
 from builtins import list
 from contextlib import redirect_stdout
@@ -52,6 +54,9 @@ consumable_constraints = []
 
 DEFAULT_METADATA_VALUES = asdict(DefaultMetadataValues())
 
+# Pickle protocol of the binary lattice format
+LATTICE_PICKLE_PROTOCOL = 4
+
 app_log = logger.app_log
 log_stack_info = logger.log_stack_info
 
@@ -119,9 +124,62 @@ class Lattice:
         for node_name, output in self.electron_outputs.items():
             attributes["electron_outputs"][node_name] = output.to_dict()
 
-        attributes["cova_imports"] = list(self.cova_imports)
+        attributes["cova_imports"] = sorted(self.cova_imports)
         return json.dumps(attributes)
 
+    def serialize_to_bytes(self) -> bytes:
+        """Serialize the lattice to the binary lattice format.
+
+        The binary format holds the same attributes as
+        `serialize_to_json` but keeps transportable objects as they
+        are, which makes it much cheaper to load.
+
+        Returns:
+            Pickled attributes of the lattice.
+
+        """
+        attributes = self.__dict__.copy()
+        attributes["metadata"] = encode_metadata(self.metadata)
+        attributes["transport_graph"] = None
+        if self.transport_graph:
+            attributes["transport_graph"] = self.transport_graph.serialize_to_node_link_data()
+
+        attributes["args"] = list(self.args)
+        attributes["kwargs"] = dict(self.kwargs)
+        attributes["named_args"] = dict(self.named_args)
+        attributes["named_kwargs"] = dict(self.named_kwargs)
+        attributes["electron_outputs"] = dict(self.electron_outputs)
+        attributes["cova_imports"] = set(self.cova_imports)
+        attributes["_bound_electrons"] = {}
+        return pickle.dumps(attributes, protocol=LATTICE_PICKLE_PROTOCOL)
+
+    @staticmethod
+    def deserialize_from_bytes(data: bytes) -> "Lattice":
+        """Reconstruct a lattice from the binary lattice format.
+
+        Only the classes which a serialized lattice consists of are
+        allowed in `data`.
+
+        Args:
+            data: Lattice serialized by `serialize_to_bytes`.
+
+        Returns:
+            The deserialized lattice.
+
+        """
+        attributes = _RestrictedUnpickler(data, [TransportableObject]).load()
+        if attributes["transport_graph"] is not None:
+            tg = _TransportGraph()
+            tg.deserialize_from_node_link_data(attributes["transport_graph"])
+            attributes["transport_graph"] = tg
+
+        def dummy_function(x):
+            return x
+
+        lat = Lattice(dummy_function)
+        lat.__dict__ = attributes
+        return lat
+
     @staticmethod
     def deserialize_from_json(json_data: str) -> None:
         attributes = json.loads(json_data)
@@ -334,6 +392,7 @@ def lattice(
     call_before: Union[List[DepsCall], DepsCall] = [],
     call_after: Union[List[DepsCall], DepsCall] = [],
     triggers: Union["BaseTrigger", List["BaseTrigger"]] = None,
+    compression: Optional[str] = None,
     # e.g. schedule: True, whether to use a custom scheduling logic or not
 ) -> Lattice:
     """
@@ -353,6 +412,7 @@ def lattice(
         call_before: An optional list of DepsCall objects specifying python functions to invoke before the electron
         call_after: An optional list of DepsCall objects specifying python functions to invoke after the electron
         triggers: Any triggers that need to be attached to this lattice, default is None
+        compression: Codec compressing the transportable objects of the dispatch in the results directory, e.g. "zlib", "lzma", "bz2", or "none" to disable compression. Defaults to the `dispatcher.compression` setting.
 
     Returns:
         :obj:`Lattice <covalent._workflow.lattice.Lattice>` : Lattice object inside which the decorated function exists.
@@ -396,6 +456,8 @@ def lattice(
         "call_after": call_after,
         "triggers": triggers,
     }
+    if compression:
+        constraints["compression"] = compression
 
     constraints = encode_metadata(constraints)
 
@@ -415,3 +477,65 @@ def lattice(
         return decorator_lattice
     else:  # decorator is called without arguments
         return decorator_lattice(_func)
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler which only loads the given classes."""
+
+    def __init__(
+        self, data: bytes, allowed_classes: List[type], buffers: Optional[List] = None
+    ) -> None:
+        super().__init__(io.BytesIO(data), buffers=buffers)
+        self._allowed_classes = {(cls.__module__, cls.__name__): cls for cls in allowed_classes}
+
+    def find_class(self, module: str, name: str) -> Any:
+        try:
+            return self._allowed_classes[(module, name)]
+        except KeyError:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a serialized lattice")
+
+
+class SublatticePayload:
+    """
+    A built sublattice in the binary lattice format.
+
+    Returned by the task which builds the graph of a sublattice so that
+    the dispatcher can make the sublattice dispatch without going
+    through JSON.
+
+    Attributes:
+        name: Name of the sublattice.
+        data: The sublattice serialized by `Lattice.serialize_to_bytes`.
+    """
+
+    def __init__(self, lattice: Lattice) -> None:
+        self.name = lattice.__name__
+        self.data = lattice.serialize_to_bytes()
+
+    def __str__(self) -> str:
+        return f"<built sublattice {self.name}>"
+
+    def get_lattice(self) -> Lattice:
+        """Deserialize the sublattice.
+
+        Returns:
+            The built sublattice.
+
+        """
+        return Lattice.deserialize_from_bytes(self.data)
+
+    @staticmethod
+    def from_transportable(output: TransportableObject) -> Union["SublatticePayload", str]:
+        """Load the payload from the output of the sublattice building task.
+
+        Args:
+            output: Transportable object wrapping the payload.
+
+        Returns:
+            The sublattice payload, or the JSON-serialized sublattice
+            returned by older versions of Covalent.
+
+        """
+        return _RestrictedUnpickler(
+            output.get_serialized(), [SublatticePayload], output.buffers
+        ).load()
@@ -399,6 +399,29 @@ class _TransportGraph:
         data["lattice_metadata"] = encode_metadata(self.lattice_metadata)
         return json.dumps(data)
 
+    def serialize_to_node_link_data(self) -> Dict:
+        """Convert the transport graph to node-link data for the binary lattice format.
+
+        Unlike `serialize_to_json`, transportable objects are kept as
+        they are. Nodes with identical serialized functions share the
+        serialized string so that it is pickled only once. Metadata is
+        encoded as in `serialize_to_json`.
+
+        Returns:
+            Node-link data of the transport graph.
+
+        """
+        data = nx.readwrite.node_link_data(self._graph)
+        blobs = {}
+        for node in data["nodes"]:
+            function = node["function"]
+            function._object = blobs.setdefault(function._object, function._object)
+            if "metadata" in node:
+                node["metadata"] = encode_metadata(node["metadata"])
+
+        data["lattice_metadata"] = encode_metadata(self.lattice_metadata)
+        return data
+
     def deserialize(self, pickled_data: bytes) -> None:
         """
         Load pickled representation of transport graph into the transport graph instance.
@@ -451,3 +474,20 @@ class _TransportGraph:
                 node["value"] = TransportableObject.from_dict(node["value"])
 
         self._graph = nx.readwrite.node_link_graph(node_link_data)
+
+    def deserialize_from_node_link_data(self, node_link_data: Dict) -> None:
+        """Load node-link data returned by `serialize_to_node_link_data` into the transport graph instance.
+
+        This overwrites anything currently set in the transport graph.
+
+        Args:
+            node_link_data: Node-link data of the transport graph
+
+        Returns:
+            None
+
+        """
+        if "lattice_metadata" in node_link_data:
+            self.lattice_metadata = node_link_data["lattice_metadata"]
+
+        self._graph = nx.readwrite.node_link_graph(node_link_data)
@@ -22,43 +22,88 @@
 
 import base64
 import json
+import mmap
 import platform
-from typing import Any, Callable
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, List, Optional, Sequence
 
 import cloudpickle
 
+from .._shared_files.compression import get_codec
+from .._shared_files.config import get_config
+
 #  [string offset (8 bytes), big][data offset (8 bytes), big][header][string][data]
+#
+# When the pickle has out-of-band buffers, the data is followed by the
+# buffers, each starting at a multiple of BUFFER_ALIGNMENT bytes from the
+# start of the archive:
+#
+#  ...[header][string][data][padding][buffer 0][padding][buffer 1]...
 
 STRING_OFFSET_BYTES = 8
 DATA_OFFSET_BYTES = 8
 HEADER_OFFSET = STRING_OFFSET_BYTES + DATA_OFFSET_BYTES
 BYTE_ORDER = "big"
 
+# Archive header field telling how the data is encoded. Archives written
+# before the field was added hold the base64-encoded pickle.
+DATA_ENCODING_KEY = "data_encoding"
+DATA_ENCODING_RAW = "raw"
+DATA_ENCODING_BASE64 = "base64"
+
+# Archive header fields giving the size of the pickle and of its
+# out-of-band buffers, if it has any
+DATA_SIZE_KEY = "data_size"
+BUFFER_SIZES_KEY = "buffer_sizes"
+
+# Archive header field naming the codec compressing the data and the
+# buffers, if they are compressed
+CODEC_KEY = "codec"
+
+PICKLE_PROTOCOL = 5
+BUFFER_ALIGNMENT = 64
+
+
+def _padding(position: int) -> int:
+    """Return the number of bytes from `position` to the next aligned position."""
+    return -position % BUFFER_ALIGNMENT
+
 
 class _TOArchive:
     """Archived transportable object."""
 
-    def __init__(self, header: bytes, object_string: bytes, data: bytes):
+    def __init__(self, header: bytes, object_string: bytes, data: bytes, buffers: Sequence = ()):
         """Initialize TOArchive.
 
         Args:
             header: Archived transportable object header.
             object_string: Archived transportable object string.
             data: Archived transportable object data.
+            buffers: Out-of-band buffers of the pickled object.
 
         """
         self.header = header
         self.object_string = object_string
         self.data = data
+        self.buffers = list(buffers)
 
-    def cat(self) -> bytes:
-        """Concatenate TOArchive.
+    def segments(self) -> List[bytes]:
+        """Return the consecutive segments of the TOArchive.
+
+        The segments can be written one after the other, e.g. with
+        `write` or `os.writev`, without concatenating them first.
 
         Returns:
-            Concatenated TOArchive.
+            Segments of the TOArchive.
 
         """
-        header_size = len(self.header)
+        header = self.header
+        if self.buffers:
+            # Trailing whitespace is valid JSON; it aligns the start of the data
+            header += b" " * _padding(HEADER_OFFSET + len(header) + len(self.object_string))
+
+        header_size = len(header)
         string_size = len(self.object_string)
         data_offset = STRING_OFFSET_BYTES + DATA_OFFSET_BYTES + header_size + string_size
         string_offset = STRING_OFFSET_BYTES + DATA_OFFSET_BYTES + header_size
@@ -66,7 +111,38 @@ class _TOArchive:
         data_offset = data_offset.to_bytes(DATA_OFFSET_BYTES, BYTE_ORDER, signed=False)
         string_offset = string_offset.to_bytes(STRING_OFFSET_BYTES, BYTE_ORDER, signed=False)
 
-        return string_offset + data_offset + self.header + self.object_string + self.data
+        segments = [string_offset + data_offset, header, self.object_string, self.data]
+        position = len(self.data)
+        for buffer in self.buffers:
+            if padding := _padding(position):
+                segments.append(bytes(padding))
+            segments.append(buffer)
+            position += padding + len(buffer)
+        return segments
+
+    def cat(self) -> bytes:
+        """Concatenate TOArchive.
+
+        Returns:
+            Concatenated TOArchive.
+
+        """
+        return b"".join(self.segments())
+
+    def write(self, f: BinaryIO) -> int:
+        """Write the TOArchive to a binary file without concatenating it.
+
+        Args:
+            f: File opened for writing in binary mode.
+
+        Returns:
+            Number of bytes written.
+
+        """
+        size = 0
+        for segment in self.segments():
+            size += f.write(segment)
+        return size
 
     def load(self, header_only: bool, string_only: bool) -> "_TOArchive":
         """Load TOArchive object.
@@ -83,14 +159,24 @@ class _TOArchive:
         header = _TOArchiveUtils.parse_header(self, string_offset)
         object_string = b""
         data = b""
+        buffers = []
 
         if not header_only:
             data_offset = _TOArchiveUtils.data_offset(self)
             object_string = _TOArchiveUtils.parse_string(self, string_offset, data_offset)
 
             if not string_only:
-                data = _TOArchiveUtils.parse_data(self, data_offset)
-        return _TOArchive(header, object_string, data)
+                decoded_header = json.loads(header.decode("utf-8"))
+                if BUFFER_SIZES_KEY in decoded_header:
+                    data, buffers = _TOArchiveUtils.parse_buffers(
+                        self,
+                        data_offset,
+                        decoded_header[DATA_SIZE_KEY],
+                        decoded_header[BUFFER_SIZES_KEY],
+                    )
+                else:
+                    data = _TOArchiveUtils.parse_data(self, data_offset)
+        return _TOArchive(header, object_string, data, buffers)
 
     def _to_transportable_object(self) -> "TransportableObject":
         """Convert a _TOArchive to a TransportableObject.
@@ -103,17 +189,37 @@ class _TOArchive:
 
         """
         decoded_object_str = self.object_string.decode("utf-8")
-        decoded_data = self.data.decode("utf-8")
         decoded_header = json.loads(self.header.decode("utf-8"))
+        encoding = decoded_header.pop(DATA_ENCODING_KEY, DATA_ENCODING_BASE64)
+        codec_name = decoded_header.pop(CODEC_KEY, None)
+        decoded_header.pop(DATA_SIZE_KEY, None)
+        decoded_header.pop(BUFFER_SIZES_KEY, None)
+        if encoding == DATA_ENCODING_BASE64:
+            decoded_data = base64.b64decode(self.data)
+        else:
+            decoded_data = self.data
+        buffers = self.buffers
+        # Header and string only loads leave the data compressed
+        if codec_name and decoded_data:
+            codec = get_codec(codec_name)
+            decoded_data = codec.decompress(decoded_data)
+            buffers = [codec.decompress(buffer) for buffer in buffers]
         to = TransportableObject(None)
         to._header = decoded_header
         to._object_string = decoded_object_str or ""
-        to._object = decoded_data or ""
+        to._object = decoded_data or b""
+        to._buffers = buffers
         return to
 
 
 class _TOArchiveUtils:
-    """TOArchive utilities object."""
+    """TOArchive utilities object.
+
+    The utilities parse archives held in any buffer, e.g. bytes, a
+    memoryview or an mmap of an archive file, and only read the byte
+    ranges they parse. The header and the string are copied, whereas the
+    data and the buffers are read-only views of the archive.
+    """
 
     @staticmethod
     def data_offset(serialized: bytes) -> int:
@@ -155,7 +261,7 @@ class _TOArchiveUtils:
             Serialized TOArchive header.
 
         """
-        return serialized[HEADER_OFFSET:string_offset]
+        return bytes(serialized[HEADER_OFFSET:string_offset])
 
     @staticmethod
     def parse_string(serialized: bytes, string_offset: int, data_offset: int) -> bytes:
@@ -170,7 +276,7 @@ class _TOArchiveUtils:
             Serialized TOArchive object string.
 
         """
-        return serialized[string_offset:data_offset]
+        return bytes(serialized[string_offset:data_offset])
 
     @staticmethod
     def parse_data(serialized: bytes, data_offset: int) -> bytes:
@@ -181,10 +287,113 @@ class _TOArchiveUtils:
             data_offset: Data offset.
 
         Returns:
-            Serialized TOArchive data.
+            Serialized TOArchive data, a read-only view of `serialized`.
 
         """
-        return serialized[data_offset:]
+        return memoryview(serialized).toreadonly()[data_offset:]
+
+    @staticmethod
+    def parse_buffers(
+        serialized: bytes, data_offset: int, data_size: int, buffer_sizes: List[int]
+    ) -> tuple:
+        """Parse data and its out-of-band buffers.
+
+        The data and the buffers are read-only views of `serialized`,
+        which is not copied.
+
+        Args:
+            serialized: Serialized TOArchive.
+            data_offset: Data offset.
+            data_size: Size of the data.
+            buffer_sizes: Sizes of the out-of-band buffers.
+
+        Returns:
+            Serialized TOArchive data and the out-of-band buffers.
+
+        """
+        view = memoryview(serialized).toreadonly()
+        position = data_offset + data_size
+        buffers = []
+        for size in buffer_sizes:
+            position += _padding(position)
+            buffers.append(view[position : position + size])
+            position += size
+        return view[data_offset : data_offset + data_size], buffers
+
+
+class _DeserializationCache:
+    """
+    Per-process cache of deserialized transportable objects
+
+    Objects are keyed by their pickle and out-of-band buffers, so equal
+    transportable objects share their deserialized object, which isn't
+    copied. The serialized size of the cached objects is bounded to
+    `max_size` bytes and the least recently used ones are evicted first.
+
+    Attributes:
+        max_size: Serialized size in bytes of the cached objects.
+        size: Serialized size in bytes of the objects currently cached.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._lock = threading.Lock()
+
+        # key -> (deserialized object, serialized size), least recently used first
+        self._entries = OrderedDict()
+
+    def get_deserialized(self, obj: "TransportableObject") -> Any:
+        """Return the deserialized object of `obj`, deserializing it on a miss."""
+        key = (obj._object, *obj._buffers)
+        size = obj.size
+        try:
+            hash(key)
+        except TypeError:
+            # Writable buffers can't be hashed
+            return obj._deserialize()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        value = obj._deserialize()
+        if size > self.max_size:
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self.size += size
+                while self.size > self.max_size:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self.size -= evicted_size
+        return value
+
+    def clear(self) -> None:
+        """Drop the cached objects."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_deserialization_cache: Optional[_DeserializationCache] = None
+_deserialization_cache_configured = False
+
+
+def _get_deserialization_cache() -> Optional[_DeserializationCache]:
+    """Return the deserialization cache, or None if it is disabled."""
+    global _deserialization_cache, _deserialization_cache_configured
+    if not _deserialization_cache_configured:
+        try:
+            max_size = int(get_config("sdk.deserialization_cache_size"))
+        except KeyError:
+            max_size = 0
+        _deserialization_cache = _DeserializationCache(max_size) if max_size > 0 else None
+        _deserialization_cache_configured = True
+    return _deserialization_cache
 
 
 class TransportableObject:
@@ -201,7 +410,8 @@ class TransportableObject:
             obj: Object to be serialized.
 
         Attributes:
-            _object: The serialized object.
+            _object: The pickled object.
+            _buffers: The out-of-band buffers of the pickled object.
             _object_string: The string representation of the object.
             _header: The header of the object with python version (python version used on the client's machine), doc (Object doc string) and name attributes.
 
@@ -209,10 +419,16 @@ class TransportableObject:
             None
 
         """
-        b64object = base64.b64encode(cloudpickle.dumps(obj))
         object_string_u8 = str(obj).encode("utf-8")
 
-        self._object = b64object.decode("utf-8")
+        # Large contiguous buffers (e.g. of NumPy arrays) are kept out of
+        # the pickle. They are copied so that the transportable object
+        # doesn't change with `obj`, as with an in-band pickle.
+        buffers = []
+        self._object = cloudpickle.dumps(
+            obj, protocol=PICKLE_PROTOCOL, buffer_callback=buffers.append
+        )
+        self._buffers = [bytes(buffer.raw()) for buffer in buffers]
         self._object_string = object_string_u8.decode("utf-8")
 
         self._header = {
@@ -235,22 +451,78 @@ class TransportableObject:
     def object_string(self):
         return self._object_string
 
+    @property
+    def buffers(self) -> list:
+        """Out-of-band buffers of the pickled object."""
+        return self._buffers
+
+    @property
+    def size(self) -> int:
+        """Size of the serialized object and its string representation in bytes."""
+        return (
+            len(self._object)
+            + sum(len(buffer) for buffer in self._buffers)
+            + len(self._object_string)
+        )
+
+    def __getstate__(self) -> dict:
+        # Data loaded from an archive are views, which can't be pickled
+        state = self.__dict__.copy()
+        if isinstance(state["_object"], memoryview):
+            state["_object"] = bytes(state["_object"])
+        state["_buffers"] = [bytes(buffer) for buffer in state.get("_buffers", [])]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # Objects pickled by older versions hold the base64-encoded pickle
+        # and have no out-of-band buffers
+        if isinstance(state.get("_object"), str):
+            state = {**state, "_object": base64.b64decode(state["_object"])}
+        buffers = state.get("_buffers", [])
+        state = {
+            **state,
+            "_buffers": [
+                base64.b64decode(buffer) if isinstance(buffer, str) else buffer
+                for buffer in buffers
+            ],
+        }
+        self.__dict__.update(state)
+
     def __eq__(self, obj) -> bool:
         if not isinstance(obj, TransportableObject):
             return False
         return self.__dict__ == obj.__dict__
 
-    def get_deserialized(self) -> Callable:
+    def get_deserialized(self, use_cache: bool = True, writable: bool = False) -> Callable:
         """
         Get the deserialized transportable object.
 
         Note that this method is different from the `deserialize` method which deserializes from the `archived` transportable object.
 
+        Objects rebuilt from out-of-band buffers (e.g. NumPy arrays) use the buffers without copying them and are read-only, unless `writable` is True.
+
+        If the `sdk.deserialization_cache_size` setting is positive, deserialized objects are cached in the process and equal transportable objects return the same object, which must then not be mutated.
+
+        Args:
+            use_cache: Whether to use the deserialization cache. Pass False to get a fresh copy of a mutable object.
+            writable: Whether to rebuild objects from writable copies of the out-of-band buffers. The deserialization cache is not used.
+
         Returns:
             function: The deserialized object/callable function.
 
         """
-        return cloudpickle.loads(base64.b64decode(self._object.encode("utf-8")))
+        if writable:
+            return self._deserialize(writable=True)
+        cache = _get_deserialization_cache() if use_cache else None
+        if cache is not None:
+            return cache.get_deserialized(self)
+        return self._deserialize()
+
+    def _deserialize(self, writable: bool = False) -> Any:
+        buffers = self._buffers
+        if writable:
+            buffers = [bytearray(buffer) for buffer in buffers]
+        return cloudpickle.loads(self._object, buffers=buffers)
 
     def to_dict(self) -> dict:
         """Return a JSON-serializable dictionary representation of self.
@@ -259,7 +531,12 @@ class TransportableObject:
             dict: A JSON-serializable dictionary representation of self.
 
         """
-        return {"type": "TransportableObject", "attributes": self.__dict__.copy()}
+        attributes = self.__dict__.copy()
+        attributes["_object"] = base64.b64encode(self._object).decode("utf-8")
+        attributes["_buffers"] = [
+            base64.b64encode(buffer).decode("utf-8") for buffer in self._buffers
+        ]
+        return {"type": "TransportableObject", "attributes": attributes}
 
     @staticmethod
     def from_dict(object_dict) -> "TransportableObject":
@@ -273,30 +550,68 @@ class TransportableObject:
 
         """
         sc = TransportableObject(None)
-        sc.__dict__ = object_dict["attributes"]
+        sc.__setstate__(object_dict["attributes"])
         return sc
 
-    def get_serialized(self) -> str:
+    def get_serialized(self) -> bytes:
         """
         Get the serialized transportable object.
 
         Note that this is different from the `serialize` method which serializes the `archived` transportable object.
 
         Returns:
-            object: The serialized transportable object.
+            object: The pickled object, whose out-of-band buffers are given by `buffers`. It is a read-only view of the archive if the object was loaded from one.
 
         """
         return self._object
 
-    def serialize(self) -> bytes:
+    def serialize(self, codec: Optional[str] = None) -> bytes:
         """
         Serialize the transportable object to the archived transportable object.
 
+        Args:
+            codec: Name of the codec compressing the data, see `covalent._shared_files.compression`. The data is not compressed by default.
+
         Returns:
             The serialized object along with the python version.
 
         """
-        return self._to_archive().cat()
+        return self._to_archive(codec).cat()
+
+    def serialize_to_file(self, f: BinaryIO, codec: Optional[str] = None) -> int:
+        """
+        Write the archived transportable object to a file.
+
+        Unlike `serialize`, the archive is written segment by segment, so
+        the out-of-band buffers are not copied into a single bytes object.
+
+        Args:
+            f: File opened for writing in binary mode.
+            codec: Name of the codec compressing the data. The data is not compressed by default.
+
+        Returns:
+            Number of bytes written.
+
+        """
+        return self._to_archive(codec).write(f)
+
+    @staticmethod
+    def is_archive(prefix: bytes) -> bool:
+        """
+        Whether serialized data is an archived transportable object rather than a pickle.
+
+        Pickles of protocol 2 and higher start with the PROTO opcode
+        (0x80) whereas archives start with the big-endian string offset,
+        whose first byte is 0.
+
+        Args:
+            prefix: The first byte(s) of the serialized data.
+
+        Returns:
+            Whether the data is an archived transportable object.
+
+        """
+        return prefix[:1] == b"\x00"
 
     def serialize_to_json(self) -> str:
         """
@@ -346,7 +661,7 @@ class TransportableObject:
         """Deserialize the transportable object from the archived transportable object.
 
         Args:
-            data: Serialized transportable object
+            data: Serialized transportable object, in bytes or any other buffer such as an mmap.
 
         Returns:
             The deserialized transportable object.
@@ -355,6 +670,33 @@ class TransportableObject:
         ar = _TOArchive.load(serialized, header_only, string_only)
         return ar._to_transportable_object()
 
+    @staticmethod
+    def deserialize_from_file(
+        path: str, *, header_only: bool = False, string_only: bool = False
+    ) -> "TransportableObject":
+        """Deserialize the transportable object from an archived transportable object file.
+
+        The file is memory-mapped rather than read, so header and string only loads read the header and the string of the archive but not its data. Uncompressed out-of-band buffers are loaded as read-only views of the mapped file, which stays mapped as long as they are referenced.
+
+        Args:
+            path: Path to the archived transportable object.
+
+        Returns:
+            The deserialized transportable object.
+
+        """
+        with open(path, "rb") as f:
+            archive = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        to = TransportableObject.deserialize(
+            archive, header_only=header_only, string_only=string_only
+        )
+        try:
+            archive.close()
+        except BufferError:
+            # The buffers are views of the mapped file
+            pass
+        return to
+
     @staticmethod
     def deserialize_list(collection: list) -> list:
         """
@@ -407,17 +749,27 @@ class TransportableObject:
                 raise TypeError("Couldn't deserialize collection")
         return new_dict
 
-    def _to_archive(self) -> _TOArchive:
+    def _to_archive(self, codec: Optional[str] = None) -> _TOArchive:
         """Convert a TransportableObject to a _TOArchive.
 
         Args:
-            to: Transportable object to be converted.
+            codec: Name of the codec compressing the data and the buffers, if any.
 
         Returns:
             Archived transportable object.
 
         """
-        header = json.dumps(self._header).encode("utf-8")
+        header = {**self._header, DATA_ENCODING_KEY: DATA_ENCODING_RAW}
+        data = self._object
+        buffers = self._buffers
+        if codec:
+            compress = get_codec(codec).compress
+            header[CODEC_KEY] = codec
+            data = compress(data)
+            buffers = [compress(buffer) for buffer in buffers]
+        if buffers:
+            header[DATA_SIZE_KEY] = len(data)
+            header[BUFFER_SIZES_KEY] = [len(buffer) for buffer in buffers]
+        header = json.dumps(header).encode("utf-8")
         object_string = self._object_string.encode("utf-8")
-        data = self._object.encode("utf-8")
-        return _TOArchive(header=header, object_string=object_string, data=data)
+        return _TOArchive(header=header, object_string=object_string, data=data, buffers=buffers)
@@ -34,6 +34,7 @@ from pathlib import Path
 from typing import (
     Any,
     Callable,
+    Collection,
     ContextManager,
     Dict,
     Iterable,
@@ -50,7 +51,8 @@ from covalent._shared_files.exceptions import TaskCancelledError
 from covalent._workflow.depscall import RESERVED_RETVAL_KEY__FILES
 from covalent.executor.utils import Signals
 
-from .._shared_files import TaskRuntimeError, logger
+from .._data_store import ObjectRef
+from .._shared_files import TaskRuntimeError, logger, tracing
 from .._shared_files.context_managers import active_dispatch_info_manager
 from .._shared_files.util_classes import RESULT_STATUS, DispatchInfo
 from .._workflow.transport import TransportableObject
@@ -98,9 +100,10 @@ def wrapper_fn(
 
     fn = function.get_deserialized()
 
-    new_args = [arg.get_deserialized() for arg in args]
+    # Tasks may mutate their inputs, so they get fresh writable copies
+    new_args = [_load_input(arg).get_deserialized(writable=True) for arg in args]
 
-    new_kwargs = {k: v.get_deserialized() for k, v in kwargs.items()}
+    new_kwargs = {k: _load_input(v).get_deserialized(writable=True) for k, v in kwargs.items()}
 
     # Inject return values into kwargs
     for key, val in cb_retvals.items():
@@ -118,6 +121,67 @@ def wrapper_fn(
     return TransportableObject(output)
 
 
+def _load_input(value: Union[TransportableObject, ObjectRef]) -> TransportableObject:
+    """Load a task input passed by reference from the object store."""
+    return value.load() if isinstance(value, ObjectRef) else value
+
+
+def reference_wrapper_fn(
+    function: TransportableObject,
+    call_before: List[Tuple[TransportableObject, TransportableObject, TransportableObject]],
+    call_after: List[Tuple[TransportableObject, TransportableObject, TransportableObject]],
+    output_ref: ObjectRef,
+    *args,
+    **kwargs,
+) -> ObjectRef:
+    """Wrapper for serialized callable whose output is passed by reference.
+
+    Runs the callable like `wrapper_fn`, then writes the output to the
+    object store at `output_ref` and returns a reference to it instead
+    of the output.
+
+    """
+
+    output = wrapper_fn(function, call_before, call_after, *args, **kwargs)
+    return output_ref.store(output)
+
+
+def task_group_wrapper_fn(
+    function: TransportableObject,
+    tasks: List[Tuple[int, TransportableObject, List, List, List, Dict]],
+    boundary: Collection[int],
+    *args,
+) -> Dict[int, TransportableObject]:
+    """Wrapper running a packed task group in a single invocation.
+
+    `function` is the serialized callable of the first task; like in
+    `wrapper_fn`, it comes first so that executors can read its Python
+    version. Each task is given by its node id, serialized callable, call_before,
+    call_after and references to its args and kwargs, in topological
+    order. A reference is either `("input", i)`, the i-th positional
+    argument of this wrapper, or `("node", node_id)`, the output of an
+    earlier task of the group. Only the outputs of the tasks in
+    `boundary`, whose outputs are needed outside the group, are returned.
+
+    Returns:
+        Map from node id to the output of each task in `boundary`.
+
+    """
+
+    outputs = {}
+
+    def resolve(ref):
+        source, key = ref
+        return args[key] if source == "input" else outputs[key]
+
+    for node_id, function, call_before, call_after, arg_refs, kwarg_refs in tasks:
+        task_args = [resolve(ref) for ref in arg_refs]
+        task_kwargs = {k: resolve(ref) for k, ref in kwarg_refs.items()}
+        outputs[node_id] = wrapper_fn(function, call_before, call_after, *task_args, **task_kwargs)
+
+    return {node_id: outputs[node_id] for node_id in boundary}
+
+
 class _AbstractBaseExecutor(ABC):
     """
     Private parent class for BaseExecutor and AsyncBaseExecutor
@@ -131,6 +195,12 @@ class _AbstractBaseExecutor(ABC):
 
     """
 
+    # Whether the dispatcher may reuse one instance for all tasks with the
+    # same executor configuration. Pooled instances are set up once with
+    # `setup_shared()` and torn down with `teardown_shared()` once idle;
+    # each task runs on a shallow copy holding its own runtime state.
+    SUPPORTS_INSTANCE_POOLING = False
+
     def __init__(
         self,
         log_stdout: str = "",
@@ -407,12 +477,13 @@ class BaseExecutor(_AbstractBaseExecutor):
             self._notify(Signals.EXIT)
             self.teardown(task_metadata=task_metadata)
 
-        self.write_streams_to_file(
-            (self._task_stdout.getvalue(), self._task_stderr.getvalue()),
-            (self.log_stdout, self.log_stderr),
-            dispatch_id,
-            results_dir,
-        )
+        with tracing.span("write_streams", dispatch_id):
+            self.write_streams_to_file(
+                (self._task_stdout.getvalue(), self._task_stderr.getvalue()),
+                (self.log_stdout, self.log_stderr),
+                dispatch_id,
+                results_dir,
+            )
 
         return (result, self._task_stdout.getvalue(), self._task_stderr.getvalue(), job_status)
 
@@ -468,10 +539,59 @@ class BaseExecutor(_AbstractBaseExecutor):
         await self._loop.run_in_executor(self._cancel_pool, self.teardown, task_metadata)
         return cancel_result
 
+    def resume(self, task_metadata: Dict, job_handle: Any) -> Any:
+        """
+        Method to wait for the job identified uniquely by the `job_handle`,
+        submitted before the dispatcher restarted, and retrieve its output (base class)
+
+        Executors which can reattach to their jobs override this method.
+        The task is run again if it raises NotImplementedError.
+
+        Arg(s)
+            task_metadata: Metadata of the task to be resumed
+            job_handle: Unique ID of the job assigned by the backend
+
+        Return(s)
+            The output of the job, as returned by `run`
+        """
+        raise NotImplementedError
+
+    async def _resume(self, task_metadata: Dict, job_handle: Any) -> Any:
+        """
+        Resume the task in a non-blocking manner
+
+        Arg(s)
+            task_metadata: Metadata of the task to be resumed
+            job_handle: Unique ID of the job assigned by the backend
+
+        Return(s)
+            The output, stdout, stderr and status of the task as returned by `_execute`
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, self.resume, task_metadata, job_handle)
+            job_status = RESULT_STATUS.COMPLETED
+        except TaskCancelledError:
+            job_status = RESULT_STATUS.CANCELLED
+            result = None
+        except TaskRuntimeError:
+            job_status = RESULT_STATUS.FAILED
+            result = None
+
+        return (result, "", "", job_status)
+
     def teardown(self, task_metadata: Dict) -> Any:
         """Placeholder to run nay executor specific cleanup/teardown actions"""
         pass
 
+    def setup_shared(self) -> None:
+        """Placeholder to set up state shared by all tasks of a pooled instance"""
+        pass
+
+    def teardown_shared(self) -> None:
+        """Placeholder to tear down the shared state of a pooled instance"""
+        pass
+
 
 class AsyncBaseExecutor(_AbstractBaseExecutor):
     """Async base executor class to be used for defining any executor
@@ -666,12 +786,13 @@ class AsyncBaseExecutor(_AbstractBaseExecutor):
             self._notify(Signals.EXIT)
             await self.teardown(task_metadata=task_metadata)
 
-        await self.write_streams_to_file(
-            (self._task_stdout.getvalue(), self._task_stderr.getvalue()),
-            (self.log_stdout, self.log_stderr),
-            dispatch_id,
-            results_dir,
-        )
+        with tracing.span("write_streams", dispatch_id):
+            await self.write_streams_to_file(
+                (self._task_stdout.getvalue(), self._task_stderr.getvalue()),
+                (self.log_stdout, self.log_stderr),
+                dispatch_id,
+                results_dir,
+            )
 
         return (result, self._task_stdout.getvalue(), self._task_stderr.getvalue(), job_status)
 
@@ -683,6 +804,14 @@ class AsyncBaseExecutor(_AbstractBaseExecutor):
         """Executor specific teardown method"""
         pass
 
+    async def setup_shared(self) -> None:
+        """Set up state shared by all tasks of a pooled instance"""
+        pass
+
+    async def teardown_shared(self) -> None:
+        """Tear down the shared state of a pooled instance"""
+        pass
+
     @abstractmethod
     async def run(self, function: Callable, args: List, kwargs: Dict, task_metadata: Dict) -> Any:
         """Abstract method to run a function in the executor in async-aware manner.
@@ -728,3 +857,44 @@ class AsyncBaseExecutor(_AbstractBaseExecutor):
         cancel_result = await self.cancel(task_metadata, job_handle)
         await self.teardown(task_metadata)
         return cancel_result
+
+    async def resume(self, task_metadata: Dict, job_handle: Any) -> Any:
+        """
+        Executor specific method to wait for the job identified uniquely by
+        the `job_handle`, submitted before the dispatcher restarted, and
+        retrieve its output
+
+        Executors which can reattach to their jobs override this method.
+        The task is run again if it raises NotImplementedError.
+
+        Arg(s)
+            task_metadata: Metadata associated with the task to be resumed
+            job_handle: Unique ID assigned to the job by the backend
+
+        Return(s)
+            The output of the job, as returned by `run`
+        """
+        raise NotImplementedError
+
+    async def _resume(self, task_metadata: Dict, job_handle: Any) -> Any:
+        """
+        Resume the task in a non-blocking manner
+
+        Arg(s)
+            task_metadata: Metadata associated with the task to be resumed
+            job_handle: Unique ID assigned to the job by the backend
+
+        Return(s)
+            The output, stdout, stderr and status of the task as returned by `_execute`
+        """
+        try:
+            result = await self.resume(task_metadata, job_handle)
+            job_status = RESULT_STATUS.COMPLETED
+        except TaskCancelledError:
+            job_status = RESULT_STATUS.CANCELLED
+            result = None
+        except TaskRuntimeError:
+            job_status = RESULT_STATUS.FAILED
+            result = None
+
+        return (result, "", "", job_status)
@@ -59,6 +59,8 @@ class DaskExecutor(AsyncBaseExecutor):
     Dask executor class that submits the input function to a running dask cluster.
     """
 
+    SUPPORTS_INSTANCE_POOLING = True
+
     def __init__(
         self,
         scheduler_address: str = "",
@@ -86,14 +88,27 @@ class DaskExecutor(AsyncBaseExecutor):
 
         self.scheduler_address = scheduler_address
 
-    async def run(self, function: Callable, args: List, kwargs: Dict, task_metadata: Dict):
-        """Submit the function and inputs to the dask cluster"""
+    async def setup_shared(self) -> None:
+        """Connect a pooled instance to the dask scheduler once for all its tasks"""
+        self._shared_client = await Client(address=self.scheduler_address, asynchronous=True)
 
-        if await self.get_cancel_requested():
-            app_log.debug("Task has cancelled")
-            raise TaskCancelledError
+    async def teardown_shared(self) -> None:
+        """Close the scheduler connection of a pooled instance"""
+        dask_client = self.__dict__.pop("_shared_client", None)
+        if dask_client is not None:
+            await dask_client.close()
 
-        node_id = task_metadata["node_id"]
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable dictionary representation of self, without the shared client"""
+        object_dict = super().to_dict()
+        object_dict["attributes"].pop("_shared_client", None)
+        return object_dict
+
+    async def _get_client(self) -> Client:
+        """Return the client of a pooled instance, else the client shared by the scheduler address"""
+        dask_client = self.__dict__.get("_shared_client")
+        if dask_client:
+            return dask_client
 
         dask_client = _address_client_mapper.get(self.scheduler_address)
 
@@ -102,6 +117,19 @@ class DaskExecutor(AsyncBaseExecutor):
             _address_client_mapper[self.scheduler_address] = dask_client
             await dask_client
 
+        return dask_client
+
+    async def run(self, function: Callable, args: List, kwargs: Dict, task_metadata: Dict):
+        """Submit the function and inputs to the dask cluster"""
+
+        if await self.get_cancel_requested():
+            app_log.debug("Task has cancelled")
+            raise TaskCancelledError
+
+        node_id = task_metadata["node_id"]
+
+        dask_client = await self._get_client()
+
         future = dask_client.submit(dask_wrapper, function, args, kwargs)
         await self.set_job_handle(future.key)
         app_log.debug(f"Submitted task {node_id} to dask with key {future.key}")
@@ -132,12 +160,7 @@ class DaskExecutor(AsyncBaseExecutor):
         Return(s)
             True by default
         """
-        dask_client = _address_client_mapper.get(self.scheduler_address)
-
-        if not dask_client:
-            dask_client = Client(address=self.scheduler_address, asynchronous=True)
-            _address_client_mapper[self.scheduler_address] = dask_client
-            await dask_client
+        dask_client = await self._get_client()
 
         fut: Future = Future(key=job_handle, client=dask_client)
         await fut.cancel()
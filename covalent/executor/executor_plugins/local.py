@@ -59,6 +59,8 @@ class LocalExecutor(BaseExecutor):
     Local executor class that directly invokes the input function.
     """
 
+    SUPPORTS_INSTANCE_POOLING = True
+
     def run(self, function: Callable, args: List, kwargs: Dict, task_metadata: Dict) -> Any:
         """
         Execute the function locally
@@ -18,4 +18,4 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
-from .entry_point import cancel_running_dispatch, run_dispatcher, run_redispatch
+from .entry_point import cancel_running_dispatch, resume_dispatches, run_dispatcher, run_redispatch
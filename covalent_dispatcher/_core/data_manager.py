@@ -23,20 +23,29 @@ Defines the core functionality of the result service
 """
 
 import asyncio
+import hashlib
 import traceback
 import uuid
 from datetime import datetime, timezone
-from typing import Callable, Dict, Optional
+from functools import partial
+from typing import Callable, Coroutine, Dict, List, Optional
 
 from covalent._results_manager import Result
-from covalent._shared_files import logger
+from covalent._shared_files import logger, tracing
+from covalent._shared_files.config import get_config
 from covalent._shared_files.defaults import sublattice_prefix
 from covalent._shared_files.util_classes import RESULT_STATUS
-from covalent._workflow.lattice import Lattice
+from covalent._workflow.lattice import Lattice, SublatticePayload
 from covalent._workflow.transport_graph_ops import TransportGraphOps
+from covalent._workflow.transportable_object import TransportableObject
 
 from .._db import load, update, upsert
-from .._db.write_result_to_db import resolve_electron_id
+from .._db.journal import get_journal
+from .._db.write_result_to_db import StoredObjectRef, resolve_electron_id
+from .data_modules import shards
+from .data_modules.output_store import OutputStore
+from .data_modules.persistence import PersistenceWorker
+from .data_modules.result_cache import ResultCache
 
 app_log = logger.app_log
 log_stack_info = logger.log_stack_info
@@ -48,6 +57,140 @@ _registered_dispatches = {}
 # to dispatcher
 _dispatch_status_queues = {}
 
+# Map of dispatch_id -> node results waiting to be persisted as one batch
+_pending_node_results = {}
+
+# Map of dispatch_id -> background tasks persisting data of the dispatch
+_background_tasks = {}
+
+# Map of dispatch_id -> digest -> serialized objects shared by the
+# dispatch and its sublattice dispatches
+_sublattice_blobs = {}
+
+# Threads running the blocking DB and file writes
+_persistence_worker = None
+
+# Memory budget for the node outputs of the live dispatches
+_output_store = None
+
+# Electron outputs shared between dispatches
+_result_cache = None
+
+
+def _get_persistence_worker() -> PersistenceWorker:
+    """Return the persistence worker, creating it from the config on first use."""
+    global _persistence_worker
+    if _persistence_worker is None:
+        _persistence_worker = PersistenceWorker(int(get_config("dispatcher.persistence_workers")))
+    return _persistence_worker
+
+
+def _get_output_store() -> OutputStore:
+    """Return the output store, creating it from the config on first use."""
+    global _output_store
+    if _output_store is None:
+        _output_store = OutputStore(
+            int(get_config("dispatcher.output_memory_budget")), is_pending=_is_pending_update
+        )
+    return _output_store
+
+
+def _get_result_cache() -> ResultCache:
+    """Return the result cache, creating it from the config on first use."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            get_config("dispatcher.result_cache_dir"),
+            int(get_config("dispatcher.result_cache_max_size")),
+        )
+    return _result_cache
+
+
+async def get_cached_output(key: str) -> Optional[TransportableObject]:
+    """Return the output of a task from the result cache, or None on a miss."""
+    try:
+        return await _get_persistence_worker().run(None, _get_result_cache().get, key)
+    except Exception as ex:
+        app_log.warning(f"Error reading the result cache: {ex}")
+        return None
+
+
+async def _put_cached_output(key: str, output: TransportableObject) -> None:
+    try:
+        await _get_persistence_worker().run(None, _get_result_cache().put, key, output)
+    except Exception as ex:
+        app_log.warning(f"Error writing the result cache: {ex}")
+
+
+def cache_output(dispatch_id: str, key: str, output: TransportableObject) -> None:
+    """Write the output of a task to the result cache in the background."""
+    _create_background_task(dispatch_id, _put_cached_output(key, output))
+
+
+def _create_background_task(dispatch_id: str, coro: Coroutine) -> None:
+    """Run a coroutine in the background until the dispatch is finalized.
+
+    A reference to the task is kept until it is done, and exceptions
+    raised by the task are logged.
+
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.setdefault(dispatch_id, set()).add(task)
+    task.add_done_callback(partial(_background_task_done, dispatch_id))
+
+
+def _background_task_done(dispatch_id: str, task: asyncio.Task) -> None:
+    tasks = _background_tasks.get(dispatch_id)
+    if tasks is not None:
+        tasks.discard(task)
+        if not tasks:
+            del _background_tasks[dispatch_id]
+
+    if not task.cancelled() and (ex := task.exception()):
+        app_log.error(f"Error in background task of dispatch {dispatch_id}: {ex}", exc_info=ex)
+
+
+async def wait_for_background_tasks(dispatch_id: str) -> None:
+    """Wait for the background tasks of a dispatch, including the ones they start."""
+    while tasks := _background_tasks.get(dispatch_id):
+        await asyncio.wait(tasks)
+
+
+def _is_pending_update(dispatch_id: str, node_id: int) -> bool:
+    """Return whether a node update is yet to be written by the write-behind journal."""
+    journal = get_journal()
+    return journal is not None and journal.has_pending(dispatch_id, node_id)
+
+
+async def get_node_output(result_object: Result, node_id: int) -> TransportableObject:
+    """Return the output of a node, loading it from storage if it was spilled.
+
+    Arg(s)
+        result_object: Result object of the dispatch
+        node_id: ID of the node
+
+    Return(s)
+        Output of the node
+
+    """
+    output_store = _get_output_store()
+    output = output_store.get(result_object, node_id)
+    if isinstance(output, StoredObjectRef):
+        ref = output
+        output = await _get_persistence_worker().run(None, ref.load)
+        output_store.reload(result_object, node_id, ref, output)
+    return output
+
+
+def _track_outputs(result_object: Result, node_results: List[Dict]) -> None:
+    """Hand the persisted outputs of completed nodes to the output store."""
+    output_store = _get_output_store()
+    for node_result in node_results:
+        if node_result.get("status") != RESULT_STATUS.COMPLETED:
+            continue
+        if node_result.get("output") is not None:
+            output_store.add(result_object, node_result["node_id"])
+
 
 def generate_node_result(
     node_id: int,
@@ -120,6 +263,26 @@ async def _handle_built_sublattice(dispatch_id: str, node_result: Dict) -> None:
         app_log.debug(f"Failed to make sublattice dispatch: {tb}")
 
 
+def _is_built_sublattice(node_result: Dict) -> bool:
+    """Whether the node result marks a sublattice whose graph has just been built."""
+    return (
+        node_result["status"] == RESULT_STATUS.COMPLETED
+        and node_result["node_name"].startswith(sublattice_prefix)
+        and not node_result["sub_dispatch_id"]
+    )
+
+
+async def _notify_status_queue(result_object: Result, node_result: Dict) -> None:
+    """Push the status of a node result to the dispatcher's status queue."""
+    sub_dispatch_id = node_result["sub_dispatch_id"]
+    detail = {"sub_dispatch_id": sub_dispatch_id} if sub_dispatch_id is not None else {}
+    if node_status := node_result["status"]:
+        dispatch_id = result_object.dispatch_id
+        status_queue = get_status_queue(dispatch_id)
+        node_id = node_result["node_id"]
+        await status_queue.put((node_id, node_status, detail))
+
+
 # Domain: result
 async def update_node_result(result_object, node_result) -> None:
     """
@@ -135,29 +298,105 @@ async def update_node_result(result_object, node_result) -> None:
     """
     app_log.debug(f"Updating node result for {node_result['node_id']}.")
 
-    if (
-        node_result["status"] == RESULT_STATUS.COMPLETED
-        and node_result["node_name"].startswith(sublattice_prefix)
-        and not node_result["sub_dispatch_id"]
-    ):
+    if _is_built_sublattice(node_result):
         app_log.debug(
             f"Sublattice {node_result['node_name']} build graph completed, invoking make sublattice dispatch..."
         )
         await _handle_built_sublattice(result_object.dispatch_id, node_result)
 
     try:
-        update._node(result_object, **node_result)
+        # The result object is only updated on the event loop; the
+        # workers just write the updated nodes to the DB
+        node_records = update.apply_nodes(result_object, [node_result])
+        with tracing.span("persist_node_results", result_object.dispatch_id):
+            await _get_persistence_worker().run(
+                result_object.dispatch_id,
+                update.persist_nodes,
+                result_object,
+                [node_result],
+                node_records,
+            )
     except Exception as ex:
         app_log.exception(f"Error persisting node update: {ex}")
         node_result["status"] = RESULT_STATUS.FAILED
+    else:
+        _track_outputs(result_object, [node_result])
     finally:
-        sub_dispatch_id = node_result["sub_dispatch_id"]
-        detail = {"sub_dispatch_id": sub_dispatch_id} if sub_dispatch_id is not None else {}
-        if node_status := node_result["status"]:
-            dispatch_id = result_object.dispatch_id
-            status_queue = get_status_queue(dispatch_id)
-            node_id = node_result["node_id"]
-            await status_queue.put((node_id, node_status, detail))
+        await _notify_status_queue(result_object, node_result)
+
+
+# Domain: result
+async def update_node_results(result_object, node_results: List[Dict]) -> None:
+    """
+    Updates the result object with a batch of node results
+
+    The batch is persisted in a single DB transaction and the
+    status of each node is then pushed to the status queue in order.
+
+    Arg(s)
+        result_object: Result object the current dispatch
+        node_results: List of node results to be updated in the result object
+
+    Return(s)
+        None
+
+    """
+    if not node_results:
+        return
+
+    app_log.debug(f"Updating {len(node_results)} node results.")
+
+    for node_result in node_results:
+        if _is_built_sublattice(node_result):
+            await _handle_built_sublattice(result_object.dispatch_id, node_result)
+
+    try:
+        node_records = update.apply_nodes(result_object, node_results)
+        with tracing.span("persist_node_results", result_object.dispatch_id):
+            await _get_persistence_worker().run(
+                result_object.dispatch_id,
+                update.persist_nodes,
+                result_object,
+                node_results,
+                node_records,
+            )
+    except Exception as ex:
+        app_log.exception(f"Error persisting node updates: {ex}")
+        for node_result in node_results:
+            node_result["status"] = RESULT_STATUS.FAILED
+    else:
+        _track_outputs(result_object, node_results)
+    finally:
+        for node_result in node_results:
+            await _notify_status_queue(result_object, node_result)
+
+
+# Domain: result
+async def submit_node_result(result_object, node_result) -> None:
+    """
+    Queue a node result to be persisted together with the other node
+    results of the dispatch which arrive in the same event loop
+    iteration.
+
+    Arg(s)
+        result_object: Result object the current dispatch
+        node_result: Result of the node to be updated in the result object
+
+    Return(s)
+        None
+
+    """
+    dispatch_id = result_object.dispatch_id
+    if dispatch_id not in _pending_node_results:
+        _pending_node_results[dispatch_id] = []
+        _create_background_task(dispatch_id, _flush_node_results(result_object))
+    _pending_node_results[dispatch_id].append(node_result)
+
+
+async def _flush_node_results(result_object) -> None:
+    """Persist all the queued node results of a dispatch in one batch."""
+    node_results = _pending_node_results.pop(result_object.dispatch_id, [])
+    await update_node_results(result_object, node_results)
 
 
 # Domain: result
@@ -175,8 +414,73 @@ def initialize_result_object(
         Result: result object
 
     """
-    dispatch_id = get_unique_id()
     lattice = Lattice.deserialize_from_json(json_lattice)
+    return _initialize_result_object_from_lattice(
+        lattice, parent_result_object, parent_electron_id
+    )
+
+
+def initialize_sublattice_result_object(
+    payload: SublatticePayload, parent_result_object: Result, parent_electron_id: int
+) -> Result:
+    """Construct the result object of a sublattice from the output of its graph building task.
+
+    The sublattice is loaded from the binary payload. Serialized
+    objects which are identical to those of the parent dispatch or of
+    sibling sublattices are shared with them instead of being held in
+    memory once per sublattice dispatch.
+
+    Args:
+        payload: Sublattice payload returned by the graph building task.
+        parent_result_object: The result object of the parent dispatch.
+        parent_electron_id: The DB id of the parent electron.
+
+    Returns:
+        Result: result object
+
+    """
+    lattice = payload.get_lattice()
+    blobs = _sublattice_blobs.get(parent_result_object.dispatch_id)
+    if blobs is None:
+        # Sublattices are mostly built from the electrons of their parent
+        blobs = _sublattice_blobs[parent_result_object.dispatch_id] = {}
+        _share_blobs(parent_result_object.lattice, blobs)
+    _share_blobs(lattice, blobs)
+    return _initialize_result_object_from_lattice(
+        lattice, parent_result_object, parent_electron_id
+    )
+
+
+def _share_blobs(lattice: Lattice, blobs: Dict[bytes, bytes]) -> None:
+    """Replace the serialized objects of a lattice with identical ones from `blobs`.
+
+    Objects are identified by the digest of their pickled bytes, and
+    those not yet in `blobs` are added to it.
+
+    """
+    tg = lattice.transport_graph
+    transportable_objects = [
+        lattice.workflow_function,
+        *lattice.args,
+        *lattice.kwargs.values(),
+        *lattice.named_args.values(),
+        *lattice.named_kwargs.values(),
+    ]
+    for node_id in tg._graph.nodes:
+        transportable_objects.append(tg.get_node_value(node_id, "function"))
+        if "value" in tg._graph.nodes[node_id]:
+            transportable_objects.append(tg.get_node_value(node_id, "value"))
+
+    for to in transportable_objects:
+        if isinstance(to, TransportableObject):
+            digest = hashlib.sha256(to._object).digest()
+            to._object = blobs.setdefault(digest, to._object)
+
+
+def _initialize_result_object_from_lattice(
+    lattice: Lattice, parent_result_object: Result = None, parent_electron_id: int = None
+) -> Result:
+    dispatch_id = get_unique_id()
     result_object = Result(lattice, dispatch_id)
     if parent_result_object:
         result_object._root_dispatch_id = parent_result_object._root_dispatch_id
@@ -196,6 +500,10 @@ def get_unique_id() -> str:
     """
     Get a unique ID.
 
+    In a dispatcher shard, the ID is drawn until it hashes to the shard,
+    so that the sublattice dispatches and redispatches made by a shard
+    are also owned by it.
+
     Args:
         None
 
@@ -203,7 +511,10 @@ def get_unique_id() -> str:
         str: Unique ID
 
     """
-    return str(uuid.uuid4())
+    dispatch_id = str(uuid.uuid4())
+    while not shards.is_local(dispatch_id):
+        dispatch_id = str(uuid.uuid4())
+    return dispatch_id
 
 
 async def make_dispatch(
@@ -220,15 +531,15 @@ async def make_dispatch(
         Dispatch ID of the lattice.
 
     """
-    result_object = initialize_result_object(
-        json_lattice, parent_result_object, parent_electron_id
+    result_object = await _get_persistence_worker().run(
+        None, initialize_result_object, json_lattice, parent_result_object, parent_electron_id
     )
     _register_result_object(result_object)
     return result_object.dispatch_id
 
 
 async def make_sublattice_dispatch(result_object: Result, node_result: dict) -> str:
-    """Get sublattice json lattice (once the transport graph has been built) and invoke make_dispatch.
+    """Make the dispatch of a sublattice once its transport graph has been built.
 
     Args:
         result_object: Result object for parent dispatch of the node.
@@ -239,12 +550,22 @@ async def make_sublattice_dispatch(result_object: Result, node_result: dict) ->
 
     """
     node_id = node_result["node_id"]
-    json_lattice = node_result["output"].object_string
+    output = node_result["output"]
     parent_electron_id = load.electron_record(result_object.dispatch_id, node_id)["id"]
     app_log.debug(
         f"Making sublattice dispatch for node_id {node_id} and electron_id {parent_electron_id}."
     )
-    return await make_dispatch(json_lattice, result_object, parent_electron_id)
+
+    # Sublattices built by older versions of Covalent are JSON-serialized
+    payload = SublatticePayload.from_transportable(output)
+    if not isinstance(payload, SublatticePayload):
+        return await make_dispatch(output.object_string, result_object, parent_electron_id)
+
+    sub_result_object = await _get_persistence_worker().run(
+        None, initialize_sublattice_result_object, payload, result_object, parent_electron_id
+    )
+    _register_result_object(sub_result_object)
+    return sub_result_object.dispatch_id
 
 
 def _get_result_object_from_new_lattice(
@@ -338,6 +659,96 @@ def make_derived_dispatch(
     return result_object.dispatch_id
 
 
+def _find_resumable_dispatches() -> List[Dict]:
+    """Find the dispatches left running by a previous dispatcher process."""
+    # Node updates left in the write-behind journal are replayed first
+    get_journal()
+
+    records = load.running_dispatches()
+    for record in records:
+        record["parent_dispatch_id"] = (
+            resolve_electron_id(record["electron_id"])[0] if record["electron_id"] else None
+        )
+
+    # Order the dispatches parents first, starting from the root dispatches
+    # owned by this process; sublattice dispatches are only resumed along
+    # with their parent dispatch
+    resumable = []
+    dispatch_ids = set()
+    pending = records
+    while True:
+        ready = [
+            r
+            for r in pending
+            if r["parent_dispatch_id"] in dispatch_ids
+            or (r["parent_dispatch_id"] is None and shards.is_local(r["dispatch_id"]))
+        ]
+        if not ready:
+            return resumable
+        resumable.extend(ready)
+        dispatch_ids.update(r["dispatch_id"] for r in ready)
+        pending = [r for r in pending if r["dispatch_id"] not in dispatch_ids]
+
+
+async def get_resumable_dispatches() -> List[Dict]:
+    """Return the dispatches left running by a previous dispatcher process.
+
+    Returns:
+        The `dispatch_id` and `parent_dispatch_id` (None unless the
+        dispatch is a sublattice) of each dispatch, parents first.
+
+    """
+    return await _get_persistence_worker().run(None, _find_resumable_dispatches)
+
+
+def _as_utc(timestamp: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps loaded from the DB are naive UTC
+    if timestamp is not None and timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def _load_resumed_result_object(dispatch_id: str) -> Result:
+    """Load a result object and restore the state of its nodes from the DB.
+
+    The node updates are written to the electron records, not to the
+    stored transport graph. The outputs of the completed nodes are
+    loaded on first use, see `get_node_output`.
+
+    """
+    result_object = load.get_result_object_from_storage(dispatch_id)
+    tg = result_object.lattice.transport_graph
+    for state in load.electron_states(dispatch_id):
+        # Not node updates, so don't mark the nodes dirty
+        node_data = tg._graph.nodes[state["node_id"]]
+        node_data["status"] = state["status"]
+        node_data["start_time"] = _as_utc(state["started_at"])
+        node_data["end_time"] = _as_utc(state["completed_at"])
+        if state["status"] == RESULT_STATUS.COMPLETED:
+            node_data["output"] = StoredObjectRef(state["storage_path"], state["results_filename"])
+        elif state["status"] == RESULT_STATUS.DISPATCHING_SUBLATTICE:
+            node_data["sub_dispatch_id"] = load.sublattice_dispatch_id(state["electron_id"])
+    return result_object
+
+
+async def resume_dispatch(dispatch_id: str) -> Result:
+    """Register a dispatch left running by a previous dispatcher process.
+
+    Args:
+        dispatch_id: Dispatch ID of the dispatch.
+
+    Returns:
+        The result object of the dispatch, with the state of its nodes
+        restored from the DB.
+
+    """
+    result_object = await _get_persistence_worker().run(
+        None, _load_resumed_result_object, dispatch_id
+    )
+    _register_result_object(result_object)
+    return result_object
+
+
 def get_result_object(dispatch_id: str) -> Result:
     return _registered_dispatches[dispatch_id]
 
@@ -351,6 +762,8 @@ def _register_result_object(result_object: Result):
 def finalize_dispatch(dispatch_id: str):
     del _dispatch_status_queues[dispatch_id]
     del _registered_dispatches[dispatch_id]
+    _sublattice_blobs.pop(dispatch_id, None)
+    _get_output_store().forget(dispatch_id)
 
 
 def get_status_queue(dispatch_id: str):
@@ -359,7 +772,11 @@ def get_status_queue(dispatch_id: str):
 
 async def persist_result(dispatch_id: str):
     result_object = get_result_object(dispatch_id)
-    update.persist(result_object)
+    # Snapshot the dirty nodes here since the loop keeps updating them
+    node_records = upsert.take_dirty_node_records(result_object)
+    await _get_persistence_worker().run(
+        dispatch_id, update.persist, result_object, node_records=node_records
+    )
     await _update_parent_electron(result_object)
 
 
@@ -385,6 +802,7 @@ async def _update_parent_electron(result_object: Result):
         await update_node_result(parent_result_obj, node_result)
 
 
-def upsert_lattice_data(dispatch_id: str):
+async def upsert_lattice_data(dispatch_id: str):
     result_object = get_result_object(dispatch_id)
-    upsert.lattice_data(result_object)
+    with tracing.span("persist_lattice", dispatch_id):
+        await _get_persistence_worker().run(dispatch_id, upsert.lattice_data, result_object)
@@ -20,23 +20,80 @@
 
 # """Interface to the Jobs table"""
 
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
-from ..._db.jobdb import get_job_records, to_job_ids, update_job_records
+from covalent._shared_files import logger
 
+from ..._db.jobdb import get_dispatch_job_records, update_job_records
 
-def _set_cancel_requested(job_ids: List[int]) -> None:
+app_log = logger.app_log
+
+# In-memory registry of job records: dispatch_id -> task_id -> job
+# record. It is loaded from the jobs table once per dispatch and kept in
+# sync by writing every update through to the table. Tasks without a job
+# are registered as None so that looking them up again doesn't reload
+# the records of the dispatch.
+_job_records: Dict[str, Dict[int, Optional[Dict]]] = {}
+
+
+def _get_job_records(dispatch_id: str, task_ids: List[int]) -> List[Dict]:
+    """
+    Look up the registered job records of tasks, loading the records of
+    the dispatch from the database if any of them isn't registered yet
+
+    Arg(s)
+        dispatch_id: Dispatch ID of the lattice
+        task_ids: IDs of tasks in the lattice
+
+    Return(s)
+        Registered job records of the tasks which have a job; tasks
+        without a job are logged and skipped
+    """
+    records = _job_records.get(dispatch_id)
+    if records is None or any(task_id not in records for task_id in task_ids):
+        records = get_dispatch_job_records(dispatch_id)
+        if not records:
+            raise KeyError(f"Invalid dispatch {dispatch_id}")
+        for task_id in task_ids:
+            records.setdefault(task_id, None)
+        _job_records[dispatch_id] = records
+
+    missing = [task_id for task_id in task_ids if records[task_id] is None]
+    if missing:
+        app_log.warning(f"Tasks {missing} of dispatch {dispatch_id} have no job record")
+
+    return [records[task_id] for task_id in task_ids if records[task_id] is not None]
+
+
+def _update_job_records(records: List[Dict], **kwargs) -> None:
     """
-    Update the job record with `cancel_requested`= True (private to module)
+    Write updated fields of job records to the database and then to the registry
 
     Arg(s)
-        job_ids: List of all job ids that have been requested to be cancelled
+        records: Registered job records to update
+        kwargs: Fields to update
 
     Return(s)
         None
     """
-    records = [{"job_id": job_id, "cancel_requested": True} for job_id in job_ids]
-    update_job_records(records)
+    update_job_records([{"job_id": record["job_id"], **kwargs} for record in records])
+    for record in records:
+        record.update(kwargs)
+
+
+def forget_dispatch(dispatch_id: str) -> None:
+    """
+    Drop the registered job records of a dispatch
+
+    Later lookups load the records from the database again.
+
+    Arg(s)
+        dispatch_id: Dispatch ID of the lattice
+
+    Return(s)
+        None
+    """
+    _job_records.pop(dispatch_id, None)
 
 
 async def set_cancel_requested(dispatch_id: str, task_ids: List[int]):
@@ -50,14 +107,15 @@ async def set_cancel_requested(dispatch_id: str, task_ids: List[int]):
     Return(s)
         None
     """
-    job_ids = to_job_ids(dispatch_id, task_ids)
-    _set_cancel_requested(job_ids)
+    _update_job_records(_get_job_records(dispatch_id, task_ids), cancel_requested=True)
 
 
 async def get_jobs_metadata(dispatch_id: str, task_ids: List[int]) -> Any:
     """
     Retrive all job records with task_ids for the given dispatch
 
+    Records are served from the in-memory registry.
+
     Arg(s)
         dispatch_id: Dispatch ID
         task_ids: List of task ids
@@ -65,8 +123,7 @@ async def get_jobs_metadata(dispatch_id: str, task_ids: List[int]) -> Any:
     Return(s)
         Dictionary of job metdata associated with each task
     """
-    job_ids = to_job_ids(dispatch_id, task_ids)
-    return get_job_records(job_ids)
+    return [dict(record) for record in _get_job_records(dispatch_id, task_ids)]
 
 
 async def _set_job_metadata(dispatch_id: str, task_id: int, **kwargs) -> None:
@@ -80,11 +137,14 @@ async def _set_job_metadata(dispatch_id: str, task_id: int, **kwargs) -> None:
 
     Return(s)
         None
+
+    Raises:
+        KeyError: If the task has no job record
     """
-    job_id = to_job_ids(dispatch_id, [task_id])[0]
-    update_kwargs = kwargs
-    update_kwargs["job_id"] = job_id
-    update_job_records([update_kwargs])
+    records = _get_job_records(dispatch_id, [task_id])
+    if not records:
+        raise KeyError(f"No job record for task {task_id} of dispatch {dispatch_id}")
+    _update_job_records(records, **kwargs)
 
 
 async def set_job_handle(dispatch_id: str, task_id: int, job_handle: str) -> None:
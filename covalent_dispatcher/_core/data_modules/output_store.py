@@ -0,0 +1,154 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Memory budget for the node outputs of live dispatches"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from covalent._results_manager import Result
+from covalent._workflow.transportable_object import TransportableObject
+
+from ..._db.upsert import ELECTRON_RESULTS_FILENAME, get_node_storage_path
+from ..._db.write_result_to_db import StoredObjectRef
+
+
+class OutputStore:
+    """
+    Bounds the memory held by the node outputs of live result objects.
+
+    Node outputs are tracked in least recently used order once they have
+    been persisted. When their total size exceeds `memory_budget` bytes,
+    the least recently used outputs are replaced in the transport graph
+    by references to their results files, and loaded back with `reload`
+    the next time they are read.
+
+    Attributes:
+        memory_budget: Size in bytes of the tracked outputs kept in
+            memory, or 0 to keep all outputs in memory.
+        resident_size: Size in bytes of the tracked outputs in memory.
+    """
+
+    def __init__(
+        self, memory_budget: int, is_pending: Optional[Callable[[str, int], bool]] = None
+    ) -> None:
+        self.memory_budget = memory_budget
+        self.resident_size = 0
+
+        # Returns whether the update of a node is yet to be written, in
+        # which case its output can't be spilled
+        self._is_pending = is_pending
+
+        # (dispatch_id, node_id) -> (result object, output, size), least
+        # recently used first
+        self._resident: "OrderedDict[Tuple[str, int], Tuple[Result, TransportableObject, int]]" = (
+            OrderedDict()
+        )
+
+    def add(self, result_object: Result, node_id: int) -> None:
+        """Track the persisted output of a node.
+
+        Args:
+            result_object: Result object of the dispatch.
+            node_id: ID of the node whose output has been persisted.
+
+        """
+        if not self.memory_budget:
+            return
+
+        output = result_object.lattice.transport_graph.get_node_value(node_id, "output")
+        if not isinstance(output, TransportableObject):
+            return
+
+        key = (result_object.dispatch_id, node_id)
+        self._discard(key)
+        self._resident[key] = (result_object, output, output.size)
+        self.resident_size += output.size
+        self._spill()
+
+    def get(self, result_object: Result, node_id: int) -> Any:
+        """Return the output of a node.
+
+        A spilled output is returned as a reference to its results file,
+        which the caller loads outside the event loop and hands back with
+        `reload`.
+
+        Args:
+            result_object: Result object of the dispatch.
+            node_id: ID of the node.
+
+        Returns:
+            The output of the node, or a reference to it if it was spilled.
+
+        """
+        output = result_object.lattice.transport_graph.get_node_value(node_id, "output")
+        key = (result_object.dispatch_id, node_id)
+        if key in self._resident:
+            self._resident.move_to_end(key)
+        return output
+
+    def reload(
+        self, result_object: Result, node_id: int, ref: StoredObjectRef, output: Any
+    ) -> None:
+        """Put a spilled output loaded by the caller back in memory.
+
+        Args:
+            result_object: Result object of the dispatch.
+            node_id: ID of the node.
+            ref: Reference returned by `get` for the spilled output.
+            output: The output loaded from `ref`.
+
+        """
+        node_data = result_object.lattice.transport_graph._graph.nodes[node_id]
+
+        # The output may have been reloaded or updated in the meantime
+        if node_data.get("output") is ref:
+            # Not a node update, so don't mark the node dirty
+            node_data["output"] = output
+            self.add(result_object, node_id)
+
+    def forget(self, dispatch_id: str) -> None:
+        """Stop tracking the outputs of a dispatch."""
+        for key in [key for key in self._resident if key[0] == dispatch_id]:
+            self._discard(key)
+
+    def _discard(self, key: Tuple[str, int]) -> None:
+        if key in self._resident:
+            self.resident_size -= self._resident.pop(key)[2]
+
+    def _spill(self) -> None:
+        """Spill the least recently used outputs until the budget is met."""
+        for key in list(self._resident):
+            if self.resident_size <= self.memory_budget:
+                break
+
+            dispatch_id, node_id = key
+            if self._is_pending and self._is_pending(dispatch_id, node_id):
+                continue
+
+            result_object, output, size = self._resident[key]
+            self._discard(key)
+            node_data = result_object.lattice.transport_graph._graph.nodes[node_id]
+
+            # The output may have been replaced by a newer update
+            if node_data.get("output") is output:
+                node_data["output"] = StoredObjectRef(
+                    get_node_storage_path(dispatch_id, node_id), ELECTRON_RESULTS_FILENAME, size
+                )
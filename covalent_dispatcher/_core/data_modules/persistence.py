@@ -0,0 +1,81 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Worker threads running blocking DB and file persistence"""
+
+import asyncio
+import itertools
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+class PersistenceWorker:
+    """
+    Runs blocking persistence calls outside the event loop.
+
+    The worker consists of `num_lanes` single-threaded executors. All
+    calls for a dispatch go to the same lane, so they run one at a time
+    in submission order, while different dispatches are persisted in
+    parallel. With `num_lanes=0`, calls run inline in the event loop.
+
+    Attributes:
+        num_lanes: Number of worker threads.
+    """
+
+    def __init__(self, num_lanes: int) -> None:
+        self.num_lanes = num_lanes
+        self._lanes = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"covalent-persistence-{i}")
+            for i in range(num_lanes)
+        ]
+        self._round_robin = itertools.cycle(range(num_lanes)) if num_lanes else None
+
+    def _get_lane(self, dispatch_id: Optional[str]) -> ThreadPoolExecutor:
+        if dispatch_id is None:
+            return self._lanes[next(self._round_robin)]
+        return self._lanes[zlib.crc32(dispatch_id.encode()) % self.num_lanes]
+
+    async def run(self, dispatch_id: Optional[str], fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking persistence call.
+
+        Args:
+            dispatch_id: Dispatch whose calls must be ordered with this
+                one, or None if the call needn't be ordered.
+            fn: Function to call with `args` and `kwargs`.
+
+        Returns:
+            The return value of `fn`. Exceptions raised by `fn` are
+            re-raised in the caller.
+
+        """
+        if not self._lanes:
+            return fn(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_lane(dispatch_id), partial(fn, *args, **kwargs)
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads once the submitted calls are done."""
+        for lane in self._lanes:
+            lane.shutdown(wait=wait)
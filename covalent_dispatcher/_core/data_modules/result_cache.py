@@ -0,0 +1,189 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Electron outputs shared between dispatches"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from covalent._workflow.transportable_object import TransportableObject
+
+# Node metadata which determines the output of a task; the executor doesn't
+CACHE_KEY_METADATA = ("deps", "call_before", "call_after")
+
+
+def _digest(obj: TransportableObject) -> str:
+    digest = hashlib.sha256(obj.get_serialized())
+    for buffer in obj.buffers:
+        digest.update(buffer)
+    return digest.hexdigest()
+
+
+def get_cache_key(
+    function: TransportableObject,
+    function_string: Optional[str],
+    metadata: Dict,
+    args: List[Any],
+    kwargs: Dict[str, Any],
+) -> Optional[str]:
+    """
+    Return the key of a task in the result cache
+
+    Functions defined at the top level of a module are pickled by
+    reference, so the source of the function is part of the key to
+    tell the versions of such a function apart.
+
+    Arg(s)
+        function: Serialized function of the electron
+        function_string: Source code of the electron's function
+        metadata: Node metadata of the electron
+        args: Resolved positional inputs of the task
+        kwargs: Resolved keyword inputs of the task
+
+    Return(s)
+        Hash of the function and its source, its executor-independent
+        metadata and its inputs, or None if an input isn't a
+        transportable object (e.g. a reference to an object store)
+    """
+    inputs = [*args, *kwargs.values()]
+    if not all(isinstance(value, TransportableObject) for value in inputs):
+        return None
+
+    key_data = [
+        _digest(function),
+        hashlib.sha256((function_string or "").encode("utf-8")).hexdigest(),
+        {key: metadata.get(key) for key in CACHE_KEY_METADATA},
+        [_digest(value) for value in args],
+        {key: _digest(value) for key, value in kwargs.items()},
+    ]
+    serialized = json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(serialized).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed store of electron outputs
+
+    Each output is stored in a file named after the cache key of its
+    task, see `get_cache_key`, so tasks with the same function, deps and
+    inputs share their output across dispatches. The stored outputs are
+    bounded to `max_size` bytes and the least recently used ones are
+    evicted first. Outputs are read and written from worker threads.
+
+    Attributes:
+        cache_dir: Directory of the stored outputs.
+        max_size: Size in bytes of the stored outputs.
+        size: Size in bytes of the outputs currently stored.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.size = 0
+        self._lock = threading.Lock()
+
+        # key -> size of the stored output, least recently used first
+        self._entries = OrderedDict()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        stored = []
+        for path in self.cache_dir.glob("*/*"):
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+            else:
+                stat = path.stat()
+                stored.append((stat.st_mtime, path.name, stat.st_size))
+        for _, key, size in sorted(stored):
+            self._entries[key] = size
+            self.size += size
+        self._evict()
+
+    def _get_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[TransportableObject]:
+        """
+        Return the stored output of a task
+
+        Arg(s)
+            key: Cache key of the task
+
+        Return(s)
+            The output, or None if it isn't stored
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._get_path(key)
+        try:
+            # Stored outputs are replaced or unlinked but never
+            # overwritten, so the file can be mapped
+            output = TransportableObject.deserialize_from_file(path)
+            # Keep the recency of the output across restarts
+            os.utime(path)
+        except OSError:
+            # Evicted by another dispatcher process sharing the directory
+            with self._lock:
+                if key in self._entries:
+                    self.size -= self._entries.pop(key)
+            return None
+
+        return output
+
+    def put(self, key: str, output: TransportableObject) -> None:
+        """
+        Store the output of a task
+
+        Arg(s)
+            key: Cache key of the task
+            output: Output of the task
+
+        Return(s)
+            None
+        """
+        if output.size > self.max_size:
+            return
+
+        path = self._get_path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            size = output.serialize_to_file(f)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)
+            self._entries[key] = size
+            self.size += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.size > self.max_size:
+            key, size = self._entries.popitem(last=False)
+            self.size -= size
+            self._get_path(key).unlink(missing_ok=True)
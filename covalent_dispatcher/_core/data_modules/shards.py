@@ -0,0 +1,61 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Assignment of dispatches to the shards of a sharded dispatcher"""
+
+import os
+import zlib
+from typing import Optional, Tuple
+
+# Set to "<index>/<num_shards>" in the dispatcher shard processes
+SHARD_ENV_VAR = "COVALENT_DISPATCHER_SHARD"
+
+
+def shard_of(dispatch_id: str, num_shards: int) -> int:
+    """
+    Return the index of the shard owning a dispatch
+
+    Arg(s)
+        dispatch_id: Dispatch ID of the lattice
+        num_shards: Number of dispatcher shards
+
+    Return(s)
+        Index of the shard in [0, num_shards)
+    """
+    return zlib.crc32(dispatch_id.encode()) % num_shards
+
+
+def get_local_shard() -> Optional[Tuple[int, int]]:
+    """
+    Return the (index, num_shards) of the shard run by this process, or
+    None if the dispatcher isn't sharded
+    """
+    if value := os.environ.get(SHARD_ENV_VAR):
+        index, num_shards = value.split("/")
+        return int(index), int(num_shards)
+    return None
+
+
+def is_local(dispatch_id: str) -> bool:
+    """Whether the dispatch is owned by this process."""
+    if local_shard := get_local_shard():
+        index, num_shards = local_shard
+        return shard_of(dispatch_id, num_shards) == index
+    return True
@@ -24,22 +24,53 @@ Defines the core functionality of the dispatcher
 
 import asyncio
 import traceback
+from collections import Counter
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from covalent._results_manager import Result
-from covalent._shared_files import logger
-from covalent._shared_files.defaults import parameter_prefix
+from covalent._shared_files import logger, tracing
+from covalent._shared_files.config import get_config
+from covalent._shared_files.defaults import parameter_prefix, postprocess_prefix, sublattice_prefix
 from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent._workflow.transportable_object import TransportableObject
 from covalent_ui import result_webhook
 
 from . import data_manager as datasvc
 from . import runner
-from .data_modules.job_manager import set_cancel_requested
+from .data_modules.job_manager import forget_dispatch, set_cancel_requested
+from .data_modules.result_cache import get_cache_key
+from .dispatcher_modules import planning
+from .dispatcher_modules.dependency_index import DependencyIndex
+from .dispatcher_modules.inline import InlineEvaluator
+from .dispatcher_modules.task_groups import PackedTaskGroups, find_packed_task_groups
 
 app_log = logger.app_log
 log_stack_info = logger.log_stack_info
 
+# Map of dispatch_id -> dependency index of the transport graph, frozen
+# when the dispatch starts running
+_dependency_indices = {}
+
+# Map of dispatch_id -> upward ranks of the nodes, used as task priorities
+_task_priorities = {}
+
+# Map of dispatch_id -> task groups which run as a single executor job
+_task_groups = {}
+
+# Map of dispatch_id -> evaluator of the structural nodes which run in
+# the dispatcher
+_inline_evaluators = {}
+
+# Map of dispatch_id -> sublattice dispatches resumed along with the
+# dispatch, for the dispatches left running by a previous dispatcher
+# process
+_resumed_dispatches = {}
+
+# Map of dispatch_id -> node_id -> result cache key of the submitted
+# tasks, for the dispatches using the result cache
+_cache_keys = {}
+
 
 """
 Dispatcher module is responsible for planning and dispatching workflows. The dispatcher
@@ -66,6 +97,9 @@ def _get_abstract_task_inputs(node_id: int, node_name: str, result_object: Resul
         resolved to their values later.
     """
 
+    if dep_index := _dependency_indices.get(result_object.dispatch_id):
+        return dep_index.get_abstract_task_inputs(node_id)
+
     abstract_task_input = {"args": [], "kwargs": {}}
 
     for parent in result_object.lattice.transport_graph.get_dependencies(node_id):
@@ -98,10 +132,25 @@ async def _handle_completed_node(result_object, node_id, pending_parents):
     Return(s)
         List of nodes ready to be executed
     """
-    g = result_object.lattice.transport_graph._graph
-
     ready_nodes = []
     app_log.debug(f"Node {node_id} completed")
+
+    _record_runtime(result_object, node_id)
+    await _cache_output(result_object, node_id)
+
+    if dep_index := _dependency_indices.get(result_object.dispatch_id):
+        task_groups = _task_groups.get(result_object.dispatch_id)
+        for child in dep_index.get_children(node_id):
+            # Members of a task group don't wait for each other
+            if task_groups and task_groups.is_internal_edge(node_id, child):
+                continue
+            pending_parents[child] -= 1
+            if pending_parents[child] == 0:
+                app_log.debug(f"Queuing node {child} for execution")
+                ready_nodes.append(child)
+        return ready_nodes
+
+    g = result_object.lattice.transport_graph._graph
     for child, edges in g.adj[node_id].items():
         for _ in edges:
             pending_parents[child] -= 1
@@ -112,13 +161,31 @@ async def _handle_completed_node(result_object, node_id, pending_parents):
     return ready_nodes
 
 
+def _record_runtime(result_object: Result, node_id: int) -> None:
+    """Add the runtime of a completed node to the runtime history used for planning."""
+    node_attrs = result_object.lattice.transport_graph._graph.nodes[node_id]
+    start_time = node_attrs.get("start_time")
+    end_time = node_attrs.get("end_time")
+    if start_time and end_time:
+        planning.record_runtime(node_attrs["name"], (end_time - start_time).total_seconds())
+
+
+async def _cache_output(result_object: Result, node_id: int) -> None:
+    """Add the output of a completed task to the result cache."""
+    cache_keys = _cache_keys.get(result_object.dispatch_id)
+    if cache_keys and (key := cache_keys.pop(node_id, None)):
+        output = await datasvc.get_node_output(result_object, node_id)
+        if isinstance(output, TransportableObject):
+            datasvc.cache_output(result_object.dispatch_id, key, output)
+
+
 # Domain: dispatcher
 async def _handle_failed_node(result_object, node_id):
     result_object._task_failed = True
     result_object._end_time = datetime.now(timezone.utc)
     app_log.debug(f"Node {result_object.dispatch_id}:{node_id} failed")
     app_log.debug("8A: Failed node upsert statement (run_planned_workflow)")
-    datasvc.upsert_lattice_data(result_object.dispatch_id)
+    await datasvc.upsert_lattice_data(result_object.dispatch_id)
     await result_webhook.send_update(result_object)
 
 
@@ -128,7 +195,7 @@ async def _handle_cancelled_node(result_object, node_id):
     result_object._end_time = datetime.now(timezone.utc)
     app_log.debug(f"Node {result_object.dispatch_id}:{node_id} cancelled")
     app_log.debug("9: Cancelled node upsert statement (run_planned_workflow)")
-    datasvc.upsert_lattice_data(result_object.dispatch_id)
+    await datasvc.upsert_lattice_data(result_object.dispatch_id)
     await result_webhook.send_update(result_object)
 
 
@@ -144,6 +211,13 @@ async def _get_initial_tasks_and_deps(result_object: Result) -> Tuple[int, int,
 
     """
 
+    if dep_index := _dependency_indices.get(result_object.dispatch_id):
+        pending_parents = dep_index.get_pending_parents()
+        if task_groups := _task_groups.get(result_object.dispatch_id):
+            task_groups.exclude_internal_edges(pending_parents, dep_index)
+        ready_nodes = [node_id for node_id, n_parents in pending_parents.items() if n_parents == 0]
+        return dep_index.num_nodes, ready_nodes, pending_parents
+
     num_tasks = 0
     ready_nodes = []
     pending_parents = {}
@@ -161,60 +235,390 @@ async def _get_initial_tasks_and_deps(result_object: Result) -> Tuple[int, int,
 
 
 # Domain: dispatcher
-async def _submit_task(result_object, node_id):
-    # Get name of the node for the current task
+def _get_resumed_tasks_and_deps(
+    result_object: Result, sub_dispatch_ids: Set[str]
+) -> Tuple[int, List[int], List[int], int, Dict]:
+    """Compute the state of a resumed dispatch from the statuses of its nodes
+
+    Completed nodes are not run again. Nodes which were running are
+    resumed, except for sublattices whose dispatch is resumed too and
+    reports back to the node once it completes.
+
+    Args:
+        result_object: Result object with the node statuses restored from the DB.
+        sub_dispatch_ids: Sublattice dispatches resumed along with the dispatch.
+
+    Returns: (num_tasks, ready_nodes, running_nodes, num_waiting,
+        pending_parents) where num_tasks is the number of tasks left to
+        complete, ready_nodes are the tasks to submit, running_nodes are
+        the tasks to resume, num_waiting is the number of sublattices
+        waiting for their dispatch, and pending_parents is a map from
+        `node_id` to the number of parents that have yet to complete.
+
+    """
+    dep_index = _dependency_indices[result_object.dispatch_id]
+    tg = result_object.lattice.transport_graph
+    pending_parents = dep_index.get_pending_parents()
+
+    statuses = [tg.get_node_value(node_id, "status") for node_id in range(dep_index.num_nodes)]
+    num_tasks = dep_index.num_nodes
+    for node_id, status in enumerate(statuses):
+        if status == RESULT_STATUS.COMPLETED:
+            num_tasks -= 1
+            for child in dep_index.get_children(node_id):
+                pending_parents[child] -= 1
+        elif status == RESULT_STATUS.FAILED:
+            result_object._task_failed = True
+        elif status == RESULT_STATUS.CANCELLED:
+            result_object._task_cancelled = True
+
+    # The job of a packed task group is recorded on one of its members
+    task_group_ids = [
+        tg._graph.nodes[node_id].get("task_group_id", node_id)
+        for node_id in range(dep_index.num_nodes)
+    ]
+    group_sizes = Counter(task_group_ids)
+
+    ready_nodes = []
+    running_nodes = []
+    num_waiting = 0
+    for node_id, status in enumerate(statuses):
+        if status in (RESULT_STATUS.COMPLETED, RESULT_STATUS.FAILED, RESULT_STATUS.CANCELLED):
+            continue
+        if status == RESULT_STATUS.DISPATCHING_SUBLATTICE:
+            if tg.get_node_value(node_id, "sub_dispatch_id") in sub_dispatch_ids:
+                num_waiting += 1
+                continue
+        elif status == RESULT_STATUS.RUNNING:
+            if group_sizes[task_group_ids[node_id]] == 1:
+                running_nodes.append(node_id)
+                continue
+        if pending_parents[node_id] == 0:
+            ready_nodes.append(node_id)
+
+    app_log.debug(
+        f"Resuming dispatch {result_object.dispatch_id} with {len(ready_nodes)} ready, "
+        f"{len(running_nodes)} running and {num_waiting} sublattice tasks"
+    )
+    return num_tasks, ready_nodes, running_nodes, num_waiting, pending_parents
+
+
+# Domain: dispatcher
+async def _get_trivial_node_result(result_object: Result, node_id: int) -> Optional[Dict]:
+    """Return the node result for a node which doesn't need to be executed.
+
+    Parameter nodes and nodes which were already completed (e.g. reused
+    during a redispatch) are resolved directly by the dispatcher.
+
+    Args:
+        result_object: Result object of the dispatch.
+        node_id: ID of the node in the transport graph.
+
+    Returns:
+        The node result if the node need not be executed, otherwise None.
+
+    """
     node_name = result_object.lattice.transport_graph.get_node_value(node_id, "name")
     node_status = result_object.lattice.transport_graph.get_node_value(node_id, "status")
 
-    # Handle parameter nodes
     if node_name.startswith(parameter_prefix):
         output = result_object.lattice.transport_graph.get_node_value(node_id, "value")
-        timestamp = datetime.now(timezone.utc)
-        node_result = datasvc.generate_node_result(
-            node_id=node_id,
-            node_name=node_name,
-            start_time=timestamp,
-            end_time=timestamp,
-            status=RESULT_STATUS.COMPLETED,
-            output=output,
-        )
-        await datasvc.update_node_result(result_object, node_result)
-        app_log.debug(f"Updated parameter node {node_id}.")
+        app_log.debug(f"Updating parameter node {node_id}.")
 
     elif node_status == RESULT_STATUS.COMPLETED:
-        timestamp = datetime.now(timezone.utc)
-        output = result_object.lattice.transport_graph.get_node_value(node_id, "output")
-        node_result = datasvc.generate_node_result(
-            node_id=node_id,
-            node_name=node_name,
-            start_time=timestamp,
-            end_time=timestamp,
-            status=RESULT_STATUS.COMPLETED,
-            output=output,
-        )
-        await datasvc.update_node_result(result_object, node_result)
-        app_log.debug(f"Skipped completed node execution {node_name}.")
+        output = await datasvc.get_node_output(result_object, node_id)
+        app_log.debug(f"Skipping completed node execution {node_name}.")
 
     else:
-        # Gather inputs and dispatch task
-        app_log.debug(f"Gathering inputs for task {node_id}.")
+        return None
+
+    timestamp = datetime.now(timezone.utc)
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        start_time=timestamp,
+        end_time=timestamp,
+        status=RESULT_STATUS.COMPLETED,
+        output=output,
+    )
 
-        abs_task_input = _get_abstract_task_inputs(node_id, node_name, result_object)
-        executor = result_object.lattice.transport_graph.get_node_value(node_id, "metadata")[
-            "executor"
-        ]
-        executor_data = result_object.lattice.transport_graph.get_node_value(node_id, "metadata")[
-            "executor_data"
+
+# Domain: dispatcher
+async def _get_inline_node_result(result_object: Result, node_id: int) -> Optional[Dict]:
+    """Evaluate a structural node in the dispatcher.
+
+    Args:
+        result_object: Result object of the dispatch.
+        node_id: ID of the node in the transport graph.
+
+    Returns:
+        The node result if the node was evaluated inline, otherwise None
+        if it has to run on its executor.
+
+    """
+    evaluator = _inline_evaluators.get(result_object.dispatch_id)
+    if not evaluator or node_id not in evaluator.node_ids:
+        return None
+
+    tg = result_object.lattice.transport_graph
+    node_name = tg.get_node_value(node_id, "name")
+    abstract_inputs = _get_abstract_task_inputs(node_id, node_name, result_object)
+    args = [
+        await datasvc.get_node_output(result_object, parent) for parent in abstract_inputs["args"]
+    ]
+    kwargs = {
+        key: await datasvc.get_node_output(result_object, parent)
+        for key, parent in abstract_inputs["kwargs"].items()
+    }
+    if not evaluator.accepts(node_id, args, kwargs):
+        return None
+
+    start_time = datetime.now(timezone.utc)
+    try:
+        output = await evaluator.evaluate(tg.get_node_value(node_id, "function"), args, kwargs)
+    except Exception as ex:
+        # The executor reports the error, or has what the dispatcher lacks
+        app_log.debug(f"Structural node {node_id} will run on its executor: {ex}")
+        return None
+
+    app_log.debug(f"Evaluated structural node {node_name} inline.")
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        start_time=start_time,
+        end_time=datetime.now(timezone.utc),
+        status=RESULT_STATUS.COMPLETED,
+        output=output,
+    )
+
+
+# Domain: dispatcher
+async def _get_cached_node_result(result_object: Result, node_id: int) -> Optional[Dict]:
+    """Look up the output of a task in the result cache.
+
+    On a miss, the cache key of the task is kept so that its output is
+    cached once it completes.
+
+    Args:
+        result_object: Result object of the dispatch.
+        node_id: ID of the node in the transport graph.
+
+    Returns:
+        The node result if the output of the task was cached, otherwise None.
+
+    """
+    cache_keys = _cache_keys.get(result_object.dispatch_id)
+    if cache_keys is None:
+        return None
+
+    tg = result_object.lattice.transport_graph
+    node_name = tg.get_node_value(node_id, "name")
+    metadata = tg.get_node_value(node_id, "metadata")
+    if node_name.startswith((sublattice_prefix, postprocess_prefix)) or not metadata.get(
+        "cache", True
+    ):
+        return None
+
+    with tracing.span("result_cache_lookup", result_object.dispatch_id):
+        abstract_inputs = _get_abstract_task_inputs(node_id, node_name, result_object)
+        args = [
+            await datasvc.get_node_output(result_object, parent)
+            for parent in abstract_inputs["args"]
         ]
-        coro = runner.run_abstract_task(
-            dispatch_id=result_object.dispatch_id,
-            node_id=node_id,
-            executor=[executor, executor_data],
-            node_name=node_name,
-            abstract_inputs=abs_task_input,
+        kwargs = {
+            key: await datasvc.get_node_output(result_object, parent)
+            for key, parent in abstract_inputs["kwargs"].items()
+        }
+        key = get_cache_key(
+            tg.get_node_value(node_id, "function"),
+            tg._graph.nodes[node_id].get("function_string"),
+            metadata,
+            args,
+            kwargs,
         )
-        app_log.debug(f"Creating task {node_id}.")
-        asyncio.create_task(coro)
+        if key is None:
+            return None
+        output = await datasvc.get_cached_output(key)
+
+    if output is None:
+        cache_keys[node_id] = key
+        return None
+
+    app_log.debug(f"Reusing cached output of task {node_name}.")
+    timestamp = datetime.now(timezone.utc)
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        start_time=timestamp,
+        end_time=timestamp,
+        status=RESULT_STATUS.COMPLETED,
+        output=output,
+    )
+
+
+# Domain: dispatcher
+async def _submit_task(result_object, node_id, deferred_updates: Optional[List[Dict]] = None):
+    """Submit a ready node for execution.
+
+    Args:
+        result_object: Result object of the dispatch.
+        node_id: ID of the node in the transport graph.
+        deferred_updates: If a list is passed, the node results of nodes
+            which don't need to be executed are appended to it instead
+            of being persisted immediately.
+
+    """
+    task_groups = _task_groups.get(result_object.dispatch_id)
+    task_group_id = task_groups.get_group_id(node_id) if task_groups else None
+
+    node_result = await _get_trivial_node_result(result_object, node_id)
+    if node_result is None:
+        node_result = await _get_inline_node_result(result_object, node_id)
+    # The members of a packed task group run together
+    if node_result is None and task_group_id is None:
+        node_result = await _get_cached_node_result(result_object, node_id)
+    if node_result is not None:
+        if deferred_updates is None:
+            await datasvc.update_node_result(result_object, node_result)
+        else:
+            deferred_updates.append(node_result)
+        return
+
+    # Members of a packed task group are submitted together once all of them are ready
+    if task_group_id is not None:
+        members = task_groups.mark_ready(node_id)
+        if members is not None:
+            _submit_task_group(result_object, task_group_id, members)
+        return
+
+    # Gather inputs and dispatch task
+    app_log.debug(f"Gathering inputs for task {node_id}.")
+
+    node_name = result_object.lattice.transport_graph.get_node_value(node_id, "name")
+    abs_task_input = _get_abstract_task_inputs(node_id, node_name, result_object)
+    executor = result_object.lattice.transport_graph.get_node_value(node_id, "metadata")[
+        "executor"
+    ]
+    executor_data = result_object.lattice.transport_graph.get_node_value(node_id, "metadata")[
+        "executor_data"
+    ]
+    priorities = _task_priorities.get(result_object.dispatch_id)
+    app_log.debug(f"Queuing task {node_id}.")
+    runner.submit_abstract_task(
+        dispatch_id=result_object.dispatch_id,
+        node_id=node_id,
+        executor=[executor, executor_data],
+        node_name=node_name,
+        abstract_inputs=abs_task_input,
+        priority=priorities[node_id] if priorities else 0.0,
+    )
+
+
+# Domain: dispatcher
+def _resume_task(result_object: Result, node_id: int) -> None:
+    """Resume a node which was running when the dispatcher stopped.
+
+    Args:
+        result_object: Result object of the dispatch.
+        node_id: ID of the node in the transport graph.
+
+    """
+    tg = result_object.lattice.transport_graph
+    node_name = tg.get_node_value(node_id, "name")
+    metadata = tg.get_node_value(node_id, "metadata")
+    priorities = _task_priorities.get(result_object.dispatch_id)
+    app_log.debug(f"Resuming task {node_id}.")
+    runner.submit_resumed_task(
+        dispatch_id=result_object.dispatch_id,
+        node_id=node_id,
+        executor=[metadata["executor"], metadata["executor_data"]],
+        node_name=node_name,
+        abstract_inputs=_get_abstract_task_inputs(node_id, node_name, result_object),
+        priority=priorities[node_id] if priorities else 0.0,
+    )
+
+
+# Domain: dispatcher
+def _submit_task_group(result_object: Result, task_group_id: int, node_ids: List[int]) -> None:
+    """Submit the members of a packed task group as a single executor job.
+
+    Args:
+        result_object: Result object of the dispatch.
+        task_group_id: ID of the task group.
+        node_ids: Members of the group in topological order.
+
+    """
+    tg = result_object.lattice.transport_graph
+    priorities = _task_priorities.get(result_object.dispatch_id)
+
+    tasks = []
+    for node_id in node_ids:
+        node_name = tg.get_node_value(node_id, "name")
+        tasks.append(
+            {
+                "node_id": node_id,
+                "name": node_name,
+                "abstract_inputs": _get_abstract_task_inputs(node_id, node_name, result_object),
+            }
+        )
+
+    metadata = tg.get_node_value(task_group_id, "metadata")
+    app_log.debug(f"Queuing task group {task_group_id} with tasks {node_ids}.")
+    runner.submit_task_group(
+        dispatch_id=result_object.dispatch_id,
+        task_group_id=task_group_id,
+        tasks=tasks,
+        executor=[metadata["executor"], metadata["executor_data"]],
+        priority=max(priorities[node_id] for node_id in node_ids) if priorities else 0.0,
+    )
+
+
+# Domain: dispatcher
+async def _submit_tasks(result_object: Result, node_ids: List[int]) -> None:
+    """Submit a batch of ready nodes.
+
+    Nodes which don't need to be executed are recorded together using a
+    single DB transaction; the remaining nodes are sent to the runner,
+    those on the critical path first.
+
+    Args:
+        result_object: Result object of the dispatch.
+        node_ids: IDs of the nodes which are ready to run.
+
+    Returns:
+        None
+
+    """
+    if priorities := _task_priorities.get(result_object.dispatch_id):
+        node_ids = sorted(node_ids, key=lambda node_id: priorities[node_id], reverse=True)
+
+    with tracing.span("submit_tasks", result_object.dispatch_id):
+        deferred_updates = []
+        for node_id in node_ids:
+            await _submit_task(result_object, node_id, deferred_updates)
+
+        await datasvc.update_node_results(result_object, deferred_updates)
+
+
+def _get_status_updates(status_queue: asyncio.Queue, first_msg: Tuple, max_batch_size: int):
+    """Drain the pending messages of the status queue without blocking.
+
+    Args:
+        status_queue: Status queue of the dispatch.
+        first_msg: Message already retrieved from the queue.
+        max_batch_size: Maximum number of messages to return.
+
+    Returns:
+        List of status messages in the order in which they were received.
+
+    """
+    batch = [first_msg]
+    while len(batch) < max_batch_size:
+        try:
+            batch.append(status_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
 
 
 # Domain: dispatcher
@@ -225,6 +629,11 @@ async def _run_planned_workflow(result_object: Result, status_queue: asyncio.Que
     at the same level are executed in parallel. Also updates the status
     of the whole workflow execution.
 
+    Status updates are processed in batches: all the messages pending in
+    the status queue are drained at once (up to
+    `dispatcher.status_batch_size`) and the nodes which become ready are
+    submitted together.
+
     Args:
         result_object: Result object being used for current dispatch
         status_queue: message queue for notifying the main loop of status updates
@@ -233,57 +642,85 @@ async def _run_planned_workflow(result_object: Result, status_queue: asyncio.Que
         None
     """
     app_log.debug("Starting _run_planned_workflow ...")
+    sub_dispatch_ids = _resumed_dispatches.get(result_object.dispatch_id)
     result_object._status = RESULT_STATUS.RUNNING
-    result_object._start_time = datetime.now(timezone.utc)
-    datasvc.upsert_lattice_data(result_object.dispatch_id)
+    if sub_dispatch_ids is None or not result_object._start_time:
+        result_object._start_time = datetime.now(timezone.utc)
+    await datasvc.upsert_lattice_data(result_object.dispatch_id)
     app_log.debug(f"Wrote lattice status {result_object._status} to DB.")
 
-    tasks_left, initial_nodes, pending_parents = await _get_initial_tasks_and_deps(result_object)
-
-    unresolved_tasks = 0
+    max_batch_size = max(int(get_config("dispatcher.status_batch_size")), 1)
 
-    for node_id in initial_nodes:
-        unresolved_tasks += 1
-        await _submit_task(result_object, node_id)
-
-    while unresolved_tasks > 0:
+    if sub_dispatch_ids is None:
+        tasks_left, initial_nodes, pending_parents = await _get_initial_tasks_and_deps(
+            result_object
+        )
+        running_nodes = []
+        num_waiting = 0
+    else:
+        (
+            tasks_left,
+            initial_nodes,
+            running_nodes,
+            num_waiting,
+            pending_parents,
+        ) = _get_resumed_tasks_and_deps(result_object, sub_dispatch_ids)
+
+    # Sublattice dispatches resumed in the background report back to their nodes
+    unresolved_tasks = len(initial_nodes) + len(running_nodes) + num_waiting
+    await _submit_tasks(result_object, initial_nodes)
+    for node_id in running_nodes:
+        _resume_task(result_object, node_id)
+
+    # Members of a packed task group wait for the rest of the group and
+    # never report back if another member can't run because a task failed
+    task_groups = _task_groups.get(result_object.dispatch_id)
+
+    while unresolved_tasks > (task_groups.num_waiting if task_groups else 0):
         app_log.debug(f"{tasks_left} tasks left to complete.")
         app_log.debug(f"Waiting to hear from {unresolved_tasks} tasks.")
 
-        node_id, node_status, detail = await status_queue.get()
-
-        app_log.debug(
-            f"Status queue msg for node id {node_id}: {node_status} with detail {detail}."
-        )
-
-        if node_status == RESULT_STATUS.RUNNING:
-            continue
+        first_msg = await status_queue.get()
+        batch_start = tracing.now()
+        status_updates = _get_status_updates(status_queue, first_msg, max_batch_size)
 
-        # Note: A node status can only be 'DISPATCHING' if it is a sublattice and the corresponding graph has been built.
-        if node_status == RESULT_STATUS.DISPATCHING_SUBLATTICE:
-            sub_dispatch_id = detail["sub_dispatch_id"]
-            run_dispatch(sub_dispatch_id)
+        ready_nodes = []
+        for node_id, node_status, detail in status_updates:
             app_log.debug(
-                f"Submitted sublattice (dispatch id: {sub_dispatch_id}) to run_dispatch."
+                f"Status queue msg for node id {node_id}: {node_status} with detail {detail}."
             )
-            continue
 
-        unresolved_tasks -= 1
+            if node_status == RESULT_STATUS.RUNNING:
+                continue
 
-        if node_status == RESULT_STATUS.COMPLETED:
-            tasks_left -= 1
-            ready_nodes = await _handle_completed_node(result_object, node_id, pending_parents)
-            for node_id in ready_nodes:
-                unresolved_tasks += 1
-                await _submit_task(result_object, node_id)
+            # Note: A node status can only be 'DISPATCHING' if it is a sublattice and the corresponding graph has been built.
+            if node_status == RESULT_STATUS.DISPATCHING_SUBLATTICE:
+                sub_dispatch_id = detail["sub_dispatch_id"]
+                run_dispatch(sub_dispatch_id)
+                app_log.debug(
+                    f"Submitted sublattice (dispatch id: {sub_dispatch_id}) to run_dispatch."
+                )
+                continue
 
-        if node_status == RESULT_STATUS.FAILED:
-            await _handle_failed_node(result_object, node_id)
-            continue
+            unresolved_tasks -= 1
 
-        if node_status == RESULT_STATUS.CANCELLED:
-            await _handle_cancelled_node(result_object, node_id)
-            continue
+            if node_status == RESULT_STATUS.COMPLETED:
+                tasks_left -= 1
+                ready_nodes.extend(
+                    await _handle_completed_node(result_object, node_id, pending_parents)
+                )
+
+            if node_status == RESULT_STATUS.FAILED:
+                await _handle_failed_node(result_object, node_id)
+                continue
+
+            if node_status == RESULT_STATUS.CANCELLED:
+                await _handle_cancelled_node(result_object, node_id)
+                continue
+
+        unresolved_tasks += len(ready_nodes)
+        await _submit_tasks(result_object, ready_nodes)
+        tracing.record("process_status_updates", result_object.dispatch_id, batch_start)
 
     if result_object._task_failed or result_object._task_cancelled:
         app_log.debug(f"Workflow {result_object.dispatch_id} cancelled or failed")
@@ -309,6 +746,18 @@ def _plan_workflow(result_object: Result) -> None:
     Planning means to decide which executors (along with their arguments) will
     be used by each node.
 
+    The transport graph is also frozen into a dependency index, and the
+    upward rank of each node (the cost of the longest path from the node
+    to an exit node) is computed. Ready nodes with higher ranks are
+    submitted first. If `dispatcher.runtime_weighted_priorities` is
+    enabled, nodes are weighted by the historical runtime of their
+    electron. If `dispatcher.inline_structural_nodes` is enabled, the
+    structural nodes which can be evaluated in the dispatcher are left
+    out of their task groups. If `dispatcher.task_packing` is enabled,
+    the task groups which can run as a single executor job are
+    determined. If `dispatcher.result_cache` is enabled, the outputs of
+    the tasks are looked up in the result cache before they are run.
+
     Args:
         result_object: Result object being used for current dispatch
 
@@ -324,6 +773,30 @@ def _plan_workflow(result_object: Result) -> None:
         #    result_object.lattice.transport_graph.set_node_value(node_id, "executor", executor)
         pass
 
+    tg = result_object.lattice.transport_graph
+    dep_index = DependencyIndex(tg._graph)
+    node_names = [tg.get_node_value(node_id, "name") for node_id in range(dep_index.num_nodes)]
+    use_history = get_config("dispatcher.runtime_weighted_priorities") == "true"
+    weights = planning.get_node_weights(node_names, use_history)
+
+    _dependency_indices[result_object.dispatch_id] = dep_index
+    _task_priorities[result_object.dispatch_id] = planning.compute_upward_ranks(dep_index, weights)
+
+    inline_node_ids = ()
+    if get_config("dispatcher.inline_structural_nodes") == "true":
+        evaluator = InlineEvaluator(tg._graph, int(get_config("dispatcher.inline_max_input_size")))
+        _inline_evaluators[result_object.dispatch_id] = evaluator
+        inline_node_ids = evaluator.node_ids
+
+    # Packed groups of resumed dispatches may have members already completed
+    resumed = result_object.dispatch_id in _resumed_dispatches
+    if get_config("dispatcher.task_packing") == "true" and not resumed:
+        if packed_groups := find_packed_task_groups(tg._graph, dep_index, inline_node_ids):
+            _task_groups[result_object.dispatch_id] = PackedTaskGroups(packed_groups)
+
+    if get_config("dispatcher.result_cache") == "true":
+        _cache_keys[result_object.dispatch_id] = {}
+
 
 async def run_workflow(result_object: Result) -> Result:
     """
@@ -346,7 +819,8 @@ async def run_workflow(result_object: Result) -> Result:
         return result_object
 
     try:
-        _plan_workflow(result_object)
+        with tracing.span("plan_workflow", result_object.dispatch_id):
+            _plan_workflow(result_object)
         status_queue = datasvc.get_status_queue(result_object.dispatch_id)
         result_object = await _run_planned_workflow(result_object, status_queue)
 
@@ -359,6 +833,14 @@ async def run_workflow(result_object: Result) -> Result:
         result_object._end_time = datetime.now(timezone.utc)
 
     finally:
+        _dependency_indices.pop(result_object.dispatch_id, None)
+        _task_priorities.pop(result_object.dispatch_id, None)
+        _task_groups.pop(result_object.dispatch_id, None)
+        _inline_evaluators.pop(result_object.dispatch_id, None)
+        _resumed_dispatches.pop(result_object.dispatch_id, None)
+        _cache_keys.pop(result_object.dispatch_id, None)
+        forget_dispatch(result_object.dispatch_id)
+        await datasvc.wait_for_background_tasks(result_object.dispatch_id)
         await datasvc.persist_result(result_object.dispatch_id)
         datasvc.finalize_dispatch(result_object.dispatch_id)
 
@@ -392,12 +874,52 @@ async def cancel_dispatch(dispatch_id: str, task_ids: List[int] = None) -> None:
     await set_cancel_requested(dispatch_id, task_ids)
     await runner.cancel_tasks(dispatch_id, task_ids)
 
+    # The job records of a dispatch which isn't running were only
+    # loaded for the cancellation
+    if dispatch_id not in _dependency_indices:
+        forget_dispatch(dispatch_id)
+
     # Recursively cancel running sublattice dispatches
     sub_ids = list(map(lambda x: tg.get_node_value(x, "sub_dispatch_id"), task_ids))
     for sub_dispatch_id in sub_ids:
         await cancel_dispatch(sub_dispatch_id)
 
 
+async def resume_dispatches() -> List[asyncio.Future]:
+    """
+    Resume the dispatches left running by a previous dispatcher process
+
+    The state of each dispatch is restored from the DB. Completed tasks
+    aren't run again, and running tasks are reattached to their jobs if
+    their executor supports it.
+
+    Arg(s)
+        None
+
+    Return(s)
+        The futures of the resumed dispatches
+    """
+    resumed = []
+    for record in await datasvc.get_resumable_dispatches():
+        dispatch_id = record["dispatch_id"]
+        parent_dispatch_id = record["parent_dispatch_id"]
+        if parent_dispatch_id and parent_dispatch_id not in _resumed_dispatches:
+            continue
+        try:
+            await datasvc.resume_dispatch(dispatch_id)
+        except Exception as ex:
+            app_log.exception(f"Failed to resume dispatch {dispatch_id}: {ex}")
+            continue
+
+        _resumed_dispatches[dispatch_id] = set()
+        if parent_dispatch_id:
+            _resumed_dispatches[parent_dispatch_id].add(dispatch_id)
+        resumed.append(dispatch_id)
+
+    app_log.debug(f"Resuming dispatches {resumed}")
+    return [run_dispatch(dispatch_id) for dispatch_id in resumed]
+
+
 def run_dispatch(dispatch_id: str) -> asyncio.Future:
     """
     Run the workflow and return immediately
@@ -0,0 +1,165 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Compact, array-backed dependency index of a transport graph"""
+
+from array import array
+from typing import Dict, List
+
+import networkx as nx
+
+
+class DependencyIndex:
+    """
+    Frozen view of the edges of a transport graph.
+
+    The graph is walked once and its structure is stored in CSR
+    (compressed sparse row) arrays indexed by node id, so that input
+    resolution and ready-set computation don't need to traverse the
+    networkx dict-of-dicts.
+
+    Attributes:
+        in_degree: Number of incoming edges (including `wait_for` edges) of each node.
+        child_offsets, children: CSR arrays of the child of every outgoing edge.
+        arg_offsets, arg_parents: CSR arrays of the positional inputs of each node,
+            sorted by their argument index.
+        kwarg_offsets, kwarg_parents, kwarg_names: CSR arrays of the keyword
+            inputs of each node.
+    """
+
+    __slots__ = (
+        "num_nodes",
+        "in_degree",
+        "child_offsets",
+        "children",
+        "arg_offsets",
+        "arg_parents",
+        "kwarg_offsets",
+        "kwarg_parents",
+        "kwarg_names",
+    )
+
+    def __init__(self, graph: nx.MultiDiGraph) -> None:
+        """Build the index from the internal graph of a transport graph.
+
+        Args:
+            graph: The `nx.MultiDiGraph` of the transport graph. Node ids are
+                expected to be the integers `0, ..., n - 1`.
+
+        """
+        num_nodes = max(graph.nodes, default=-1) + 1
+
+        in_degree = [0] * num_nodes
+        child_offsets = [0]
+        children = []
+        arg_offsets = [0]
+        arg_parents = []
+        kwarg_offsets = [0]
+        kwarg_parents = []
+        kwarg_names = []
+
+        # Walk the raw adjacency dicts; the networkx views add a layer of
+        # indirection on every lookup
+        succ = graph._succ
+        pred = graph._pred
+        for node_id in range(num_nodes):
+            for child, edges in succ.get(node_id, {}).items():
+                children.extend([child] * len(edges))
+            child_offsets.append(len(children))
+
+            args = []
+            for parent, edges in pred.get(node_id, {}).items():
+                in_degree[node_id] += len(edges)
+                for d in edges.values():
+                    if d.get("wait_for"):
+                        continue
+                    if d["param_type"] == "arg":
+                        args.append((d["arg_index"], parent))
+                    elif d["param_type"] == "kwarg":
+                        kwarg_parents.append(parent)
+                        kwarg_names.append(d["edge_name"])
+
+            if args:
+                # Stable sort keeps the predecessor order for equal indices
+                args.sort(key=lambda x: x[0])
+                arg_parents.extend(parent for _, parent in args)
+            arg_offsets.append(len(arg_parents))
+            kwarg_offsets.append(len(kwarg_parents))
+
+        self.num_nodes = num_nodes
+        self.in_degree = array("l", in_degree)
+        self.child_offsets = array("l", child_offsets)
+        self.children = array("l", children)
+        self.arg_offsets = array("l", arg_offsets)
+        self.arg_parents = array("l", arg_parents)
+        self.kwarg_offsets = array("l", kwarg_offsets)
+        self.kwarg_parents = array("l", kwarg_parents)
+        self.kwarg_names = kwarg_names
+
+    def get_children(self, node_id: int) -> array:
+        """Return the child of every outgoing edge of a node.
+
+        A child appears once for each edge connecting it to the node.
+
+        """
+        return self.children[self.child_offsets[node_id] : self.child_offsets[node_id + 1]]
+
+    def get_pending_parents(self) -> Dict[int, int]:
+        """Return the initial map from node id to number of incomplete parent edges."""
+        return dict(enumerate(self.in_degree))
+
+    def get_ready_nodes(self) -> List[int]:
+        """Return the nodes without any parents."""
+        return [node_id for node_id, d in enumerate(self.in_degree) if d == 0]
+
+    def get_topological_order(self) -> List[int]:
+        """Return the node ids in a topological order (parents before children)."""
+        pending = list(self.in_degree)
+        order = self.get_ready_nodes()
+        for node_id in order:
+            for child in self.get_children(node_id):
+                pending[child] -= 1
+                if pending[child] == 0:
+                    order.append(child)
+        return order
+
+    def get_abstract_task_inputs(self, node_id: int) -> dict:
+        """Return the `node_id` placeholders for the args and kwargs of a task.
+
+        Args:
+            node_id: Node id of the task in the transport graph.
+
+        Returns:
+            Dictionary with the parent node ids of the positional
+            arguments (in order) under "args" and a map from keyword to
+            parent node id under "kwargs".
+
+        """
+        arg_start, arg_end = self.arg_offsets[node_id], self.arg_offsets[node_id + 1]
+        kwarg_start, kwarg_end = self.kwarg_offsets[node_id], self.kwarg_offsets[node_id + 1]
+        return {
+            "args": self.arg_parents[arg_start:arg_end].tolist(),
+            "kwargs": dict(
+                zip(
+                    self.kwarg_names[kwarg_start:kwarg_end],
+                    self.kwarg_parents[kwarg_start:kwarg_end],
+                )
+            ),
+        }
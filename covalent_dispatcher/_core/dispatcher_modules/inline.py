@@ -0,0 +1,132 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Inline evaluation of structural nodes in the dispatcher"""
+
+import asyncio
+import re
+from functools import partial
+from typing import Dict, List, Set
+
+import networkx as nx
+
+from covalent._shared_files.defaults import (
+    attr_prefix,
+    electron_dict_prefix,
+    electron_list_prefix,
+    generator_prefix,
+    parameter_prefix,
+    postprocess_prefix,
+    prefix_separator,
+    sublattice_prefix,
+    subscript_prefix,
+)
+from covalent._workflow.transportable_object import TransportableObject
+from covalent.executor.base import wrapper_fn
+
+_STRUCTURAL_PREFIXES = (
+    electron_list_prefix,
+    electron_dict_prefix,
+    subscript_prefix,
+    attr_prefix,
+    generator_prefix,
+)
+
+# Names of the nodes which subscript, unpack or get an attribute of an electron
+_ACCESSOR_NAME = re.compile(
+    rf"^{re.escape(prefix_separator)}.*(\.__getitem__|\.__getattr__|\[\d+\])$", re.DOTALL
+)
+
+
+def is_structural_node(node_name: str) -> bool:
+    """Whether a node only collects or indexes into the outputs of its parents."""
+    if node_name.startswith((parameter_prefix, sublattice_prefix, postprocess_prefix)):
+        return False
+    return node_name.startswith(_STRUCTURAL_PREFIXES) or bool(_ACCESSOR_NAME.match(node_name))
+
+
+def _has_deps(metadata: Dict) -> bool:
+    """Whether a node needs deps which only its executor sets up."""
+    deps = metadata.get("deps") or {}
+    return any(deps.values()) or bool(metadata.get("call_before") or metadata.get("call_after"))
+
+
+class InlineEvaluator:
+    """
+    Evaluates the structural nodes of a dispatch in the dispatcher.
+
+    Structural nodes (collections of electrons, and subscripts, unpacked
+    items and attributes of electron outputs) are cheap, so they are run
+    by a worker thread of the dispatcher instead of being sent to their
+    executor. Nodes which need deps or whose inputs are too large to be
+    deserialized in the dispatcher are left to their executor.
+
+    Attributes:
+        node_ids: Nodes which may be evaluated inline.
+        max_input_size: Maximum total size in bytes of the serialized
+            inputs of a node evaluated inline.
+    """
+
+    def __init__(self, graph: nx.MultiDiGraph, max_input_size: int) -> None:
+        self.node_ids: Set[int] = {
+            node_id
+            for node_id, attrs in graph.nodes(data=True)
+            if is_structural_node(attrs["name"]) and not _has_deps(attrs["metadata"])
+        }
+        self.max_input_size = max_input_size
+
+    def accepts(self, node_id: int, args: List, kwargs: Dict) -> bool:
+        """Whether a node can be evaluated inline with the given inputs.
+
+        Args:
+            node_id: ID of the node.
+            args: Serialized positional inputs of the node.
+            kwargs: Serialized keyword inputs of the node.
+
+        Returns:
+            Whether to evaluate the node inline.
+
+        """
+        if node_id not in self.node_ids:
+            return False
+
+        inputs = list(args) + list(kwargs.values())
+        if not all(isinstance(value, TransportableObject) for value in inputs):
+            return False
+        return sum(value.size for value in inputs) <= self.max_input_size
+
+    async def evaluate(
+        self, function: TransportableObject, args: List, kwargs: Dict
+    ) -> TransportableObject:
+        """Evaluate a structural node in a worker thread.
+
+        Args:
+            function: Serialized function of the node.
+            args: Serialized positional inputs of the node.
+            kwargs: Serialized keyword inputs of the node.
+
+        Returns:
+            The serialized output of the node.
+
+        """
+        # Deserializing the inputs and the output mustn't block the event loop
+        return await asyncio.get_running_loop().run_in_executor(
+            None, partial(wrapper_fn, function, [], [], *args, **kwargs)
+        )
@@ -0,0 +1,116 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Critical-path prioritization of the tasks of a workflow"""
+
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+from covalent._shared_files.defaults import parameter_prefix
+
+from .dependency_index import DependencyIndex
+
+# Weight given to the latest runtime when updating the runtime history
+RUNTIME_SMOOTHING = 0.5
+
+# LRU map of electron name -> exponentially smoothed runtime (in
+# seconds), bounded since electron names are unbounded over the
+# lifetime of the dispatcher
+RUNTIME_HISTORY_SIZE = 10000
+_runtime_history: "OrderedDict[str, float]" = OrderedDict()
+
+
+def record_runtime(node_name: str, runtime: float) -> None:
+    """Record the runtime of a task in the runtime history.
+
+    Args:
+        node_name: Name of the electron.
+        runtime: Runtime of the task in seconds.
+
+    """
+    # Parameter names contain their values and aren't worth tracking
+    if node_name.startswith(parameter_prefix):
+        return
+
+    previous = _runtime_history.pop(node_name, None)
+    if previous is None:
+        _runtime_history[node_name] = runtime
+    else:
+        _runtime_history[node_name] = (
+            RUNTIME_SMOOTHING * runtime + (1 - RUNTIME_SMOOTHING) * previous
+        )
+    if len(_runtime_history) > RUNTIME_HISTORY_SIZE:
+        _runtime_history.popitem(last=False)
+
+
+def get_node_weights(node_names: List[str], use_history: bool = True) -> List[float]:
+    """Return the expected cost of each task.
+
+    Args:
+        node_names: Electron names indexed by node id.
+        use_history: Whether to weight the tasks by their historical runtime.
+
+    Returns:
+        Weights indexed by node id. Without any history every task has
+        weight 1; tasks without history are given the average runtime
+        of the tasks with history.
+
+    """
+    if not use_history:
+        return [1.0] * len(node_names)
+
+    runtimes = [_runtime_history.get(name) for name in node_names]
+    known = [r for r in runtimes if r is not None]
+    if not known:
+        return [1.0] * len(node_names)
+
+    default = sum(known) / len(known)
+    return [default if r is None else r for r in runtimes]
+
+
+def compute_upward_ranks(
+    dep_index: DependencyIndex, weights: Optional[List[float]] = None
+) -> array:
+    """Compute the upward rank of each node.
+
+    The upward rank of a node is its weight plus the largest upward rank
+    of its children, i.e. the cost of the longest path from the node to
+    an exit node. Tasks on the critical path have the highest ranks.
+
+    Args:
+        dep_index: Dependency index of the transport graph.
+        weights: Weights indexed by node id. Defaults to 1 for every node.
+
+    Returns:
+        Array of upward ranks indexed by node id.
+
+    """
+    num_nodes = dep_index.num_nodes
+    if weights is None:
+        weights = [1.0] * num_nodes
+
+    ranks = array("d", weights)
+    for node_id in reversed(dep_index.get_topological_order()):
+        children = dep_index.get_children(node_id)
+        if children:
+            ranks[node_id] += max(ranks[child] for child in children)
+
+    return ranks
@@ -0,0 +1,176 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Task groups which are run as a single executor job"""
+
+from collections import defaultdict
+from typing import Collection, Dict, List, Optional
+
+import networkx as nx
+
+from covalent._shared_files.defaults import parameter_prefix, postprocess_prefix, sublattice_prefix
+from covalent._shared_files.util_classes import RESULT_STATUS
+
+from .dependency_index import DependencyIndex
+
+# Nodes which are never packed with other nodes
+_UNPACKABLE_PREFIXES = (parameter_prefix, postprocess_prefix, sublattice_prefix)
+
+
+def _is_packable(graph: nx.MultiDiGraph, members: List[int]) -> bool:
+    """Whether the members of a task group can run together on one executor."""
+
+    first = graph.nodes[members[0]]["metadata"]
+    for node_id in members:
+        attrs = graph.nodes[node_id]
+        if attrs["name"].startswith(_UNPACKABLE_PREFIXES):
+            return False
+
+        # Completed nodes are reused when redispatching
+        if attrs.get("status") == RESULT_STATUS.COMPLETED:
+            return False
+
+        metadata = attrs["metadata"]
+        if metadata.get("executor") != first.get("executor") or metadata.get(
+            "executor_data"
+        ) != first.get("executor_data"):
+            return False
+
+    return True
+
+
+def find_packed_task_groups(
+    graph: nx.MultiDiGraph, dep_index: DependencyIndex, exclude: Collection[int] = ()
+) -> Dict[int, List[int]]:
+    """Find the task groups of a transport graph which can be packed.
+
+    A task group is packed if it has several members, all of which run
+    on the same executor and none of which is a parameter, sublattice or
+    postprocessing node. Groups that a path leaves and re-enters can't
+    be run as a single job and are left unpacked; they are found as the
+    cycles of the graph obtained by contracting each group to a node.
+
+    Args:
+        graph: The `nx.MultiDiGraph` of the transport graph.
+        dep_index: Dependency index of the graph.
+        exclude: Nodes to leave out of their task groups.
+
+    Returns:
+        Map from task group id to the members of the group in topological order.
+
+    """
+    groups = defaultdict(list)
+    for node_id in dep_index.get_topological_order():
+        if node_id in exclude:
+            continue
+        groups[graph.nodes[node_id].get("task_group_id", node_id)].append(node_id)
+
+    packed = {
+        group_id: members
+        for group_id, members in groups.items()
+        if len(members) > 1 and _is_packable(graph, members)
+    }
+    if not packed:
+        return {}
+
+    node_group = {node_id: group_id for group_id, members in packed.items() for node_id in members}
+
+    def _contracted(node_id):
+        group_id = node_group.get(node_id)
+        return node_id if group_id is None else ("group", group_id)
+
+    contracted = nx.DiGraph()
+    for parent in range(dep_index.num_nodes):
+        for child in dep_index.get_children(parent):
+            u, v = _contracted(parent), _contracted(child)
+            if u != v:
+                contracted.add_edge(u, v)
+
+    for component in nx.strongly_connected_components(contracted):
+        if len(component) > 1:
+            for node in component:
+                if isinstance(node, tuple):
+                    packed.pop(node[1], None)
+
+    return packed
+
+
+class PackedTaskGroups:
+    """
+    Packed task groups of a dispatch and their readiness.
+
+    A packed group is submitted once all its members are ready, that is
+    once the parents of its members outside the group have completed.
+
+    Attributes:
+        groups: Map from task group id to the members of the group in
+            topological order.
+        node_group: Map from node id to the id of its packed task group.
+        num_waiting: Number of ready members waiting for the other
+            members of their group.
+    """
+
+    def __init__(self, groups: Dict[int, List[int]]) -> None:
+        self.groups = groups
+        self.node_group = {
+            node_id: group_id for group_id, members in groups.items() for node_id in members
+        }
+        self._ready = defaultdict(set)
+        self.num_waiting = 0
+
+    def get_group_id(self, node_id: int) -> Optional[int]:
+        """Return the id of the packed task group of a node, if any."""
+        return self.node_group.get(node_id)
+
+    def is_internal_edge(self, parent: int, child: int) -> bool:
+        """Whether an edge connects two members of the same packed group."""
+        group_id = self.node_group.get(parent)
+        return group_id is not None and self.node_group.get(child) == group_id
+
+    def exclude_internal_edges(
+        self, pending_parents: Dict[int, int], dep_index: DependencyIndex
+    ) -> None:
+        """Don't wait for parents inside the same group, which run in the same job."""
+        for members in self.groups.values():
+            for node_id in members:
+                for child in dep_index.get_children(node_id):
+                    if self.is_internal_edge(node_id, child):
+                        pending_parents[child] -= 1
+
+    def mark_ready(self, node_id: int) -> Optional[List[int]]:
+        """Mark a member of a packed group as ready.
+
+        Args:
+            node_id: Node id of the member.
+
+        Returns:
+            The members of the group if all of them are now ready, otherwise None.
+
+        """
+        group_id = self.node_group[node_id]
+        ready = self._ready[group_id]
+        ready.add(node_id)
+        if len(ready) < len(self.groups[group_id]):
+            self.num_waiting += 1
+            return None
+
+        self.num_waiting -= len(ready) - 1
+        del self._ready[group_id]
+        return self.groups[group_id]
@@ -24,7 +24,7 @@ Defines the core functionality of the dispatcher
 
 from covalent._results_manager import Result
 
-from . import dispatcher, runner
+from . import dispatcher
 
 
 def _get_task_inputs(node_id: int, node_name: str, result_object: Result) -> dict:
@@ -45,12 +45,11 @@ def _get_task_inputs(node_id: int, node_name: str, result_object: Result) -> dic
     """
 
     abstract_inputs = dispatcher._get_abstract_task_inputs(node_id, node_name, result_object)
-    input_values = runner._get_task_input_values(result_object, abstract_inputs)
 
     abstract_args = abstract_inputs["args"]
     abstract_kwargs = abstract_inputs["kwargs"]
-    args = [input_values[node_id] for node_id in abstract_args]
-    kwargs = {k: input_values[v] for k, v in abstract_kwargs.items()}
+    args = [result_object._get_node_output(node_id) for node_id in abstract_args]
+    kwargs = {k: result_object._get_node_output(v) for k, v in abstract_kwargs.items()}
     task_input = {"args": args, "kwargs": kwargs}
 
     return task_input
@@ -23,24 +23,35 @@ Defines the core functionality of the runner
 """
 
 import asyncio
+import hashlib
 import json
 import traceback
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from functools import partial
-from typing import Any, Dict, List, Literal, Tuple, Union
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
 
+from covalent._data_store import ObjectRef
 from covalent._results_manager import Result
-from covalent._shared_files import logger
+from covalent._shared_files import logger, tracing
 from covalent._shared_files.config import get_config
+from covalent._shared_files.defaults import postprocess_prefix, sublattice_prefix
 from covalent._shared_files.util_classes import RESULT_STATUS
 from covalent._workflow import DepsBash, DepsCall, DepsPip
 from covalent.executor import _executor_manager
-from covalent.executor.base import AsyncBaseExecutor, wrapper_fn
+from covalent.executor.base import (
+    AsyncBaseExecutor,
+    reference_wrapper_fn,
+    task_group_wrapper_fn,
+    wrapper_fn,
+)
 
 from . import data_manager as datasvc
 from .data_modules.job_manager import get_jobs_metadata, set_cancel_result
 from .runner_modules import executor_proxy
+from .runner_modules.admission import AdmissionQueue, get_instance_key
+from .runner_modules.executor_pool import ExecutorPool
 
 app_log = logger.app_log
 log_stack_info = logger.log_stack_info
@@ -48,6 +59,24 @@ debug_mode = get_config("sdk.log_level") == "debug"
 
 _cancel_threadpool = ThreadPoolExecutor()
 
+# Fair ready queue capping the number of in-flight tasks per executor;
+# created on first use from the dispatcher config
+_admission_queue = None
+
+# Configured executor instances shared between tasks; created on first use
+_executor_pool = None
+
+# LRU cache of assembled (call_before, call_after) keyed by the content
+# hash of the deps metadata, see `_gather_deps`
+DEPS_CACHE_SIZE = 256
+_deps_cache = OrderedDict()
+
+# Root directory of the object store holding task outputs passed by
+# reference, or None if outputs are passed by value; read from the
+# dispatcher config on first use
+_object_store_dir = None
+_object_store_initialized = False
+
 
 # Domain: runner
 def get_executor(
@@ -74,9 +103,60 @@ def get_executor(
     return executor
 
 
+def _new_executor(short_name: str) -> AsyncBaseExecutor:
+    return _executor_manager.get_executor(short_name)
+
+
+# Domain: runner
+def _get_executor_pool() -> ExecutorPool:
+    """Return the executor pool, creating it from the dispatcher config if needed."""
+    global _executor_pool
+    if _executor_pool is None:
+        _executor_pool = ExecutorPool(
+            _new_executor,
+            idle_timeout=float(get_config("dispatcher.executor_pool_idle_timeout")),
+        )
+    return _executor_pool
+
+
+# Domain: runner
+def _get_object_store_dir() -> Optional[str]:
+    """Return the object store directory if task outputs are passed by reference."""
+    global _object_store_dir, _object_store_initialized
+    if not _object_store_initialized:
+        _object_store_initialized = True
+        if get_config("dispatcher.pass_by_reference") == "true":
+            _object_store_dir = get_config("dispatcher.object_store_dir")
+    return _object_store_dir
+
+
+# Domain: runner
+def _get_output_ref(dispatch_id: str, node_id: int, node_name: str) -> Optional[ObjectRef]:
+    """
+    Return where the executor should store the output of a task
+
+    The outputs of postprocessing and sublattice nodes are always
+    returned by value since the dispatcher reads them.
+
+    Arg(s)
+        dispatch_id: Dispatch ID of the workflow
+        node_id: ID of the task in the transport graph
+        node_name: Name of the task
+
+    Return(s)
+        Reference to the output in the object store, or None if the
+        output is passed by value
+
+    """
+    base_dir = _get_object_store_dir()
+    if base_dir is None or node_name.startswith((postprocess_prefix, sublattice_prefix)):
+        return None
+    return ObjectRef(base_dir, dispatch_id, f"{dispatch_id}-{node_id}.pkl")
+
+
 # Domain: runner
 # to be called by _run_abstract_task
-def _get_task_input_values(result_object: Result, abs_task_inputs: dict) -> dict:
+async def _get_task_input_values(result_object: Result, abs_task_inputs: dict) -> dict:
     """
     Retrieve the input values from the result_object for the task
 
@@ -91,17 +171,119 @@ def _get_task_input_values(result_object: Result, abs_task_inputs: dict) -> dict
     node_values = {}
     args = abs_task_inputs["args"]
     for node_id in args:
-        value = result_object.lattice.transport_graph.get_node_value(node_id, "output")
+        value = await datasvc.get_node_output(result_object, node_id)
         node_values[node_id] = value
 
     kwargs = abs_task_inputs["kwargs"]
     for _, node_id in kwargs.items():
-        value = result_object.lattice.transport_graph.get_node_value(node_id, "output")
+        value = await datasvc.get_node_output(result_object, node_id)
         node_values[node_id] = value
 
     return node_values
 
 
+# Domain: runner
+def _get_admission_queue() -> AdmissionQueue:
+    """Return the admission queue, creating it from the dispatcher config if needed."""
+    global _admission_queue
+    if _admission_queue is None:
+        _admission_queue = AdmissionQueue(
+            limits={
+                k: int(v) for k, v in get_config("dispatcher.executor_concurrency_limits").items()
+            },
+            default_limit=int(get_config("dispatcher.executor_concurrency_limit")),
+            instance_limit=int(get_config("dispatcher.executor_instance_concurrency_limit")),
+        )
+    return _admission_queue
+
+
+# Domain: runner
+def submit_abstract_task(
+    dispatch_id: str,
+    node_id: int,
+    node_name: str,
+    abstract_inputs: Dict,
+    executor: Any,
+    priority: float = 0.0,
+) -> None:
+    """Queue a task for execution.
+
+    The task is started once its executor has a free slot, see
+    `AdmissionQueue`.
+
+    Args:
+        dispatch_id: Dispatch ID of the workflow.
+        node_id: Node ID of the task in the transport graph.
+        node_name: Name of the task.
+        abstract_inputs: Node ids of the task's args and kwargs.
+        executor: Pair of executor short name and serialized executor.
+        priority: Tasks with higher priorities are started first when
+            the executor's slots are limited.
+
+    """
+    short_name, executor_data = executor
+    _get_admission_queue().submit(
+        dispatch_id,
+        short_name,
+        get_instance_key(short_name, executor_data),
+        partial(
+            run_abstract_task,
+            dispatch_id=dispatch_id,
+            node_id=node_id,
+            node_name=node_name,
+            abstract_inputs=abstract_inputs,
+            executor=executor,
+        ),
+        priority,
+    )
+
+
+# Domain: runner
+def submit_resumed_task(
+    dispatch_id: str,
+    node_id: int,
+    node_name: str,
+    abstract_inputs: Dict,
+    executor: Any,
+    priority: float = 0.0,
+) -> None:
+    """Queue a task which was running when the dispatcher stopped.
+
+    The job of the task is awaited if its executor can reattach to it,
+    otherwise the task is run again, see `resume_abstract_task`.
+
+    Args:
+        dispatch_id: Dispatch ID of the workflow.
+        node_id: Node ID of the task in the transport graph.
+        node_name: Name of the task.
+        abstract_inputs: Node ids of the task's args and kwargs.
+        executor: Pair of executor short name and serialized executor.
+        priority: Tasks with higher priorities are started first when
+            the executor's slots are limited.
+
+    """
+    short_name, executor_data = executor
+    _get_admission_queue().submit(
+        dispatch_id,
+        short_name,
+        get_instance_key(short_name, executor_data),
+        partial(
+            resume_abstract_task,
+            dispatch_id=dispatch_id,
+            node_id=node_id,
+            node_name=node_name,
+            abstract_inputs=abstract_inputs,
+            executor=executor,
+        ),
+        priority,
+    )
+
+
+def get_executor_queue_stats() -> Dict[str, Dict[str, int]]:
+    """Return the number of queued and in-flight tasks of each executor."""
+    return _get_admission_queue().get_stats()
+
+
 # Domain: runner
 async def run_abstract_task(
     dispatch_id: str,
@@ -119,7 +301,7 @@ async def run_abstract_task(
     )
 
     result_object = datasvc.get_result_object(dispatch_id)
-    await datasvc.update_node_result(result_object, node_result)
+    await datasvc.submit_node_result(result_object, node_result)
 
 
 # Domain: runner
@@ -148,17 +330,18 @@ async def _run_abstract_task(
         serialized_callable = result_object.lattice.transport_graph.get_node_value(
             node_id, "function"
         )
-        input_values = _get_task_input_values(result_object, abstract_inputs)
+        with tracing.span("resolve_inputs", dispatch_id):
+            input_values = await _get_task_input_values(result_object, abstract_inputs)
 
-        abstract_args = abstract_inputs["args"]
-        abstract_kwargs = abstract_inputs["kwargs"]
-        args = [input_values[node_id] for node_id in abstract_args]
-        kwargs = {k: input_values[v] for k, v in abstract_kwargs.items()}
-        task_input = {"args": args, "kwargs": kwargs}
+            abstract_args = abstract_inputs["args"]
+            abstract_kwargs = abstract_inputs["kwargs"]
+            args = [input_values[node_id] for node_id in abstract_args]
+            kwargs = {k: input_values[v] for k, v in abstract_kwargs.items()}
+            task_input = {"args": args, "kwargs": kwargs}
 
-        app_log.debug(f"Collecting deps for task {node_id}")
+            app_log.debug(f"Collecting deps for task {node_id}")
 
-        call_before, call_after = _gather_deps(result_object, node_id)
+            call_before, call_after = _gather_deps(result_object, node_id)
 
     except Exception as ex:
         app_log.error(f"Exception when trying to resolve inputs or deps: {ex}")
@@ -192,6 +375,292 @@ async def _run_abstract_task(
     )
 
 
+# Domain: runner
+async def resume_abstract_task(
+    dispatch_id: str,
+    node_id: int,
+    node_name: str,
+    abstract_inputs: Dict,
+    executor: Any,
+) -> None:
+    node_result = await _resume_task(
+        dispatch_id=dispatch_id,
+        node_id=node_id,
+        node_name=node_name,
+        executor=executor,
+    )
+    if node_result is None:
+        app_log.debug(f"Running task {dispatch_id}:{node_id} again")
+        node_result = await _run_abstract_task(
+            dispatch_id=dispatch_id,
+            node_id=node_id,
+            node_name=node_name,
+            abstract_inputs=abstract_inputs,
+            executor=executor,
+        )
+
+    result_object = datasvc.get_result_object(dispatch_id)
+    await datasvc.submit_node_result(result_object, node_result)
+
+
+# Domain: runner
+async def _resume_task(
+    dispatch_id: str,
+    node_id: int,
+    node_name: str,
+    executor: Any,
+) -> Optional[Dict]:
+    """Wait for the job of a task submitted by a previous dispatcher process.
+
+    Args:
+        dispatch_id: Dispatch ID of the workflow.
+        node_id: Node ID of the task in the transport graph.
+        node_name: Name of the task.
+        executor: Pair of executor short name and serialized executor.
+
+    Returns:
+        The node result of the task, or None if the task has to be run
+        again because it has no job or its executor can't reattach to it.
+
+    """
+    records = await get_jobs_metadata(dispatch_id, [node_id])
+    job_handle = json.loads(records[0]["job_handle"]) if records else None
+    if job_handle is None:
+        return None
+
+    result_object = datasvc.get_result_object(dispatch_id)
+    executor_pool = _get_executor_pool()
+    pool_key = None
+    try:
+        short_name, object_dict = executor
+        executor, pool_key = await executor_pool.acquire(
+            short_name, object_dict, loop=asyncio.get_running_loop()
+        )
+        task_metadata = {
+            "dispatch_id": dispatch_id,
+            "node_id": node_id,
+            "results_dir": result_object.results_dir,
+        }
+        app_log.debug(f"Reattaching to job {job_handle} of task {dispatch_id}:{node_id}")
+        output, stdout, stderr, status = await executor._resume(task_metadata, job_handle)
+
+    except NotImplementedError:
+        app_log.debug(f"Executor {executor} can't reattach to job {job_handle}")
+        return None
+
+    except Exception as ex:
+        app_log.debug(f"Exception when reattaching to job of task {dispatch_id}:{node_id}: {ex}")
+        return None
+
+    finally:
+        executor_pool.release(pool_key)
+
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        end_time=datetime.now(timezone.utc),
+        status=status,
+        output=output,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+
+# Domain: runner
+def submit_task_group(
+    dispatch_id: str,
+    task_group_id: int,
+    tasks: List[Dict],
+    executor: Any,
+    priority: float = 0.0,
+) -> None:
+    """Queue a packed task group for execution as a single executor job.
+
+    Args:
+        dispatch_id: Dispatch ID of the workflow.
+        task_group_id: ID of the task group, which is also the node id
+            of one of its members.
+        tasks: Members of the group in topological order. Each member is
+            a dictionary with the keys "node_id", "name",
+            and "abstract_inputs".
+        executor: Pair of executor short name and serialized executor.
+        priority: Tasks with higher priorities are started first when
+            the executor's slots are limited.
+
+    """
+    short_name, executor_data = executor
+    _get_admission_queue().submit(
+        dispatch_id,
+        short_name,
+        get_instance_key(short_name, executor_data),
+        partial(
+            run_task_group,
+            dispatch_id=dispatch_id,
+            task_group_id=task_group_id,
+            tasks=tasks,
+            executor=executor,
+        ),
+        priority,
+    )
+
+
+# Domain: runner
+async def run_task_group(
+    dispatch_id: str,
+    task_group_id: int,
+    tasks: List[Dict],
+    executor: Any,
+) -> None:
+    node_results = await _run_task_group(
+        dispatch_id=dispatch_id,
+        task_group_id=task_group_id,
+        tasks=tasks,
+        executor=executor,
+    )
+
+    result_object = datasvc.get_result_object(dispatch_id)
+    for node_result in node_results:
+        await datasvc.submit_node_result(result_object, node_result)
+
+
+# Domain: runner
+async def _run_task_group(
+    dispatch_id: str,
+    task_group_id: int,
+    tasks: List[Dict],
+    executor: Any,
+) -> List[Dict]:
+    """Run the members of a packed task group in a single executor job.
+
+    Outputs are passed between members inside the worker without a
+    round trip through the dispatcher. Only the outputs of the group's
+    boundary nodes, which have a child outside the group or are
+    sinks of the graph, are returned; internal nodes complete without an output.
+    The group succeeds or fails as a whole, and its stdout and stderr
+    are recorded on the node `task_group_id`.
+
+    Args:
+        dispatch_id: Dispatch ID of the workflow.
+        task_group_id: ID of the task group.
+        tasks: Members of the group, see `submit_task_group`.
+        executor: Pair of executor short name and serialized executor.
+
+    Returns:
+        Node results of the members of the group.
+
+    """
+    result_object = datasvc.get_result_object(dispatch_id)
+    tg = result_object.lattice.transport_graph
+    timestamp = datetime.now(timezone.utc)
+    node_ids = [task["node_id"] for task in tasks]
+    members = set(node_ids)
+
+    def _get_node_results(**kwargs) -> List[Dict]:
+        return [
+            datasvc.generate_node_result(node_id=task["node_id"], node_name=task["name"], **kwargs)
+            for task in tasks
+        ]
+
+    try:
+        job_records = await get_jobs_metadata(dispatch_id, node_ids)
+        if any(record["cancel_requested"] for record in job_records):
+            app_log.debug(f"Don't run cancelled task group {dispatch_id}:{task_group_id}")
+            return _get_node_results(
+                start_time=timestamp, end_time=timestamp, status=RESULT_STATUS.CANCELLED
+            )
+
+        # Inputs from outside the group are passed as positional args
+        external_inputs = []
+        input_index = {}
+
+        def _get_ref(parent: int) -> Tuple[str, int]:
+            if parent in members:
+                return ("node", parent)
+            if parent not in input_index:
+                input_index[parent] = len(external_inputs)
+                external_inputs.append(parent)
+            return ("input", input_index[parent])
+
+        task_specs = []
+        for task in tasks:
+            node_id = task["node_id"]
+            abstract_inputs = task["abstract_inputs"]
+            call_before, call_after = _gather_deps(result_object, node_id)
+            task_specs.append(
+                (
+                    node_id,
+                    tg.get_node_value(node_id, "function"),
+                    call_before,
+                    call_after,
+                    [_get_ref(parent) for parent in abstract_inputs["args"]],
+                    {k: _get_ref(parent) for k, parent in abstract_inputs["kwargs"].items()},
+                )
+            )
+
+        with tracing.span("resolve_inputs", dispatch_id):
+            input_values = await _get_task_input_values(
+                result_object, {"args": external_inputs, "kwargs": {}}
+            )
+        args = [input_values[parent] for parent in external_inputs]
+
+        # Outputs needed outside the group, including those of its sinks
+        boundary = []
+        for node_id in node_ids:
+            children = set(tg._graph.successors(node_id))
+            if not children or not children <= members:
+                boundary.append(node_id)
+
+    except Exception as ex:
+        app_log.error(f"Exception when trying to resolve inputs or deps of task group: {ex}")
+        return _get_node_results(
+            start_time=timestamp,
+            end_time=timestamp,
+            status=RESULT_STATUS.FAILED,
+            error=str(ex),
+        )
+
+    app_log.debug(f"Marking task group {task_group_id} as running (_run_task_group)")
+    await datasvc.update_node_results(
+        result_object, _get_node_results(start_time=timestamp, status=RESULT_STATUS.RUNNING)
+    )
+
+    group_result = await _run_assembled_task(
+        result_object=result_object,
+        node_id=task_group_id,
+        node_name=tg.get_node_value(task_group_id, "name"),
+        executor=executor,
+        assembled_callable=partial(task_group_wrapper_fn, task_specs[0][1], task_specs, boundary),
+        inputs={"args": args, "kwargs": {}},
+    )
+
+    status = group_result["status"]
+    outputs = group_result["output"]
+    error = group_result["error"]
+    if status == RESULT_STATUS.COMPLETED and not isinstance(outputs, dict):
+        status = RESULT_STATUS.FAILED
+        error = f"Task group {task_group_id} returned {type(outputs)} instead of a dict of outputs"
+
+    node_results = []
+    for task in tasks:
+        node_id = task["node_id"]
+        is_main_node = node_id == task_group_id
+        completed = status == RESULT_STATUS.COMPLETED
+        node_results.append(
+            datasvc.generate_node_result(
+                node_id=node_id,
+                node_name=task["name"],
+                end_time=group_result["end_time"],
+                status=status,
+                output=outputs.get(node_id) if completed else None,
+                error=error,
+                stdout=group_result["stdout"] if is_main_node else None,
+                stderr=group_result["stderr"] if is_main_node or not completed else None,
+            )
+        )
+
+    return node_results
+
+
 # Domain: runner
 async def _run_task(
     result_object: Result,
@@ -219,13 +688,58 @@ async def _run_task(
     Returns:
         None
 
+    """
+    output_ref = _get_output_ref(result_object.dispatch_id, node_id, node_name)
+    if output_ref:
+        assembled_callable = partial(
+            reference_wrapper_fn, serialized_callable, call_before, call_after, output_ref
+        )
+    else:
+        assembled_callable = partial(wrapper_fn, serialized_callable, call_before, call_after)
+    return await _run_assembled_task(
+        result_object=result_object,
+        node_id=node_id,
+        node_name=node_name,
+        executor=executor,
+        assembled_callable=assembled_callable,
+        inputs=inputs,
+    )
+
+
+# Domain: runner
+async def _run_assembled_task(
+    result_object: Result,
+    node_id: int,
+    node_name: str,
+    executor: Any,
+    assembled_callable: Callable,
+    inputs: Dict,
+) -> Dict:
+    """Run an assembled callable on the selected executor.
+
+    Args:
+        result_object: Result object being used for current dispatch
+        node_id: Node id of the task to be executed.
+        node_name: Name of the task.
+        executor: Pair of executor short name and serialized executor.
+        assembled_callable: Callable to run on the executor.
+        inputs: Args and kwargs of the callable.
+
+    Returns:
+        The node result of the task.
+
     """
     dispatch_id = result_object.dispatch_id
     results_dir = result_object.results_dir
+    executor_pool = _get_executor_pool()
 
-    # Instantiate the executor from JSON
+    # Instantiate the executor from JSON or reuse a pooled instance
     try:
-        executor = get_executor(executor=executor, loop=asyncio.get_running_loop())
+        short_name, object_dict = executor
+        with tracing.span("instantiate_executor", dispatch_id):
+            executor, pool_key = await executor_pool.acquire(
+                short_name, object_dict, loop=asyncio.get_running_loop()
+            )
 
     except Exception as ex:
         tb = "".join(traceback.TracebackException.from_exception(ex).format())
@@ -243,19 +757,19 @@ async def _run_task(
     # Run the task on the executor and register any failures.
     try:
         app_log.debug(f"Executing task {node_name}")
-        assembled_callable = partial(wrapper_fn, serialized_callable, call_before, call_after)
 
         # Note: Executor proxy monitors the executors instances and watches the send and receive queues of the executor.
         asyncio.create_task(executor_proxy.watch(dispatch_id, node_id, executor))
 
-        output, stdout, stderr, status = await executor._execute(
-            function=assembled_callable,
-            args=inputs["args"],
-            kwargs=inputs["kwargs"],
-            dispatch_id=dispatch_id,
-            results_dir=results_dir,
-            node_id=node_id,
-        )
+        with tracing.span("run_executor", dispatch_id):
+            output, stdout, stderr, status = await executor._execute(
+                function=assembled_callable,
+                args=inputs["args"],
+                kwargs=inputs["kwargs"],
+                dispatch_id=dispatch_id,
+                results_dir=results_dir,
+                node_id=node_id,
+            )
 
         node_result = datasvc.generate_node_result(
             node_id=node_id,
@@ -279,23 +793,26 @@ async def _run_task(
             status=RESULT_STATUS.FAILED,
             error=error_msg,
         )
+    finally:
+        executor_pool.release(pool_key)
+
     return node_result
 
 
 # Domain: runner
-def _gather_deps(result_object: Result, node_id: int) -> Tuple[List, List]:
-    """Assemble deps for a node into the final call_before and call_after"""
-
-    deps = result_object.lattice.transport_graph.get_node_value(node_id, "metadata")["deps"]
+def _get_deps_key(deps: Dict, call_before_objs_json: List, call_after_objs_json: List) -> str:
+    """Return the content hash of the deps metadata of a node."""
+    serialized = json.dumps(
+        [deps, call_before_objs_json, call_after_objs_json], sort_keys=True
+    ).encode("utf-8")
+    return hashlib.sha256(serialized).hexdigest()
 
-    # Assemble call_before and call_after from all the deps
 
-    call_before_objs_json = result_object.lattice.transport_graph.get_node_value(
-        node_id, "metadata"
-    )["call_before"]
-    call_after_objs_json = result_object.lattice.transport_graph.get_node_value(
-        node_id, "metadata"
-    )["call_after"]
+# Domain: runner
+def _assemble_deps(
+    deps: Dict, call_before_objs_json: List, call_after_objs_json: List
+) -> Tuple[List, List]:
+    """Rehydrate deps from JSON and assemble them into call_before and call_after"""
 
     call_before = []
     call_after = []
@@ -324,6 +841,42 @@ def _gather_deps(result_object: Result, node_id: int) -> Tuple[List, List]:
     return call_before, call_after
 
 
+# Domain: runner
+def _gather_deps(result_object: Result, node_id: int) -> Tuple[List, List]:
+    """Assemble deps for a node into the final call_before and call_after
+
+    Nodes usually share identical deps, so the assembled deps are
+    cached by the content hash of the deps metadata. The cache is
+    bounded and evicts the least recently used entries.
+
+    """
+
+    metadata = result_object.lattice.transport_graph.get_node_value(node_id, "metadata")
+    deps = metadata["deps"]
+    call_before_objs_json = metadata["call_before"]
+    call_after_objs_json = metadata["call_after"]
+
+    if not deps and not call_before_objs_json and not call_after_objs_json:
+        return [], []
+
+    try:
+        key = _get_deps_key(deps, call_before_objs_json, call_after_objs_json)
+    except TypeError:
+        return _assemble_deps(deps, call_before_objs_json, call_after_objs_json)
+
+    if key in _deps_cache:
+        _deps_cache.move_to_end(key)
+        call_before, call_after = _deps_cache[key]
+    else:
+        call_before, call_after = _assemble_deps(deps, call_before_objs_json, call_after_objs_json)
+        _deps_cache[key] = (call_before, call_after)
+        if len(_deps_cache) > DEPS_CACHE_SIZE:
+            _deps_cache.popitem(last=False)
+
+    # The (immutable) tuples of transportable objects are shared
+    return list(call_before), list(call_after)
+
+
 async def _cancel_task(
     dispatch_id: str, task_id: int, executor, executor_data: Dict, job_handle: str
 ) -> Union[Any, Literal[False]]:
@@ -344,9 +897,14 @@ async def _cancel_task(
     app_log.debug(f"Cancel task {task_id} using executor {executor}, {executor_data}")
     app_log.debug(f"job_handle: {job_handle}")
 
+    executor_pool = _get_executor_pool()
+    pool_key = None
     try:
-        executor = get_executor(
-            executor=executor, loop=asyncio.get_running_loop(), cancel_pool=_cancel_threadpool
+        executor, pool_key = await executor_pool.acquire(
+            executor,
+            executor_data,
+            loop=asyncio.get_running_loop(),
+            cancel_pool=_cancel_threadpool,
         )
         task_metadata = {"dispatch_id": dispatch_id, "node_id": task_id}
         cancel_job_result = await executor._cancel(task_metadata, json.loads(job_handle))
@@ -355,6 +913,9 @@ async def _cancel_task(
         app_log.debug(f"Exception when cancel task {dispatch_id}:{task_id}: {ex}")
         cancel_job_result = False
 
+    finally:
+        executor_pool.release(pool_key)
+
     await set_cancel_result(dispatch_id, task_id, cancel_job_result)
     return cancel_job_result
 
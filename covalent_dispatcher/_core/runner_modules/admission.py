@@ -0,0 +1,276 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+Admission control for tasks sent to executors
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from covalent._shared_files import logger, tracing
+
+app_log = logger.app_log
+
+# Prometheus gauges of the executor queue stats: stat, metric name, help
+_GAUGES = (
+    ("queued", "covalent_executor_queued_tasks", "Tasks waiting for a slot of their executor."),
+    ("in_flight", "covalent_executor_in_flight_tasks", "Tasks admitted to their executor."),
+    ("limit", "covalent_executor_concurrency_limit", "Cap on in-flight tasks, 0 if unbounded."),
+    ("instances", "covalent_executor_busy_instances", "Executor instances with in-flight tasks."),
+)
+
+
+def get_instance_key(short_name: str, executor_data: Dict) -> str:
+    """Return a key identifying an executor instance by its configuration.
+
+    Args:
+        short_name: Short name of the executor plugin.
+        executor_data: Serialized executor returned by `to_dict()`.
+
+    Returns:
+        Hash which is equal for identically configured executors.
+
+    """
+    serialized = json.dumps(executor_data, sort_keys=True, default=str)
+    return hashlib.sha1(f"{short_name}:{serialized}".encode()).hexdigest()
+
+
+class _ExecutorQueue:
+    """Ready tasks and in-flight counts of one executor plugin."""
+
+    __slots__ = ("limit", "in_flight", "instance_in_flight", "dispatches", "num_queued")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.instance_in_flight = {}
+
+        # dispatch_id -> instance_key -> heap of (-priority, seq, queued
+        # at, task starter); dispatches are served round-robin so that a large
+        # dispatch cannot starve the others
+        self.dispatches = OrderedDict()
+        self.num_queued = 0
+
+
+class AdmissionQueue:
+    """
+    Fair ready queue which caps the number of in-flight tasks per executor.
+
+    Tasks are held until a slot is available both for their executor
+    plugin (identified by its short name) and for their executor
+    instance (identified by its configuration). A task is only turned
+    into a coroutine once it is admitted. A limit of 0 means unbounded.
+
+    Dispatches sharing an executor take turns; within a dispatch, the
+    task with the highest priority whose executor instance has a free
+    slot is admitted first. Tasks with equal priorities are admitted in
+    submission order.
+
+    Attributes:
+        limits: Map from executor short name to its concurrency limit.
+        default_limit: Limit for executors not present in `limits`.
+        instance_limit: Concurrency limit of each executor instance.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 0,
+        instance_limit: int = 0,
+    ) -> None:
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.instance_limit = instance_limit
+        self._queues: Dict[str, _ExecutorQueue] = {}
+        self._counter = itertools.count()
+
+        # Strong references to the running tasks
+        self._tasks = set()
+
+    def _get_queue(self, short_name: str) -> _ExecutorQueue:
+        if short_name not in self._queues:
+            limit = self.limits.get(short_name, self.default_limit)
+            self._queues[short_name] = _ExecutorQueue(limit)
+        return self._queues[short_name]
+
+    def _instance_has_slot(self, queue: _ExecutorQueue, instance_key: str) -> bool:
+        return (
+            self.instance_limit <= 0
+            or queue.instance_in_flight.get(instance_key, 0) < self.instance_limit
+        )
+
+    def submit(
+        self,
+        dispatch_id: str,
+        short_name: str,
+        instance_key: str,
+        start: Callable[[], Awaitable[Any]],
+        priority: float = 0.0,
+    ) -> None:
+        """Queue a task and start it as soon as a slot is available.
+
+        Args:
+            dispatch_id: Dispatch the task belongs to.
+            short_name: Short name of the executor running the task.
+            instance_key: Key of the executor instance, see `get_instance_key`.
+            start: Callable returning the coroutine which runs the task.
+            priority: Tasks with higher priorities are admitted first.
+
+        """
+        queue = self._get_queue(short_name)
+        instances = queue.dispatches.setdefault(dispatch_id, {})
+        heap = instances.setdefault(instance_key, [])
+        heapq.heappush(heap, (-priority, next(self._counter), tracing.now(), start))
+        queue.num_queued += 1
+        self._admit(short_name)
+
+    def _admit(self, short_name: str) -> None:
+        """Start queued tasks of an executor while slots are available."""
+
+        queue = self._queues[short_name]
+        while queue.num_queued and (queue.limit <= 0 or queue.in_flight < queue.limit):
+            selected = self._select_next(queue)
+            if selected is None:
+                break
+
+            dispatch_id, instance_key = selected
+            instances = queue.dispatches[dispatch_id]
+            _, _, queued_at, start = heapq.heappop(instances[instance_key])
+            queue.num_queued -= 1
+            if not instances[instance_key]:
+                del instances[instance_key]
+            if instances:
+                queue.dispatches.move_to_end(dispatch_id)
+            else:
+                del queue.dispatches[dispatch_id]
+
+            queue.in_flight += 1
+            queue.instance_in_flight[instance_key] = (
+                queue.instance_in_flight.get(instance_key, 0) + 1
+            )
+            task = asyncio.create_task(
+                self._run(dispatch_id, short_name, instance_key, queued_at, start)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _select_next(self, queue: _ExecutorQueue) -> Optional[Tuple[str, str]]:
+        """Return the dispatch and executor instance of the next task to admit."""
+
+        for dispatch_id, instances in queue.dispatches.items():
+            best = None
+            for instance_key, heap in instances.items():
+                if self._instance_has_slot(queue, instance_key) and (
+                    best is None or heap[0] < instances[best][0]
+                ):
+                    best = instance_key
+            if best is not None:
+                return dispatch_id, best
+        return None
+
+    async def _run(
+        self,
+        dispatch_id: str,
+        short_name: str,
+        instance_key: str,
+        queued_at: Optional[float],
+        start: Callable[[], Awaitable[Any]],
+    ) -> None:
+        tracing.record("queue_wait", dispatch_id, queued_at)
+        try:
+            await start()
+        except Exception as ex:
+            app_log.exception(f"Unhandled exception in task admitted to {short_name}: {ex}")
+        finally:
+            queue = self._queues[short_name]
+            queue.in_flight -= 1
+            queue.instance_in_flight[instance_key] -= 1
+            if queue.instance_in_flight[instance_key] == 0:
+                del queue.instance_in_flight[instance_key]
+            self._admit(short_name)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the number of queued and in-flight tasks of each executor.
+
+        Returns:
+            Map from executor short name to a dictionary with the keys
+            "queued", "in_flight", "limit" and "instances" (number of
+            executor instances with in-flight tasks).
+
+        """
+        return {
+            short_name: {
+                "queued": queue.num_queued,
+                "in_flight": queue.in_flight,
+                "limit": queue.limit,
+                "instances": len(queue.instance_in_flight),
+            }
+            for short_name, queue in self._queues.items()
+        }
+
+
+def merge_stats(stats: List[Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
+    """Merge the executor queue stats of several dispatcher processes.
+
+    Args:
+        stats: Stats returned by `AdmissionQueue.get_stats` in each process.
+
+    Returns:
+        The total counts of each executor over all processes.
+
+    """
+    merged = {}
+    for process_stats in stats:
+        for short_name, counts in process_stats.items():
+            if short_name not in merged:
+                merged[short_name] = dict(counts)
+                continue
+
+            total = merged[short_name]
+            for key in ("queued", "in_flight", "instances"):
+                total[key] += counts[key]
+            # Each process caps its own tasks, unless it is unbounded
+            bounded = total["limit"] > 0 and counts["limit"] > 0
+            total["limit"] = total["limit"] + counts["limit"] if bounded else 0
+    return merged
+
+
+def render_prometheus(stats: Dict[str, Dict[str, int]]) -> str:
+    """Render the executor queue stats as gauges in the Prometheus text format.
+
+    Args:
+        stats: Stats returned by `AdmissionQueue.get_stats` or `merge_stats`.
+
+    Returns:
+        The metrics in the Prometheus text exposition format.
+
+    """
+    lines = []
+    for key, name, description in _GAUGES:
+        lines.extend([f"# HELP {name} {description}", f"# TYPE {name} gauge"])
+        for short_name, counts in sorted(stats.items()):
+            lines.append(f'{name}{{executor="{short_name}"}} {counts[key]}')
+    return "\n".join(lines) + "\n"
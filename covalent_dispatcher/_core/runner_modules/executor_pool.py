@@ -0,0 +1,177 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+Pool of configured executor instances shared between tasks
+"""
+
+import asyncio
+import copy
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from covalent._shared_files import logger
+from covalent.executor.base import _AbstractBaseExecutor
+
+from .admission import get_instance_key
+
+app_log = logger.app_log
+
+
+async def _call_hook(executor: _AbstractBaseExecutor, hook_name: str) -> None:
+    """Call a sync or async lifecycle hook of an executor without blocking the loop."""
+    hook = getattr(executor, hook_name)
+    if inspect.iscoroutinefunction(hook):
+        await hook()
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, hook)
+
+
+class _PoolEntry:
+    """A shared executor instance and its users."""
+
+    __slots__ = ("executor", "ready", "refcount", "evict_handle")
+
+    def __init__(self, executor: _AbstractBaseExecutor) -> None:
+        self.executor = executor
+        self.ready = None
+        self.refcount = 0
+        self.evict_handle = None
+
+
+class ExecutorPool:
+    """
+    Pool of executor instances keyed by executor configuration.
+
+    Executors whose class sets `SUPPORTS_INSTANCE_POOLING` are
+    instantiated, rehydrated and set up (`setup_shared()`) once per
+    configuration. Each task receives a shallow copy of the shared
+    instance on which the per-task runtime state is initialized, so that
+    connection state set up by the executor is shared while queues and
+    output streams are not. Instances which stay unused for
+    `idle_timeout` seconds are torn down (`teardown_shared()`) and
+    evicted.
+
+    Other executors are instantiated for each task, as before.
+
+    Attributes:
+        factory: Callable returning a new executor instance for a short name.
+        idle_timeout: Seconds after which unused instances are evicted.
+    """
+
+    def __init__(
+        self, factory: Callable[[str], _AbstractBaseExecutor], idle_timeout: float = 600
+    ) -> None:
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[str, _PoolEntry] = {}
+
+        # Strong references to the running teardowns
+        self._teardowns = set()
+
+    async def acquire(
+        self,
+        short_name: str,
+        object_dict: Dict,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        cancel_pool: Optional[ThreadPoolExecutor] = None,
+    ) -> Tuple[_AbstractBaseExecutor, Optional[str]]:
+        """Return an executor ready to run a task.
+
+        Args:
+            short_name: Short name of the executor plugin.
+            object_dict: Serialized executor returned by `to_dict()`.
+            loop: Running event loop.
+            cancel_pool: Threadpool for cancelling tasks.
+
+        Returns:
+            The executor and the pool key which must be passed to
+            `release()` once the task is done (`None` if the executor
+            isn't pooled).
+
+        """
+        key = get_instance_key(short_name, object_dict)
+        entry = self._entries.get(key)
+        if entry is None:
+            executor = self.factory(short_name)
+            executor.from_dict(object_dict)
+            if not getattr(type(executor), "SUPPORTS_INSTANCE_POOLING", False):
+                executor._init_runtime(loop=loop, cancel_pool=cancel_pool)
+                return executor, None
+
+            app_log.debug(f"Setting up pooled {short_name} executor {key}")
+            entry = _PoolEntry(executor)
+            entry.ready = asyncio.ensure_future(_call_hook(executor, "setup_shared"))
+            self._entries[key] = entry
+
+        entry.refcount += 1
+        if entry.evict_handle is not None:
+            entry.evict_handle.cancel()
+            entry.evict_handle = None
+
+        try:
+            await entry.ready
+        except Exception:
+            entry.refcount -= 1
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            raise
+
+        executor = copy.copy(entry.executor)
+        executor._init_runtime(loop=loop, cancel_pool=cancel_pool)
+        return executor, key
+
+    def release(self, key: Optional[str]) -> None:
+        """Return an executor acquired from the pool.
+
+        Args:
+            key: Pool key returned by `acquire()`.
+
+        """
+        entry = self._entries.get(key) if key is not None else None
+        if entry is None:
+            return
+
+        entry.refcount -= 1
+        if entry.refcount == 0:
+            entry.evict_handle = asyncio.get_running_loop().call_later(
+                self.idle_timeout, self._evict, key
+            )
+
+    def _evict(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry.refcount > 0:
+            return
+
+        del self._entries[key]
+        app_log.debug(f"Evicting idle executor {key}")
+        teardown = asyncio.ensure_future(self._teardown(key, entry.executor))
+        self._teardowns.add(teardown)
+        teardown.add_done_callback(self._teardowns.discard)
+
+    async def _teardown(self, key: str, executor: _AbstractBaseExecutor) -> None:
+        try:
+            await _call_hook(executor, "teardown_shared")
+        except Exception as ex:
+            app_log.warning(f"Error tearing down executor {key}: {ex}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -38,7 +38,7 @@ _getters = {}
 
 async def _get_cancel_requested(dispatch_id: str, task_id: int):
     """
-    Query the database for the task's cancellation status
+    Look up the task's cancellation status in the job registry
 
     Arg(s)
         dispatch_id: Dispatch ID of the lattice
@@ -48,7 +48,7 @@ async def _get_cancel_requested(dispatch_id: str, task_id: int):
         Cancellation status of the task
 
     """
-    # Don't hit the DB for post-processing task
+    # Post-processing tasks have no job
     if task_id < 0:
         return False
 
@@ -18,17 +18,21 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
+import sqlite3
+import threading
 from contextlib import contextmanager
 from os import environ, path
 from pathlib import Path
 from typing import BinaryIO, Generator, Optional
+from uuid import uuid4
 
 from alembic import command
 from alembic.config import Config
 from alembic.environment import EnvironmentContext
 from alembic.migration import MigrationContext
 from alembic.script import ScriptDirectory
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy_utils import create_database, database_exists
 
@@ -37,6 +41,31 @@ from covalent._shared_files.config import get_config
 from . import models
 
 
+def _begin_immediate_writes(engine: Engine) -> None:
+    """Make SQLite take the write lock when a write transaction begins.
+
+    A deferred transaction which reads before writing fails with
+    "database is locked" without waiting if another connection wrote in
+    the meantime. Write transactions, run with the `begin_immediate`
+    execution option, instead wait for the lock on the busy timeout so
+    that concurrent writers are serialized. Other transactions stay
+    deferred and don't block writers.
+
+    """
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN instead of pysqlite
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        if conn.get_execution_options().get("begin_immediate"):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            conn.exec_driver_sql("BEGIN")
+
+
 class DataStore:
     def __init__(
         self,
@@ -49,10 +78,40 @@ class DataStore:
         else:
             self.db_URL = "sqlite+pysqlite:///" + get_config("dispatcher.db_path")
 
-        self.engine = create_engine(self.db_URL, **kwargs)
-        if not database_exists(self.engine.url):
+        url = make_url(self.db_URL)
+        is_sqlite = url.get_backend_name() == "sqlite"
+        is_memory = is_sqlite and url.database in (None, "", ":memory:")
+        self._memory_db = None
+        self._memory_write_lock = None
+        if is_memory:
+            # Sessions are also opened from the persistence worker threads,
+            # each on its own connection. A plain in-memory DB only exists
+            # on the connection which created it, so a named shared-cache
+            # DB is used instead and kept alive by an extra connection.
+            uri = f"file:covalent-{uuid4().hex}?mode=memory&cache=shared"
+            self._memory_db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            url = make_url(f"sqlite+pysqlite:///{uri}&uri=true")
+
+            # Shared-cache connections report lock conflicts at once
+            # instead of waiting on the busy timeout, so writers queue on
+            # a lock and readers don't take table locks
+            self._memory_write_lock = threading.Lock()
+
+        self.engine = create_engine(url, **kwargs)
+
+        if is_memory:
+
+            @event.listens_for(self.engine, "connect")
+            def _read_uncommitted(dbapi_connection, connection_record):
+                dbapi_connection.execute("PRAGMA read_uncommitted = true")
+
+        elif is_sqlite:
+            _begin_immediate_writes(self.engine)
+
+        if not is_memory and not database_exists(self.engine.url):
             create_database(self.engine.url)
         self.Session = sessionmaker(self.engine)
+        self.WriteSession = sessionmaker(self.engine.execution_options(begin_immediate=True))
 
         # flag should only be used in pytest - tables should be generated using migrations
         if initialize_db:
@@ -100,6 +159,16 @@ class DataStore:
         with self.Session.begin() as session:
             yield session
 
+    @contextmanager
+    def write_session(self) -> Generator[Session, None, None]:
+        """Session for persistence writes, which takes the write lock when it begins."""
+        if self._memory_write_lock is None:
+            with self.WriteSession.begin() as session:
+                yield session
+        else:
+            with self._memory_write_lock, self.Session.begin() as session:
+                yield session
+
 
 class DataStoreSession:
     def __init__(self, session: Session, metadata={}):
@@ -142,6 +142,34 @@ def get_job_records(job_ids: List[int]) -> List[Dict]:
     return records
 
 
+def get_dispatch_job_records(dispatch_id: str) -> Dict[int, Dict]:
+    """
+    Retrieve the job records of all tasks of a dispatch in a single query
+
+    Arg(s)
+        dispatch_id: Dispatch ID of the lattice
+
+    Return(s)
+        Dictionary mapping each task id of the lattice to its job record
+    """
+    with workflow_db.session() as session:
+        stmt = (
+            select(Electron.transport_graph_node_id, Job)
+            .join(Job, Electron.job_id == Job.id)
+            .join(Lattice, Electron.parent_lattice_id == Lattice.id)
+            .where(Lattice.dispatch_id == dispatch_id)
+        )
+        return {
+            task_id: {
+                "job_id": job_record.id,
+                "cancel_requested": job_record.cancel_requested,
+                "cancel_successful": job_record.cancel_successful,
+                "job_handle": job_record.job_handle,
+            }
+            for task_id, job_record in session.execute(stmt).all()
+        }
+
+
 def to_job_ids(dispatch_id: str, task_ids: List[int]) -> List[int]:
     """
     Map all lattice task ids to their corresponding job ids
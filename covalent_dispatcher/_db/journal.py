@@ -0,0 +1,362 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Write-behind journal of node updates with periodic group commit"""
+
+import os
+import pickle
+import shutil
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from covalent._results_manager import Result
+from covalent._shared_files import logger, tracing
+from covalent._shared_files.config import get_config
+
+from . import load, upsert
+from .write_result_to_db import StoredObjectRef
+
+app_log = logger.app_log
+
+# Journal of the dispatcher, if write-behind persistence is enabled
+_journal = None
+_journal_initialized = False
+_journal_lock = threading.Lock()
+
+
+def _read_records(path: str) -> List[Tuple[str, Dict]]:
+    """Read the records of a journal file, ignoring a torn last record."""
+    records = []
+    if not os.path.exists(path):
+        return records
+
+    with open(path, "rb") as f:
+        while True:
+            try:
+                records.append(pickle.load(f))
+            except EOFError:
+                break
+            except Exception as ex:
+                app_log.warning(f"Ignoring incomplete record at the end of journal {path}: {ex}")
+                break
+    return records
+
+
+class WriteBehindJournal:
+    """
+    Write-behind journal of node updates.
+
+    Node updates are applied to the in-memory result object and appended
+    to an append-only journal file instead of being written to the DB
+    right away. Node outputs are written to their results files first
+    and only referenced by the journal. Appends are written in batches:
+    each append waits until a batch containing it has been synced, and
+    one sync covers all the appends made while the previous batch was
+    being synced. The snapshots of the updated nodes are written to the
+    DB in one transaction (group commit) every `flush_interval` seconds
+    or as soon as `flush_records` records are pending. Committed records
+    are then cut from the head of the journal; records left in the
+    journal by a crash are replayed when the journal is opened.
+
+    Attributes:
+        path: Path of the journal file.
+        flush_interval: Maximum time in seconds between group commits.
+        flush_records: Number of pending records which triggers a group commit.
+    """
+
+    def __init__(self, path: str, flush_interval: float, flush_records: int) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+
+        # Guards the pending batch and the dirty nodes
+        self._lock = threading.Lock()
+
+        # Serializes writes to the journal file
+        self._file_lock = threading.Lock()
+
+        # Serializes group commits
+        self._commit_lock = threading.Lock()
+
+        # Number of records which aren't committed yet
+        self._num_records = 0
+
+        # Encoded records waiting to be written to the journal file, and
+        # whether they reference outputs which aren't synced yet
+        self._batch: List[bytes] = []
+        self._batch_has_outputs = False
+
+        # Number of appends made and of appends synced to the journal file
+        self._num_appends = 0
+        self._num_synced = 0
+
+        # dispatch_id -> (lattice metadata, node id -> snapshot of the node)
+        self._dirty: Dict[str, Tuple[dict, Dict[int, Dict]]] = {}
+
+        # Nodes being written by the running group commit
+        self._committing: Dict[str, Tuple[dict, Dict[int, Dict]]] = {}
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.replay()
+        self._file = open(path, "ab")
+
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="covalent-journal-commit", daemon=True
+        )
+        self._thread.start()
+
+    def append(self, result: Result, node_results: List[Dict], node_records: List[Dict]) -> None:
+        """Journal node updates which have been applied to a result object.
+
+        Returns once the updates are synced to the journal file.
+
+        Args:
+            result: Result object of the dispatch.
+            node_results: Node results applied to the result object.
+            node_records: Snapshots of the nodes changed by the node
+                results, see `upsert.get_node_records`.
+
+        """
+        records = []
+        stored_outputs = {}
+        for node_result in node_results:
+            record = _to_record(node_result)
+            output = record.get("output")
+            if output is not None and not isinstance(output, StoredObjectRef):
+                record["output"] = upsert.store_electron_output(result, record["node_id"], output)
+                stored_outputs[record["node_id"]] = record["output"]
+            records.append(pickle.dumps((result.dispatch_id, record)))
+
+        # The snapshots reference the stored outputs so the commit
+        # doesn't write them again
+        node_records = [
+            {**record, "output": stored_outputs[record["node_id"]]}
+            if record["node_id"] in stored_outputs
+            else record
+            for record in node_records
+        ]
+
+        with self._lock:
+            self._batch.extend(records)
+            self._batch_has_outputs = self._batch_has_outputs or bool(stored_outputs)
+            self._num_appends += 1
+            append_id = self._num_appends
+            self._num_records += len(records)
+
+            _, dirty_records = self._dirty.setdefault(
+                result.dispatch_id, (result.lattice.metadata, {})
+            )
+            dirty_records.update((record["node_id"], record) for record in node_records)
+
+            if self._num_records >= self.flush_records:
+                self._wakeup.set()
+
+        with self._file_lock:
+            # The batch may already have been synced by another append
+            if self._num_synced < append_id:
+                self._sync_batch()
+
+    def _sync_batch(self) -> None:
+        """Write the pending records to the journal file and sync them."""
+        with self._lock:
+            batch, self._batch = self._batch, []
+            has_outputs, self._batch_has_outputs = self._batch_has_outputs, False
+            num_appends = self._num_appends
+
+        for record in batch:
+            self._file.write(record)
+        self._file.flush()
+        if has_outputs:
+            # Also sync the results files the records reference
+            os.sync()
+        else:
+            os.fsync(self._file.fileno())
+        self._num_synced = num_appends
+
+    def commit(self) -> None:
+        """Write all the journaled node updates to the DB in a single transaction."""
+        with self._commit_lock:
+            with self._file_lock, self._lock:
+                if not self._dirty:
+                    return
+                dirty, self._dirty = self._dirty, {}
+                self._committing = dirty
+                num_records = self._num_records
+                committed_size = self._file.tell()
+
+            try:
+                self._write(dirty)
+            except Exception:
+                # Keep the updates for the next commit, unless the nodes
+                # have been updated again in the meantime
+                with self._lock:
+                    for dispatch_id, (lattice_metadata, records) in dirty.items():
+                        newer = self._dirty.get(dispatch_id, (lattice_metadata, {}))[1]
+                        self._dirty[dispatch_id] = (lattice_metadata, {**records, **newer})
+                    self._committing = {}
+                raise
+
+            with self._file_lock, self._lock:
+                self._committing = {}
+                self._num_records -= num_records
+                self._cut(committed_size)
+
+    def has_pending(self, dispatch_id: str, node_id: int) -> bool:
+        """Return whether an update of a node hasn't been written to the DB yet."""
+        with self._lock:
+            return any(
+                node_id in updates[dispatch_id][1]
+                for updates in (self._dirty, self._committing)
+                if dispatch_id in updates
+            )
+
+    def _write(self, updates: Dict[str, Tuple[dict, Dict[int, Dict]]]) -> None:
+        """Write the node snapshots of several dispatches in a single transaction."""
+        with tracing.span("db_journal_commit"):
+            with upsert.workflow_db.write_session() as session:
+                for dispatch_id, (lattice_metadata, records) in updates.items():
+                    upsert._electron_records(
+                        session, dispatch_id, lattice_metadata, records.values()
+                    )
+
+    def _cut(self, committed_size: int) -> None:
+        """Remove the first `committed_size` bytes of committed records from the journal."""
+        if self._file.tell() == committed_size:
+            # Nothing was appended during the commit
+            self._file.seek(0)
+            self._file.truncate()
+            os.fsync(self._file.fileno())
+            return
+
+        # Move the records appended during the commit to a new journal
+        tmp_path = f"{self.path}.tmp"
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            src.seek(committed_size)
+            shutil.copyfileobj(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "ab")
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.commit()
+            except Exception as ex:
+                app_log.exception(f"Error committing journaled node updates: {ex}")
+
+    def replay(self) -> None:
+        """Write the node updates left in the journal file to the DB."""
+        records = _read_records(self.path)
+        if not records:
+            return
+
+        app_log.warning(f"Replaying {len(records)} journaled node updates from {self.path}")
+        results = {}
+        node_ids = defaultdict(set)
+        skipped = set()
+        for dispatch_id, node_result in records:
+            if dispatch_id in skipped:
+                continue
+            if dispatch_id not in results:
+                try:
+                    results[dispatch_id] = load.get_result_object_from_storage(dispatch_id)
+                except Exception as ex:
+                    app_log.error(f"Skipping journaled updates of dispatch {dispatch_id}: {ex}")
+                    skipped.add(dispatch_id)
+                    continue
+
+            result = results[dispatch_id]
+
+            result._update_node(**node_result)
+            node_ids[dispatch_id].add(node_result["node_id"])
+
+        self._write(
+            {
+                dispatch_id: (
+                    result.lattice.metadata,
+                    {
+                        record["node_id"]: record
+                        for record in upsert.get_node_records(result, node_ids[dispatch_id])
+                    },
+                )
+                for dispatch_id, result in results.items()
+            }
+        )
+        os.remove(self.path)
+
+    def close(self) -> None:
+        """Commit the pending updates and stop the commit thread."""
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.commit()
+        with self._file_lock:
+            self._file.close()
+
+
+def close_journal() -> None:
+    """Commit the pending node updates and close the journal, if it is open."""
+    global _journal, _journal_initialized
+    with _journal_lock:
+        if _journal is not None:
+            _journal.close()
+        _journal = None
+        _journal_initialized = False
+
+
+def _to_record(node_result: Dict) -> Dict:
+    # The sublattice result object is only kept in memory
+    return {k: v for k, v in node_result.items() if k != "sublattice_result"}
+
+
+def get_journal() -> Optional[WriteBehindJournal]:
+    """Return the journal if write-behind persistence is enabled.
+
+    The journal is opened, and any records left in it are replayed, on
+    first use.
+
+    """
+    global _journal, _journal_initialized
+    if _journal_initialized:
+        return _journal
+
+    # Persistence workers may open the journal concurrently
+    with _journal_lock:
+        if not _journal_initialized:
+            if get_config("dispatcher.write_behind") == "true":
+                path = get_config("dispatcher.journal_path")
+                # Each dispatcher shard keeps its own journal
+                if shard := os.environ.get("COVALENT_DISPATCHER_SHARD"):
+                    path = f"{path}.{shard.split('/')[0]}"
+                _journal = WriteBehindJournal(
+                    path=path,
+                    flush_interval=int(get_config("dispatcher.journal_flush_interval_ms")) / 1000,
+                    flush_records=int(get_config("dispatcher.journal_flush_records")),
+                )
+            _journal_initialized = True
+    return _journal
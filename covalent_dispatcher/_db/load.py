@@ -21,9 +21,10 @@
 """Functions to load results from the database."""
 
 
-from typing import Dict, Union
+from typing import Dict, List, Union
 
 from covalent import lattice
+from covalent._data_store import ObjectRef
 from covalent._results_manager.result import Result
 from covalent._shared_files import logger
 from covalent._shared_files.util_classes import Status
@@ -31,7 +32,7 @@ from covalent._workflow.transport import TransportableObject
 
 from .datastore import workflow_db
 from .models import Electron, Lattice
-from .write_result_to_db import load_file
+from .write_result_to_db import StoredObjectRef, load_file
 
 app_log = logger.app_log
 log_stack_info = logger.log_stack_info
@@ -78,6 +79,7 @@ def _result_from(lattice_record: Lattice) -> Result:
     transport_graph = load_file(
         storage_path=lattice_record.storage_path, filename=lattice_record.transport_graph_filename
     )
+    _load_referenced_outputs(transport_graph)
     output = load_file(
         storage_path=lattice_record.storage_path, filename=lattice_record.results_filename
     )
@@ -149,6 +151,34 @@ def _result_from(lattice_record: Lattice) -> Result:
     return result
 
 
+def _result_string_from(lattice_record: Lattice) -> str:
+    """Return the string representation of the workflow output.
+
+    Only the header and the string of the stored output are read.
+
+    Args:
+        lattice_record: Lattice record of the workflow.
+
+    Returns:
+        String representation of the output.
+
+    """
+    output = load_file(
+        storage_path=lattice_record.storage_path,
+        filename=lattice_record.results_filename,
+        string_only=True,
+    )
+    return output.object_string if isinstance(output, TransportableObject) else ""
+
+
+def _load_referenced_outputs(transport_graph) -> None:
+    """Replace references to spilled node outputs and to outputs passed by
+    reference with the outputs."""
+    for _, node_data in transport_graph._graph.nodes(data=True):
+        if isinstance(node_data.get("output"), (StoredObjectRef, ObjectRef)):
+            node_data["output"] = node_data["output"].load()
+
+
 def get_result_object_from_storage(dispatch_id: str) -> Result:
     """Get the result object from the database.
 
@@ -203,3 +233,55 @@ def sublattice_dispatch_id(electron_id: int) -> Union[str, None]:
     with workflow_db.session() as session:
         if record := (session.query(Lattice).filter(Lattice.electron_id == electron_id).first()):
             return record.dispatch_id
+
+
+def running_dispatches() -> List[Dict]:
+    """Get the dispatches left in the RUNNING state.
+
+    Returns:
+        The dispatch id of each running dispatch and the DB id of its
+        parent electron (None unless the dispatch is a sublattice).
+
+    """
+    with workflow_db.session() as session:
+        records = (
+            session.query(Lattice.dispatch_id, Lattice.electron_id)
+            .where(Lattice.status == str(Result.RUNNING))
+            .all()
+        )
+        return [
+            {"dispatch_id": record.dispatch_id, "electron_id": record.electron_id}
+            for record in records
+        ]
+
+
+def electron_states(dispatch_id: str) -> List[Dict]:
+    """Get the persisted execution state of the electrons of a dispatch.
+
+    Args:
+        dispatch_id: Dispatch id for lattice.
+
+    Returns:
+        The node id, electron id, status, timestamps and results file of
+        each electron.
+
+    """
+    with workflow_db.session() as session:
+        records = (
+            session.query(Electron)
+            .join(Lattice, Lattice.id == Electron.parent_lattice_id)
+            .where(Lattice.dispatch_id == dispatch_id)
+            .all()
+        )
+        return [
+            {
+                "node_id": record.transport_graph_node_id,
+                "electron_id": record.id,
+                "status": Status(record.status),
+                "started_at": record.started_at,
+                "completed_at": record.completed_at,
+                "storage_path": record.storage_path,
+                "results_filename": record.results_filename,
+            }
+            for record in records
+        ]
@@ -21,7 +21,7 @@
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Dict, List, Union
 
 from covalent._results_manager import Result
 from covalent._shared_files import logger
@@ -32,11 +32,16 @@ from covalent._workflow.lattice import Lattice
 from covalent._workflow.transport import _TransportGraph
 
 from . import upsert
+from .journal import get_journal
 
 app_log = logger.app_log
 
 
-def persist(record: Union[Result, Lattice, _TransportGraph], electron_id: int = None) -> None:
+def persist(
+    record: Union[Result, Lattice, _TransportGraph],
+    electron_id: int = None,
+    node_records: List[Dict] = None,
+) -> None:
     """Save Result object to a DataStoreSession. Changes are queued until
     committed by the caller.
 
@@ -44,11 +49,17 @@ def persist(record: Union[Result, Lattice, _TransportGraph], electron_id: int =
         record: The entity to persist in the DB
         electron_id: (hack) DB-generated id for the parent electron
             if the workflow is actually a subworkflow
+        node_records: Snapshots of the nodes to write, taken with
+            `upsert.take_dirty_node_records` by the thread which owns
+            the result object; defaults to the dirty nodes
     """
     if isinstance(record, Result):
+        # Journaled node updates must reach the DB before the result
+        if journal := get_journal():
+            journal.commit()
         _initialize_results_dir(record)
         app_log.debug("Persisting record...")
-        upsert.persist_result(record, electron_id)
+        upsert.persist_result(record, electron_id, node_records)
         app_log.debug("persist complete")
     if isinstance(record, Lattice):
         persist(record.transport_graph)
@@ -90,30 +101,118 @@ def _node(
         None
 
     """
-    if node_name is None:
-        node_name = result.lattice.transport_graph.get_node_value(node_id, "name")
-
-    result._update_node(
-        node_id=node_id,
-        node_name=node_name,
-        start_time=start_time,
-        end_time=end_time,
-        status=status,
-        output=output,
-        error=error,
-        sub_dispatch_id=sub_dispatch_id,
-        sublattice_result=sublattice_result,
-        stdout=stdout,
-        stderr=stderr,
+    _nodes(
+        result,
+        [
+            {
+                "node_id": node_id,
+                "node_name": node_name,
+                "start_time": start_time,
+                "end_time": end_time,
+                "status": status,
+                "output": output,
+                "error": error,
+                "sub_dispatch_id": sub_dispatch_id,
+                "sublattice_result": sublattice_result,
+                "stdout": stdout,
+                "stderr": stderr,
+            }
+        ],
     )
 
-    upsert.electron_data(result)
 
-    if node_name.startswith(postprocess_prefix):
-        app_log.warning(f"Persisting postprocess result {output}, node_name: {node_name}")
-        result._result = output
-        result._status = status
-        result._end_time = end_time
+def _nodes(result, node_results: List[Dict]) -> None:
+    """
+    Update a batch of node results in the transport graph.
+
+    All the in-memory node updates are applied first and the dirty
+    nodes are then written to the DB in a single `electron_data`
+    transaction. With write-behind persistence, the updates are
+    journaled instead and committed together with other updates.
+
+    Args:
+        result: The result object of the dispatch.
+        node_results: List of node result dictionaries with the same
+            keys as the keyword arguments of `_node`.
+
+    Returns:
+        None
+
+    """
+    node_records = apply_nodes(result, node_results)
+    persist_nodes(result, node_results, node_records)
+
+
+def apply_nodes(result, node_results: List[Dict]) -> List[Dict]:
+    """
+    Apply a batch of node results to the in-memory result object.
+
+    Must be called from the thread which owns the result object, i.e.
+    the dispatcher event loop; the DB and file writes are done
+    separately by `persist_nodes`.
+
+    Args:
+        result: The result object of the dispatch.
+        node_results: List of node result dictionaries with the same
+            keys as the keyword arguments of `_node`. Missing node
+            names are filled in.
+
+    Returns:
+        Snapshots of the nodes changed by the node results, see
+        `upsert.get_node_records`.
+
+    """
+    tg = result.lattice.transport_graph
+    for node_result in node_results:
+        if node_result.get("node_name") is None:
+            node_result["node_name"] = tg.get_node_value(node_result["node_id"], "name")
+        result._update_node(**node_result)
+
+        if node_result["node_name"].startswith(postprocess_prefix):
+            result._result = node_result.get("output")
+            result._status = node_result.get("status")
+            result._end_time = node_result.get("end_time")
+
+    return upsert.take_dirty_node_records(result)
+
+
+def persist_nodes(result, node_results: List[Dict], node_records: List[Dict]) -> None:
+    """
+    Write node results already applied by `apply_nodes` to the DB.
+
+    The nodes are written from the snapshots taken by `apply_nodes`,
+    so this can run on a persistence worker while the event loop keeps
+    updating other nodes.
+
+    Args:
+        result: The result object of the dispatch.
+        node_results: The node results passed to `apply_nodes`.
+        node_records: The node snapshots returned by `apply_nodes`.
+
+    Returns:
+        None
+
+    """
+    postprocess_results = [
+        node_result
+        for node_result in node_results
+        if node_result["node_name"].startswith(postprocess_prefix)
+    ]
+
+    journal = get_journal()
+    if journal:
+        journal.append(result, node_results, node_records)
+        if postprocess_results:
+            # The lattice result is written right away, so commit its nodes first
+            journal.commit()
+    else:
+        upsert.electron_data(result, node_records=node_records)
+
+    for node_result in postprocess_results:
+        output = node_result.get("output")
+        app_log.warning(
+            f"Persisting postprocess result {output}, node_name: {node_result['node_name']}"
+        )
         upsert.lattice_data(result)
 
 
@@ -18,28 +18,35 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
+import copy
 import os
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
 
 from sqlalchemy.orm import Session
 
+from covalent._data_store import ObjectRef
 from covalent._results_manager import Result
-from covalent._shared_files import logger
+from covalent._shared_files import logger, tracing
+from covalent._shared_files.compression import NO_COMPRESSION, get_codec
 from covalent._shared_files.config import get_config
+from covalent._workflow.transport import _TransportGraph
+from covalent._workflow.transportable_object import TransportableObject
 
 from . import models
 from .datastore import workflow_db
 from .jobdb import transaction_get_job_record
 from .write_result_to_db import (
+    StoredObjectRef,
     get_electron_type,
     store_file,
     transaction_insert_electrons_data,
     transaction_insert_lattices_data,
+    transaction_update_electrons_data,
+    transaction_update_lattice_completed_electron_num,
     transaction_update_lattices_data,
     transaction_upsert_electron_dependency_data,
-    update_electrons_data,
-    update_lattice_completed_electron_num,
 )
 
 app_log = logger.app_log
@@ -75,6 +82,100 @@ LATTICE_LATTICE_IMPORTS_FILENAME = "lattice_imports.pkl"
 LATTICE_STORAGE_TYPE = "local"
 
 
+def get_node_storage_path(dispatch_id: str, node_id: int) -> Path:
+    """Return the directory containing the files of a node."""
+    results_dir = os.environ.get("COVALENT_DATA_DIR") or get_config("dispatcher.results_dir")
+    return Path(os.path.join(results_dir, dispatch_id, f"node_{node_id}"))
+
+
+class _CompressionPolicy:
+    """
+    Chooses the codec compressing the transportable objects written to
+    the results directory
+
+    The codec is given by the `compression` metadata of the electron,
+    else of the lattice, else by `dispatcher.compression`. Objects
+    smaller than `dispatcher.compression_threshold` bytes are not
+    compressed.
+    """
+
+    def __init__(self, lattice_metadata: dict) -> None:
+        self.default_codec = lattice_metadata.get("compression") or get_config(
+            "dispatcher.compression"
+        )
+        self.threshold = int(get_config("dispatcher.compression_threshold"))
+
+    def get_codec(self, data: Any, metadata: Optional[dict] = None) -> Optional[str]:
+        """Return the codec compressing `data`, or None to write it as a pickle."""
+        if not isinstance(data, TransportableObject) or data.size < self.threshold:
+            return None
+        codec = (metadata or {}).get("compression") or self.default_codec
+        if codec == NO_COMPRESSION:
+            return None
+        try:
+            get_codec(codec)
+        except ValueError:
+            app_log.warning(f"Unknown compression codec {codec!r}, writing uncompressed")
+            return None
+        return codec
+
+
+def _load_object_ref(value: Any) -> Any:
+    """Return the object referenced by an output passed by reference."""
+    return value.load() if isinstance(value, ObjectRef) else value
+
+
+def _get_persisted_transport_graph(tg: _TransportGraph) -> _TransportGraph:
+    """
+    Return the transport graph to write to the results directory
+
+    The pickled transport graph is read by the SDK and the UI, which
+    can't resolve outputs passed by reference or spilled to their
+    results files, so these are loaded in a copy of the graph.
+
+    Arg(s)
+        tg: Transport graph of the lattice
+
+    Return(s)
+        The transport graph, or a copy of it without references
+    """
+    refs = {
+        node_id: node_data["output"]
+        for node_id, node_data in tg._graph.nodes(data=True)
+        if isinstance(node_data.get("output"), (ObjectRef, StoredObjectRef))
+    }
+    if not refs:
+        return tg
+
+    persisted = copy.copy(tg)
+    persisted._graph = tg.get_internal_graph_copy()
+    for node_id, ref in refs.items():
+        persisted._graph.nodes[node_id]["output"] = ref.load()
+    return persisted
+
+
+def store_electron_output(result: Result, node_id: int, output: Any) -> StoredObjectRef:
+    """
+    Write the output of a node to its results file ahead of its electron record
+
+    Arg(s)
+        result: Result object associated with the lattice
+        node_id: ID of the node
+        output: Output of the node
+
+    Return(s)
+        Reference to the written results file
+    """
+    node_path = get_node_storage_path(result.dispatch_id, node_id)
+    node_path.mkdir(parents=True, exist_ok=True)
+    node_metadata = result.lattice.transport_graph.get_node_value(node_id, "metadata")
+    output = _load_object_ref(output)
+    codec = _CompressionPolicy(result.lattice.metadata).get_codec(output, node_metadata)
+    store_file(node_path, ELECTRON_RESULTS_FILENAME, output, codec)
+    size = output.size if isinstance(output, TransportableObject) else 0
+    return StoredObjectRef(node_path, ELECTRON_RESULTS_FILENAME, size)
+
+
 def _lattice_data(session: Session, result: Result, electron_id: int = None) -> None:
     """
     Private method to update lattice data in database
@@ -102,6 +203,7 @@ def _lattice_data(session: Session, result: Result, electron_id: int = None) ->
     # Store all lattice info that belongs in filenames in the results directory
     results_dir = os.environ.get("COVALENT_DATA_DIR") or get_config("dispatcher.results_dir")
     data_storage_path = os.path.join(results_dir, result.dispatch_id)
+    compression = _CompressionPolicy(result.lattice.metadata)
     for filename, data in [
         (LATTICE_FUNCTION_FILENAME, result.lattice.workflow_function),
         (LATTICE_FUNCTION_STRING_FILENAME, workflow_func_string),
@@ -116,14 +218,17 @@ def _lattice_data(session: Session, result: Result, electron_id: int = None) ->
         (LATTICE_NAMED_ARGS_FILENAME, result.lattice.named_args),
         (LATTICE_NAMED_KWARGS_FILENAME, result.lattice.named_kwargs),
         (LATTICE_RESULTS_FILENAME, result._result),
-        (LATTICE_TRANSPORT_GRAPH_FILENAME, result._lattice.transport_graph),
+        (
+            LATTICE_TRANSPORT_GRAPH_FILENAME,
+            _get_persisted_transport_graph(result._lattice.transport_graph),
+        ),
         (LATTICE_DEPS_FILENAME, result.lattice.metadata["deps"]),
         (LATTICE_CALL_BEFORE_FILENAME, result.lattice.metadata["call_before"]),
         (LATTICE_CALL_AFTER_FILENAME, result.lattice.metadata["call_after"]),
         (LATTICE_COVA_IMPORTS_FILENAME, result.lattice.cova_imports),
         (LATTICE_LATTICE_IMPORTS_FILENAME, result.lattice.lattice_imports),
     ]:
-        store_file(data_storage_path, filename, data)
+        store_file(data_storage_path, filename, data, compression.get_codec(data))
 
     # Write lattice records to Database
     if not lattice_exists:
@@ -175,105 +280,143 @@ def _lattice_data(session: Session, result: Result, electron_id: int = None) ->
         transaction_update_lattices_data(session=session, **lattice_record_kwarg)
 
 
-def _electron_data(session: Session, result: Result, cancel_requested: bool = False):
+def get_node_records(result: Result, node_ids: Iterable[int]) -> List[Dict]:
     """
-    Update electron data in database
+    Snapshot the attributes of transport graph nodes
+
+    Node attributes are replaced rather than mutated when a node is
+    updated, so the snapshot can be written from another thread while
+    the dispatcher keeps updating the transport graph.
 
     Arg(s)
-        session: SQLalchemy session object
         result: Result object associated with the lattice
-        cancel_requested: Boolean indicating whether electron was requested to be cancelled
+        node_ids: Nodes to snapshot
 
     Return(s)
-        None
+        One dictionary of node attributes per node, including its `node_id`
+    """
+    nodes = result.lattice.transport_graph._graph.nodes
+    return [{**nodes[node_id], "node_id": node_id} for node_id in node_ids]
+
+
+def take_dirty_node_records(result: Result) -> List[Dict]:
+    """
+    Snapshot the dirty nodes of the transport graph and reset them
+
+    Arg(s)
+        result: Result object associated with the lattice
+
+    Return(s)
+        The node records of the dirty nodes
     """
     tg = result.lattice.transport_graph
-    dirty_nodes = set(tg.dirty_nodes)
-    tg.dirty_nodes.clear()  # Ensure that dirty nodes list is reset once the data is updated
-    for node_id in dirty_nodes:
-        results_dir = os.environ.get("COVALENT_DATA_DIR") or get_config("dispatcher.results_dir")
-        node_path = Path(os.path.join(results_dir, result.dispatch_id, f"node_{node_id}"))
+    node_ids = list(dict.fromkeys(tg.dirty_nodes))
+    tg.dirty_nodes.clear()
+    return get_node_records(result, node_ids)
 
-        if not node_path.exists():
-            node_path.mkdir()
 
-        node_name = tg.get_node_value(node_id, "name")
+def _electron_data(
+    session: Session,
+    result: Result,
+    cancel_requested: bool = False,
+    node_records: Optional[Iterable[Dict]] = None,
+):
+    """
+    Update electron data in database
 
-        try:
-            function_string = tg.get_node_value(node_id, "function_string")
-        except KeyError:
-            function_string = None
+    Arg(s)
+        session: SQLalchemy session object
+        result: Result object associated with the lattice
+        cancel_requested: Boolean indicating whether electron was requested to be cancelled
+        node_records: Snapshots of the nodes to update, see `get_node_records`;
+            defaults to the dirty nodes of the transport graph
 
-        try:
-            node_value = tg.get_node_value(node_id, "value")
-        except KeyError:
-            node_value = None
+    Return(s)
+        None
+    """
+    if node_records is None:
+        node_records = take_dirty_node_records(result)
+    _electron_records(
+        session, result.dispatch_id, result.lattice.metadata, node_records, cancel_requested
+    )
 
-        try:
-            node_stdout = tg.get_node_value(node_id, "stdout")
-        except KeyError:
-            node_stdout = None
 
-        try:
-            node_stderr = tg.get_node_value(node_id, "stderr")
-        except KeyError:
-            node_stderr = None
+def _electron_records(
+    session: Session,
+    dispatch_id: str,
+    lattice_metadata: dict,
+    node_records: Iterable[Dict],
+    cancel_requested: bool = False,
+):
+    """
+    Update electron data in database from node snapshots
 
-        try:
-            node_error = tg.get_node_value(node_id, "error")
-        except KeyError:
-            node_error = None
+    Arg(s)
+        session: SQLalchemy session object
+        dispatch_id: Dispatch id of the lattice
+        lattice_metadata: Metadata of the lattice
+        node_records: Snapshots of the nodes to update, see `get_node_records`
+        cancel_requested: Boolean indicating whether electron was requested to be cancelled
 
-        try:
-            node_output = tg.get_node_value(node_id, "output")
-        except KeyError:
-            node_output = None
+    Return(s)
+        None
+    """
+    compression = _CompressionPolicy(lattice_metadata)
+    for record in node_records:
+        node_id = record["node_id"]
+        node_path = get_node_storage_path(dispatch_id, node_id)
 
-        executor = tg.get_node_value(node_id, "metadata")["executor"]
-        started_at = tg.get_node_value(node_key=node_id, value_key="start_time")
-        completed_at = tg.get_node_value(node_key=node_id, value_key="end_time")
+        if not node_path.exists():
+            node_path.mkdir()
 
-        for filename, data in [
-            (ELECTRON_FUNCTION_FILENAME, tg.get_node_value(node_id, "function")),
+        node_name = record["name"]
+        function_string = record.get("function_string")
+        node_value = record.get("value")
+        node_stdout = record.get("stdout")
+        node_stderr = record.get("stderr")
+        node_error = record.get("error")
+        node_output = _load_object_ref(record.get("output"))
+
+        node_metadata = record["metadata"]
+        executor = node_metadata["executor"]
+        started_at = record.get("start_time")
+        completed_at = record.get("end_time")
+
+        files = [
+            (ELECTRON_FUNCTION_FILENAME, record["function"]),
             (ELECTRON_FUNCTION_STRING_FILENAME, function_string),
             (ELECTRON_VALUE_FILENAME, node_value),
-            (
-                ELECTRON_EXECUTOR_DATA_FILENAME,
-                tg.get_node_value(node_id, "metadata")["executor_data"],
-            ),
-            (ELECTRON_DEPS_FILENAME, tg.get_node_value(node_id, "metadata")["deps"]),
-            (
-                ELECTRON_CALL_BEFORE_FILENAME,
-                tg.get_node_value(node_id, "metadata")["call_before"],
-            ),
-            (
-                ELECTRON_CALL_AFTER_FILENAME,
-                tg.get_node_value(node_id, "metadata")["call_after"],
-            ),
+            (ELECTRON_EXECUTOR_DATA_FILENAME, node_metadata["executor_data"]),
+            (ELECTRON_DEPS_FILENAME, node_metadata["deps"]),
+            (ELECTRON_CALL_BEFORE_FILENAME, node_metadata["call_before"]),
+            (ELECTRON_CALL_AFTER_FILENAME, node_metadata["call_after"]),
             (ELECTRON_STDOUT_FILENAME, node_stdout),
             (ELECTRON_STDERR_FILENAME, node_stderr),
             (ELECTRON_ERROR_FILENAME, node_error),
-            (ELECTRON_RESULTS_FILENAME, node_output),
-        ]:
-            store_file(node_path, filename, data)
+        ]
+        # Spilled and journaled outputs are already stored in the results file
+        if not isinstance(node_output, StoredObjectRef):
+            files.append((ELECTRON_RESULTS_FILENAME, node_output))
+        for filename, data in files:
+            store_file(node_path, filename, data, compression.get_codec(data, node_metadata))
 
         electron_exists = (
             session.query(models.Electron, models.Lattice)
             .where(
                 models.Electron.parent_lattice_id == models.Lattice.id,
-                models.Lattice.dispatch_id == result.dispatch_id,
+                models.Lattice.dispatch_id == dispatch_id,
                 models.Electron.transport_graph_node_id == node_id,
             )
             .first()
             is not None
         )
 
-        status = tg.get_node_value(node_key=node_id, value_key="status")
+        status = record.get("status")
         if not electron_exists:
             electron_record_kwarg = {
-                "parent_dispatch_id": result.dispatch_id,
+                "parent_dispatch_id": dispatch_id,
                 "transport_graph_node_id": node_id,
-                "type": get_electron_type(tg.get_node_value(node_key=node_id, value_key="name")),
+                "type": get_electron_type(node_name),
                 "name": node_name,
                 "status": str(status),
                 "storage_type": ELECTRON_STORAGE_TYPE,
@@ -299,7 +442,7 @@ def _electron_data(session: Session, result: Result, cancel_requested: bool = Fa
             transaction_insert_electrons_data(session=session, **electron_record_kwarg)
         else:
             electron_record_kwarg = {
-                "parent_dispatch_id": result.dispatch_id,
+                "parent_dispatch_id": dispatch_id,
                 "transport_graph_node_id": node_id,
                 "name": node_name,
                 "status": str(status),
@@ -307,9 +450,9 @@ def _electron_data(session: Session, result: Result, cancel_requested: bool = Fa
                 "updated_at": datetime.now(timezone.utc),
                 "completed_at": completed_at,
             }
-            update_electrons_data(**electron_record_kwarg)
+            transaction_update_electrons_data(session=session, **electron_record_kwarg)
             if status == Result.COMPLETED:
-                update_lattice_completed_electron_num(result.dispatch_id)
+                transaction_update_lattice_completed_electron_num(session, dispatch_id)
 
 
 def lattice_data(result: Result, electron_id: int = None) -> None:
@@ -323,46 +466,61 @@ def lattice_data(result: Result, electron_id: int = None) -> None:
     Return(s)
         None
     """
-    with workflow_db.session() as session:
-        _lattice_data(session, result, electron_id)
+    with tracing.span("db_upsert_lattice", result.dispatch_id):
+        with workflow_db.write_session() as session:
+            _lattice_data(session, result, electron_id)
 
 
-def electron_data(result: Result, cancel_requested: bool = False) -> None:
+def electron_data(
+    result: Result,
+    cancel_requested: bool = False,
+    node_records: Optional[Iterable[Dict]] = None,
+) -> None:
     """
     Upsert electron data to the database
 
     Arg(s)
         result: Result object associated with the lattice
         cancel_requested: Boolean indicating whether the electron was requested to be cancelled
+        node_records: Snapshots of the nodes to update, see `get_node_records`;
+            defaults to the dirty nodes of the transport graph
 
     Return(s)
         None
     """
-    with workflow_db.session() as session:
-        _electron_data(session, result, cancel_requested)
+    with tracing.span("db_upsert_electrons", result.dispatch_id):
+        with workflow_db.write_session() as session:
+            _electron_data(session, result, cancel_requested, node_records)
 
 
-def persist_result(result: Result, electron_id: int = None) -> None:
+def persist_result(
+    result: Result, electron_id: int = None, node_records: Optional[Iterable[Dict]] = None
+) -> None:
     """
     Persist the result object of the lattice recursively into the database
 
     Arg(s)
         result: Result object associated with the lattice
         electron_id: ID of the electron within the lattice
+        node_records: Snapshots of the nodes to update, see `get_node_records`;
+            defaults to the dirty nodes of the transport graph
 
     Return(s)
         None
     """
-    with workflow_db.session() as session:
-        _lattice_data(session, result, electron_id)
-        if electron_id:
-            e_record = (
-                session.query(models.Electron).where(models.Electron.id == electron_id).first()
+    with tracing.span("db_persist_result", result.dispatch_id):
+        with workflow_db.write_session() as session:
+            _lattice_data(session, result, electron_id)
+            if electron_id:
+                e_record = (
+                    session.query(models.Electron).where(models.Electron.id == electron_id).first()
+                )
+                cancel_requested = transaction_get_job_record(session, e_record.job_id)[
+                    "cancel_requested"
+                ]
+            else:
+                cancel_requested = False
+            _electron_data(session, result, cancel_requested, node_records)
+            transaction_upsert_electron_dependency_data(
+                session, result.dispatch_id, result.lattice
             )
-            cancel_requested = transaction_get_job_record(session, e_record.job_id)[
-                "cancel_requested"
-            ]
-        else:
-            cancel_requested = False
-        _electron_data(session, result, cancel_requested)
-        transaction_upsert_electron_dependency_data(session, result.dispatch_id, result.lattice)
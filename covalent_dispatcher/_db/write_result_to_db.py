@@ -21,10 +21,11 @@
 """This module contains all the functions required to save the decomposed result object in the database."""
 
 import os
+import threading
 from datetime import datetime as dt
 from datetime import timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import cloudpickle
 import networkx as nx
@@ -45,6 +46,7 @@ from covalent._shared_files.defaults import (
 )
 from covalent._shared_files.exceptions import MissingLatticeRecordError
 from covalent._workflow.lattice import Lattice as LatticeClass
+from covalent._workflow.transportable_object import TransportableObject
 
 from .datastore import workflow_db
 from .models import Electron, ElectronDependency, Job, Lattice
@@ -69,18 +71,26 @@ class InvalidFileExtension(Exception):
     pass
 
 
+def transaction_update_lattice_completed_electron_num(session: Session, dispatch_id: str) -> None:
+    """
+    Update the number of completed electrons by one corresponding to a lattice
+    """
+
+    session.query(Lattice).filter_by(dispatch_id=dispatch_id).update(
+        {
+            "completed_electron_num": Lattice.completed_electron_num + 1,
+            "updated_at": dt.now(timezone.utc),
+        }
+    )
+
+
 def update_lattice_completed_electron_num(dispatch_id: str) -> None:
     """
     Update the number of completed electrons by one corresponding to a lattice
     """
 
     with workflow_db.session() as session:
-        session.query(Lattice).filter_by(dispatch_id=dispatch_id).update(
-            {
-                "completed_electron_num": Lattice.completed_electron_num + 1,
-                "updated_at": dt.now(timezone.utc),
-            }
-        )
+        transaction_update_lattice_completed_electron_num(session, dispatch_id)
 
 
 def transaction_insert_lattices_data(
@@ -378,7 +388,8 @@ def update_lattices_data(dispatch_id: str, **kwargs) -> None:
         transaction_update_lattices_data(session, dispatch_id, **kwargs)
 
 
-def update_electrons_data(
+def transaction_update_electrons_data(
+    session: Session,
     parent_dispatch_id: str,
     transport_graph_node_id: int,
     name: str,
@@ -387,38 +398,44 @@ def update_electrons_data(
     updated_at: dt,
     completed_at: dt,
 ) -> None:
-    """This function updates the electrons record."""
+    """This function updates the electrons record within the given session."""
 
-    with workflow_db.session() as session:
-        parent_lattice_id = (
-            session.query(Lattice).where(Lattice.dispatch_id == parent_dispatch_id).all()[0].id
-        )
-        valid_update = (
-            session.query(Electron)
-            .where(
-                Electron.parent_lattice_id == parent_lattice_id,
-                Electron.transport_graph_node_id == transport_graph_node_id,
-            )
-            .first()
-            is not None
+    parent_lattice_id = (
+        session.query(Lattice).where(Lattice.dispatch_id == parent_dispatch_id).all()[0].id
+    )
+    valid_update = (
+        session.query(Electron)
+        .where(
+            Electron.parent_lattice_id == parent_lattice_id,
+            Electron.transport_graph_node_id == transport_graph_node_id,
         )
-        if not valid_update:
-            raise MissingElectronRecordError
+        .first()
+        is not None
+    )
+    if not valid_update:
+        raise MissingElectronRecordError
 
-        session.execute(
-            update(Electron)
-            .where(
-                Electron.parent_lattice_id == parent_lattice_id,
-                Electron.transport_graph_node_id == transport_graph_node_id,
-            )
-            .values(
-                name=name,
-                status=status,
-                started_at=started_at,
-                updated_at=updated_at,
-                completed_at=completed_at,
-            )
+    session.execute(
+        update(Electron)
+        .where(
+            Electron.parent_lattice_id == parent_lattice_id,
+            Electron.transport_graph_node_id == transport_graph_node_id,
+        )
+        .values(
+            name=name,
+            status=status,
+            started_at=started_at,
+            updated_at=updated_at,
+            completed_at=completed_at,
         )
+    )
+
+
+def update_electrons_data(*args, **kwargs) -> None:
+    """This function updates the electrons record."""
+
+    with workflow_db.session() as session:
+        transaction_update_electrons_data(session, *args, **kwargs)
 
 
 def get_electron_type(node_name: str) -> str:
@@ -515,12 +532,26 @@ def write_lattice_error(dispatch_id: str, error: str) -> None:
             f.write(error)
 
 
-def store_file(storage_path: str, filename: str, data: Any = None) -> None:
-    """This function writes data corresponding to the filepaths in the DB."""
+def store_file(
+    storage_path: str, filename: str, data: Any = None, codec: Optional[str] = None
+) -> None:
+    """This function writes data corresponding to the filepaths in the DB.
+
+    Transportable objects are written as archives, compressed with
+    `codec` if any, instead of pickles so that they can be read back
+    from a memory-mapped file. Pickle files are replaced rather than
+    overwritten, since the previous file may still be mapped.
+    """
 
     if filename.endswith(".pkl"):
-        with open(Path(storage_path) / filename, "wb") as f:
-            cloudpickle.dump(data, f)
+        path = Path(storage_path) / filename
+        tmp_path = path.with_name(f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            if isinstance(data, TransportableObject):
+                data.serialize_to_file(f, codec=codec)
+            else:
+                cloudpickle.dump(data, f)
+        os.replace(tmp_path, path)
 
     elif filename.endswith(".log") or filename.endswith(".txt"):
         if data is None:
@@ -536,15 +567,51 @@ def store_file(storage_path: str, filename: str, data: Any = None) -> None:
         raise InvalidFileExtension("The file extension is not supported.")
 
 
-def load_file(storage_path: str, filename: str) -> Any:
-    """This function loads data for the filenames in the DB."""
+def load_file(storage_path: str, filename: str, string_only: bool = False) -> Any:
+    """This function loads data for the filenames in the DB.
+
+    Transportable objects stored as archives are loaded without their
+    data if `string_only` is True, reading only the header and the
+    string of the archive.
+    """
 
     if filename.endswith(".pkl"):
-        with open(Path(storage_path) / filename, "rb") as f:
-            data = cloudpickle.load(f)
+        path = Path(storage_path) / filename
+        with open(path, "rb") as f:
+            is_archive = TransportableObject.is_archive(f.peek(1))
+            if not is_archive:
+                data = cloudpickle.load(f)
+        if is_archive:
+            data = TransportableObject.deserialize_from_file(path, string_only=string_only)
 
     elif filename.endswith(".log") or filename.endswith(".txt"):
         with open(Path(storage_path) / filename, "r") as f:
             data = f.read()
 
     return data
+
+
+class StoredObjectRef:
+    """
+    Reference to an object written with `store_file`.
+
+    Stands in for the object in an in-memory result object after it has
+    been dropped from memory; `load` reads the object back from storage.
+
+    Attributes:
+        storage_path: Directory containing the file.
+        filename: Name of the file.
+        size: Size of the referenced object in bytes.
+    """
+
+    def __init__(self, storage_path: str, filename: str, size: int = 0) -> None:
+        self.storage_path = str(storage_path)
+        self.filename = filename
+        self.size = size
+
+    def __repr__(self) -> str:
+        return f"StoredObjectRef({os.path.join(self.storage_path, self.filename)!r})"
+
+    def load(self) -> Any:
+        """Load the referenced object from storage."""
+        return load_file(self.storage_path, self.filename)
@@ -18,6 +18,7 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
+import asyncio
 import codecs
 import json
 from typing import Optional
@@ -25,21 +26,27 @@ from uuid import UUID
 
 import cloudpickle as pickle
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 import covalent_dispatcher as dispatcher
 from covalent._results_manager.result import Result
-from covalent._shared_files import logger
+from covalent._shared_files import logger, tracing
 
+from .._core import runner
+from .._core.runner_modules import admission
 from .._db.datastore import workflow_db
-from .._db.load import _result_from
+from .._db.load import _result_from, _result_string_from
 from .._db.models import Lattice
+from .app_shards import ShardRouter
 
 app_log = logger.app_log
 log_stack_info = logger.log_stack_info
 
 router: APIRouter = APIRouter()
 
+# Set in the front-end server when the dispatcher is sharded
+shard_router: Optional[ShardRouter] = None
+
 
 @router.post("/submit")
 async def submit(request: Request, disable_run: bool = False) -> UUID:
@@ -57,6 +64,11 @@ async def submit(request: Request, disable_run: bool = False) -> UUID:
     """
     try:
         data = await request.json()
+        if shard_router:
+            return await shard_router.forward(
+                shard_router.get_next(), "/api/submit", data, {"disable_run": disable_run}
+            )
+
         data = json.dumps(data).encode("utf-8")
 
         return await dispatcher.run_dispatcher(data, disable_run)
@@ -73,6 +85,14 @@ async def redispatch(request: Request, is_pending: bool = False) -> str:
     try:
         data = await request.json()
         dispatch_id = data["dispatch_id"]
+        if shard_router:
+            return await shard_router.forward(
+                shard_router.get_owner(dispatch_id),
+                "/api/redispatch",
+                data,
+                {"is_pending": is_pending},
+            )
+
         json_lattice = data["json_lattice"]
         electron_updates = data["electron_updates"]
         reuse_previous_results = data["reuse_previous_results"]
@@ -109,6 +129,9 @@ async def cancel(request: Request) -> str:
     dispatch_id = data["dispatch_id"]
     task_ids = data["task_ids"]
 
+    if shard_router:
+        return await shard_router.forward(shard_router.get_owner(dispatch_id), "/api/cancel", data)
+
     await dispatcher.cancel_running_dispatch(dispatch_id, task_ids)
     if task_ids:
         return f"Cancelled tasks {task_ids} in dispatch {dispatch_id}."
@@ -139,7 +162,10 @@ async def get_result(
                 "id": dispatch_id,
                 "status": lattice_record.status,
             }
-            if not status_only:
+            if status_only:
+                # The output is not loaded, only its string representation
+                output["result_string"] = _result_string_from(lattice_record)
+            else:
                 output["result"] = codecs.encode(
                     pickle.dumps(_result_from(lattice_record)), "base64"
                 ).decode()
@@ -152,3 +178,41 @@ async def get_result(
             },
             headers={"Retry-After": "2"},
         )
+
+
+@router.get("/metrics")
+async def get_metrics(as_json: bool = False):
+    """
+    Return the latency histograms of the dispatcher phases recorded
+    when `dispatcher.tracing` is enabled, and the queued and in-flight
+    tasks of each executor.
+
+    Args:
+        as_json: Whether to return the metrics as JSON instead of the
+            Prometheus text format
+
+    Returns:
+        The histograms of all the dispatcher phases and of the phases of
+        recent dispatches, and the executor queue stats
+    """
+    snapshot = tracing.get_snapshot()
+    executor_queues = runner.get_executor_queue_stats()
+    if shard_router:
+        shard_snapshots = await asyncio.gather(
+            *(
+                shard_router.get_json(address, "/api/metrics", {"as_json": "true"})
+                for address in shard_router.addresses
+            )
+        )
+        snapshot = tracing.merge_snapshots([snapshot, *shard_snapshots])
+        executor_queues = admission.merge_stats(
+            [executor_queues, *(s.get("executor_queues", {}) for s in shard_snapshots)]
+        )
+    snapshot["executor_queues"] = executor_queues
+
+    if as_json:
+        return snapshot
+    return PlainTextResponse(
+        tracing.render_prometheus(snapshot) + admission.render_prometheus(executor_queues),
+        media_type="text/plain; version=0.0.4",
+    )
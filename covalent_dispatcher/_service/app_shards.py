@@ -0,0 +1,197 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+Sharded dispatcher
+
+Each shard is a process running its own dispatcher event loop behind a
+minimal copy of the dispatcher API. A dispatch is owned by the shard its
+dispatch ID hashes to, and the front-end server forwards the requests
+concerning a dispatch to its owner. The shards mint dispatch IDs which
+hash to themselves, so the sublattice dispatches and redispatches of a
+dispatch run on the same shard as the dispatch.
+"""
+
+import itertools
+import os
+import socket
+import time
+from logging import Logger
+from multiprocessing import Process
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from covalent._shared_files import tracing
+from covalent._shared_files.utils import get_random_available_port
+
+from .._core.data_modules.shards import SHARD_ENV_VAR, shard_of
+
+SHARD_HOST = "127.0.0.1"
+
+# Seconds to wait for a shard to start listening
+SHARD_STARTUP_TIMEOUT = 60
+
+
+class DispatcherShard(Process):
+    """
+    Run a dispatcher shard in a separate multiprocessing process whose
+    lifetime is tied to Covalent. The shard serves the dispatcher API on
+    localhost with a randomly selected TCP port that is available.
+    """
+
+    def __init__(self, index: int, num_shards: int, logger: Logger):
+        super().__init__()
+        self.name = f"DispatcherShard-{index}"
+        self.index = index
+        self.num_shards = num_shards
+        self.logger = logger
+        self.host = SHARD_HOST
+        self.port = get_random_available_port()
+
+    @property
+    def address(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def run(self):
+        """
+        Serves the dispatcher API of this shard
+        """
+        os.environ[SHARD_ENV_VAR] = f"{self.index}/{self.num_shards}"
+        tracing.load_config(trace_file_suffix=f".{self.index}")
+
+        from covalent_ui import result_webhook
+
+        from ..entry_point import resume_dispatches
+        from .app import router
+
+        shard_app = FastAPI()
+        shard_app.include_router(router, prefix="/api")
+        shard_app.add_event_handler("startup", resume_dispatches)
+        shard_app.add_event_handler("shutdown", result_webhook.close)
+        shard_app.add_event_handler("shutdown", tracing.close)
+
+        try:
+            uvicorn.run(shard_app, host=self.host, port=self.port, log_level="warning")
+        except Exception as e:
+            self.logger.exception(e)
+
+    def wait_until_listening(self, timeout: float = SHARD_STARTUP_TIMEOUT) -> None:
+        """
+        Block until the shard accepts connections
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=1):
+                    return
+            except OSError:
+                if not self.is_alive() or time.monotonic() > deadline:
+                    raise RuntimeError(f"{self.name} failed to start")
+                time.sleep(0.1)
+
+
+class ShardRouter:
+    """
+    Forwards the dispatcher API requests of the front-end server to the
+    shards owning the dispatches. New dispatches are spread over the
+    shards in round-robin order.
+    """
+
+    def __init__(self, addresses: List[str]):
+        self.addresses = addresses
+        self._next_shard = itertools.cycle(range(len(addresses)))
+        self._session = None
+
+    def get_owner(self, dispatch_id: str) -> str:
+        """Return the address of the shard owning a dispatch."""
+        return self.addresses[shard_of(dispatch_id, len(self.addresses))]
+
+    def get_next(self) -> str:
+        """Return the address of the shard to submit the next dispatch to."""
+        return self.addresses[next(self._next_shard)]
+
+    async def forward(
+        self, address: str, path: str, data: Any, params: Optional[Dict[str, Any]] = None
+    ) -> JSONResponse:
+        """
+        Forward a POST request to a shard and relay its response
+
+        Arg(s)
+            address: Address of the shard
+            path: Path of the endpoint
+            data: JSON body of the request
+            params: Query parameters of the request
+
+        Return(s)
+            The response of the shard
+        """
+        params = {
+            key: str(value).lower() if isinstance(value, bool) else value
+            for key, value in (params or {}).items()
+        }
+        async with self._get_session().post(f"{address}{path}", json=data, params=params) as resp:
+            return JSONResponse(status_code=resp.status, content=await resp.json())
+
+    async def get_json(self, address: str, path: str, params: Optional[Dict[str, Any]] = None):
+        """
+        Send a GET request to a shard and return its JSON response
+
+        Arg(s)
+            address: Address of the shard
+            path: Path of the endpoint
+            params: Query parameters of the request
+
+        Return(s)
+            The decoded JSON response of the shard
+        """
+        async with self._get_session().get(f"{address}{path}", params=params) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # The session is bound to the event loop of the front-end server
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+
+def start_shards(num_shards: int, logger: Logger) -> ShardRouter:
+    """
+    Start the dispatcher shards
+
+    Arg(s)
+        num_shards: Number of shard processes
+        logger: Logger of the shard processes
+
+    Return(s)
+        Router forwarding requests to the shards
+    """
+    dispatcher_shards = [DispatcherShard(i, num_shards, logger) for i in range(num_shards)]
+    for shard in dispatcher_shards:
+        shard.start()
+    for shard in dispatcher_shards:
+        shard.wait_until_listening()
+    logger.info(f"Started {num_shards} dispatcher shards")
+
+    return ShardRouter([shard.address for shard in dispatcher_shards])
@@ -25,6 +25,7 @@ Self-contained entry point for the dispatcher
 from typing import List
 
 from covalent._shared_files import logger
+from covalent._shared_files.config import get_config
 
 from ._core import cancel_dispatch
 
@@ -98,3 +99,29 @@ async def cancel_running_dispatch(dispatch_id: str, task_ids: List[int] = None)
         task_ids = []
 
     await cancel_dispatch(dispatch_id, task_ids)
+
+
+async def resume_dispatches() -> None:
+    """
+    Resumes the dispatches left running when the dispatcher last stopped,
+    if `dispatcher.resume_dispatches` is enabled.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    if get_config("dispatcher.resume_dispatches") != "true":
+        return
+
+    from ._core import resume_dispatches
+
+    try:
+        futures = await resume_dispatches()
+    except Exception as ex:
+        # Don't keep the server from starting, e.g. before the DB is migrated
+        app_log.exception(f"Failed to resume dispatches: {ex}")
+        return
+    app_log.debug(f"Resumed {len(futures)} dispatches.")
@@ -36,8 +36,11 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from covalent._shared_files import logger
+from covalent._shared_files import logger, tracing
 from covalent._shared_files.config import get_config
+from covalent_dispatcher._db.journal import close_journal, get_journal
+from covalent_dispatcher._service import app as dispatcher_service
+from covalent_ui import result_webhook
 from covalent_ui.api.v1.routes import routes
 
 file_descriptor = None
@@ -60,6 +63,43 @@ sio = socketio.AsyncServer(
 
 app.include_router(routes.routes)
 
+
+@app.on_event("startup")
+def open_journal():
+    """Replay the node updates left in the write-behind journal, if enabled."""
+    get_journal()
+
+
+@app.on_event("startup")
+async def resume_running_dispatches():
+    """Resume the dispatches left running when the server stopped."""
+    # Imported here since the dispatcher imports the UI server through
+    # the result webhook
+    from covalent_dispatcher import resume_dispatches
+
+    # Each dispatcher shard resumes its own dispatches
+    if not dispatcher_service.shard_router:
+        await resume_dispatches()
+
+
+@app.on_event("shutdown")
+def commit_journal():
+    """Commit the pending node updates of the write-behind journal."""
+    close_journal()
+
+
+@app.on_event("shutdown")
+async def close_result_webhook():
+    """Cancel the pending result updates and close the connection pool of the webhook."""
+    await result_webhook.close()
+
+
+@app.on_event("shutdown")
+def close_trace_file():
+    """Close the trace file of the dispatcher spans, if any."""
+    tracing.close()
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -20,12 +20,17 @@
 
 """File handlers"""
 
-import base64
 import json
+import os
 
 import cloudpickle as pickle
 
 from covalent._workflow.transport import TransportableObject, _TransportGraph
+from covalent._workflow.transportable_object import HEADER_OFFSET, _TOArchiveUtils
+
+# Size in bytes above which only the string of a transportable object is
+# loaded, without its pickle
+PYTHON_OBJECT_MAX_SIZE = 10 * 1024 * 1024
 
 
 def transportable_object(obj):
@@ -37,7 +42,7 @@ def transportable_object(obj):
         Decoded transportable object
     """
     if obj:
-        load_pickle = base64.b64decode(obj._object.encode("utf-8"))
+        load_pickle = bytes(obj.get_serialized())
         return f"\npickle.loads({load_pickle})"
     return None
 
@@ -81,8 +86,11 @@ def validate_data(unpickled_object):
             unpickled_object if (unpickled_object != "" or unpickled_object is not None) else None
         )
     elif isinstance(unpickled_object, TransportableObject):
-        object_bytes = transportable_object(unpickled_object)
         res = unpickled_object.object_string
+        # The pickle of large objects isn't loaded
+        if not unpickled_object.get_serialized():
+            return json.dumps(res), None
+        object_bytes = transportable_object(unpickled_object)
         return (
             json.dumps(res),
             f"import pickle{object_bytes}",
@@ -128,6 +136,18 @@ class FileHandler:
     def __unpickle_file(self, path):
         try:
             with open(self.location + "/" + path, "rb") as read_file:
+                # Transportable objects are stored as archives, which are
+                # memory-mapped rather than read. Only the header and the
+                # string of large objects are read.
+                prefix = read_file.read(HEADER_OFFSET)
+                if TransportableObject.is_archive(prefix):
+                    data_size = os.fstat(read_file.fileno()).st_size - _TOArchiveUtils.data_offset(
+                        prefix
+                    )
+                    return TransportableObject.deserialize_from_file(
+                        read_file.name, string_only=data_size > PYTHON_OBJECT_MAX_SIZE
+                    )
+                read_file.seek(0)
                 unpickled_object = pickle.load(read_file)
                 read_file.close()
                 return unpickled_object
@@ -28,7 +28,9 @@ from fastapi.templating import Jinja2Templates
 
 from covalent._shared_files import logger
 from covalent._shared_files.config import get_config
+from covalent_dispatcher._service import app as dispatcher_service
 from covalent_dispatcher._service.app_dask import DaskCluster
+from covalent_dispatcher._service.app_shards import start_shards
 from covalent_dispatcher._triggers_app import triggers_only_app  # nopycln: import
 from covalent_ui.api.main import app as fastapi_app
 from covalent_ui.api.main import sio
@@ -118,6 +120,11 @@ if __name__ == "__main__":
         dask_cluster = DaskCluster(name="LocalDaskCluster", logger=app_log)
         dask_cluster.start()
 
+    # Start the dispatcher shards if the dispatcher is sharded
+    num_shards = int(get_config("dispatcher.num_shards"))
+    if num_shards > 1 and not args.triggers_only:
+        dispatcher_service.shard_router = start_shards(num_shards, app_log)
+
     app_name = "app:fastapi_app"
     if args.triggers_only:
         app_name = "app:triggers_only_app"
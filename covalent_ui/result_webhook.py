@@ -18,12 +18,13 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
+import asyncio
 import json
+from typing import Dict
 
 import aiohttp
 import requests
 
-import covalent_ui.app as ui_server
 from covalent._results_manager import Result
 from covalent._shared_files import logger
 from covalent._shared_files.config import get_config
@@ -41,40 +42,125 @@ def get_ui_url(path):
     return f"{baseUrl}{path}"
 
 
+class ResultWebhook:
+    """
+    Long-lived client delivering result updates to the UI server
+
+    Updates are posted by background tasks over a pooled connection, so
+    a slow or absent UI server doesn't hold up the dispatcher. The
+    updates of a dispatch which arrive within the debounce interval are
+    coalesced and only the latest one is sent.
+    """
+
+    def __init__(self, debounce_interval: float):
+        self.debounce_interval = debounce_interval
+        self._loop = None
+        self._session = None
+        self._pending = {}  # dispatch_id -> latest update
+        self._tasks = {}  # dispatch_id -> delivery task
+
+    def submit(self, update: Dict) -> None:
+        """
+        Schedule the delivery of a result update
+
+        Args: update: The result update, keyed by dispatch_id.
+
+        Returns: None
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Sessions and tasks are bound to the event loop they were created in
+            self._loop = loop
+            self._session = None
+            self._pending = {}
+            self._tasks = {}
+
+        dispatch_id = update["dispatch_id"]
+        self._pending[dispatch_id] = update
+        if dispatch_id not in self._tasks:
+            self._tasks[dispatch_id] = loop.create_task(self._deliver(dispatch_id))
+
+    async def close(self) -> None:
+        """Cancel the pending deliveries and close the connection pool."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending = {}
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _deliver(self, dispatch_id: str) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.debounce_interval)
+                update = self._pending.pop(dispatch_id, None)
+                if update is None:
+                    break
+                await self._post(update)
+        finally:
+            self._tasks.pop(dispatch_id, None)
+
+    async def _post(self, update: Dict) -> None:
+        # Imported here since the UI server imports the dispatcher
+        import covalent_ui.app as ui_server
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
+        try:
+            # ignore response
+            async with self._session.post(
+                get_ui_url(ui_server.WEBHOOK_PATH),
+                json={"event": "result-update", "result": update},
+            ) as resp:
+                status = resp.status
+                text = await resp.text()
+                app_log.debug(f"send_update received response {status}, {text}")
+        except Exception as ex:
+            # catch all requests-related exceptions
+            app_log.debug(f"Unable to send result update to UI server: {ex}")
+
+
+_result_webhook = None
+
+
+def get_result_webhook() -> ResultWebhook:
+    """Return the result webhook, creating it from the config on first use."""
+    global _result_webhook
+    if _result_webhook is None:
+        _result_webhook = ResultWebhook(float(get_config("dispatcher.webhook_debounce_ms")) / 1000)
+    return _result_webhook
+
+
+async def close() -> None:
+    """Cancel the pending result updates and close the connection pool."""
+    if _result_webhook is not None:
+        await _result_webhook.close()
+
+
 async def send_update(result: Result) -> None:
     """
     Signal UI server about a result update. Note that the server will expect the
     updated result to have been saved to the results directory prior to the
     update.
 
+    The update is delivered in the background and may be coalesced with
+    later updates of the same dispatch.
+
     Args: result: The updated result object.
 
     Returns: None
     """
 
-    result_update = json.dumps(
+    get_result_webhook().submit(
         {
-            "event": "result-update",
-            "result": {
-                "dispatch_id": result.dispatch_id,
-                "results_dir": result.results_dir,
-                "status": result.status.STATUS,
-            },
-        },
+            "dispatch_id": result.dispatch_id,
+            "results_dir": result.results_dir,
+            "status": result.status.STATUS,
+        }
     )
-    try:
-        # ignore response
-        timeout = aiohttp.ClientTimeout(total=1)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(
-                get_ui_url(ui_server.WEBHOOK_PATH), json=json.loads(result_update)
-            ) as resp:
-                status = resp.status
-                text = await resp.text()
-                app_log.debug(f"send_update received response {status}, {text}")
-    except Exception as ex:
-        # catch all requests-related exceptions
-        app_log.debug(f"Unable to send result update to UI server: {ex}")
 
 
 def send_draw_request(lattice) -> None:
@@ -23,7 +23,9 @@ Tests for the core functionality of the dispatcher.
 """
 
 
-from unittest.mock import AsyncMock, MagicMock
+import hashlib
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
 
@@ -31,28 +33,42 @@ import covalent as ct
 from covalent._results_manager import Result
 from covalent._shared_files.defaults import sublattice_prefix
 from covalent._shared_files.util_classes import RESULT_STATUS
-from covalent._workflow.lattice import Lattice
+from covalent._workflow.lattice import Lattice, SublatticePayload
+from covalent._workflow.transportable_object import TransportableObject
 from covalent_dispatcher._core.data_manager import (
+    _background_tasks,
     _dispatch_status_queues,
+    _find_resumable_dispatches,
     _get_result_object_from_new_lattice,
     _get_result_object_from_old_result,
     _handle_built_sublattice,
+    _load_resumed_result_object,
     _register_result_object,
     _registered_dispatches,
+    _sublattice_blobs,
     _update_parent_electron,
+    cache_output,
     finalize_dispatch,
     generate_node_result,
+    get_node_output,
     get_result_object,
     get_status_queue,
+    get_unique_id,
     initialize_result_object,
+    initialize_sublattice_result_object,
     make_derived_dispatch,
     make_dispatch,
     make_sublattice_dispatch,
     persist_result,
+    submit_node_result,
     update_node_result,
+    update_node_results,
     upsert_lattice_data,
+    wait_for_background_tasks,
 )
+from covalent_dispatcher._core.data_modules.shards import SHARD_ENV_VAR, shard_of
 from covalent_dispatcher._db.datastore import DataStore
+from covalent_dispatcher._db.write_result_to_db import StoredObjectRef
 
 TEST_RESULTS_DIR = "/tmp/results"
 
@@ -191,7 +207,8 @@ async def test_update_node_result(mocker, node_name, node_status, sub_dispatch_i
     status_queue = AsyncMock()
 
     result_object = get_mock_result()
-    mock_update_node = mocker.patch("covalent_dispatcher._db.update._node")
+    mock_apply_nodes = mocker.patch("covalent_dispatcher._db.update.apply_nodes")
+    mock_persist_nodes = mocker.patch("covalent_dispatcher._db.update.persist_nodes")
     mocker.patch(
         "covalent_dispatcher._core.data_manager.get_status_queue", return_value=status_queue
     )
@@ -208,7 +225,10 @@ async def test_update_node_result(mocker, node_name, node_status, sub_dispatch_i
     await update_node_result(result_object, node_result)
 
     status_queue.put.assert_awaited_with((0, node_status, detail))
-    mock_update_node.assert_called_with(result_object, **node_result)
+    mock_apply_nodes.assert_called_once_with(result_object, [node_result])
+    mock_persist_nodes.assert_called_once_with(
+        result_object, [node_result], mock_apply_nodes.return_value
+    )
 
     if (
         node_status == RESULT_STATUS.COMPLETED
@@ -227,9 +247,8 @@ async def test_update_node_result_handles_db_exceptions(mocker):
     status_queue = AsyncMock()
 
     result_object = get_mock_result()
-    mock_update_node = mocker.patch(
-        "covalent_dispatcher._db.update._node", side_effect=RuntimeError()
-    )
+    mocker.patch("covalent_dispatcher._db.update.apply_nodes")
+    mocker.patch("covalent_dispatcher._db.update.persist_nodes", side_effect=RuntimeError())
     mocker.patch(
         "covalent_dispatcher._core.data_manager.get_status_queue", return_value=status_queue
     )
@@ -244,6 +263,191 @@ async def test_update_node_result_handles_db_exceptions(mocker):
     status_queue.put.assert_awaited_with((0, RESULT_STATUS.FAILED, {}))
 
 
+@pytest.mark.asyncio
+async def test_update_node_results(mocker):
+    """Check that update_node_results persists a batch at once and notifies in order"""
+
+    status_queue = AsyncMock()
+
+    result_object = get_mock_result()
+    mock_apply_nodes = mocker.patch("covalent_dispatcher._db.update.apply_nodes")
+    mock_persist_nodes = mocker.patch("covalent_dispatcher._db.update.persist_nodes")
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.get_status_queue", return_value=status_queue
+    )
+    handle_built_sublattice_mock = mocker.patch(
+        "covalent_dispatcher._core.data_manager._handle_built_sublattice"
+    )
+
+    node_results = [
+        {
+            "node_id": i,
+            "node_name": "mock_node_name",
+            "status": RESULT_STATUS.COMPLETED,
+            "sub_dispatch_id": None,
+        }
+        for i in range(3)
+    ]
+    await update_node_results(result_object, node_results)
+
+    mock_apply_nodes.assert_called_once_with(result_object, node_results)
+    mock_persist_nodes.assert_called_once_with(
+        result_object, node_results, mock_apply_nodes.return_value
+    )
+    handle_built_sublattice_mock.assert_not_called()
+    assert status_queue.put.await_args_list == [
+        call((i, RESULT_STATUS.COMPLETED, {})) for i in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_node_results_tracks_outputs(mocker):
+    """Check that the persisted outputs of completed nodes are handed to the output store"""
+
+    result_object = get_mock_result()
+    mocker.patch("covalent_dispatcher._db.update.apply_nodes")
+    mocker.patch("covalent_dispatcher._db.update.persist_nodes")
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.get_status_queue", return_value=AsyncMock()
+    )
+    output_store = MagicMock()
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager._get_output_store", return_value=output_store
+    )
+
+    node_results = [
+        generate_node_result(0, "task", status=RESULT_STATUS.COMPLETED, output=MagicMock()),
+        generate_node_result(1, "task", status=RESULT_STATUS.COMPLETED),
+        generate_node_result(2, "task", status=RESULT_STATUS.RUNNING, output=MagicMock()),
+    ]
+    await update_node_results(result_object, node_results)
+    output_store.add.assert_called_once_with(result_object, 0)
+
+    assert await get_node_output(result_object, 0) is output_store.get.return_value
+    output_store.get.assert_called_once_with(result_object, 0)
+
+
+@pytest.mark.asyncio
+async def test_get_node_output_reloads_spilled_outputs(mocker):
+    """Check that spilled outputs are loaded by the persistence worker"""
+
+    result_object = get_mock_result()
+    ref = MagicMock(spec=StoredObjectRef)
+    output_store = MagicMock()
+    output_store.get.return_value = ref
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager._get_output_store", return_value=output_store
+    )
+    worker = MagicMock()
+    worker.run = AsyncMock(return_value="output")
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager._get_persistence_worker", return_value=worker
+    )
+
+    assert await get_node_output(result_object, 0) == "output"
+    worker.run.assert_awaited_once_with(None, ref.load)
+    output_store.reload.assert_called_once_with(result_object, 0, ref, "output")
+
+
+@pytest.mark.asyncio
+async def test_submit_node_result_batches_until_flushed(mocker):
+    """Check that submitted node results are flushed as one batch by a tracked task"""
+
+    result_object = get_mock_result()
+    mock_update = mocker.patch(
+        "covalent_dispatcher._core.data_manager.update_node_results", new_callable=AsyncMock
+    )
+    node_results = [
+        generate_node_result(0, "task", status=RESULT_STATUS.RUNNING),
+        generate_node_result(1, "task", status=RESULT_STATUS.RUNNING),
+    ]
+    for node_result in node_results:
+        await submit_node_result(result_object, node_result)
+
+    assert len(_background_tasks[result_object.dispatch_id]) == 1
+    await wait_for_background_tasks(result_object.dispatch_id)
+
+    mock_update.assert_awaited_once_with(result_object, node_results)
+    assert result_object.dispatch_id not in _background_tasks
+
+
+@pytest.mark.asyncio
+async def test_cache_output_is_tracked(mocker):
+    """Check that result cache writes are awaited with the dispatch's background tasks"""
+
+    result_cache = MagicMock()
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager._get_result_cache", return_value=result_cache
+    )
+    output = TransportableObject(1)
+
+    cache_output("mock_dispatch", "key", output)
+    assert len(_background_tasks["mock_dispatch"]) == 1
+    await wait_for_background_tasks("mock_dispatch")
+
+    result_cache.put.assert_called_once_with("key", output)
+    assert "mock_dispatch" not in _background_tasks
+
+
+@pytest.mark.asyncio
+async def test_background_task_exceptions_are_logged(mocker):
+    """Check that exceptions of background tasks are logged"""
+
+    result_object = get_mock_result()
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.update_node_results",
+        side_effect=RuntimeError("error"),
+    )
+    mock_log = mocker.patch("covalent_dispatcher._core.data_manager.app_log")
+
+    await submit_node_result(
+        result_object, generate_node_result(0, "task", status=RESULT_STATUS.RUNNING)
+    )
+    await wait_for_background_tasks(result_object.dispatch_id)
+
+    mock_log.error.assert_called_once()
+    assert result_object.dispatch_id not in _background_tasks
+
+
+@pytest.mark.asyncio
+async def test_update_node_results_handles_db_exceptions(mocker):
+    """Check that update_node_results marks the whole batch failed on write failures"""
+
+    status_queue = AsyncMock()
+
+    result_object = get_mock_result()
+    mocker.patch("covalent_dispatcher._db.update.apply_nodes")
+    mocker.patch("covalent_dispatcher._db.update.persist_nodes", side_effect=RuntimeError())
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.get_status_queue", return_value=status_queue
+    )
+    node_results = [
+        {
+            "node_id": i,
+            "node_name": "mock_node_name",
+            "status": RESULT_STATUS.COMPLETED,
+            "sub_dispatch_id": None,
+        }
+        for i in range(2)
+    ]
+    await update_node_results(result_object, node_results)
+
+    assert status_queue.put.await_args_list == [
+        call((i, RESULT_STATUS.FAILED, {})) for i in range(2)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_node_results_empty(mocker):
+    """Check that an empty batch doesn't touch the DB"""
+
+    mock_apply_nodes = mocker.patch("covalent_dispatcher._db.update.apply_nodes")
+    mock_persist_nodes = mocker.patch("covalent_dispatcher._db.update.persist_nodes")
+    await update_node_results(get_mock_result(), [])
+    mock_apply_nodes.assert_not_called()
+    mock_persist_nodes.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_make_dispatch(mocker):
     res = get_mock_result()
@@ -264,8 +468,8 @@ async def test_make_sublattice_dispatch(mocker):
     """Test the make sublattice dispatch method."""
 
     mock_result_object = get_mock_result()
-    output_mock = MagicMock()
-    mock_node_result = {"node_id": 0, "output": output_mock}
+    output = TransportableObject(mock_result_object.lattice.serialize_to_json())
+    mock_node_result = {"node_id": 0, "output": output}
     load_electron_record_mock = mocker.patch(
         "covalent_dispatcher._db.load.electron_record", return_value={"id": "mock-electron-id"}
     )
@@ -279,10 +483,85 @@ async def test_make_sublattice_dispatch(mocker):
         mock_result_object.dispatch_id, mock_node_result["node_id"]
     )
     make_dispatch_mock.assert_called_with(
-        output_mock.object_string, mock_result_object, "mock-electron-id"
+        output.object_string, mock_result_object, "mock-electron-id"
     )
 
 
+@pytest.mark.asyncio
+async def test_make_sublattice_dispatch_from_payload(mocker):
+    """Test making a sublattice dispatch from the binary sublattice payload."""
+
+    mock_result_object = get_mock_result()
+    sub_result_object = get_mock_result()
+    output = TransportableObject(SublatticePayload(mock_result_object.lattice))
+    mocker.patch(
+        "covalent_dispatcher._db.load.electron_record", return_value={"id": "mock-electron-id"}
+    )
+    make_dispatch_mock = mocker.patch("covalent_dispatcher._core.data_manager.make_dispatch")
+    init_mock = mocker.patch(
+        "covalent_dispatcher._core.data_manager.initialize_sublattice_result_object",
+        return_value=sub_result_object,
+    )
+    register_mock = mocker.patch("covalent_dispatcher._core.data_manager._register_result_object")
+
+    res = await make_sublattice_dispatch(mock_result_object, {"node_id": 0, "output": output})
+
+    assert res == sub_result_object.dispatch_id
+    make_dispatch_mock.assert_not_called()
+    payload, *args = init_mock.call_args.args
+    assert isinstance(payload, SublatticePayload)
+    assert args == [mock_result_object, "mock-electron-id"]
+    register_mock.assert_called_once_with(sub_result_object)
+
+
+def test_initialize_sublattice_result_object(mocker):
+    """Test that sibling sublattice dispatches share their serialized objects."""
+
+    @ct.electron
+    def task(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        return task(x)
+
+    workflow.build_graph(1)
+    payload = SublatticePayload.from_transportable(
+        TransportableObject(SublatticePayload(workflow))
+    )
+    mock_persist = mocker.patch("covalent_dispatcher._db.update.persist")
+
+    @ct.lattice
+    def parent_workflow(x):
+        return task(x)
+
+    parent_workflow.build_graph(1)
+    parent_result_object = Result(parent_workflow, "parent_dispatch")
+
+    sub_1 = initialize_sublattice_result_object(payload, parent_result_object, 5)
+    sub_2 = initialize_sublattice_result_object(payload, parent_result_object, 6)
+
+    mock_persist.assert_called_with(sub_2, electron_id=6)
+    assert sub_1._electron_id == 5
+    assert sub_1._root_dispatch_id == parent_result_object.dispatch_id
+    assert sub_1.dispatch_id != sub_2.dispatch_id
+    assert sub_1.lattice.workflow_function == workflow.workflow_function
+    assert list(sub_1.lattice.transport_graph._graph.nodes) == list(range(3))
+
+    tg_1 = sub_1.lattice.transport_graph
+    tg_2 = sub_2.lattice.transport_graph
+    assert tg_1.get_node_value(0, "function")._object is tg_2.get_node_value(0, "function")._object
+    assert sub_1.lattice.workflow_function._object is sub_2.lattice.workflow_function._object
+
+    # Objects identical to those of the parent dispatch are shared with it
+    parent_tg = parent_result_object.lattice.transport_graph
+    assert tg_1.get_node_value(0, "function")._object is (
+        parent_tg.get_node_value(0, "function")._object
+    )
+    blobs = _sublattice_blobs.pop(parent_result_object.dispatch_id)
+    assert all(digest == hashlib.sha256(blob).digest() for digest, blob in blobs.items())
+
+
 @pytest.mark.parametrize("reuse", [True, False])
 def test_get_result_object_from_new_lattice(mocker, reuse):
     """Test the get result object from new lattice json function."""
@@ -415,6 +694,92 @@ def test_make_derived_dispatch_from_old_result(mocker, reuse):
     assert mock_new_result.lattice.transport_graph.dirty_nodes == ["mock-nodes"]
 
 
+def test_get_unique_id_in_shard(monkeypatch):
+    """
+    Test that the dispatch IDs made by a dispatcher shard are owned by the shard
+    """
+    monkeypatch.setenv(SHARD_ENV_VAR, "2/4")
+    assert all(shard_of(get_unique_id(), 4) == 2 for _ in range(20))
+
+
+def test_find_resumable_dispatches(mocker, monkeypatch):
+    """
+    Test that running dispatches are resumed parents first, and sublattice
+    dispatches only along with their parents
+    """
+    monkeypatch.delenv(SHARD_ENV_VAR, raising=False)
+    mocker.patch("covalent_dispatcher._core.data_manager.get_journal")
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.load.running_dispatches",
+        return_value=[
+            {"dispatch_id": "sub_sub", "electron_id": 2},
+            {"dispatch_id": "sub", "electron_id": 1},
+            {"dispatch_id": "root", "electron_id": None},
+            {"dispatch_id": "orphan_sub", "electron_id": 3},
+        ],
+    )
+    parents = {1: ("root", 0), 2: ("sub", 0), 3: ("finished_root", 0)}
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.resolve_electron_id",
+        side_effect=lambda eid: parents[eid],
+    )
+
+    records = _find_resumable_dispatches()
+
+    assert [(r["dispatch_id"], r["parent_dispatch_id"]) for r in records] == [
+        ("root", None),
+        ("sub", "root"),
+        ("sub_sub", "sub"),
+    ]
+
+
+def test_load_resumed_result_object(mocker):
+    """
+    Test that the node states of a resumed dispatch are restored from the DB
+    """
+    result_object = get_mock_result()
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.load.get_result_object_from_storage",
+        return_value=result_object,
+    )
+    started_at = datetime(2023, 1, 1)
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.load.electron_states",
+        return_value=[
+            {
+                "node_id": 0,
+                "electron_id": 1,
+                "status": RESULT_STATUS.COMPLETED,
+                "started_at": started_at,
+                "completed_at": started_at,
+                "storage_path": "/tmp/node_0",
+                "results_filename": "results.pkl",
+            },
+            {
+                "node_id": 2,
+                "electron_id": 2,
+                "status": RESULT_STATUS.DISPATCHING_SUBLATTICE,
+                "started_at": started_at,
+                "completed_at": None,
+                "storage_path": "/tmp/node_2",
+                "results_filename": "results.pkl",
+            },
+        ],
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.load.sublattice_dispatch_id",
+        return_value="sub_dispatch",
+    )
+
+    assert _load_resumed_result_object(result_object.dispatch_id) is result_object
+
+    tg = result_object.lattice.transport_graph
+    assert tg.get_node_value(0, "status") == RESULT_STATUS.COMPLETED
+    assert tg.get_node_value(0, "start_time") == started_at.replace(tzinfo=timezone.utc)
+    assert isinstance(tg.get_node_value(0, "output"), StoredObjectRef)
+    assert tg.get_node_value(2, "sub_dispatch_id") == "sub_dispatch"
+
+
 def test_get_result_object(mocker):
     """
     Test get result object
@@ -474,10 +839,15 @@ async def test_persist_result(mocker):
         "covalent_dispatcher._core.data_manager._update_parent_electron"
     )
     mock_persist = mocker.patch("covalent_dispatcher._core.data_manager.update.persist")
+    result_object.lattice.transport_graph.dirty_nodes[:] = [0, 1]
 
     await persist_result(result_object.dispatch_id)
     mock_update_parent.assert_awaited_with(result_object)
-    mock_persist.assert_called_with(result_object)
+    mock_persist.assert_called_once()
+    args, kwargs = mock_persist.call_args
+    assert args == (result_object,)
+    assert [record["node_id"] for record in kwargs["node_records"]] == [0, 1]
+    assert result_object.lattice.transport_graph.dirty_nodes == []
 
 
 @pytest.mark.parametrize(
@@ -530,7 +900,8 @@ async def test_update_parent_electron(mocker, sub_status, mapped_status):
     mock_update_node.assert_awaited_with(parent_result_obj, mock_node_result)
 
 
-def test_upsert_lattice_data(mocker):
+@pytest.mark.asyncio
+async def test_upsert_lattice_data(mocker):
     """
     Test updating lattice data in database
     """
@@ -539,5 +910,46 @@ def test_upsert_lattice_data(mocker):
         "covalent_dispatcher._core.data_manager.get_result_object", return_value=result_object
     )
     mock_upsert_lattice = mocker.patch("covalent_dispatcher._db.upsert.lattice_data")
-    upsert_lattice_data(result_object.dispatch_id)
+    await upsert_lattice_data(result_object.dispatch_id)
     mock_upsert_lattice.assert_called_with(result_object)
+
+
+@pytest.mark.asyncio
+async def test_update_node_result_persists_in_worker_thread(mocker):
+    """
+    Test that node results are applied on the event loop thread and
+    persisted outside of it
+    """
+    import asyncio
+    import threading
+
+    result_object = get_mock_result()
+    threads = {}
+
+    def mock_apply_nodes(*args):
+        threads["apply"] = threading.get_ident()
+
+    def mock_persist_nodes(*args):
+        threads["persist"] = threading.get_ident()
+
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.update.apply_nodes", side_effect=mock_apply_nodes
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.update.persist_nodes",
+        side_effect=mock_persist_nodes,
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.data_manager.get_status_queue", return_value=asyncio.Queue()
+    )
+
+    node_result = {
+        "node_id": 0,
+        "node_name": "task",
+        "status": RESULT_STATUS.COMPLETED,
+        "sub_dispatch_id": None,
+    }
+    await update_node_result(result_object, node_result)
+
+    assert threads["apply"] == threading.get_ident()
+    assert threads["persist"] != threading.get_ident()
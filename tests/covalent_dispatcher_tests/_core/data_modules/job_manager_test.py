@@ -18,20 +18,37 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
-from functools import partial
-
 import pytest
 
+from covalent_dispatcher._core.data_modules import job_manager
 from covalent_dispatcher._core.data_modules.job_manager import (
+    forget_dispatch,
     get_jobs_metadata,
     set_cancel_requested,
     set_cancel_result,
     set_job_handle,
 )
 
+MODULE = "covalent_dispatcher._core.data_modules.job_manager"
+
+
+def get_dispatch_job_records(dispatch_id):
+    return {
+        task_id: {
+            "job_id": task_id + 1,
+            "cancel_requested": False,
+            "cancel_successful": False,
+            "job_handle": "null",
+        }
+        for task_id in [0, 1]
+    }
 
-def to_job_ids(dispatch_id, task_ids, task_job_map):
-    return list(map(lambda x: task_job_map[x], task_ids))
+
+@pytest.fixture(autouse=True)
+def clear_job_records():
+    job_manager._job_records.clear()
+    yield
+    job_manager._job_records.clear()
 
 
 @pytest.mark.asyncio
@@ -39,35 +56,85 @@ async def test_get_jobs_metadata(mocker):
     """
     Test retrieving jobs metadata
     """
-    task_ids = [0, 1]
-    task_job_map = {0: 1, 1: 2}
-    mock_to_job_ids = partial(to_job_ids, task_job_map=task_job_map)
-    job_ids = mock_to_job_ids("dispatch", task_ids)
-    mocker.patch("covalent_dispatcher._core.data_modules.job_manager.to_job_ids", mock_to_job_ids)
-    mock_get = mocker.patch("covalent_dispatcher._core.data_modules.job_manager.get_job_records")
+    mock_get = mocker.patch(
+        f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records
+    )
 
-    await get_jobs_metadata("dispatch", task_ids)
+    records = await get_jobs_metadata("dispatch", [1, 0])
+    assert [record["job_id"] for record in records] == [2, 1]
 
-    mock_get.assert_called_with(job_ids)
+    # Later lookups are served from the registry
+    records = await get_jobs_metadata("dispatch", [0])
+    assert records[0]["job_id"] == 1
+    mock_get.assert_called_once_with("dispatch")
+
+    # Returned records are copies
+    records[0]["cancel_requested"] = True
+    assert (await get_jobs_metadata("dispatch", [0]))[0]["cancel_requested"] is False
 
 
 @pytest.mark.asyncio
-async def test_set_cancel_requested_private(mocker):
+async def test_get_jobs_metadata_reloads_unknown_tasks(mocker):
     """
-    Test the private get cancel requested module method
+    Test that the registry is reloaded when a task isn't registered
     """
-    mock_to_job_ids = mocker.patch(
-        "covalent_dispatcher._core.data_modules.job_manager.to_job_ids", return_value=[0, 1]
+    mock_get = mocker.patch(
+        f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records
     )
+    job_manager._job_records["dispatch"] = {}
+
+    records = await get_jobs_metadata("dispatch", [0])
+    assert records[0]["job_id"] == 1
+    mock_get.assert_called_once_with("dispatch")
+
 
-    mock_set_cancel_request_private = mocker.patch(
-        "covalent_dispatcher._core.data_modules.job_manager._set_cancel_requested"
+@pytest.mark.asyncio
+async def test_get_jobs_metadata_caches_missing_tasks(mocker):
+    """
+    Test that tasks without a job don't reload the registry every time
+    """
+    mock_get = mocker.patch(
+        f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records
     )
 
-    await set_cancel_requested("dispatch", [0, 1])
+    mock_warning = mocker.patch(f"{MODULE}.app_log.warning")
+
+    assert await get_jobs_metadata("dispatch", [5]) == []
+    assert await get_jobs_metadata("dispatch", [5]) == []
+    records = await get_jobs_metadata("dispatch", [0, 5])
+    assert [record["job_id"] for record in records] == [1]
+    mock_get.assert_called_once_with("dispatch")
+    assert mock_warning.call_count == 3
+
+    with pytest.raises(KeyError):
+        await set_job_handle("dispatch", 5, "handle")
+
+
+@pytest.mark.asyncio
+async def test_get_jobs_metadata_invalid_dispatch(mocker):
+    """
+    Test that looking up the jobs of an unknown dispatch raises a KeyError
+    """
+    mocker.patch(f"{MODULE}.get_dispatch_job_records", return_value={})
 
-    mock_to_job_ids.assert_called_once_with("dispatch", [0, 1])
-    mock_set_cancel_request_private.assert_called_once_with([0, 1])
+    with pytest.raises(KeyError):
+        await get_jobs_metadata("dispatch", [0])
+    assert "dispatch" not in job_manager._job_records
+
+
+@pytest.mark.asyncio
+async def test_forget_dispatch(mocker):
+    """
+    Test that forgetting a dispatch drops its registered records
+    """
+    mock_get = mocker.patch(
+        f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records
+    )
+    await get_jobs_metadata("dispatch", [0])
+    forget_dispatch("dispatch")
+    forget_dispatch("dispatch")
+    await get_jobs_metadata("dispatch", [0])
+    assert mock_get.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -75,33 +142,43 @@ async def test_set_cancel_requested(mocker):
     """
     Test set cancel requested
     """
-    mocker.patch(
-        "covalent_dispatcher._core.data_modules.job_manager.to_job_ids", return_value=[0, 1]
-    )
-    mock_update = mocker.patch(
-        "covalent_dispatcher._core.data_modules.job_manager.update_job_records"
-    )
+    mocker.patch(f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records)
+    mock_update = mocker.patch(f"{MODULE}.update_job_records")
 
     await set_cancel_requested("dispatch", [0, 1])
-    expected_args = [{"job_id": job_id, "cancel_requested": True} for job_id in [0, 1]]
+    expected_args = [{"job_id": job_id, "cancel_requested": True} for job_id in [1, 2]]
     mock_update.assert_called_with(expected_args)
 
+    records = await get_jobs_metadata("dispatch", [0, 1])
+    assert all(record["cancel_requested"] for record in records)
+
+
+@pytest.mark.asyncio
+async def test_set_cancel_requested_db_failure(mocker):
+    """
+    Test that the registry is unchanged if writing to the database fails
+    """
+    mocker.patch(f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records)
+    mocker.patch(f"{MODULE}.update_job_records", side_effect=RuntimeError("db error"))
+
+    with pytest.raises(RuntimeError):
+        await set_cancel_requested("dispatch", [0])
+
+    records = await get_jobs_metadata("dispatch", [0])
+    assert records[0]["cancel_requested"] is False
+
 
 @pytest.mark.asyncio
 async def test_set_job_handle(mocker):
     """
     Test set job handle method
     """
-    task_job_map = {0: 1, 1: 2}
-    mock_to_job_ids = partial(to_job_ids, task_job_map=task_job_map)
-    mocker.patch("covalent_dispatcher._core.data_modules.job_manager.to_job_ids", mock_to_job_ids)
-
-    mock_update = mocker.patch(
-        "covalent_dispatcher._core.data_modules.job_manager.update_job_records"
-    )
+    mocker.patch(f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records)
+    mock_update = mocker.patch(f"{MODULE}.update_job_records")
 
     await set_job_handle(dispatch_id="dispatch", task_id=0, job_handle="12356")
     mock_update.assert_called_with([{"job_id": 1, "job_handle": "12356"}])
+    assert (await get_jobs_metadata("dispatch", [0]))[0]["job_handle"] == "12356"
 
 
 @pytest.mark.asyncio
@@ -110,10 +187,7 @@ async def test_set_cancel_result(cancel_requested, mocker):
     """
     Test requesting a task to be cancelled
     """
-    mock_to_job_ids = partial(to_job_ids, task_job_map={0: 1, 1: 2})
-    mocker.patch("covalent_dispatcher._core.data_modules.job_manager.to_job_ids", mock_to_job_ids)
-    mock_update = mocker.patch(
-        "covalent_dispatcher._core.data_modules.job_manager.update_job_records"
-    )
+    mocker.patch(f"{MODULE}.get_dispatch_job_records", side_effect=get_dispatch_job_records)
+    mock_update = mocker.patch(f"{MODULE}.update_job_records")
     await set_cancel_result("dispatch", 0, cancel_status=cancel_requested)
     mock_update.assert_called_with([{"job_id": 1, "cancel_successful": cancel_requested}])
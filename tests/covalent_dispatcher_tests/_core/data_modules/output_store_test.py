@@ -0,0 +1,164 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the output store"""
+
+import pytest
+
+import covalent as ct
+from covalent._results_manager.result import Result
+from covalent._workflow.lattice import Lattice as LatticeClass
+from covalent._workflow.transportable_object import TransportableObject
+from covalent_dispatcher._core.data_modules.output_store import OutputStore
+from covalent_dispatcher._db.upsert import ELECTRON_RESULTS_FILENAME
+from covalent_dispatcher._db.write_result_to_db import StoredObjectRef, store_file
+
+
+@pytest.fixture
+def result(mocker, tmp_path):
+    """Result object of a dispatch whose nodes have persisted outputs."""
+    mocker.patch(
+        "covalent_dispatcher._core.data_modules.output_store.get_node_storage_path",
+        side_effect=lambda dispatch_id, node_id: tmp_path / f"node_{node_id}",
+    )
+
+    @ct.electron
+    def task(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        return task(task(task(x)))
+
+    workflow.build_graph(x=1)
+    received_lattice = LatticeClass.deserialize_from_json(workflow.serialize_to_json())
+    result = Result(received_lattice, dispatch_id="output_store_dispatch")
+    result._initialize_nodes()
+
+    tg = result.lattice.transport_graph
+    for node_id in tg._graph.nodes:
+        output = TransportableObject(f"output {node_id}")
+        tg.set_node_value(node_id, "output", output)
+        (tmp_path / f"node_{node_id}").mkdir()
+        store_file(tmp_path / f"node_{node_id}", ELECTRON_RESULTS_FILENAME, output)
+    return result
+
+
+def _size(result):
+    """Size of a node output; the outputs of all nodes have the same size."""
+    return result.lattice.transport_graph.get_node_value(0, "output").size
+
+
+def test_outputs_are_spilled_over_budget(result):
+    """The least recently used outputs are replaced by references over the budget."""
+    tg = result.lattice.transport_graph
+    expected = tg.get_node_value(0, "output")
+    store = OutputStore(2 * _size(result))
+
+    for node_id in range(3):
+        store.add(result, node_id)
+
+    spilled = tg.get_node_value(0, "output")
+    assert isinstance(spilled, StoredObjectRef)
+    assert spilled.size == expected.size
+    assert spilled.load() == expected
+    assert isinstance(tg.get_node_value(1, "output"), TransportableObject)
+    assert isinstance(tg.get_node_value(2, "output"), TransportableObject)
+    assert store.resident_size == 2 * _size(result)
+
+
+def test_spilled_outputs_are_loaded_back(result):
+    """Reloading a spilled output puts it back and spills the least recently used one."""
+    tg = result.lattice.transport_graph
+    expected = tg.get_node_value(0, "output")
+    store = OutputStore(2 * _size(result))
+
+    for node_id in range(3):
+        store.add(result, node_id)
+
+    tg.dirty_nodes.clear()
+    ref = store.get(result, 0)
+    assert isinstance(ref, StoredObjectRef)
+    store.reload(result, 0, ref, ref.load())
+    assert tg.get_node_value(0, "output") == expected
+    assert tg.dirty_nodes == []
+    assert isinstance(tg.get_node_value(1, "output"), StoredObjectRef)
+
+    # Recently read outputs are spilled last
+    store.get(result, 2)
+    ref = store.get(result, 1)
+    store.reload(result, 1, ref, ref.load())
+    assert isinstance(tg.get_node_value(0, "output"), StoredObjectRef)
+    assert isinstance(tg.get_node_value(1, "output"), TransportableObject)
+    assert isinstance(tg.get_node_value(2, "output"), TransportableObject)
+
+
+def test_stale_reloads_are_ignored(result):
+    """A reloaded output doesn't replace an output updated in the meantime."""
+    tg = result.lattice.transport_graph
+    store = OutputStore(_size(result))
+
+    store.add(result, 0)
+    store.add(result, 1)
+    ref = store.get(result, 0)
+    new_output = TransportableObject("new")
+    tg.set_node_value(0, "output", new_output)
+    store.reload(result, 0, ref, ref.load())
+
+    assert tg.get_node_value(0, "output") is new_output
+
+
+def test_pending_outputs_are_not_spilled(result):
+    """Outputs which haven't been written yet stay in memory."""
+    tg = result.lattice.transport_graph
+    store = OutputStore(1, is_pending=lambda dispatch_id, node_id: node_id == 0)
+
+    store.add(result, 0)
+    store.add(result, 1)
+
+    assert isinstance(tg.get_node_value(0, "output"), TransportableObject)
+    assert isinstance(tg.get_node_value(1, "output"), StoredObjectRef)
+
+
+def test_replaced_outputs_are_not_spilled(result):
+    """An output updated after it was tracked isn't replaced by a stale reference."""
+    tg = result.lattice.transport_graph
+    store = OutputStore(_size(result))
+
+    store.add(result, 0)
+    new_output = TransportableObject("new")
+    tg.set_node_value(0, "output", new_output)
+    store.add(result, 1)
+
+    assert tg.get_node_value(0, "output") is new_output
+
+
+def test_zero_budget_and_forget(result):
+    """Nothing is tracked without a budget, and forgotten dispatches are untracked."""
+    store = OutputStore(0)
+    store.add(result, 0)
+    assert store.resident_size == 0
+
+    store = OutputStore(10**6)
+    for node_id in range(3):
+        store.add(result, node_id)
+    store.forget("output_store_dispatch")
+    assert store.resident_size == 0
+    assert store._resident == {}
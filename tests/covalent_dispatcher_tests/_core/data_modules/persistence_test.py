@@ -0,0 +1,87 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the persistence worker"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from covalent_dispatcher._core.data_modules.persistence import PersistenceWorker
+
+
+@pytest.mark.asyncio
+async def test_calls_for_a_dispatch_run_in_order():
+    """Calls for the same dispatch run one at a time in submission order."""
+
+    worker = PersistenceWorker(4)
+    calls = []
+
+    def write(i):
+        # Earlier calls take longer so that reordering would show
+        time.sleep(0.001 * (5 - i))
+        calls.append(i)
+
+    await asyncio.gather(*(worker.run("dispatch", write, i) for i in range(5)))
+    worker.shutdown()
+
+    assert calls == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_dispatches_are_persisted_in_parallel():
+    """A slow write for one dispatch doesn't block the others."""
+
+    worker = PersistenceWorker(2)
+    lane_0 = worker._get_lane("a")
+    other = next(d for d in map(str, range(100)) if worker._get_lane(d) is not lane_0)
+    release = threading.Event()
+
+    slow_write = asyncio.ensure_future(worker.run("a", release.wait, 5))
+    assert await worker.run(other, lambda: "done") == "done"
+    assert not slow_write.done()
+
+    release.set()
+    assert await slow_write is True
+    worker.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_raised_in_caller():
+    """Exceptions raised in the worker thread propagate to the caller."""
+
+    worker = PersistenceWorker(1)
+
+    def fail():
+        raise RuntimeError("DB error")
+
+    with pytest.raises(RuntimeError, match="DB error"):
+        await worker.run("dispatch", fail)
+    worker.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_no_lanes_runs_inline():
+    """Without lanes, calls run synchronously in the event loop thread."""
+
+    worker = PersistenceWorker(0)
+    assert await worker.run(None, threading.get_ident) == threading.get_ident()
@@ -0,0 +1,131 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the result cache"""
+
+import inspect
+import os
+
+from covalent._data_store import ObjectRef
+from covalent._workflow.transportable_object import TransportableObject
+from covalent_dispatcher._core.data_modules.result_cache import ResultCache, get_cache_key
+
+
+def _square(x):
+    return x * x
+
+
+def _cube(x):
+    return x * x * x
+
+
+METADATA = {"executor": "local", "deps": {}, "call_before": [], "call_after": []}
+
+
+def _key(function=_square, function_string=None, metadata=METADATA, args=(2,), kwargs=None):
+    return get_cache_key(
+        TransportableObject(function),
+        inspect.getsource(function) if function_string is None else function_string,
+        metadata,
+        [TransportableObject(arg) for arg in args],
+        {k: TransportableObject(v) for k, v in (kwargs or {}).items()},
+    )
+
+
+def test_get_cache_key():
+    """Keys depend on the function, deps and inputs but not on the executor."""
+
+    key = _key()
+    assert key == _key()
+    assert key == _key(metadata={**METADATA, "executor": "dask"})
+    assert key != _key(function=_cube)
+    assert key != _key(args=(3,))
+    assert key != _key(args=(), kwargs={"x": 2})
+    assert key != _key(metadata={**METADATA, "deps": {"bash": {"commands": ["ls"]}}})
+
+
+def test_get_cache_key_function_source():
+    """Functions pickled by reference are told apart by their source."""
+
+    # os.path.join is pickled by reference, so only its name is serialized
+    key = _key(function=os.path.join, function_string="def join(a, *p):\n    ...\n")
+    assert key != _key(function=os.path.join, function_string="def join(a, *p):\n    pass\n")
+
+
+def test_get_cache_key_input_by_reference():
+    """Tasks with inputs passed by reference aren't cached."""
+
+    ref = ObjectRef("/tmp", "bucket", "object")
+    assert get_cache_key(TransportableObject(_square), "", METADATA, [ref], {}) is None
+
+
+def test_result_cache_put_get(tmp_path):
+    """Stored outputs are found by their key, also by a new cache instance."""
+
+    cache = ResultCache(str(tmp_path), 10**6)
+    output = TransportableObject(4)
+
+    assert cache.get("abcd") is None
+    cache.put("abcd", output)
+    assert cache.get("abcd").get_deserialized() == 4
+    assert cache.size == len(output.serialize())
+
+    reloaded = ResultCache(str(tmp_path), 10**6)
+    assert reloaded.get("abcd").get_deserialized() == 4
+    assert reloaded.size == cache.size
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    """Outputs are evicted in least recently used order once over the size limit."""
+
+    size = len(TransportableObject(0).serialize())
+    cache = ResultCache(str(tmp_path), 2 * size)
+
+    cache.put("aa", TransportableObject(0))
+    cache.put("bb", TransportableObject(1))
+    cache.get("aa")
+    cache.put("cc", TransportableObject(2))
+
+    assert cache.get("bb") is None
+    assert not (tmp_path / "bb" / "bb").exists()
+    assert cache.get("aa").get_deserialized() == 0
+    assert cache.get("cc").get_deserialized() == 2
+    assert cache.size == 2 * size
+
+
+def test_result_cache_skips_large_outputs(tmp_path):
+    """Outputs larger than the cache aren't stored."""
+
+    cache = ResultCache(str(tmp_path), 10)
+    cache.put("abcd", TransportableObject("x" * 100))
+
+    assert cache.get("abcd") is None
+    assert cache.size == 0
+
+
+def test_result_cache_missing_file(tmp_path):
+    """Outputs removed by another process are treated as misses."""
+
+    cache = ResultCache(str(tmp_path), 10**6)
+    cache.put("abcd", TransportableObject(4))
+    os.remove(tmp_path / "ab" / "abcd")
+
+    assert cache.get("abcd") is None
+    assert cache.size == 0
@@ -0,0 +1,62 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+Tests for the assignment of dispatches to dispatcher shards
+"""
+
+import uuid
+
+from covalent_dispatcher._core.data_modules.shards import (
+    SHARD_ENV_VAR,
+    get_local_shard,
+    is_local,
+    shard_of,
+)
+
+
+def test_shard_of_is_stable():
+    dispatch_ids = [str(uuid.uuid4()) for _ in range(100)]
+    shards = [shard_of(dispatch_id, 4) for dispatch_id in dispatch_ids]
+
+    assert shards == [shard_of(dispatch_id, 4) for dispatch_id in dispatch_ids]
+    assert set(shards) == {0, 1, 2, 3}
+
+
+def test_get_local_shard(monkeypatch):
+    monkeypatch.delenv(SHARD_ENV_VAR, raising=False)
+    assert get_local_shard() is None
+
+    monkeypatch.setenv(SHARD_ENV_VAR, "1/4")
+    assert get_local_shard() == (1, 4)
+
+
+def test_is_local(monkeypatch):
+    dispatch_id = str(uuid.uuid4())
+
+    monkeypatch.delenv(SHARD_ENV_VAR, raising=False)
+    assert is_local(dispatch_id)
+
+    index = shard_of(dispatch_id, 4)
+    monkeypatch.setenv(SHARD_ENV_VAR, f"{index}/4")
+    assert is_local(dispatch_id)
+
+    monkeypatch.setenv(SHARD_ENV_VAR, f"{(index + 1) % 4}/4")
+    assert not is_local(dispatch_id)
@@ -0,0 +1,110 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the transport graph dependency index"""
+
+import covalent as ct
+from covalent._results_manager import Result
+from covalent._workflow.lattice import Lattice
+from covalent_dispatcher._core.dispatcher import _get_abstract_task_inputs
+from covalent_dispatcher._core.dispatcher_modules.dependency_index import DependencyIndex
+
+
+def get_result_object() -> Result:
+    """Workflow with positional, keyword, collection and wait_for edges."""
+
+    @ct.electron
+    def identity(x):
+        return x
+
+    @ct.electron
+    def multivariable_task(x, y, z=0):
+        return x, y, z
+
+    @ct.electron
+    def list_task(arg):
+        return len(arg)
+
+    @ct.lattice
+    def workflow(x, y):
+        electron_x = identity(x)
+        electron_y = identity(y)
+        res_1 = multivariable_task(electron_y, electron_x, z=electron_x)
+        res_2 = multivariable_task(electron_x, electron_x)
+        res_3 = list_task([electron_x, electron_y])
+        ct.wait(res_3, [res_1, res_2])
+        return res_3
+
+    workflow.build_graph(1, 2)
+    received_lattice = Lattice.deserialize_from_json(workflow.serialize_to_json())
+    return Result(lattice=received_lattice, dispatch_id="asdf")
+
+
+def test_abstract_task_inputs_match_graph():
+    """The index resolves the same inputs as the transport graph walk."""
+
+    result_object = get_result_object()
+    tg = result_object.lattice.transport_graph
+    dep_index = DependencyIndex(tg._graph)
+
+    for node_id in tg._graph.nodes:
+        expected = _get_abstract_task_inputs(
+            node_id, tg.get_node_value(node_id, "name"), result_object
+        )
+        assert dep_index.get_abstract_task_inputs(node_id) == expected
+
+
+def test_children_and_in_degree():
+    """Children are listed once per edge and in-degrees count every edge."""
+
+    result_object = get_result_object()
+    g = result_object.lattice.transport_graph._graph
+    dep_index = DependencyIndex(g)
+
+    assert dep_index.num_nodes == len(g.nodes)
+    assert dep_index.get_pending_parents() == dict(g.in_degree())
+    assert dep_index.get_ready_nodes() == [n for n, d in g.in_degree() if d == 0]
+
+    for node_id in g.nodes:
+        expected_children = [child for child, edges in g.adj[node_id].items() for _ in edges]
+        assert list(dep_index.get_children(node_id)) == expected_children
+
+
+def test_topological_order():
+    """Every node comes after its parents."""
+
+    result_object = get_result_object()
+    g = result_object.lattice.transport_graph._graph
+    order = DependencyIndex(g).get_topological_order()
+
+    assert sorted(order) == sorted(g.nodes)
+    position = {node_id: i for i, node_id in enumerate(order)}
+    assert all(position[parent] < position[child] for parent, child, _ in g.edges)
+
+
+def test_empty_graph():
+    """An empty graph yields an empty index."""
+
+    dep_index = DependencyIndex(ct.lattice(lambda: None).transport_graph._graph)
+
+    assert dep_index.num_nodes == 0
+    assert dep_index.get_ready_nodes() == []
+    assert dep_index.get_pending_parents() == {}
+    assert dep_index.get_topological_order() == []
@@ -0,0 +1,74 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the inline evaluation of structural nodes"""
+
+import networkx as nx
+import pytest
+
+from covalent._data_store import ObjectRef
+from covalent._workflow.transportable_object import TransportableObject
+from covalent_dispatcher._core.dispatcher_modules.inline import InlineEvaluator, is_structural_node
+
+
+@pytest.mark.parametrize(
+    "node_name,expected",
+    [
+        (":electron_list:", True),
+        (":electron_dict:", True),
+        (":task.__getitem__", True),
+        (":task.__getattr__", True),
+        (":task()[1]", True),
+        (":subscripted:task", True),
+        (":parameter:[1]", False),
+        (":sublattice:workflow", False),
+        (":postprocess:", False),
+        ("task", False),
+    ],
+)
+def test_is_structural_node(node_name, expected):
+    """Test recognizing structural nodes by their names."""
+    assert is_structural_node(node_name) == expected
+
+
+@pytest.mark.asyncio
+async def test_inline_evaluator():
+    """Test which structural nodes are evaluated inline and with which inputs."""
+
+    g = nx.MultiDiGraph()
+    g.add_node(0, name="task", metadata={})
+    g.add_node(1, name=":task.__getitem__", metadata={"deps": {}, "call_before": []})
+    g.add_node(2, name=":task.__getattr__", metadata={"deps": {"bash": {"commands": ["ls"]}}})
+    g.add_node(3, name=":electron_list:", metadata={"call_after": [{"short_name": "call"}]})
+    evaluator = InlineEvaluator(g, max_input_size=1000)
+
+    assert evaluator.node_ids == {1}
+
+    args = [TransportableObject([1, 2]), TransportableObject(0)]
+    assert evaluator.accepts(1, args, {})
+    assert not evaluator.accepts(0, args, {})
+    assert not evaluator.accepts(1, [TransportableObject("x" * 1000), args[1]], {})
+    assert not evaluator.accepts(1, [ObjectRef("/tmp", "dispatch", "node_0.pkl"), args[1]], {})
+
+    def get_item(e, key):
+        return e[key]
+
+    output = await evaluator.evaluate(TransportableObject(get_item), args, {})
+    assert output.get_deserialized() == 1
@@ -0,0 +1,91 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for critical-path prioritization"""
+
+import networkx as nx
+import pytest
+
+from covalent._shared_files.defaults import parameter_prefix
+from covalent_dispatcher._core.dispatcher_modules import planning
+from covalent_dispatcher._core.dispatcher_modules.dependency_index import DependencyIndex
+
+
+def get_dependency_index() -> DependencyIndex:
+    """Diamond 0 -> {1, 2} -> 3 with a separate node 4"""
+
+    g = nx.MultiDiGraph()
+    g.add_nodes_from(range(5))
+    for parent, child in [(0, 1), (0, 2), (1, 3), (2, 3)]:
+        g.add_edge(parent, child, edge_name="x", param_type="arg", arg_index=0)
+    return DependencyIndex(g)
+
+
+@pytest.fixture
+def runtime_history(mocker):
+    return mocker.patch.dict(planning._runtime_history, {}, clear=True)
+
+
+def test_compute_upward_ranks():
+    """Unit weights rank nodes by the number of nodes on the longest path."""
+
+    ranks = planning.compute_upward_ranks(get_dependency_index())
+    assert list(ranks) == [3.0, 2.0, 2.0, 1.0, 1.0]
+
+
+def test_compute_upward_ranks_weighted():
+    """The heavier branch determines the rank of its parent."""
+
+    ranks = planning.compute_upward_ranks(get_dependency_index(), [1.0, 1.0, 5.0, 2.0, 0.5])
+    assert list(ranks) == [8.0, 3.0, 7.0, 2.0, 0.5]
+
+
+def test_record_runtime(runtime_history):
+    """Runtimes are smoothed and parameters are ignored."""
+
+    planning.record_runtime("task", 2.0)
+    planning.record_runtime("task", 4.0)
+    planning.record_runtime(f"{parameter_prefix}1", 1.0)
+
+    assert runtime_history == {"task": 3.0}
+
+
+def test_record_runtime_evicts_least_recent(mocker, runtime_history):
+    """The runtime history is bounded and evicts the least recently recorded task."""
+
+    mocker.patch.object(planning, "RUNTIME_HISTORY_SIZE", 2)
+    planning.record_runtime("a", 1.0)
+    planning.record_runtime("b", 1.0)
+    planning.record_runtime("a", 1.0)
+    planning.record_runtime("c", 1.0)
+
+    assert list(runtime_history) == ["a", "c"]
+
+
+def test_get_node_weights(runtime_history):
+    """Unknown tasks are weighted by the average known runtime."""
+
+    assert planning.get_node_weights(["a", "b"]) == [1.0, 1.0]
+
+    planning.record_runtime("a", 2.0)
+    planning.record_runtime("b", 4.0)
+
+    assert planning.get_node_weights(["a", "b", "c"]) == [2.0, 4.0, 3.0]
+    assert planning.get_node_weights(["a", "b", "c"], use_history=False) == [1.0, 1.0, 1.0]
@@ -0,0 +1,117 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for packed task groups"""
+
+import networkx as nx
+
+from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent_dispatcher._core.dispatcher_modules.dependency_index import DependencyIndex
+from covalent_dispatcher._core.dispatcher_modules.task_groups import (
+    PackedTaskGroups,
+    find_packed_task_groups,
+)
+
+
+def get_graph(names, task_groups, edges, executors=None) -> nx.MultiDiGraph:
+    """Build a transport graph with the given node names, task groups and edges."""
+
+    g = nx.MultiDiGraph()
+    for node_id, name in enumerate(names):
+        executor = executors[node_id] if executors else "local"
+        g.add_node(
+            node_id,
+            name=name,
+            task_group_id=task_groups[node_id],
+            metadata={"executor": executor, "executor_data": {}},
+            status=RESULT_STATUS.NEW_OBJECT,
+        )
+    for arg_index, (parent, child) in enumerate(edges):
+        g.add_edge(parent, child, edge_name="arg", param_type="arg", arg_index=arg_index)
+    return g
+
+
+def test_find_packed_task_groups():
+    """Groups with several packable members are packed in topological order."""
+
+    # p -> a, a -> b, b -> c; a and b form group 1
+    g = get_graph(
+        [":parameter:1", "a", "b", "c"],
+        [0, 1, 1, 3],
+        [(0, 1), (1, 2), (2, 3)],
+    )
+
+    assert find_packed_task_groups(g, DependencyIndex(g)) == {1: [1, 2]}
+
+
+def test_find_packed_task_groups_skips_unpackable_groups():
+    """Groups mixing executors or containing parameters aren't packed."""
+
+    g = get_graph(
+        [":parameter:1", "a", "b", "c"],
+        [0, 0, 2, 2],
+        [(0, 1), (1, 2), (2, 3)],
+        executors=["local", "local", "local", "dask"],
+    )
+
+    assert find_packed_task_groups(g, DependencyIndex(g)) == {}
+
+
+def test_find_packed_task_groups_excludes_nodes():
+    """Excluded nodes are left out of their task groups."""
+
+    # a -> a[0] -> b -> c; a and a[0] form group 0, b and c form group 2
+    g = get_graph(["a", ":a.__getitem__", "b", "c"], [0, 0, 2, 2], [(0, 1), (1, 2), (2, 3)])
+
+    assert find_packed_task_groups(g, DependencyIndex(g), exclude={1}) == {2: [2, 3]}
+
+
+def test_find_packed_task_groups_skips_cycles():
+    """A group that a path leaves and re-enters can't run as one job."""
+
+    # a -> b -> c with a and c in group 0 and b outside it
+    g = get_graph(["a", "b", "c"], [0, 1, 0], [(0, 1), (1, 2)])
+
+    assert find_packed_task_groups(g, DependencyIndex(g)) == {}
+
+
+def test_packed_task_groups_readiness():
+    """Internal edges are ignored and a group is released once all members are ready."""
+
+    g = get_graph(
+        [":parameter:1", "a", "b", "c"],
+        [0, 1, 1, 3],
+        [(0, 1), (1, 2), (2, 3)],
+    )
+    dep_index = DependencyIndex(g)
+    task_groups = PackedTaskGroups(find_packed_task_groups(g, dep_index))
+
+    pending_parents = dep_index.get_pending_parents()
+    task_groups.exclude_internal_edges(pending_parents, dep_index)
+    assert pending_parents == {0: 0, 1: 1, 2: 0, 3: 1}
+
+    assert task_groups.get_group_id(3) is None
+    assert task_groups.is_internal_edge(1, 2)
+    assert not task_groups.is_internal_edge(2, 3)
+
+    assert task_groups.mark_ready(2) is None
+    assert task_groups.num_waiting == 1
+    assert task_groups.mark_ready(1) == [1, 2]
+    assert task_groups.num_waiting == 0
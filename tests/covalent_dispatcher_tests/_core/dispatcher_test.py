@@ -35,19 +35,28 @@ from covalent._results_manager import Result
 from covalent._shared_files.util_classes import RESULT_STATUS
 from covalent._workflow.lattice import Lattice
 from covalent_dispatcher._core.dispatcher import (
+    _dependency_indices,
     _get_abstract_task_inputs,
     _get_initial_tasks_and_deps,
+    _get_resumed_tasks_and_deps,
+    _get_status_updates,
     _handle_cancelled_node,
     _handle_completed_node,
     _handle_failed_node,
     _plan_workflow,
     _run_planned_workflow,
     _submit_task,
+    _submit_tasks,
     cancel_dispatch,
+    resume_dispatches,
     run_dispatch,
     run_workflow,
 )
+from covalent_dispatcher._core.dispatcher_modules.dependency_index import DependencyIndex
+from covalent_dispatcher._core.dispatcher_modules.inline import InlineEvaluator
+from covalent_dispatcher._core.dispatcher_modules.task_groups import PackedTaskGroups
 from covalent_dispatcher._db.datastore import DataStore
+from covalent_ui import result_webhook
 
 TEST_RESULTS_DIR = "/tmp/results"
 
@@ -86,7 +95,7 @@ def get_mock_result() -> Result:
     return result_object
 
 
-def test_plan_workflow():
+def test_plan_workflow(mocker):
     """Test workflow planning method."""
 
     @ct.electron
@@ -97,6 +106,13 @@ def test_plan_workflow():
     def workflow(x):
         return task(x)
 
+    mock_dep_indices = mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._dependency_indices", {}
+    )
+    mock_priorities = mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._task_priorities", {}
+    )
+
     workflow.metadata["schedule"] = True
     received_workflow = Lattice.deserialize_from_json(workflow.serialize_to_json())
     result_object = Result(received_workflow, "asdf")
@@ -106,6 +122,41 @@ def test_plan_workflow():
     updated_tg = pickle.loads(result_object.lattice.transport_graph.serialize(metadata_only=True))
 
     assert updated_tg["lattice_metadata"]["schedule"]
+    assert mock_dep_indices["asdf"].num_nodes == 0
+    assert len(mock_priorities["asdf"]) == 0
+
+
+def test_plan_workflow_prioritizes_critical_path(mocker):
+    """Test that planning ranks nodes by the longest path to an exit node."""
+
+    @ct.electron
+    def task(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        res = task(x)
+        for _ in range(3):
+            res = task(res)
+        return task(x)
+
+    mock_priorities = mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._task_priorities", {}
+    )
+    mocker.patch.dict("covalent_dispatcher._core.dispatcher._dependency_indices", {})
+    mocker.patch("covalent_dispatcher._core.dispatcher.get_config", return_value="false")
+
+    workflow.build_graph(1)
+    received_workflow = Lattice.deserialize_from_json(workflow.serialize_to_json())
+    result_object = Result(received_workflow, "asdf")
+    _plan_workflow(result_object=result_object)
+
+    # Chain 1 -> 0 -> 2 -> 3 -> 4 and 6 -> 5; every task is an input of the
+    # postprocessing node 7
+    tg = result_object.lattice.transport_graph
+    assert tg.get_node_value(1, "name").startswith(":parameter:")
+    assert tg.get_node_value(7, "name") == ":postprocess:"
+    assert list(mock_priorities["asdf"]) == [5.0, 6.0, 4.0, 3.0, 2.0, 2.0, 3.0, 1.0]
 
 
 def test_get_abstract_task_inputs():
@@ -224,6 +275,27 @@ async def test_handle_completed_node(mocker):
     assert pending_parents == {0: 0, 1: 0, 2: 1}
 
 
+@pytest.mark.asyncio
+async def test_handle_completed_node_with_dependency_index(mocker):
+    """Test that the completed node handler uses the frozen dependency index"""
+
+    result_object = get_mock_result()
+    g = result_object.lattice.transport_graph._graph
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._dependency_indices",
+        {result_object.dispatch_id: DependencyIndex(g)},
+    )
+    mock_adj = mocker.patch.object(type(g), "adj")
+
+    # tg edges are (1, 0), (0, 2)
+    pending_parents = {0: 1, 1: 0, 2: 1}
+    next_nodes = await _handle_completed_node(result_object, 1, pending_parents)
+
+    assert next_nodes == [0]
+    assert pending_parents == {0: 0, 1: 0, 2: 1}
+    mock_adj.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_handle_failed_node(mocker):
     """Unit test for failed node handler"""
@@ -236,6 +308,7 @@ async def test_handle_failed_node(mocker):
         "covalent_dispatcher._core.dispatcher.datasvc.upsert_lattice_data"
     )
     await _handle_failed_node(result_object, 1)
+    await result_webhook.close()
 
     mock_upsert_lattice.assert_called()
 
@@ -255,6 +328,7 @@ async def test_handle_cancelled_node(mocker):
     node_result = {"node_id": 1, "status": Result.CANCELLED}
 
     await _handle_cancelled_node(result_object, 1)
+    await result_webhook.close()
     assert result_object._task_cancelled is True
     mock_upsert_lattice.assert_called()
 
@@ -272,6 +346,101 @@ async def test_get_initial_tasks_and_deps(mocker):
     assert num_tasks == len(result_object.lattice.transport_graph._graph.nodes)
 
 
+def test_get_resumed_tasks_and_deps(mocker):
+    """Test that a resumed dispatch skips completed tasks and resumes running ones"""
+
+    result_object = get_mock_result()
+    result_object._initialize_nodes()
+    tg = result_object.lattice.transport_graph
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._dependency_indices",
+        {result_object.dispatch_id: DependencyIndex(tg._graph)},
+    )
+
+    # tg edges are (1, 0), (0, 2), (0, 3), (2, 3)
+    tg.set_node_value(1, "status", RESULT_STATUS.COMPLETED)
+    tg.set_node_value(0, "status", RESULT_STATUS.RUNNING)
+    (
+        num_tasks,
+        ready_nodes,
+        running_nodes,
+        num_waiting,
+        pending_parents,
+    ) = _get_resumed_tasks_and_deps(result_object, set())
+
+    assert num_tasks == len(tg._graph.nodes) - 1
+    assert ready_nodes == []
+    assert running_nodes == [0]
+    assert num_waiting == 0
+    assert pending_parents[0] == 0
+    assert pending_parents[2] == 1
+    assert pending_parents[3] == 2
+
+
+@pytest.mark.parametrize("sub_dispatch_resumed", [True, False])
+def test_get_resumed_tasks_and_deps_sublattice(mocker, sub_dispatch_resumed):
+    """Test that a sublattice waits for its dispatch only if that is resumed too"""
+
+    result_object = get_mock_result()
+    result_object._initialize_nodes()
+    tg = result_object.lattice.transport_graph
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._dependency_indices",
+        {result_object.dispatch_id: DependencyIndex(tg._graph)},
+    )
+
+    tg.set_node_value(1, "status", RESULT_STATUS.COMPLETED)
+    tg.set_node_value(0, "status", RESULT_STATUS.DISPATCHING_SUBLATTICE)
+    tg.set_node_value(0, "sub_dispatch_id", "sub_dispatch")
+    sub_dispatch_ids = {"sub_dispatch"} if sub_dispatch_resumed else set()
+    _, ready_nodes, running_nodes, num_waiting, _ = _get_resumed_tasks_and_deps(
+        result_object, sub_dispatch_ids
+    )
+
+    assert running_nodes == []
+    if sub_dispatch_resumed:
+        assert ready_nodes == []
+        assert num_waiting == 1
+    else:
+        assert ready_nodes == [0]
+        assert num_waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_dispatches(mocker):
+    """Test that sublattice dispatches are only resumed along with their parents"""
+
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.get_resumable_dispatches",
+        return_value=[
+            {"dispatch_id": "root", "parent_dispatch_id": None},
+            {"dispatch_id": "failed_root", "parent_dispatch_id": None},
+            {"dispatch_id": "sub", "parent_dispatch_id": "root"},
+            {"dispatch_id": "orphan_sub", "parent_dispatch_id": "failed_root"},
+        ],
+    )
+
+    async def resume_dispatch_side_effect(dispatch_id):
+        if dispatch_id == "failed_root":
+            raise RuntimeError("missing results")
+
+    mock_resume = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.resume_dispatch",
+        side_effect=resume_dispatch_side_effect,
+    )
+    mock_resumed = mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._resumed_dispatches", {}
+    )
+    mock_run_dispatch = mocker.patch("covalent_dispatcher._core.dispatcher.run_dispatch")
+
+    futures = await resume_dispatches()
+
+    assert len(futures) == 2
+    assert mock_resume.await_count == 3
+    assert mock_resumed == {"root": {"sub"}, "sub": set()}
+    assert mock_run_dispatch.call_args_list == [call("root"), call("sub")]
+
+
 @pytest.mark.asyncio
 async def test_run_dispatch(mocker):
     """
@@ -302,12 +471,17 @@ async def test_run_workflow_normal(mocker):
     mocker.patch(
         "covalent_dispatcher._core.dispatcher._run_planned_workflow", return_value=result_object
     )
+    mock_wait = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.wait_for_background_tasks"
+    )
     mock_persist = mocker.patch("covalent_dispatcher._core.dispatcher.datasvc.persist_result")
     mock_unregister = mocker.patch(
         "covalent_dispatcher._core.dispatcher.datasvc.finalize_dispatch"
     )
     await run_workflow(result_object)
 
+    # Queued node results are written before the result is persisted
+    mock_wait.assert_awaited_once_with(result_object.dispatch_id)
     mock_persist.assert_awaited_with(result_object.dispatch_id)
     mock_unregister.assert_called_with(result_object.dispatch_id)
 
@@ -440,6 +614,50 @@ async def test_run_planned_workflow_failed_update(mocker):
     mock_handle_failed.assert_awaited_with(result_object, 0)
 
 
+@pytest.mark.asyncio
+async def test_run_planned_workflow_failed_with_waiting_task_group(mocker):
+    """
+    Test that a failed task doesn't block the workflow on the task group
+    members waiting for it
+    """
+    import asyncio
+
+    result_object = get_mock_result()
+    task_groups = PackedTaskGroups({1: [1, 2]})
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._task_groups",
+        {result_object.dispatch_id: task_groups},
+    )
+    mocker.patch("covalent_dispatcher._core.dispatcher.datasvc.upsert_lattice_data")
+
+    # Member 2 of the group is ready while member 1 waits for node 0
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher._get_initial_tasks_and_deps",
+        return_value=(3, [0, 2], {0: 0, 1: 1, 2: 0}),
+    )
+
+    async def submit_tasks_side_effect(result_object, node_ids):
+        for node_id in node_ids:
+            if node_id == 2:
+                task_groups.mark_ready(node_id)
+
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher._submit_tasks", side_effect=submit_tasks_side_effect
+    )
+
+    def side_effect(result_object, node_id):
+        result_object._task_failed = True
+
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher._handle_failed_node", side_effect=side_effect
+    )
+    status_queue = asyncio.Queue()
+    status_queue.put_nowait((0, RESULT_STATUS.FAILED, {}))
+
+    await asyncio.wait_for(_run_planned_workflow(result_object, status_queue), 5)
+    assert result_object.status == RESULT_STATUS.FAILED
+
+
 @pytest.mark.asyncio
 async def test_run_planned_workflow_dispatching(mocker):
     """Test the run planned workflow for a dispatching node."""
@@ -516,6 +734,31 @@ async def test_cancel_dispatch(mocker):
     mock_runner.cancel_tasks.assert_has_awaits(calls)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("running", [True, False])
+async def test_cancel_dispatch_forgets_finished_dispatch(mocker, running):
+    """Test that the job records loaded to cancel a finished dispatch are evicted"""
+    res = get_mock_result()
+    res._initialize_nodes()
+
+    mocker.patch("covalent_dispatcher._core.dispatcher.set_cancel_requested")
+    mock_runner = mocker.patch("covalent_dispatcher._core.dispatcher.runner")
+    mock_runner.cancel_tasks = AsyncMock()
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.get_result_object", return_value=res
+    )
+    mock_forget = mocker.patch("covalent_dispatcher._core.dispatcher.forget_dispatch")
+    if running:
+        mocker.patch.dict(_dependency_indices, {res.dispatch_id: MagicMock()})
+
+    await cancel_dispatch(res.dispatch_id, [0])
+
+    if running:
+        mock_forget.assert_not_called()
+    else:
+        mock_forget.assert_called_once_with(res.dispatch_id)
+
+
 @pytest.mark.asyncio
 async def test_cancel_dispatch_with_task_ids(mocker):
     """Test cancelling a dispatch, including sub-lattices and with task ids"""
@@ -585,3 +828,317 @@ async def test_submit_task(mocker):
     ]
     update_node_result_mock.assert_called_with(mock_result, generate_node_result_mock.return_value)
     generate_node_result_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_task_deferred_updates(mocker):
+    """Test that trivial node results are deferred when requested."""
+
+    def transport_graph_get_value_side_effect(node_id, key):
+        if key == "name":
+            return "mock-name"
+        if key == "status":
+            return RESULT_STATUS.COMPLETED
+
+    mock_result = MagicMock()
+    mock_result.lattice.transport_graph.get_node_value.side_effect = (
+        transport_graph_get_value_side_effect
+    )
+
+    generate_node_result_mock = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.generate_node_result"
+    )
+    update_node_result_mock = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.update_node_result"
+    )
+    deferred_updates = []
+    await _submit_task(mock_result, 0, deferred_updates)
+
+    update_node_result_mock.assert_not_called()
+    assert deferred_updates == [generate_node_result_mock.return_value]
+
+
+@pytest.mark.asyncio
+async def test_submit_tasks(mocker):
+    """Test that a batch of ready nodes is submitted with a single batched update."""
+
+    mock_result = MagicMock()
+
+    async def submit_task_side_effect(result_object, node_id, deferred_updates):
+        if node_id % 2 == 0:
+            deferred_updates.append(node_id)
+
+    mock_submit_task = mocker.patch(
+        "covalent_dispatcher._core.dispatcher._submit_task", side_effect=submit_task_side_effect
+    )
+    mock_update_node_results = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.update_node_results"
+    )
+
+    await _submit_tasks(mock_result, [0, 1, 2, 3])
+
+    assert mock_submit_task.await_count == 4
+    mock_update_node_results.assert_awaited_once_with(mock_result, [0, 2])
+
+
+@pytest.mark.asyncio
+async def test_submit_tasks_by_priority(mocker):
+    """Test that ready nodes on the critical path are submitted first."""
+
+    result_object = get_mock_result()
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._task_priorities",
+        {result_object.dispatch_id: [1.0, 3.0, 2.0]},
+    )
+    mock_submit_task = mocker.patch("covalent_dispatcher._core.dispatcher._submit_task")
+    mocker.patch("covalent_dispatcher._core.dispatcher.datasvc.update_node_results")
+
+    await _submit_tasks(result_object, [0, 1, 2])
+
+    assert [c.args[1] for c in mock_submit_task.mock_calls] == [1, 2, 0]
+
+
+@pytest.mark.asyncio
+async def test_submit_packed_task_group(mocker):
+    """Test that a packed task group is submitted once all its members are ready."""
+
+    result_object = get_mock_result()
+    result_object._initialize_nodes()
+    dispatch_id = result_object.dispatch_id
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._dependency_indices",
+        {dispatch_id: DependencyIndex(result_object.lattice.transport_graph._graph)},
+    )
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._task_groups",
+        {dispatch_id: PackedTaskGroups({0: [0, 2]})},
+    )
+    mock_submit_abstract_task = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.runner.submit_abstract_task"
+    )
+    mock_submit_task_group = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.runner.submit_task_group"
+    )
+
+    # tg edges are (1, 0), (0, 2), plus the edges to the postprocess node 3;
+    # the edge (0, 2) is internal to the group
+    num_tasks, ready_nodes, pending_parents = await _get_initial_tasks_and_deps(result_object)
+    assert ready_nodes == [1, 2]
+    assert pending_parents == {0: 1, 1: 0, 2: 0, 3: 2}
+
+    await _submit_task(result_object, 2)
+    mock_submit_task_group.assert_not_called()
+
+    await _submit_task(result_object, 0)
+    mock_submit_abstract_task.assert_not_called()
+    mock_submit_task_group.assert_called_once()
+    kwargs = mock_submit_task_group.call_args.kwargs
+    assert kwargs["task_group_id"] == 0
+    assert [task["node_id"] for task in kwargs["tasks"]] == [0, 2]
+    assert kwargs["tasks"][1]["abstract_inputs"] == {"args": [0], "kwargs": {}}
+
+    # Completing the group's parent only releases the group's entry node
+    next_nodes = await _handle_completed_node(result_object, 1, pending_parents)
+    assert next_nodes == [0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "index,max_input_size,inline",
+    [(1, 10**6, True), (1, 0, False), (5, 10**6, False)],
+)
+async def test_submit_structural_node_inline(mocker, index, max_input_size, inline):
+    """Test that structural nodes are evaluated in the dispatcher when possible."""
+
+    @ct.electron
+    def pair(x):
+        return [x, x + 1]
+
+    @ct.electron
+    def task(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        return task(pair(x)[index])
+
+    workflow.build_graph(1)
+    received_workflow = Lattice.deserialize_from_json(workflow.serialize_to_json())
+    result_object = Result(received_workflow, "inline_dispatch")
+    result_object._initialize_nodes()
+    tg = result_object.lattice.transport_graph
+    node_ids = {tg.get_node_value(node_id, "name"): node_id for node_id in tg._graph.nodes}
+    tg.set_node_value(node_ids["pair"], "output", ct.TransportableObject([1, 2]))
+    tg.set_node_value(node_ids[f":parameter:{index}"], "output", ct.TransportableObject(index))
+
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._dependency_indices",
+        {"inline_dispatch": DependencyIndex(tg._graph)},
+    )
+    evaluator = InlineEvaluator(tg._graph, max_input_size)
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._inline_evaluators",
+        {"inline_dispatch": evaluator},
+    )
+    mock_submit_abstract_task = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.runner.submit_abstract_task"
+    )
+
+    assert evaluator.node_ids == {node_ids[":pair.__getitem__"]}
+
+    deferred_updates = []
+    await _submit_task(result_object, node_ids[":pair.__getitem__"], deferred_updates)
+
+    if inline:
+        mock_submit_abstract_task.assert_not_called()
+        [node_result] = deferred_updates
+        assert node_result["status"] == RESULT_STATUS.COMPLETED
+        assert node_result["output"].get_deserialized() == 2
+    else:
+        mock_submit_abstract_task.assert_called_once()
+        assert deferred_updates == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cached", [True, False])
+async def test_submit_task_cached(mocker, cached):
+    """Test that tasks whose output is in the result cache aren't run."""
+    result_object = get_mock_result()
+    result_object._initialize_nodes()
+    tg = result_object.lattice.transport_graph
+    tg.set_node_value(1, "output", ct.TransportableObject("absolute"))
+
+    cache_keys = {}
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._cache_keys", {"pipeline_workflow": cache_keys}
+    )
+    cached_output = ct.TransportableObject("cached") if cached else None
+    mock_get_cached_output = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.get_cached_output",
+        new_callable=AsyncMock,
+        return_value=cached_output,
+    )
+    mock_submit_abstract_task = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.runner.submit_abstract_task"
+    )
+
+    deferred_updates = []
+    await _submit_task(result_object, 0, deferred_updates)
+
+    key = mock_get_cached_output.await_args.args[0]
+    if cached:
+        mock_submit_abstract_task.assert_not_called()
+        [node_result] = deferred_updates
+        assert node_result["status"] == RESULT_STATUS.COMPLETED
+        assert node_result["output"] == cached_output
+        assert cache_keys == {}
+    else:
+        mock_submit_abstract_task.assert_called_once()
+        assert deferred_updates == []
+        assert cache_keys == {0: key}
+
+
+@pytest.mark.asyncio
+async def test_submit_task_cache_opt_out(mocker):
+    """Test that electrons can opt out of the result cache."""
+    result_object = get_mock_result()
+    result_object._initialize_nodes()
+    tg = result_object.lattice.transport_graph
+    tg.set_node_value(1, "output", ct.TransportableObject("absolute"))
+    tg.get_node_value(0, "metadata")["cache"] = False
+
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._cache_keys", {"pipeline_workflow": {}}
+    )
+    mock_get_cached_output = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.datasvc.get_cached_output", new_callable=AsyncMock
+    )
+    mock_submit_abstract_task = mocker.patch(
+        "covalent_dispatcher._core.dispatcher.runner.submit_abstract_task"
+    )
+
+    await _submit_task(result_object, 0, [])
+
+    mock_get_cached_output.assert_not_awaited()
+    mock_submit_abstract_task.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_handle_completed_node_caches_output(mocker):
+    """Test that the outputs of tasks missing from the result cache are cached."""
+    result_object = get_mock_result()
+    result_object._initialize_nodes()
+    output = ct.TransportableObject("output")
+    result_object.lattice.transport_graph.set_node_value(0, "output", output)
+
+    cache_keys = {0: "key"}
+    mocker.patch.dict(
+        "covalent_dispatcher._core.dispatcher._cache_keys", {"pipeline_workflow": cache_keys}
+    )
+    mock_cache_output = mocker.patch("covalent_dispatcher._core.dispatcher.datasvc.cache_output")
+
+    await _handle_completed_node(result_object, 0, {0: 0, 1: 0, 2: 1, 3: 2})
+
+    mock_cache_output.assert_called_once_with("pipeline_workflow", "key", output)
+    assert cache_keys == {}
+
+
+def test_get_status_updates():
+    """Test draining the status queue in batches."""
+    import asyncio
+
+    status_queue = asyncio.Queue()
+    for i in range(1, 5):
+        status_queue.put_nowait((i, RESULT_STATUS.COMPLETED, {}))
+
+    first_msg = (0, RESULT_STATUS.COMPLETED, {})
+    batch = _get_status_updates(status_queue, first_msg, 3)
+    assert [msg[0] for msg in batch] == [0, 1, 2]
+
+    batch = _get_status_updates(status_queue, first_msg, 10)
+    assert [msg[0] for msg in batch] == [0, 3, 4]
+    assert status_queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_run_planned_workflow_batches_ready_nodes(mocker):
+    """Test that the nodes made ready by a batch of updates are submitted together."""
+    import asyncio
+
+    result_object = get_mock_result()
+
+    mocker.patch("covalent_dispatcher._core.dispatcher.datasvc.upsert_lattice_data")
+    mocker.patch("covalent_dispatcher._core.dispatcher.result_webhook.send_update")
+
+    # 0 and 1 are ready; 2 depends on both
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher._get_initial_tasks_and_deps",
+        return_value=(3, [0, 1], {0: 0, 1: 0, 2: 2}),
+    )
+
+    async def handle_completed_side_effect(result_object, node_id, pending_parents):
+        pending_parents[2] -= 1
+        return [2] if pending_parents[2] == 0 else []
+
+    mocker.patch(
+        "covalent_dispatcher._core.dispatcher._handle_completed_node",
+        side_effect=handle_completed_side_effect,
+    )
+
+    status_queue = asyncio.Queue()
+
+    async def submit_tasks_side_effect(result_object, node_ids):
+        for node_id in node_ids:
+            status_queue.put_nowait((node_id, RESULT_STATUS.COMPLETED, {}))
+
+    mock_submit_tasks = mocker.patch(
+        "covalent_dispatcher._core.dispatcher._submit_tasks", side_effect=submit_tasks_side_effect
+    )
+
+    await _run_planned_workflow(result_object, status_queue)
+
+    assert mock_submit_tasks.await_args_list == [
+        call(result_object, [0, 1]),
+        call(result_object, [2]),
+        call(result_object, []),
+    ]
@@ -34,6 +34,7 @@ from covalent_dispatcher._core.dispatcher import run_workflow
 from covalent_dispatcher._core.execution import _get_task_inputs
 from covalent_dispatcher._db import update
 from covalent_dispatcher._db.datastore import DataStore
+from covalent_ui import result_webhook
 
 TEST_RESULTS_DIR = "/tmp/results"
 
@@ -228,6 +229,7 @@ async def test_run_workflow_with_failing_nonleaf(mocker):
 
     update.persist(result_object)
     result_object = await run_workflow(result_object)
+    await result_webhook.close()
     mock_unregister.assert_called_with(result_object.dispatch_id)
     assert result_object.status == Result.FAILED
 
@@ -289,6 +291,7 @@ async def test_run_workflow_with_failing_leaf(mocker):
     update.persist(result_object)
 
     result_object = await run_workflow(result_object)
+    await result_webhook.close()
     mock_unregister.assert_called_with(result_object.dispatch_id)
     assert result_object.status == Result.FAILED
     assert result_object._error == "The following tasks failed:\n0: failing_task"
@@ -335,6 +338,7 @@ async def test_run_workflow_does_not_deserialize(mocker):
     mock_to_deserialize = mocker.patch("covalent.TransportableObject.get_deserialized")
 
     result_object = await run_workflow(result_object)
+    await result_webhook.close()
 
     mock_to_deserialize.assert_not_called()
     assert result_object.status == Result.COMPLETED
@@ -371,6 +375,7 @@ async def test_run_workflow_with_client_side_postprocess(test_db, mocker):
     update.persist(result_object)
 
     result_object = await run_workflow(result_object)
+    await result_webhook.close()
     mock_unregister.assert_called_with(result_object.dispatch_id)
     assert result_object.status == Result.RUNNING
     assert mock_run_abstract_task.call_count == 1
@@ -416,6 +421,7 @@ async def test_run_workflow_with_failed_postprocess(test_db, mocker):
     result_object.lattice.set_metadata("workflow_executor", "local")
 
     result_object = await run_workflow(result_object)
+    await result_webhook.close()
     mock_unregister.assert_called_with(result_object.dispatch_id)
 
     assert result_object.status == Result.RUNNING
@@ -0,0 +1,244 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the executor admission queue"""
+
+import asyncio
+
+import pytest
+
+from covalent._shared_files import tracing
+from covalent_dispatcher._core.runner_modules.admission import (
+    AdmissionQueue,
+    get_instance_key,
+    merge_stats,
+    render_prometheus,
+)
+
+
+class _TaskRecorder:
+    """Starts tasks which block until released and records the start order."""
+
+    def __init__(self):
+        self.started = []
+        self.events = {}
+
+    def starter(self, name):
+        self.events[name] = asyncio.Event()
+
+        async def start():
+            self.started.append(name)
+            await self.events[name].wait()
+
+        return start
+
+    async def finish(self, name):
+        self.events[name].set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    async def finish_all(self):
+        for event in self.events.values():
+            event.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+def test_get_instance_key():
+    """Identically configured executors share a key."""
+
+    data_1 = {"attributes": {"a": 1, "b": 2}}
+    data_2 = {"attributes": {"b": 2, "a": 1}}
+    data_3 = {"attributes": {"a": 1, "b": 3}}
+
+    assert get_instance_key("local", data_1) == get_instance_key("local", data_2)
+    assert get_instance_key("local", data_1) != get_instance_key("local", data_3)
+    assert get_instance_key("local", data_1) != get_instance_key("dask", data_1)
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_unbounded():
+    """Tasks start immediately without limits."""
+
+    recorder = _TaskRecorder()
+    admission = AdmissionQueue()
+    for i in range(5):
+        admission.submit("dispatch", "local", "inst", recorder.starter(i))
+    await asyncio.sleep(0)
+
+    assert recorder.started == [0, 1, 2, 3, 4]
+    assert admission.get_stats()["local"] == {
+        "queued": 0,
+        "in_flight": 5,
+        "limit": 0,
+        "instances": 1,
+    }
+
+    for i in range(5):
+        await recorder.finish(i)
+    assert admission.get_stats()["local"]["in_flight"] == 0
+    assert admission.get_stats()["local"]["instances"] == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_executor_limit():
+    """Tasks wait for a slot of their executor; other executors are unaffected."""
+
+    recorder = _TaskRecorder()
+    admission = AdmissionQueue(limits={"local": 2}, default_limit=1)
+    for i in range(4):
+        admission.submit("dispatch", "local", "inst", recorder.starter(i))
+    admission.submit("dispatch", "dask", "inst", recorder.starter("dask_0"))
+    admission.submit("dispatch", "dask", "inst", recorder.starter("dask_1"))
+    await asyncio.sleep(0)
+
+    assert recorder.started == [0, 1, "dask_0"]
+    assert admission.get_stats()["local"]["queued"] == 2
+    assert admission.get_stats()["local"]["in_flight"] == 2
+    assert admission.get_stats()["dask"]["queued"] == 1
+
+    await recorder.finish(1)
+    assert recorder.started == [0, 1, "dask_0", 2]
+
+    await recorder.finish("dask_0")
+    assert recorder.started == [0, 1, "dask_0", 2, "dask_1"]
+
+    await recorder.finish_all()
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_instance_limit():
+    """A saturated executor instance doesn't block other instances."""
+
+    recorder = _TaskRecorder()
+    admission = AdmissionQueue(instance_limit=1)
+    admission.submit("dispatch", "local", "inst_a", recorder.starter("a0"))
+    admission.submit("dispatch", "local", "inst_a", recorder.starter("a1"))
+    admission.submit("dispatch", "local", "inst_b", recorder.starter("b0"))
+    await asyncio.sleep(0)
+
+    assert recorder.started == ["a0", "b0"]
+    assert admission.get_stats()["local"]["instances"] == 2
+
+    await recorder.finish("a0")
+    assert recorder.started == ["a0", "b0", "a1"]
+
+    await recorder.finish_all()
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_round_robin_between_dispatches():
+    """A large dispatch doesn't starve a dispatch submitted after it."""
+
+    recorder = _TaskRecorder()
+    admission = AdmissionQueue(default_limit=1)
+    for i in range(3):
+        admission.submit("big", "local", "inst", recorder.starter(f"big_{i}"))
+    admission.submit("small", "local", "inst", recorder.starter("small_0"))
+    await asyncio.sleep(0)
+
+    assert recorder.started == ["big_0"]
+
+    await recorder.finish("big_0")
+    await recorder.finish("big_1")
+    assert recorder.started == ["big_0", "big_1", "small_0"]
+
+    await recorder.finish_all()
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_releases_slot_on_exception():
+    """A failing task frees its slot."""
+
+    recorder = _TaskRecorder()
+    admission = AdmissionQueue(default_limit=1)
+
+    async def failing_task():
+        raise RuntimeError("error")
+
+    admission.submit("dispatch", "local", "inst", failing_task)
+    admission.submit("dispatch", "local", "inst", recorder.starter(0))
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert recorder.started == [0]
+
+    await recorder.finish_all()
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_priorities():
+    """Tasks with higher priorities are admitted first within a dispatch."""
+
+    recorder = _TaskRecorder()
+    admission = AdmissionQueue(default_limit=1)
+    admission.submit("dispatch", "local", "inst_a", recorder.starter("first"), priority=0.0)
+    admission.submit("dispatch", "local", "inst_a", recorder.starter("low"), priority=1.0)
+    admission.submit("dispatch", "local", "inst_a", recorder.starter("low_2"), priority=1.0)
+    admission.submit("dispatch", "local", "inst_b", recorder.starter("high"), priority=5.0)
+    await asyncio.sleep(0)
+
+    for name in ["first", "high", "low"]:
+        await recorder.finish(name)
+    assert recorder.started == ["first", "high", "low", "low_2"]
+
+    await recorder.finish_all()
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_records_queue_wait():
+    """The time between submission and admission of each task is traced."""
+
+    tracing.configure(True)
+    try:
+        recorder = _TaskRecorder()
+        admission = AdmissionQueue(default_limit=1)
+        admission.submit("dispatch", "local", "inst", recorder.starter(0))
+        admission.submit("dispatch", "local", "inst", recorder.starter(1))
+        await asyncio.sleep(0)
+        await recorder.finish_all()
+        await recorder.finish_all()
+
+        snapshot = tracing.get_snapshot()
+        assert snapshot["dispatches"]["dispatch"]["queue_wait"]["count"] == 2
+    finally:
+        tracing.configure(False)
+
+
+def test_merge_and_render_stats():
+    """Stats of several processes are summed and rendered as gauges."""
+
+    stats = [
+        {"local": {"queued": 1, "in_flight": 2, "limit": 2, "instances": 1}},
+        {
+            "local": {"queued": 3, "in_flight": 1, "limit": 0, "instances": 1},
+            "dask": {"queued": 0, "in_flight": 1, "limit": 4, "instances": 1},
+        },
+    ]
+    merged = merge_stats(stats)
+
+    assert merged["local"] == {"queued": 4, "in_flight": 3, "limit": 0, "instances": 2}
+    assert merged["dask"] == stats[1]["dask"]
+    assert stats[0]["local"]["queued"] == 1
+
+    text = render_prometheus(merged)
+    assert "# TYPE covalent_executor_queued_tasks gauge" in text
+    assert 'covalent_executor_queued_tasks{executor="local"} 4' in text
+    assert 'covalent_executor_concurrency_limit{executor="dask"} 4' in text
@@ -0,0 +1,175 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the executor instance pool"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from covalent.executor.base import AsyncBaseExecutor, BaseExecutor
+from covalent_dispatcher._core.runner_modules.executor_pool import ExecutorPool
+
+
+class PooledExecutor(AsyncBaseExecutor):
+    SUPPORTS_INSTANCE_POOLING = True
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.setup_calls = 0
+        self.teardown_calls = 0
+
+    async def setup_shared(self):
+        self.setup_calls += 1
+        self.connection = object()
+
+    async def teardown_shared(self):
+        self.teardown_calls += 1
+
+    async def run(self, function, args, kwargs, task_metadata):
+        pass
+
+
+class SyncPooledExecutor(BaseExecutor):
+    SUPPORTS_INSTANCE_POOLING = True
+
+    def setup_shared(self):
+        self.connection = object()
+
+    def run(self, function, args, kwargs, task_metadata):
+        pass
+
+
+class UnpooledExecutor(AsyncBaseExecutor):
+    async def run(self, function, args, kwargs, task_metadata):
+        pass
+
+
+def get_pool(executor_cls, idle_timeout=600):
+    factory = MagicMock(side_effect=lambda short_name: executor_cls())
+    return ExecutorPool(factory, idle_timeout=idle_timeout), factory
+
+
+@pytest.mark.asyncio
+async def test_pooled_executor_is_set_up_once():
+    """Tasks with the same configuration share the setup but not the runtime state."""
+
+    pool, factory = get_pool(PooledExecutor)
+    object_dict = PooledExecutor(retries=1).to_dict()
+
+    executor_1, key_1 = await pool.acquire("pooled", object_dict)
+    executor_2, key_2 = await pool.acquire("pooled", object_dict)
+
+    factory.assert_called_once_with("pooled")
+    assert key_1 == key_2
+    assert len(pool) == 1
+    assert executor_1 is not executor_2
+    assert executor_1.connection is executor_2.connection
+    assert executor_1._send_queue is not executor_2._send_queue
+    assert executor_1.retries == 1
+    assert executor_1.setup_calls == 1
+
+    executor_3, key_3 = await pool.acquire("pooled", PooledExecutor(retries=2).to_dict())
+    assert key_3 != key_1
+    assert executor_3.connection is not executor_1.connection
+    assert len(pool) == 2
+
+    pool.release(key_1)
+    pool.release(key_2)
+    pool.release(key_3)
+
+
+@pytest.mark.asyncio
+async def test_sync_hooks():
+    """Sync lifecycle hooks are supported."""
+
+    pool, _ = get_pool(SyncPooledExecutor)
+    executor, key = await pool.acquire("sync", {})
+
+    assert executor.connection is not None
+    pool.release(key)
+
+
+@pytest.mark.asyncio
+async def test_unpooled_executor():
+    """Executors which don't opt in are instantiated for every task."""
+
+    pool, factory = get_pool(UnpooledExecutor)
+    object_dict = UnpooledExecutor(retries=3).to_dict()
+
+    executor_1, key_1 = await pool.acquire("unpooled", object_dict)
+    executor_2, key_2 = await pool.acquire("unpooled", object_dict)
+
+    assert factory.call_count == 2
+    assert key_1 is None and key_2 is None
+    assert executor_1 is not executor_2
+    assert executor_1.retries == 3
+    assert len(pool) == 0
+    pool.release(key_1)
+
+
+@pytest.mark.asyncio
+async def test_idle_eviction():
+    """Idle instances are torn down and evicted."""
+
+    pool, factory = get_pool(PooledExecutor, idle_timeout=0.01)
+    executor, key = await pool.acquire("pooled", {})
+    template = pool._entries[key].executor
+
+    pool.release(key)
+    await asyncio.sleep(0.05)
+
+    assert len(pool) == 0
+    assert template.teardown_calls == 1
+
+    await pool.acquire("pooled", {})
+    assert factory.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_cancels_eviction():
+    """Reusing an instance before it's evicted keeps it alive."""
+
+    pool, factory = get_pool(PooledExecutor, idle_timeout=0.02)
+    _, key = await pool.acquire("pooled", {})
+    pool.release(key)
+
+    _, key = await pool.acquire("pooled", {})
+    await asyncio.sleep(0.05)
+
+    assert len(pool) == 1
+    factory.assert_called_once()
+    pool.release(key)
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_is_not_pooled():
+    """An instance whose setup fails is discarded."""
+
+    class FailingExecutor(PooledExecutor):
+        async def setup_shared(self):
+            raise RuntimeError("no connection")
+
+    pool, _ = get_pool(FailingExecutor)
+
+    with pytest.raises(RuntimeError):
+        await pool.acquire("failing", {})
+    assert len(pool) == 0
@@ -23,25 +23,38 @@ Tests for the core functionality of the runner.
 """
 
 
+import asyncio
 import json
+from collections import OrderedDict
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from mock import call
 
 import covalent as ct
+from covalent._data_store import ObjectRef
 from covalent._results_manager import Result
+from covalent._shared_files.util_classes import RESULT_STATUS
 from covalent._workflow.lattice import Lattice
+from covalent.executor.base import reference_wrapper_fn, wrapper_fn
+from covalent_dispatcher._core import runner
 from covalent_dispatcher._core.runner import (
     _cancel_task,
     _gather_deps,
+    _get_admission_queue,
     _get_cancel_requested,
     _get_metadata_for_nodes,
+    _resume_task,
     _run_abstract_task,
     _run_task,
+    _run_task_group,
     cancel_tasks,
     get_executor,
+    get_executor_queue_stats,
+    resume_abstract_task,
+    submit_abstract_task,
 )
+from covalent_dispatcher._core.runner_modules.admission import AdmissionQueue
 from covalent_dispatcher._db.datastore import DataStore
 
 TEST_RESULTS_DIR = "/tmp/results"
@@ -125,6 +138,53 @@ def test_gather_deps():
     assert len(after) == 1
 
 
+def test_gather_deps_cache(mocker):
+    """Test that identical deps are assembled once and evicted in LRU order"""
+
+    def square(x):
+        return x * x
+
+    @ct.electron(call_before=[ct.DepsCall(square, [5])])
+    def task(x):
+        return x
+
+    @ct.electron(call_before=[ct.DepsCall(square, [6])])
+    def other_task(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        task(x)
+        task(x)
+        return other_task(x)
+
+    workflow.build_graph(5)
+    received_workflow = Lattice.deserialize_from_json(workflow.serialize_to_json())
+    result_object = Result(received_workflow, "asdf")
+
+    deps_cache = OrderedDict()
+    mocker.patch("covalent_dispatcher._core.runner._deps_cache", deps_cache)
+    mocker.patch("covalent_dispatcher._core.runner.DEPS_CACHE_SIZE", 1)
+    assemble_spy = mocker.spy(runner, "_assemble_deps")
+
+    # Nodes: 0 task, 1 parameter, 2 task, 3 parameter, 4 other_task, ...
+    before_0, after_0 = _gather_deps(result_object, 0)
+    before_2, after_2 = _gather_deps(result_object, 2)
+
+    assert assemble_spy.call_count == 1
+    assert before_0 is not before_2
+    assert before_0[0] is before_2[0]
+    assert after_0 == after_2 == []
+
+    before_4, _ = _gather_deps(result_object, 4)
+    assert assemble_spy.call_count == 2
+    assert before_4[0][1].get_deserialized() == [6]
+    assert len(deps_cache) == 1
+
+    _gather_deps(result_object, 0)
+    assert assemble_spy.call_count == 3
+
+
 @pytest.mark.asyncio
 async def test_run_abstract_task_exception_handling(mocker):
     """Test that exceptions from resolving abstract inputs are handled"""
@@ -241,6 +301,48 @@ async def test_run_task_runtime_exception_handling(mocker):
     assert node_result["stderr"] == "error"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "node_name,by_reference",
+    [("task", True), (":postprocess:", False), (":sublattice:task", False)],
+)
+async def test_run_task_passes_output_by_reference(mocker, node_name, by_reference):
+    """Test that executors store task outputs in the object store in pass-by-reference mode"""
+
+    result_object = get_mock_result()
+    mocker.patch("covalent_dispatcher._core.runner._object_store_dir", "/tmp/objects")
+    mocker.patch("covalent_dispatcher._core.runner._object_store_initialized", True)
+    mock_executor = MagicMock()
+    mock_executor._execute = AsyncMock(return_value=("output", "", "", Result.COMPLETED))
+    mocker.patch(
+        "covalent_dispatcher._core.runner._executor_manager.get_executor",
+        return_value=mock_executor,
+    )
+    serialized_callable = ct.TransportableObject(print)
+
+    await _run_task(
+        result_object=result_object,
+        node_id=1,
+        inputs={"args": [], "kwargs": {}},
+        serialized_callable=serialized_callable,
+        executor=["local", {}],
+        call_before=[],
+        call_after=[],
+        node_name=node_name,
+    )
+
+    assembled_callable = mock_executor._execute.await_args.kwargs["function"]
+    assert assembled_callable.args[0] is serialized_callable
+    if by_reference:
+        assert assembled_callable.func is reference_wrapper_fn
+        output_ref = assembled_callable.args[3]
+        assert isinstance(output_ref, ObjectRef)
+        assert output_ref.base_dir == "/tmp/objects"
+        assert output_ref.bucket_name == "pipeline_workflow"
+    else:
+        assert assembled_callable.func is wrapper_fn
+
+
 @pytest.mark.asyncio
 async def test__cancel_task(mocker):
     """
@@ -253,7 +355,8 @@ async def test__cancel_task(mocker):
 
     mock_app_log = mocker.patch("covalent_dispatcher._core.runner.app_log.debug")
     get_executor_mock = mocker.patch(
-        "covalent_dispatcher._core.runner.get_executor", return_value=mock_executor
+        "covalent_dispatcher._core.runner._executor_manager.get_executor",
+        return_value=mock_executor,
     )
     mock_set_cancel_result = mocker.patch("covalent_dispatcher._core.runner.set_cancel_result")
 
@@ -268,7 +371,8 @@ async def test__cancel_task(mocker):
     await _cancel_task(dispatch_id, task_id, executor, executor_data, job_handle)
 
     assert mock_app_log.call_count == 2
-    get_executor_mock.assert_called_once()
+    get_executor_mock.assert_called_once_with(executor)
+    mock_executor.from_dict.assert_called_once_with(executor_data)
     mock_executor._cancel.assert_called_with(task_metadata, json.loads(job_handle))
     mock_set_cancel_result.assert_called()
 
@@ -285,7 +389,8 @@ async def test__cancel_task_exception(mocker):
 
     mock_app_log = mocker.patch("covalent_dispatcher._core.runner.app_log.debug")
     get_executor_mock = mocker.patch(
-        "covalent_dispatcher._core.runner.get_executor", return_value=mock_executor
+        "covalent_dispatcher._core.runner._executor_manager.get_executor",
+        return_value=mock_executor,
     )
     mocker.patch("covalent_dispatcher._core.runner.set_cancel_result")
 
@@ -304,6 +409,88 @@ async def test__cancel_task_exception(mocker):
     assert cancel_result is False
 
 
+@pytest.mark.asyncio
+async def test_resume_task(mocker):
+    """
+    Test reattaching to the job of a task submitted by a previous dispatcher process
+    """
+    mock_executor = AsyncMock()
+    mock_executor.from_dict = MagicMock()
+    mock_executor._init_runtime = MagicMock()
+    mock_executor._resume = AsyncMock(return_value=("output", "", "", RESULT_STATUS.COMPLETED))
+    mocker.patch(
+        "covalent_dispatcher._core.runner._executor_manager.get_executor",
+        return_value=mock_executor,
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.runner.get_jobs_metadata",
+        return_value=[{"job_handle": json.dumps(42)}],
+    )
+    mock_result_object = MagicMock()
+    mock_result_object.results_dir = TEST_RESULTS_DIR
+    mocker.patch(
+        "covalent_dispatcher._core.runner.datasvc.get_result_object",
+        return_value=mock_result_object,
+    )
+
+    node_result = await _resume_task("abcd", 0, "task", ["mock_executor", {}])
+
+    task_metadata = {"dispatch_id": "abcd", "node_id": 0, "results_dir": TEST_RESULTS_DIR}
+    mock_executor._resume.assert_awaited_once_with(task_metadata, 42)
+    assert node_result["status"] == RESULT_STATUS.COMPLETED
+    assert node_result["output"] == "output"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("job_handle,resume_error", [("null", None), ("42", NotImplementedError)])
+async def test_resume_task_not_resumable(mocker, job_handle, resume_error):
+    """
+    Test that a task is run again if there's no job to reattach to
+    """
+    mock_executor = AsyncMock()
+    mock_executor.from_dict = MagicMock()
+    mock_executor._init_runtime = MagicMock()
+    mock_executor._resume = AsyncMock(side_effect=resume_error)
+    mocker.patch(
+        "covalent_dispatcher._core.runner._executor_manager.get_executor",
+        return_value=mock_executor,
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.runner.get_jobs_metadata",
+        return_value=[{"job_handle": job_handle}],
+    )
+    mocker.patch("covalent_dispatcher._core.runner.datasvc.get_result_object")
+
+    assert await _resume_task("abcd", 0, "task", ["mock_executor", {}]) is None
+    assert mock_executor._resume.await_count == (1 if resume_error else 0)
+
+
+@pytest.mark.asyncio
+async def test_resume_abstract_task_runs_task_again(mocker):
+    """
+    Test that a task whose job can't be reattached to is run again
+    """
+    mocker.patch("covalent_dispatcher._core.runner._resume_task", return_value=None)
+    mock_run = mocker.patch(
+        "covalent_dispatcher._core.runner._run_abstract_task", return_value={"node_id": 0}
+    )
+    mocker.patch("covalent_dispatcher._core.runner.datasvc.get_result_object")
+    mock_submit = mocker.patch("covalent_dispatcher._core.runner.datasvc.submit_node_result")
+
+    abstract_inputs = {"args": [], "kwargs": {}}
+    executor = ["mock_executor", {}]
+    await resume_abstract_task("abcd", 0, "task", abstract_inputs, executor)
+
+    mock_run.assert_awaited_once_with(
+        dispatch_id="abcd",
+        node_id=0,
+        node_name="task",
+        abstract_inputs=abstract_inputs,
+        executor=executor,
+    )
+    assert mock_submit.await_args.args[1] == {"node_id": 0}
+
+
 @pytest.mark.asyncio
 async def test_cancel_tasks(mocker):
     """
@@ -353,3 +540,144 @@ async def test__get_cancel_requested(mocker):
     await _get_cancel_requested(dispatch_id, task_id)
 
     mock_get_jobs_metadata.assert_awaited_with(dispatch_id, [task_id])
+
+
+@pytest.mark.asyncio
+async def test_submit_abstract_task(mocker):
+    """Test that tasks are started through the admission queue"""
+
+    admission_queue = AdmissionQueue(default_limit=1)
+    mocker.patch("covalent_dispatcher._core.runner._admission_queue", admission_queue)
+    mock_run_abstract_task = mocker.patch(
+        "covalent_dispatcher._core.runner.run_abstract_task", new_callable=AsyncMock
+    )
+    executor = ["local", {"attributes": {}}]
+
+    submit_abstract_task("abcd", 0, "task", {"args": [], "kwargs": {}}, executor)
+    submit_abstract_task("abcd", 1, "task", {"args": [], "kwargs": {}}, executor)
+
+    assert get_executor_queue_stats()["local"]["in_flight"] == 1
+    assert get_executor_queue_stats()["local"]["queued"] == 1
+
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert get_executor_queue_stats()["local"]["in_flight"] == 0
+    assert get_executor_queue_stats()["local"]["queued"] == 0
+    assert mock_run_abstract_task.await_count == 2
+    mock_run_abstract_task.assert_awaited_with(
+        dispatch_id="abcd",
+        node_id=1,
+        node_name="task",
+        abstract_inputs={"args": [], "kwargs": {}},
+        executor=executor,
+    )
+
+
+def test_get_admission_queue_from_config(mocker):
+    """Test that the admission queue limits are read from the config"""
+
+    config = {
+        "dispatcher.executor_concurrency_limits": {"dask": "4"},
+        "dispatcher.executor_concurrency_limit": 0,
+        "dispatcher.executor_instance_concurrency_limit": 2,
+    }
+    mocker.patch("covalent_dispatcher._core.runner._admission_queue", None)
+    mocker.patch("covalent_dispatcher._core.runner.get_config", side_effect=config.get)
+
+    admission_queue = _get_admission_queue()
+
+    assert admission_queue.limits == {"dask": 4}
+    assert admission_queue.default_limit == 0
+    assert admission_queue.instance_limit == 2
+    assert _get_admission_queue() is admission_queue
+
+
+@pytest.mark.asyncio
+async def test_run_task_group(mocker):
+    """Test that a task group runs as one job and is split into node results"""
+
+    result_object = get_mock_result()
+    mocker.patch(
+        "covalent_dispatcher._core.runner.datasvc.get_result_object", return_value=result_object
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.runner.get_jobs_metadata",
+        return_value=[{"cancel_requested": False}, {"cancel_requested": False}],
+    )
+    mock_update = mocker.patch(
+        "covalent_dispatcher._core.runner.datasvc.update_node_results", new_callable=AsyncMock
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.runner._get_task_input_values",
+        return_value={1: ct.TransportableObject(1)},
+    )
+    group_result = runner.datasvc.generate_node_result(
+        node_id=0,
+        node_name="task",
+        status=Result.COMPLETED,
+        output={2: ct.TransportableObject(1)},
+        stdout="out",
+        stderr="err",
+    )
+    mock_run = mocker.patch(
+        "covalent_dispatcher._core.runner._run_assembled_task", return_value=group_result
+    )
+
+    # tg edges are (1, 0), (0, 2), (2, 3) once the postprocess edge from
+    # node 0 is removed, so node 0 only feeds the group
+    result_object.lattice.transport_graph._graph.remove_edge(0, 3)
+    tasks = [
+        {"node_id": 0, "name": "task", "abstract_inputs": {"args": [1], "kwargs": {}}},
+        {"node_id": 2, "name": "task", "abstract_inputs": {"args": [0], "kwargs": {}}},
+    ]
+    node_results = await _run_task_group("pipeline_workflow", 0, tasks, ["local", {}])
+
+    mock_update.assert_awaited_once()
+    assembled_callable = mock_run.call_args.kwargs["assembled_callable"]
+    task_specs = assembled_callable.args[1]
+    assert [spec[0] for spec in task_specs] == [0, 2]
+    assert task_specs[0][4] == [("input", 0)]
+    assert task_specs[1][4] == [("node", 0)]
+    assert len(mock_run.call_args.kwargs["inputs"]["args"]) == 1
+
+    # Only the output of node 2, which has a child outside the group, is returned
+    assert assembled_callable.args[2] == [2]
+
+    assert [r["status"] for r in node_results] == [Result.COMPLETED, Result.COMPLETED]
+    assert node_results[0]["output"] is None
+    assert node_results[1]["output"].get_deserialized() == 1
+    assert node_results[0]["stdout"] == "out"
+    assert node_results[1]["stdout"] is None
+
+
+@pytest.mark.asyncio
+async def test_run_task_group_failure(mocker):
+    """Test that a failed task group fails all of its members"""
+
+    result_object = get_mock_result()
+    mocker.patch(
+        "covalent_dispatcher._core.runner.datasvc.get_result_object", return_value=result_object
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.runner.get_jobs_metadata",
+        return_value=[{"cancel_requested": False}, {"cancel_requested": False}],
+    )
+    mocker.patch(
+        "covalent_dispatcher._core.runner.datasvc.update_node_results", new_callable=AsyncMock
+    )
+    mocker.patch("covalent_dispatcher._core.runner._get_task_input_values", return_value={1: 1})
+    group_result = runner.datasvc.generate_node_result(
+        node_id=0, node_name="task", status=Result.FAILED, stderr="Error!"
+    )
+    mocker.patch("covalent_dispatcher._core.runner._run_assembled_task", return_value=group_result)
+
+    tasks = [
+        {"node_id": 0, "name": "task", "abstract_inputs": {"args": [1], "kwargs": {}}},
+        {"node_id": 2, "name": "task", "abstract_inputs": {"args": [0], "kwargs": {}}},
+    ]
+    node_results = await _run_task_group("pipeline_workflow", 0, tasks, ["local", {}])
+
+    assert [r["status"] for r in node_results] == [Result.FAILED, Result.FAILED]
+    assert [r["stderr"] for r in node_results] == ["Error!", "Error!"]
+    assert all(r["output"] is None for r in node_results)
@@ -22,6 +22,10 @@
 Unit tests for DataStore object
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event, text
+
 from covalent._shared_files.config import get_config
 from covalent_dispatcher._db.datastore import DataStore
 
@@ -31,3 +35,46 @@ def test_datastore_init():
 
     ds = DataStore(db_URL=None)
     assert ds.db_URL == "sqlite+pysqlite:///" + get_config("dispatcher.db_path")
+
+
+def test_datastore_write_sessions_begin_immediate(tmp_path):
+    """Test that only write sessions take the SQLite write lock when they begin."""
+
+    ds = DataStore(db_URL=f"sqlite+pysqlite:///{tmp_path}/test.db", initialize_db=True)
+    statements = []
+    event.listen(
+        ds.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, stmt, *args: statements.append(stmt),
+    )
+
+    with ds.session() as session:
+        session.execute(text("SELECT 1"))
+    assert statements[0] == "BEGIN"
+
+    statements.clear()
+    with ds.write_session() as session:
+        session.execute(text("SELECT 1"))
+    assert statements[0] == "BEGIN IMMEDIATE"
+
+
+def test_datastore_in_memory_threads():
+    """Test that threads see the same in-memory DB on their own connections."""
+
+    ds = DataStore(db_URL="sqlite+pysqlite://", initialize_db=True)
+    with ds.write_session() as session:
+        session.execute(text("CREATE TABLE test (id INTEGER)"))
+        session.execute(text("INSERT INTO test VALUES (1)"))
+
+    def _read():
+        with ds.session() as session:
+            return session.execute(text("SELECT id FROM test")).scalar(), id(
+                session.connection().connection.dbapi_connection
+            )
+
+    with ThreadPoolExecutor(1) as pool:
+        value, connection_id = pool.submit(_read).result()
+
+    assert value == 1
+    with ds.session() as session:
+        assert id(session.connection().connection.dbapi_connection) != connection_id
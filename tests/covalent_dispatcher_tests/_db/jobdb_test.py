@@ -26,6 +26,7 @@ import pytest
 from covalent_dispatcher._db.datastore import DataStore
 from covalent_dispatcher._db.jobdb import (
     MissingJobRecordError,
+    get_dispatch_job_records,
     get_job_record,
     to_job_ids,
     update_job_records,
@@ -134,3 +135,44 @@ def test_to_job_ids(test_db, mocker):
 
     job_ids = to_job_ids("test_dispatch", [0, 1])
     assert job_ids == [1, 2]
+
+
+def test_get_dispatch_job_records(test_db, mocker):
+    """
+    Test retrieving the job records of all tasks of a dispatch
+    """
+    mocker.patch("covalent_dispatcher._db.jobdb.workflow_db", test_db)
+    mocker.patch("covalent_dispatcher._db.write_result_to_db.workflow_db", test_db)
+    cur_time = dt.now(timezone.utc)
+    lattice_kwargs = get_lattice_kwargs(
+        dispatch_id="test_dispatch", created_at=cur_time, updated_at=cur_time, started_at=cur_time
+    )
+    insert_lattices_data(**lattice_kwargs)
+
+    for task_id, cancel_requested in [(0, False), (1, True)]:
+        electron_kwargs = get_electron_kwargs(
+            parent_dispatch_id="test_dispatch",
+            transport_graph_node_id=task_id,
+            cancel_requested=cancel_requested,
+            created_at=cur_time,
+            updated_at=cur_time,
+        )
+        insert_electrons_data(**electron_kwargs)
+
+    records = get_dispatch_job_records("test_dispatch")
+    assert records == {
+        0: {
+            "job_id": 1,
+            "cancel_requested": False,
+            "cancel_successful": False,
+            "job_handle": "null",
+        },
+        1: {
+            "job_id": 2,
+            "cancel_requested": True,
+            "cancel_successful": False,
+            "job_handle": "null",
+        },
+    }
+
+    assert get_dispatch_job_records("other_dispatch") == {}
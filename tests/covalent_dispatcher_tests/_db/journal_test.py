@@ -0,0 +1,322 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for the write-behind journal of node updates"""
+
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import covalent as ct
+from covalent._results_manager.result import Result
+from covalent._workflow.lattice import Lattice as LatticeClass
+from covalent._workflow.transportable_object import TransportableObject
+from covalent_dispatcher._db import upsert
+from covalent_dispatcher._db.journal import (
+    WriteBehindJournal,
+    _read_records,
+    close_journal,
+    get_journal,
+)
+from covalent_dispatcher._db.write_result_to_db import StoredObjectRef
+
+
+@pytest.fixture
+def result():
+    @ct.electron
+    def task(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        return task(x)
+
+    workflow.build_graph(x=1)
+    received_lattice = LatticeClass.deserialize_from_json(workflow.serialize_to_json())
+    result = Result(received_lattice, dispatch_id="journal_dispatch")
+    result._initialize_nodes()
+    result.lattice.transport_graph.dirty_nodes.clear()
+    return result
+
+
+def _update(result, node_result):
+    """Apply a node result and return the snapshot of the updated node."""
+    result._update_node(**node_result)
+    return upsert.take_dirty_node_records(result)
+
+
+def _append(journal, result, node_result):
+    journal.append(result, [node_result], _update(result, node_result))
+
+
+def test_journal_append_and_commit(mocker, tmp_path, result):
+    """Test that journaled updates are written to the DB in one group commit."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    electron_records_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records"
+    )
+    path = str(tmp_path / "journal.pkl")
+    journal = WriteBehindJournal(path, flush_interval=3600, flush_records=1000)
+
+    node_result = {"node_id": 0, "status": "RUNNING", "sublattice_result": "not journaled"}
+    _append(journal, result, node_result)
+
+    assert _read_records(path) == [("journal_dispatch", {"node_id": 0, "status": "RUNNING"})]
+    electron_records_mock.assert_not_called()
+
+    # The commit writes the journaled snapshot, not the live node
+    result._update_node(node_id=0, status="COMPLETED")
+
+    journal.commit()
+    _, args, _ = electron_records_mock.mock_calls[0]
+    assert args[1] == "journal_dispatch"
+    assert args[2] is result.lattice.metadata
+    assert [(record["node_id"], record["status"]) for record in args[3]] == [(0, "RUNNING")]
+    assert _read_records(path) == []
+
+    journal.close()
+
+
+def test_journal_append_is_durable(mocker, tmp_path, result):
+    """Test that records are fsynced before append returns."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    mocker.patch("covalent_dispatcher._db.journal.upsert._electron_records")
+    journal = WriteBehindJournal(
+        str(tmp_path / "journal.pkl"), flush_interval=3600, flush_records=1000
+    )
+    fsync_spy = mocker.spy(os, "fsync")
+
+    _append(journal, result, {"node_id": 0, "status": "RUNNING"})
+    fsync_spy.assert_called_once_with(journal._file.fileno())
+
+    journal.close()
+
+
+def test_journal_syncs_appends_in_batches(mocker, tmp_path, result):
+    """Test that appends made while a batch is synced are synced together."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    mocker.patch("covalent_dispatcher._db.journal.upsert._electron_records")
+    path = str(tmp_path / "journal.pkl")
+    journal = WriteBehindJournal(path, flush_interval=3600, flush_records=1000)
+    fsync_spy = mocker.spy(os, "fsync")
+
+    with journal._file_lock:
+        threads = [
+            threading.Thread(
+                target=journal.append,
+                args=(result, [{"node_id": node_id, "status": "RUNNING"}], []),
+            )
+            for node_id in (0, 1)
+        ]
+        for thread in threads:
+            thread.start()
+        while journal._num_appends < 2:
+            time.sleep(0.01)
+
+    for thread in threads:
+        thread.join()
+
+    fsync_spy.assert_called_once_with(journal._file.fileno())
+    assert len(_read_records(path)) == 2
+
+    journal.close()
+
+
+def test_journal_stores_outputs_by_reference(mocker, tmp_path, result):
+    """Test that node outputs are written to their results files, not to the journal."""
+    mocker.patch.dict(os.environ, {"COVALENT_DATA_DIR": str(tmp_path)})
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    electron_records_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records"
+    )
+    sync_mock = mocker.patch("covalent_dispatcher._db.journal.os.sync")
+    path = str(tmp_path / "journal.pkl")
+    journal = WriteBehindJournal(path, flush_interval=3600, flush_records=1000)
+
+    output = TransportableObject("x" * 1000)
+    _append(journal, result, {"node_id": 0, "status": "COMPLETED", "output": output})
+
+    [(_, record)] = _read_records(path)
+    assert isinstance(record["output"], StoredObjectRef)
+    assert record["output"].load().get_deserialized() == "x" * 1000
+    assert os.path.getsize(path) < 1000
+
+    # The results file is synced with the batch
+    sync_mock.assert_called_once()
+
+    journal.commit()
+    [node_record] = electron_records_mock.mock_calls[0].args[3]
+    assert isinstance(node_record["output"], StoredObjectRef)
+    assert repr(node_record["output"]) == repr(record["output"])
+
+    journal.close()
+
+
+def test_journal_commit_keeps_records_appended_during_commit(mocker, tmp_path, result):
+    """Test that only the committed records are cut from the journal."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    path = str(tmp_path / "journal.pkl")
+    journal = WriteBehindJournal(path, flush_interval=3600, flush_records=1000)
+
+    def _electron_records(*args):
+        _append(journal, result, {"node_id": 1, "status": "RUNNING"})
+
+    mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records", side_effect=_electron_records
+    )
+
+    _append(journal, result, {"node_id": 0, "status": "RUNNING"})
+    journal.commit()
+    assert _read_records(path) == [("journal_dispatch", {"node_id": 1, "status": "RUNNING"})]
+    assert journal.has_pending("journal_dispatch", 1)
+
+    _append(journal, result, {"node_id": 1, "status": "COMPLETED"})
+    assert len(_read_records(path)) == 2
+
+    journal.close()
+
+
+def test_journal_commit_failure_keeps_updates(mocker, tmp_path, result):
+    """Test that updates are retried on the next commit if a commit fails."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    electron_records_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records",
+        side_effect=[RuntimeError("db error"), None],
+    )
+    path = str(tmp_path / "journal.pkl")
+    journal = WriteBehindJournal(path, flush_interval=3600, flush_records=1000)
+
+    _append(journal, result, {"node_id": 0, "status": "RUNNING"})
+    _append(journal, result, {"node_id": 0, "status": "COMPLETED"})
+
+    with pytest.raises(RuntimeError):
+        journal.commit()
+    assert len(_read_records(path)) == 2
+
+    journal.commit()
+    assert electron_records_mock.call_count == 2
+    [record] = electron_records_mock.mock_calls[1].args[3]
+    assert (record["node_id"], record["status"]) == (0, "COMPLETED")
+    assert _read_records(path) == []
+
+    journal.close()
+
+
+def test_journal_replay(mocker, tmp_path, result):
+    """Test that records left in the journal are replayed when it is opened."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    electron_records_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records"
+    )
+    load_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.load.get_result_object_from_storage",
+        return_value=result,
+    )
+
+    path = tmp_path / "journal.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(("journal_dispatch", {"node_id": 0, "status": "COMPLETED", "output": 5}), f)
+        # Torn record written during a crash
+        f.write(pickle.dumps(("journal_dispatch", {"node_id": 1}))[:-3])
+
+    journal = WriteBehindJournal(str(path), flush_interval=3600, flush_records=1000)
+
+    load_mock.assert_called_once_with("journal_dispatch")
+    _, args, _ = electron_records_mock.mock_calls[0]
+    assert args[1] == "journal_dispatch"
+    [record] = args[3]
+    assert (record["node_id"], record["status"], record["output"]) == (0, "COMPLETED", 5)
+    assert _read_records(str(path)) == []
+
+    journal.close()
+
+
+def test_journal_commits_when_flush_records_reached(mocker, tmp_path, result):
+    """Test that the commit thread commits once enough records are pending."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    electron_records_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records"
+    )
+    journal = WriteBehindJournal(
+        str(tmp_path / "journal.pkl"), flush_interval=3600, flush_records=1
+    )
+
+    _append(journal, result, {"node_id": 0, "status": "RUNNING"})
+
+    for _ in range(100):
+        if electron_records_mock.called:
+            break
+        time.sleep(0.05)
+    electron_records_mock.assert_called_once()
+
+    journal.close()
+
+
+def test_journal_has_pending(mocker, tmp_path, result):
+    """Test that nodes are pending until their updates have been committed."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    journal = WriteBehindJournal(
+        str(tmp_path / "journal.pkl"), flush_interval=3600, flush_records=1000
+    )
+
+    def _electron_records(*args):
+        assert journal.has_pending("journal_dispatch", 0)
+
+    electron_records_mock = mocker.patch(
+        "covalent_dispatcher._db.journal.upsert._electron_records", side_effect=_electron_records
+    )
+
+    _append(journal, result, {"node_id": 0, "status": "COMPLETED"})
+    assert journal.has_pending("journal_dispatch", 0)
+    assert not journal.has_pending("journal_dispatch", 1)
+    assert not journal.has_pending("other_dispatch", 0)
+
+    journal.commit()
+    electron_records_mock.assert_called_once()
+    assert not journal.has_pending("journal_dispatch", 0)
+
+    journal.close()
+
+
+def test_get_journal_opens_one_journal(mocker, tmp_path):
+    """Test that concurrent callers of get_journal share a single journal."""
+    mocker.patch("covalent_dispatcher._db.journal.upsert.workflow_db")
+    config = {
+        "dispatcher.write_behind": "true",
+        "dispatcher.journal_path": str(tmp_path / "journal.pkl"),
+        "dispatcher.journal_flush_interval_ms": "3600000",
+        "dispatcher.journal_flush_records": "1000",
+    }
+    mocker.patch("covalent_dispatcher._db.journal.get_config", side_effect=config.get)
+    init_spy = mocker.spy(WriteBehindJournal, "__init__")
+    close_journal()
+
+    with ThreadPoolExecutor(8) as pool:
+        journals = list(pool.map(lambda _: get_journal(), range(8)))
+
+    try:
+        assert init_spy.call_count == 1
+        assert all(journal is journals[0] for journal in journals)
+    finally:
+        close_journal()
@@ -25,13 +25,18 @@ from unittest.mock import MagicMock, call
 
 import pytest
 
+from covalent._data_store import ObjectRef
 from covalent._shared_files.util_classes import Status
+from covalent._workflow.transport import TransportableObject, _TransportGraph
 from covalent_dispatcher._db.load import (
+    _load_referenced_outputs,
     _result_from,
+    _result_string_from,
     electron_record,
     get_result_object_from_storage,
     sublattice_dispatch_id,
 )
+from covalent_dispatcher._db.write_result_to_db import StoredObjectRef, store_file
 
 
 def test_result_from(mocker):
@@ -194,6 +199,33 @@ def test_result_from(mocker):
     assert args[0].__name__ == "dummy_function"
 
 
+def test_load_referenced_outputs(tmp_path):
+    """Test that spilled node outputs and outputs passed by reference are loaded."""
+    tg = _TransportGraph()
+    tg.add_node(name="a", function=None, metadata={})
+    tg.add_node(name="b", function=None, metadata={})
+    store_file(tmp_path, "results.pkl", "spilled output")
+    tg.set_node_value(0, "output", StoredObjectRef(tmp_path, "results.pkl"))
+    tg.set_node_value(1, "output", 5)
+    tg.add_node(name="c", function=None, metadata={})
+    output_ref = ObjectRef(tmp_path, "dispatch", "node_2.pkl").store(TransportableObject(3))
+    tg.set_node_value(2, "output", output_ref)
+
+    _load_referenced_outputs(tg)
+
+    assert tg.get_node_value(0, "output") == "spilled output"
+    assert tg.get_node_value(1, "output") == 5
+    assert tg.get_node_value(2, "output").get_deserialized() == 3
+
+
+def test_result_string_from(tmp_path, mocker):
+    """Test that the string of the workflow output is read without its data."""
+    store_file(tmp_path, "results.pkl", TransportableObject([1, 2]))
+    lattice_record = mocker.MagicMock(storage_path=str(tmp_path), results_filename="results.pkl")
+
+    assert _result_string_from(lattice_record) == "[1, 2]"
+
+
 def test_get_result_object_from_storage(mocker):
     """Test the get_result_object_from_storage method."""
     from covalent_dispatcher._db.load import Lattice
@@ -26,6 +26,7 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from sqlalchemy import event
 
 import covalent as ct
 from covalent._results_manager.result import Result
@@ -452,3 +453,94 @@ def test_node(mocker, node_name):
     else:
         assert mock_result._result != "mock_output"
         assert mock_result._status != "COMPLETED"
+
+
+def test_nodes(mocker):
+    """Test that _nodes updates all the nodes before a single DB write."""
+    electron_data_mock = mocker.patch("covalent_dispatcher._db.upsert.electron_data")
+    lattice_data_mock = mocker.patch("covalent_dispatcher._db.upsert.lattice_data")
+    mock_result = MagicMock()
+    node_results = [
+        {"node_id": 0, "node_name": "mock_node_name", "status": "COMPLETED", "output": 1},
+        {"node_id": 1, "node_name": postprocess_prefix, "status": "COMPLETED", "output": 2},
+    ]
+    update._nodes(mock_result, node_results)
+
+    assert mock_result._update_node.call_count == 2
+    electron_data_mock.assert_called_once_with(mock_result, node_records=[])
+    lattice_data_mock.assert_called_once_with(mock_result)
+    assert mock_result._result == 2
+
+
+def test_nodes_single_transaction(test_db, result_1, mocker):
+    """Test that a batch of updates to existing electrons is written in one transaction."""
+    mocker.patch("covalent_dispatcher._db.write_result_to_db.workflow_db", test_db)
+    mocker.patch("covalent_dispatcher._db.upsert.workflow_db", test_db)
+    update.persist(result_1)
+
+    commits = []
+    event.listen(test_db.engine, "commit", commits.append)
+    session_spy = mocker.spy(test_db, "write_session")
+
+    # The postprocess node also writes the lattice result
+    tg = result_1.lattice.transport_graph
+    node_ids = [
+        node_id
+        for node_id in tg._graph.nodes
+        if not tg.get_node_value(node_id, "name").startswith(postprocess_prefix)
+    ]
+    node_results = [
+        {"node_id": node_id, "status": Result.COMPLETED, "end_time": dt.now(timezone.utc)}
+        for node_id in node_ids
+    ]
+    update._nodes(result_1, node_results)
+
+    assert session_spy.call_count == 1
+    assert len(commits) == 1
+
+    with test_db.session() as session:
+        lattice_record = session.query(Lattice).first()
+        completed_electrons = (
+            session.query(Electron).where(Electron.status == str(Result.COMPLETED)).count()
+        )
+        assert lattice_record.completed_electron_num == len(node_ids)
+        assert completed_electrons == len(node_ids)
+
+    teardown_temp_results_dir(dispatch_id="dispatch_1")
+
+
+def test_apply_nodes_snapshots_dirty_nodes(result_1):
+    """Test that apply_nodes only updates memory and hands over snapshots of the dirty nodes."""
+    tg = result_1.lattice.transport_graph
+    tg.dirty_nodes.clear()
+    node_results = [
+        {"node_id": 1, "node_name": "mock_node_name", "status": Result.RUNNING},
+        {"node_id": 0, "node_name": "mock_node_name", "status": Result.COMPLETED},
+        {"node_id": 1, "node_name": "mock_node_name", "status": Result.COMPLETED},
+    ]
+
+    node_records = update.apply_nodes(result_1, node_results)
+    assert [record["node_id"] for record in node_records] == [1, 0]
+    assert tg.dirty_nodes == []
+
+    # Later updates don't change the snapshot handed to the persistence worker
+    result_1._update_node(node_id=0, status=Result.FAILED)
+    assert node_records[1]["status"] == Result.COMPLETED
+
+
+def test_nodes_write_behind(mocker):
+    """Test that _nodes journals the node updates when write-behind is enabled."""
+    electron_data_mock = mocker.patch("covalent_dispatcher._db.upsert.electron_data")
+    lattice_data_mock = mocker.patch("covalent_dispatcher._db.upsert.lattice_data")
+    journal_mock = MagicMock()
+    mocker.patch("covalent_dispatcher._db.update.get_journal", return_value=journal_mock)
+    mock_result = MagicMock()
+    node_results = [
+        {"node_id": 0, "node_name": "mock_node_name", "status": "COMPLETED", "output": 1},
+    ]
+    update._nodes(mock_result, node_results)
+
+    journal_mock.append.assert_called_once_with(mock_result, node_results, [])
+    journal_mock.commit.assert_not_called()
+    electron_data_mock.assert_not_called()
+    lattice_data_mock.assert_not_called()
@@ -23,6 +23,7 @@ from pathlib import Path
 import pytest
 
 import covalent as ct
+from covalent._data_store import ObjectRef
 from covalent._results_manager.result import Result
 from covalent._workflow.lattice import Lattice as LatticeClass
 from covalent.executor import LocalExecutor
@@ -33,9 +34,13 @@ from covalent_dispatcher._db.upsert import (
     ELECTRON_STDERR_FILENAME,
     ELECTRON_STDOUT_FILENAME,
     LATTICE_FUNCTION_STRING_FILENAME,
+    LATTICE_TRANSPORT_GRAPH_FILENAME,
+    _CompressionPolicy,
+    _get_persisted_transport_graph,
     electron_data,
     lattice_data,
 )
+from covalent_dispatcher._db.write_result_to_db import StoredObjectRef, store_file
 
 TEMP_RESULTS_DIR = os.environ.get("COVALENT_DATA_DIR") or ct.get_config("dispatcher.results_dir")
 le = LocalExecutor(log_stdout="/tmp/stdout.log")
@@ -97,10 +102,10 @@ def test_upsert_electron_data_handles_missing_keys(test_db, result_1, mocker):
     electron_data(result_1)
 
     node_path = Path(TEMP_RESULTS_DIR) / result_1.dispatch_id / "node_0"
-    mock_store_file.assert_any_call(node_path, ELECTRON_ERROR_FILENAME, None)
-    mock_store_file.assert_any_call(node_path, ELECTRON_STDOUT_FILENAME, None)
-    mock_store_file.assert_any_call(node_path, ELECTRON_STDERR_FILENAME, None)
-    mock_store_file.assert_any_call(node_path, ELECTRON_RESULTS_FILENAME, None)
+    mock_store_file.assert_any_call(node_path, ELECTRON_ERROR_FILENAME, None, None)
+    mock_store_file.assert_any_call(node_path, ELECTRON_STDOUT_FILENAME, None, None)
+    mock_store_file.assert_any_call(node_path, ELECTRON_STDERR_FILENAME, None, None)
+    mock_store_file.assert_any_call(node_path, ELECTRON_RESULTS_FILENAME, None, None)
 
 
 def test_public_lattice_data(test_db, result_1, mocker):
@@ -114,10 +119,77 @@ def test_public_lattice_data(test_db, result_1, mocker):
 
     lattice_data(result_1)
     mock_store_file.assert_any_call(
-        lattice_path, LATTICE_FUNCTION_STRING_FILENAME, result_1.lattice.workflow_function_string
+        lattice_path,
+        LATTICE_FUNCTION_STRING_FILENAME,
+        result_1.lattice.workflow_function_string,
+        None,
     )
 
     del result_1.lattice.__dict__["workflow_function_string"]
     mock_store_file.reset_mock()
     lattice_data(result_1)
-    mock_store_file.assert_any_call(lattice_path, LATTICE_FUNCTION_STRING_FILENAME, None)
+    mock_store_file.assert_any_call(lattice_path, LATTICE_FUNCTION_STRING_FILENAME, None, None)
+
+
+def test_object_refs_are_loaded_before_persisting(test_db, result_1, mocker, tmp_path):
+    """Test that outputs passed by reference are loaded in the persisted results."""
+    mocker.patch("covalent_dispatcher._db.upsert.workflow_db", test_db)
+    mock_store_file = mocker.patch("covalent_dispatcher._db.upsert.store_file")
+    mocker.patch("covalent_dispatcher._db.upsert.transaction_insert_lattices_data")
+    mocker.patch("covalent_dispatcher._db.upsert.transaction_update_lattices_data")
+    mocker.patch("covalent_dispatcher._db.upsert.transaction_insert_electrons_data")
+
+    tg = result_1.lattice.transport_graph
+    output_ref = ObjectRef(tmp_path, "dispatch_1", "node_0.pkl").store(ct.TransportableObject(2))
+    tg.set_node_value(0, "output", output_ref)
+
+    lattice_data(result_1)
+    persisted_tg = next(
+        call.args[2]
+        for call in mock_store_file.call_args_list
+        if call.args[1] == LATTICE_TRANSPORT_GRAPH_FILENAME
+    )
+    assert persisted_tg is not tg
+    assert persisted_tg.get_node_value(0, "output").get_deserialized() == 2
+    assert tg.get_node_value(0, "output") is output_ref
+
+    mock_store_file.reset_mock()
+    electron_data(result_1)
+    node_path = Path(TEMP_RESULTS_DIR) / result_1.dispatch_id / "node_0"
+    output = next(
+        call.args[2]
+        for call in mock_store_file.call_args_list
+        if call.args[:2] == (node_path, ELECTRON_RESULTS_FILENAME)
+    )
+    assert output.get_deserialized() == 2
+
+
+def test_spilled_outputs_are_loaded_in_persisted_graph(result_1, tmp_path):
+    """Test that spilled outputs are loaded in the persisted transport graph."""
+    tg = result_1.lattice.transport_graph
+    store_file(tmp_path, ELECTRON_RESULTS_FILENAME, ct.TransportableObject(2))
+    tg.set_node_value(0, "output", StoredObjectRef(tmp_path, ELECTRON_RESULTS_FILENAME))
+
+    persisted_tg = _get_persisted_transport_graph(tg)
+    assert persisted_tg.get_node_value(0, "output").get_deserialized() == 2
+    assert isinstance(tg.get_node_value(0, "output"), StoredObjectRef)
+
+
+def test_compression_policy(mocker):
+    """Test that the codec is chosen by the electron, the lattice, then the config."""
+
+    config = {"dispatcher.compression": "zlib", "dispatcher.compression_threshold": 100}
+    mocker.patch("covalent_dispatcher._db.upsert.get_config", side_effect=config.get)
+    large = ct.TransportableObject("x" * 1000)
+
+    policy = _CompressionPolicy({})
+    assert policy.get_codec(large) == "zlib"
+    assert policy.get_codec(large, {"compression": "lzma"}) == "lzma"
+    assert policy.get_codec(large, {"compression": "none"}) is None
+    assert policy.get_codec(large, {"compression": "unknown"}) is None
+    assert policy.get_codec(ct.TransportableObject(1)) is None
+    assert policy.get_codec({"x": "x" * 1000}) is None
+
+    policy = _CompressionPolicy({"compression": "bz2"})
+    assert policy.get_codec(large) == "bz2"
+    assert policy.get_codec(large, {"compression": "lzma"}) == "lzma"
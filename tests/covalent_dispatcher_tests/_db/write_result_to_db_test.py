@@ -20,6 +20,7 @@
 
 """Unit tests for the module used to write the decomposed result object to the database."""
 
+import os
 import tempfile
 from datetime import datetime as dt
 from datetime import timezone
@@ -784,3 +785,21 @@ def test_store_and_load_file():
         data = None
         store_file(storage_path=temp_dir, filename="pickle.txt", data=data)
         assert load_file(storage_path=temp_dir, filename="pickle.txt") == ""
+
+
+@pytest.mark.parametrize("codec", [None, "zlib", "lzma", "bz2"])
+def test_store_and_load_compressed_file(codec):
+    """Test that transportable objects are stored as archives, compressed or not, and loaded back."""
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data = ct.TransportableObject("x" * 10000)
+        store_file(storage_path=temp_dir, filename="results.pkl", data=data, codec=codec)
+
+        with open(os.path.join(temp_dir, "results.pkl"), "rb") as f:
+            assert ct.TransportableObject.is_archive(f.read(1))
+        assert load_file(storage_path=temp_dir, filename="results.pkl") == data
+        assert os.listdir(temp_dir) == ["results.pkl"]
+
+        string_only = load_file(storage_path=temp_dir, filename="results.pkl", string_only=True)
+        assert string_only.object_string == data.object_string
+        assert string_only.get_serialized() == b""
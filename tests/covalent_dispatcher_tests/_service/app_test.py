@@ -26,12 +26,15 @@ from contextlib import contextmanager
 from typing import Generator
 
 import pytest
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 from sqlalchemy import Column, Integer, String, create_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from covalent._results_manager.result import Result
+from covalent._shared_files.tracing import Tracer
 from covalent_dispatcher._db.dispatchdb import DispatchDB
+from covalent_dispatcher._service.app_shards import ShardRouter
 from covalent_ui.app import fastapi_app as fast_app
 
 DISPATCH_ID = "f34671d1-48f2-41ce-89d9-9a8cb5c60e5d"
@@ -67,7 +70,8 @@ def app():
 
 
 @pytest.fixture
-def client():
+def client(mocker):
+    mocker.patch("covalent_dispatcher.resume_dispatches")
     with TestClient(fast_app) as c:
         yield c
 
@@ -195,6 +199,88 @@ async def test_cancel_exception(mocker, client):
         cancel_running_dispatch_mock.assert_called_once_with(DISPATCH_ID, [])
 
 
+@pytest.mark.parametrize(
+    "path,params,routed_by_id",
+    [
+        ("/api/submit", {"disable_run": True}, False),
+        ("/api/redispatch", {"is_pending": False}, True),
+        ("/api/cancel", None, True),
+    ],
+)
+def test_requests_forwarded_to_shards(mocker, client, path, params, routed_by_id):
+    """Test that the dispatcher requests are forwarded to the shards when sharded."""
+    shard_router = ShardRouter(["http://shard-0", "http://shard-1"])
+    forward_mock = mocker.patch.object(
+        shard_router, "forward", return_value=JSONResponse(content=DISPATCH_ID)
+    )
+    mocker.patch("covalent_dispatcher._service.app.shard_router", shard_router)
+    run_dispatcher_mock = mocker.patch("covalent_dispatcher.run_dispatcher")
+    run_redispatch_mock = mocker.patch("covalent_dispatcher.run_redispatch")
+    cancel_running_dispatch_mock = mocker.patch("covalent_dispatcher.cancel_running_dispatch")
+
+    data = {"dispatch_id": DISPATCH_ID, "task_ids": []}
+    response = client.post(path, data=json.dumps(data), params=params)
+
+    assert response.json() == DISPATCH_ID
+    address = shard_router.get_owner(DISPATCH_ID) if routed_by_id else "http://shard-0"
+    forward_args = (address, path, data, params) if params else (address, path, data)
+    forward_mock.assert_called_once_with(*forward_args)
+    run_dispatcher_mock.assert_not_called()
+    run_redispatch_mock.assert_not_called()
+    cancel_running_dispatch_mock.assert_not_called()
+
+
+def test_get_metrics(mocker, client):
+    """Test that the phase histograms are served in the Prometheus text format."""
+    tracer = Tracer()
+    tracer.record("run_executor", DISPATCH_ID, 0.0)
+    mocker.patch("covalent._shared_files.tracing.get_tracer", return_value=tracer)
+    executor_queues = {"local": {"queued": 2, "in_flight": 1, "limit": 1, "instances": 1}}
+    mocker.patch(
+        "covalent_dispatcher._service.app.runner.get_executor_queue_stats",
+        return_value=executor_queues,
+    )
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'covalent_dispatcher_phase_seconds_count{phase="run_executor"} 1' in response.text
+    assert 'covalent_executor_queued_tasks{executor="local"} 2' in response.text
+
+    response = client.get("/api/metrics", params={"as_json": True})
+    assert response.json() == {**tracer.get_snapshot(), "executor_queues": executor_queues}
+
+
+def test_get_metrics_from_shards(mocker, client):
+    """Test that the phase histograms of the dispatcher shards are merged."""
+    tracer = Tracer()
+    tracer.record("run_executor", DISPATCH_ID, 0.0)
+    shard_router = ShardRouter(["http://shard-0", "http://shard-1"])
+    get_json_mock = mocker.patch.object(
+        shard_router, "get_json", return_value=tracer.get_snapshot()
+    )
+    mocker.patch("covalent_dispatcher._service.app.shard_router", shard_router)
+    mocker.patch("covalent._shared_files.tracing.get_tracer", return_value=None)
+    get_json_mock.return_value["executor_queues"] = {
+        "local": {"queued": 1, "in_flight": 2, "limit": 2, "instances": 1}
+    }
+    mocker.patch(
+        "covalent_dispatcher._service.app.runner.get_executor_queue_stats", return_value={}
+    )
+
+    response = client.get("/api/metrics", params={"as_json": True})
+
+    assert get_json_mock.call_count == 2
+    assert response.json()["global"]["run_executor"]["count"] == 2
+    assert response.json()["dispatches"][DISPATCH_ID]["run_executor"]["count"] == 2
+    assert response.json()["executor_queues"]["local"] == {
+        "queued": 2,
+        "in_flight": 4,
+        "limit": 4,
+        "instances": 2,
+    }
+
+
 def test_get_result(mocker, client, test_db_file):
     """Test the get-result endpoint."""
     lattice = MockLattice(
@@ -216,6 +302,28 @@ def test_get_result(mocker, client, test_db_file):
     os.remove("/tmp/testdb.sqlite")
 
 
+def test_get_result_status_only(mocker, client, test_db_file):
+    """Test that the get-result endpoint returns the output string without the result object."""
+    lattice = MockLattice(
+        status=str(Result.COMPLETED),
+        dispatch_id=DISPATCH_ID,
+    )
+
+    with test_db_file.session() as session:
+        session.add(lattice)
+        session.commit()
+
+    mock_result_from = mocker.patch("covalent_dispatcher._service.app._result_from")
+    mocker.patch("covalent_dispatcher._service.app._result_string_from", return_value="[1, 2]")
+    mocker.patch("covalent_dispatcher._service.app.workflow_db", test_db_file)
+    mocker.patch("covalent_dispatcher._service.app.Lattice", MockLattice)
+    response = client.get(f"/api/result/{DISPATCH_ID}?status_only=True")
+    result = response.json()
+    assert result == {"id": DISPATCH_ID, "status": Result.COMPLETED, "result_string": "[1, 2]"}
+    mock_result_from.assert_not_called()
+    os.remove("/tmp/testdb.sqlite")
+
+
 def test_get_result_503(mocker, client, test_db_file):
     """Test the get-result endpoint."""
     lattice = MockLattice(
@@ -21,6 +21,9 @@
 """Unit tests for the FastAPI app."""
 
 
+import subprocess
+import sys
+
 import pytest
 
 from covalent_dispatcher.entry_point import cancel_running_dispatch, run_dispatcher, run_redispatch
@@ -87,3 +90,11 @@ async def test_cancel_running_dispatch(mocker):
     mock_cancel_workflow = mocker.patch("covalent_dispatcher.entry_point.cancel_dispatch")
     await cancel_running_dispatch(DISPATCH_ID)
     mock_cancel_workflow.assert_awaited_once_with(DISPATCH_ID, [])
+
+
+@pytest.mark.parametrize(
+    "module", ["covalent_dispatcher", "covalent_ui.api.main", "covalent_ui.app"]
+)
+def test_import(module):
+    """Test that the dispatcher and the UI server import in a fresh interpreter."""
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
@@ -0,0 +1,50 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Tests for references to objects in an object store"""
+
+import pickle
+
+import pytest
+
+from covalent import TransportableObject
+from covalent._data_store import ObjectRef
+
+
+def test_object_ref_store_and_load(tmp_path):
+    """Test that stored objects are loaded back and can be overwritten."""
+    ref = ObjectRef(tmp_path, "dispatch", "node_0.pkl")
+    stored = ref.store(TransportableObject([1, 2]))
+
+    assert (stored.bucket_name, stored.object_name) == ("dispatch", "node_0.pkl")
+    assert stored.size == (tmp_path / "dispatch" / "node_0.pkl").stat().st_size
+    assert stored.load().get_deserialized() == [1, 2]
+
+    ref.store(TransportableObject("new"))
+    assert stored.load().get_deserialized() == "new"
+
+    # References are sent to executors
+    assert pickle.loads(pickle.dumps(stored)).load().get_deserialized() == "new"
+
+
+def test_object_ref_load_missing_object(tmp_path):
+    """Test that loading a missing object raises an error."""
+    with pytest.raises(FileNotFoundError):
+        ObjectRef(tmp_path, "dispatch", "node_0.pkl").load()
@@ -28,10 +28,11 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from covalent import DepsCall, TransportableObject
+from covalent._data_store import ObjectRef
 from covalent._results_manager import Result
 from covalent._shared_files.exceptions import TaskCancelledError, TaskRuntimeError
 from covalent.executor import BaseExecutor, wrapper_fn
-from covalent.executor.base import AsyncBaseExecutor
+from covalent.executor.base import AsyncBaseExecutor, reference_wrapper_fn, task_group_wrapper_fn
 from covalent.executor.utils.wrappers import Signals
 
 
@@ -171,6 +172,54 @@ def test_wrapper_fn_calldep_non_unique_retval_keys_injection():
     assert output.get_deserialized() == 6
 
 
+def test_reference_wrapper_fn(tmp_path):
+    """Test passing task inputs and outputs by reference"""
+
+    def f(x, y):
+        return x + y
+
+    input_ref = ObjectRef(tmp_path, "dispatch", "input.pkl").store(TransportableObject(5))
+    output_ref = ObjectRef(tmp_path, "dispatch", "output.pkl")
+
+    ref = reference_wrapper_fn(
+        TransportableObject(f), [], [], output_ref, input_ref, y=TransportableObject(2)
+    )
+
+    assert isinstance(ref, ObjectRef)
+    assert ref.object_name == "output.pkl"
+    assert ref.size > 0
+    assert ref.load().get_deserialized() == 7
+
+    # Inputs passed by reference are loaded by the plain wrapper too
+    assert wrapper_fn(TransportableObject(f), [], [], ref, y=ref).get_deserialized() == 14
+
+
+def test_task_group_wrapper_fn():
+    """Test running a packed task group in a single invocation"""
+
+    def add(x, y):
+        return x + y
+
+    def double(x):
+        return 2 * x
+
+    serialized_add = TransportableObject(add)
+    tasks = [
+        (3, serialized_add, [], [], [("input", 0), ("input", 1)], {}),
+        (4, TransportableObject(double), [], [], [], {"x": ("node", 3)}),
+        (5, serialized_add, [], [], [("node", 4), ("input", 0)], {}),
+    ]
+    args = [TransportableObject(1), TransportableObject(2)]
+
+    outputs = task_group_wrapper_fn(serialized_add, tasks, [4, 5], *args)
+
+    # Only the outputs of the boundary nodes are returned
+    assert {node_id: output.get_deserialized() for node_id, output in outputs.items()} == {
+        4: 6,
+        5: 7,
+    }
+
+
 def test_base_executor_subclassing():
     """Test that executors must implement run"""
 
@@ -805,3 +854,51 @@ async def test_base_async_executor_private_cancel(mocker):
     mock_app_log.assert_called_with(f"Cancel not implemented for executor {type(me)}")
     me.teardown.assert_awaited_with(task_metadata)
     assert cancel_result is False
+
+
+@pytest.mark.asyncio
+async def test_base_executor_resume_not_implemented():
+    me = MockExecutor()
+    with pytest.raises(NotImplementedError):
+        await me._resume({}, 42)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "side_effect,output,status",
+    [
+        (None, "output", Result.COMPLETED),
+        (TaskRuntimeError("error"), None, Result.FAILED),
+        (TaskCancelledError("cancelled"), None, Result.CANCELLED),
+    ],
+)
+async def test_base_executor_resume(side_effect, output, status):
+    me = MockExecutor()
+    me.resume = MagicMock(return_value="output", side_effect=side_effect)
+
+    assert await me._resume({}, 42) == (output, "", "", status)
+    me.resume.assert_called_once_with({}, 42)
+
+
+@pytest.mark.asyncio
+async def test_base_async_executor_resume_not_implemented():
+    me = MockAsyncExecutor()
+    with pytest.raises(NotImplementedError):
+        await me._resume({}, 42)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "side_effect,output,status",
+    [
+        (None, "output", Result.COMPLETED),
+        (TaskRuntimeError("error"), None, Result.FAILED),
+        (TaskCancelledError("cancelled"), None, Result.CANCELLED),
+    ],
+)
+async def test_base_async_executor_resume(side_effect, output, status):
+    me = MockAsyncExecutor()
+    me.resume = AsyncMock(return_value="output", side_effect=side_effect)
+
+    assert await me._resume({}, 42) == (output, "", "", status)
+    me.resume.assert_awaited_once_with({}, 42)
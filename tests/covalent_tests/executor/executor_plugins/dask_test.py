@@ -238,3 +238,34 @@ def test_dask_task_cancel(mocker):
     result = asyncio.run(dask_exec.cancel(task_metadata, job_handle))
     mock_app_log.assert_called_with(f"Cancelled future with key {job_handle}")
     assert result is True
+
+
+def test_dask_executor_shared_client(mocker):
+    """Test that a pooled dask executor connects once and closes the client on teardown"""
+
+    import copy
+
+    mock_client = AsyncMock()
+
+    async def connect():
+        return mock_client
+
+    # Awaiting an asynchronous client connects it and returns the client
+    mock_client_cls = mocker.patch(
+        "covalent.executor.executor_plugins.dask.Client", return_value=connect()
+    )
+
+    async def run_pooled():
+        dask_exec = DaskExecutor("127.0.0.1")
+        await dask_exec.setup_shared()
+        task_exec = copy.copy(dask_exec)
+        assert await task_exec._get_client() is mock_client
+        assert "_shared_client" not in task_exec.to_dict()["attributes"]
+        await dask_exec.teardown_shared()
+        return dask_exec
+
+    dask_exec = asyncio.run(run_pooled())
+
+    mock_client_cls.assert_called_once_with(address="127.0.0.1", asynchronous=True)
+    mock_client.close.assert_awaited_once()
+    assert "_shared_client" not in dask_exec.__dict__
@@ -26,6 +26,7 @@ from pathlib import Path
 import pytest
 
 import covalent as ct
+from covalent._data_store import ObjectRef
 from covalent._results_manager.result import Result
 from covalent._workflow.lattice import Lattice as LatticeClass
 from covalent.executor import LocalExecutor
@@ -117,6 +118,14 @@ def test_get_node_error(result_1):
     assert not result_1._get_node_error(node_id=0)
 
 
+def test_get_node_output_loads_object_ref(result_1, tmp_path):
+    """Test that outputs passed by reference are loaded from the object store."""
+    output_ref = ObjectRef(tmp_path, "dispatch_1", "node_0.pkl").store(ct.TransportableObject(2))
+    result_1.lattice.transport_graph.set_node_value(0, "output", output_ref)
+
+    assert result_1._get_node_output(node_id=0).get_deserialized() == 2
+
+
 def test_get_all_node_results(result_1, mocker):
     """Test result method to get all the node results."""
 
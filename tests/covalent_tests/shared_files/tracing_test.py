@@ -0,0 +1,150 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""Unit tests for the tracing module."""
+
+import json
+
+import pytest
+
+from covalent._shared_files import tracing
+from covalent._shared_files.tracing import BUCKETS, Histogram, Tracer
+
+
+@pytest.fixture
+def enable_tracing():
+    tracing.configure(True)
+    yield
+    tracing.configure(False)
+
+
+def test_histogram_buckets():
+    """Test that values are counted in the first bucket bounding them."""
+    histogram = Histogram()
+    histogram.observe(BUCKETS[0])
+    histogram.observe(BUCKETS[0] * 1.5)
+    histogram.observe(BUCKETS[-1] * 2)
+
+    assert histogram.counts[0] == 1
+    assert histogram.counts[1] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.count == 3
+    assert histogram.sum == pytest.approx(BUCKETS[0] * 2.5 + BUCKETS[-1] * 2)
+    assert Histogram.from_dict(histogram.to_dict()).to_dict() == histogram.to_dict()
+
+
+def test_span_disabled():
+    """Test that no span is recorded when tracing is disabled."""
+    tracing.configure(False)
+
+    with tracing.span("phase", "dispatch"):
+        pass
+    tracing.record("phase", "dispatch", tracing.now())
+
+    assert tracing.now() is None
+    assert tracing.get_snapshot() == {"global": {}, "dispatches": {}}
+
+
+def test_span_enabled(enable_tracing):
+    """Test that spans are aggregated globally and per dispatch."""
+    with tracing.span("phase_1", "dispatch"):
+        pass
+    with tracing.span("phase_1"):
+        pass
+    tracing.record("phase_2", "dispatch", tracing.now())
+
+    snapshot = tracing.get_snapshot()
+    assert snapshot["global"]["phase_1"]["count"] == 2
+    assert snapshot["global"]["phase_2"]["count"] == 1
+    assert snapshot["dispatches"]["dispatch"]["phase_1"]["count"] == 1
+    assert snapshot["dispatches"]["dispatch"]["phase_2"]["count"] == 1
+
+
+def test_load_config(mocker):
+    """Test that tracing is configured from the dispatcher config."""
+    config = {"dispatcher.tracing": "true", "dispatcher.trace_file": "/tmp/trace.json"}
+    mocker.patch("covalent._shared_files.tracing.get_config", side_effect=config.get)
+    configure_mock = mocker.patch("covalent._shared_files.tracing.configure")
+
+    tracing.load_config(trace_file_suffix=".1")
+
+    configure_mock.assert_called_once_with(True, "/tmp/trace.json.1")
+
+
+def test_tracer_evicts_old_dispatches():
+    """Test that only the histograms of the most recent dispatches are kept."""
+    tracer = Tracer(max_dispatches=2)
+    for dispatch_id in ["a", "b", "c"]:
+        tracer.record("phase", dispatch_id, 0.0)
+
+    snapshot = tracer.get_snapshot()
+    assert list(snapshot["dispatches"]) == ["b", "c"]
+    assert snapshot["global"]["phase"]["count"] == 3
+
+
+def test_tracer_trace_file(tmp_path):
+    """Test that spans are written as Chrome trace events."""
+    trace_file = tmp_path / "traces" / "trace.json"
+    tracer = Tracer(str(trace_file))
+    tracer.record("phase", "dispatch", 1.0)
+    tracer.record("phase", None, 2.0)
+    tracer.close()
+
+    events = json.loads(trace_file.read_text().rstrip(",\n") + "]")
+    assert [event["name"] for event in events] == ["phase", "phase"]
+    assert events[0]["ph"] == "X"
+    assert events[0]["ts"] == 1e6
+    assert events[0]["args"] == {"dispatch_id": "dispatch"}
+
+
+def test_merge_snapshots():
+    """Test that the histograms of several processes are added up."""
+    tracer_1 = Tracer()
+    tracer_1.record("phase", "a", 0.0)
+    tracer_2 = Tracer()
+    tracer_2.record("phase", "a", 0.0)
+    tracer_2.record("phase", "b", 0.0)
+
+    merged = tracing.merge_snapshots([tracer_1.get_snapshot(), tracer_2.get_snapshot()])
+
+    assert merged["global"]["phase"]["count"] == 3
+    assert merged["dispatches"]["a"]["phase"]["count"] == 2
+    assert merged["dispatches"]["b"]["phase"]["count"] == 1
+
+
+def test_render_prometheus():
+    """Test that histograms are rendered with cumulative buckets."""
+    histogram = Histogram()
+    histogram.observe(BUCKETS[0])
+    histogram.observe(BUCKETS[1])
+    snapshot = {
+        "global": {"phase": histogram.to_dict()},
+        "dispatches": {"dispatch": {"phase": histogram.to_dict()}},
+    }
+
+    lines = tracing.render_prometheus(snapshot).splitlines()
+
+    name = "covalent_dispatcher_phase_seconds"
+    assert f"# TYPE {name} histogram" in lines
+    assert f'{name}_bucket{{phase="phase",le="{BUCKETS[0]}"}} 1' in lines
+    assert f'{name}_bucket{{phase="phase",le="{BUCKETS[1]}"}} 2' in lines
+    assert f'{name}_bucket{{phase="phase",le="+Inf"}} 2' in lines
+    assert f'{name}_count{{phase="phase"}} 2' in lines
+    assert 'covalent_dispatch_phase_seconds_count{dispatch_id="dispatch",phase="phase"} 2' in lines
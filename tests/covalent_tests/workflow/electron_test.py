@@ -99,8 +99,9 @@ def test_build_sublattice_graph():
         "results_dir": None,
     }
 
-    json_lattice = _build_sublattice_graph(workflow, json.dumps(parent_metadata), 1)
-    lattice = Lattice.deserialize_from_json(json_lattice)
+    payload = _build_sublattice_graph(workflow, json.dumps(parent_metadata), 1)
+    assert str(payload) == "<built sublattice workflow>"
+    lattice = payload.get_lattice()
 
     assert list(lattice.transport_graph._graph.nodes) == list(range(3))
     for k in lattice.metadata.keys():
@@ -18,9 +18,16 @@
 #
 # Relief from the License may be granted by purchasing a commercial license.
 
+import json
+import pickle
+from collections import OrderedDict
+
+import pytest
+
 import covalent as ct
-from covalent._workflow.lattice import Lattice
+from covalent._workflow.lattice import Lattice, SublatticePayload
 from covalent._workflow.transport import encode_metadata
+from covalent._workflow.transportable_object import TransportableObject
 from covalent.executor import LocalExecutor
 from covalent.triggers import BaseTrigger
 
@@ -76,3 +83,65 @@ def test_lattice_json_serialization():
     )
 
     assert json_workflow == new_workflow.serialize_to_json()
+
+
+def test_lattice_binary_serialization():
+    """Test that the binary lattice format round-trips like the JSON format"""
+
+    @ct.electron(executor="le", deps_bash=ct.DepsBash("yum install gcc"))
+    def f(x):
+        return x * x
+
+    @ct.lattice(executor="le")
+    def workflow(x, y=2):
+        return [f(x), f(y)]
+
+    workflow.build_graph(5, y=3)
+    json_workflow = workflow.serialize_to_json()
+
+    new_workflow = Lattice.deserialize_from_bytes(workflow.serialize_to_bytes())
+
+    # The imports are a set; they're serialized in sorted order so that
+    # round trips compare equal
+    assert json.loads(json_workflow)["cova_imports"] == sorted(workflow.cova_imports)
+    assert json_workflow == new_workflow.serialize_to_json()
+
+    # Nodes with the same function share its serialized string
+    tg = new_workflow.transport_graph
+    functions = [
+        tg.get_node_value(node_id, "function")
+        for node_id in tg._graph.nodes
+        if tg.get_node_value(node_id, "name") == "f"
+    ]
+    assert len(functions) == 2
+    assert functions[0]._object is functions[1]._object
+
+
+def test_lattice_binary_deserialization_rejects_other_classes():
+    """Test that only the classes of a serialized lattice can be loaded"""
+
+    data = pickle.dumps({"transport_graph": None, "x": OrderedDict()})
+    with pytest.raises(pickle.UnpicklingError):
+        Lattice.deserialize_from_bytes(data)
+
+
+def test_sublattice_payload_from_transportable():
+    """Test loading a sublattice payload from a task output"""
+
+    @ct.electron
+    def f(x):
+        return x
+
+    @ct.lattice
+    def workflow(x):
+        return f(x)
+
+    workflow.build_graph(1)
+    output = TransportableObject(SublatticePayload(workflow))
+
+    assert output.object_string == "<built sublattice workflow>"
+    lattice = SublatticePayload.from_transportable(output).get_lattice()
+    assert lattice.serialize_to_json() == workflow.serialize_to_json()
+
+    with pytest.raises(pickle.UnpicklingError):
+        SublatticePayload.from_transportable(TransportableObject(OrderedDict()))
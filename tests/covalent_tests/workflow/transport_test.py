@@ -20,8 +20,13 @@
 
 """Unit tests for transport graph."""
 
+import base64
 import copy
+import json
+import mmap
+import pickle
 import platform
+import zlib
 from unittest.mock import call
 
 import cloudpickle
@@ -29,9 +34,17 @@ import networkx as nx
 import pytest
 
 import covalent as ct
+from covalent._shared_files.compression import register_codec
 from covalent._shared_files.defaults import parameter_prefix
 from covalent._shared_files.util_classes import RESULT_STATUS
 from covalent._workflow.transport import TransportableObject, _TransportGraph, encode_metadata
+from covalent._workflow.transportable_object import (
+    BUFFER_ALIGNMENT,
+    _DeserializationCache,
+    _get_deserialization_cache,
+    _TOArchive,
+    _TOArchiveUtils,
+)
 from covalent.executor import LocalExecutor
 from covalent.triggers import BaseTrigger
 
@@ -48,6 +61,18 @@ def subtask_2(x):
     return x
 
 
+class Buffer:
+    """Object pickled with an out-of-band buffer under protocol 5, like NumPy arrays."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5:
+            return Buffer, (pickle.PickleBuffer(self.data),)
+        return Buffer, (bytes(self.data),)
+
+
 @pytest.fixture
 def transportable_object():
     """Transportable object fixture."""
@@ -124,7 +149,7 @@ def test_transportable_object_serialize_deserialize_string_only():
     ser = to.serialize()
     new_to = TransportableObject.deserialize(ser, string_only=True)
     assert new_to.object_string == to.object_string
-    assert new_to._object == ""
+    assert new_to._object == b""
     assert new_to._header["py_version"] == platform.python_version()
     assert new_to._header["attrs"]["name"] == ""
     assert "doc" in new_to._header["attrs"]
@@ -208,6 +233,212 @@ def test_transportable_object_serialize_deserialize(transportable_object):
     }
 
 
+def test_transportable_object_archive_holds_raw_pickle(transportable_object):
+    """Test that the archived data is the pickled object without base64 encoding."""
+
+    to = transportable_object
+    data = to.serialize()
+    data_offset = _TOArchiveUtils.data_offset(data)
+
+    assert to.get_serialized() == cloudpickle.dumps(subtask)
+    assert data[data_offset:] == to.get_serialized()
+
+
+def test_transportable_object_deserialize_base64_archive(transportable_object):
+    """Test that archives holding the base64-encoded pickle are still readable."""
+
+    to = transportable_object
+    header = json.dumps(to._header).encode("utf-8")
+    object_string = to.object_string.encode("utf-8")
+    data = base64.b64encode(to.get_serialized())
+    legacy = _TOArchive(header=header, object_string=object_string, data=data).cat()
+
+    new_to = TransportableObject.deserialize(legacy)
+    assert new_to == to
+    assert new_to.get_deserialized()(x=3) == subtask(x=3)
+    assert TransportableObject.deserialize(legacy, header_only=True)._header == to._header
+
+
+def test_transportable_object_to_dict_base64(transportable_object):
+    """Test that the JSON representation holds the base64-encoded pickle."""
+
+    to = transportable_object
+    attributes = to.to_dict()["attributes"]
+
+    assert base64.b64decode(attributes["_object"]) == to.get_serialized()
+    assert to._object == to.get_serialized()
+
+
+def test_transportable_object_unpickle_base64_state(transportable_object):
+    """Test that transportable objects pickled by older versions are still readable."""
+
+    to = transportable_object
+    legacy = TransportableObject(None)
+    legacy.__dict__ = {
+        "_object": base64.b64encode(to.get_serialized()).decode("utf-8"),
+        "_object_string": to._object_string,
+        "_header": to._header,
+    }
+
+    assert pickle.loads(pickle.dumps(legacy)) == to
+
+
+def test_transportable_object_out_of_band_buffers():
+    """Test that large buffers are kept out of the pickle and only copied into writable objects."""
+
+    data = bytearray(b"x" * 1000)
+    to = TransportableObject(Buffer(data))
+    data[0] = ord("y")
+
+    assert to.buffers == [b"x" * 1000]
+    assert b"x" * 1000 not in to.get_serialized()
+
+    obj = to.get_deserialized()
+    assert bytes(obj.data) == b"x" * 1000
+    assert memoryview(obj.data).readonly
+    assert memoryview(obj.data).obj is to.buffers[0]
+
+    obj = to.get_deserialized(writable=True)
+    assert bytes(obj.data) == b"x" * 1000
+    assert not memoryview(obj.data).readonly
+
+
+def test_transportable_object_archive_out_of_band_buffers(tmp_path):
+    """Test that out-of-band buffers are archived as aligned segments."""
+
+    to = TransportableObject([Buffer(bytearray(b"x" * 1000)), Buffer(bytearray(b"y" * 77))])
+    data = to.serialize()
+
+    new_to = TransportableObject.deserialize(data)
+    assert new_to == to
+    assert [bytes(new_to.get_deserialized()[i].data) for i in range(2)] == [b"x" * 1000, b"y" * 77]
+    for buffer, view in zip(to.buffers, new_to.buffers):
+        assert view.readonly
+        assert data.index(buffer) % BUFFER_ALIGNMENT == 0
+
+    # Buffers loaded from an archive are views which are copied when pickled
+    assert pickle.loads(pickle.dumps(new_to)) == to
+    assert TransportableObject.from_dict(json.loads(json.dumps(new_to.to_dict()))) == to
+
+    with open(tmp_path / "archive", "wb") as f:
+        assert to.serialize_to_file(f) == len(data)
+    assert (tmp_path / "archive").read_bytes() == data
+
+
+def test_transportable_object_deserialize_from_file(tmp_path):
+    """Test that archive files are memory-mapped and their buffers are not copied."""
+
+    to = TransportableObject([Buffer(bytearray(b"x" * 1000)), "y"])
+    path = tmp_path / "archive"
+    with open(path, "wb") as f:
+        to.serialize_to_file(f)
+
+    header_only = TransportableObject.deserialize_from_file(path, header_only=True)
+    assert header_only._header == to._header
+    assert header_only.get_serialized() == b""
+    string_only = TransportableObject.deserialize_from_file(path, string_only=True)
+    assert string_only.object_string == to.object_string
+    assert string_only.get_serialized() == b""
+
+    new_to = TransportableObject.deserialize_from_file(path)
+    assert new_to == to
+    assert isinstance(new_to.get_serialized().obj, mmap.mmap)
+    assert isinstance(new_to.buffers[0].obj, mmap.mmap)
+
+    # The mapping outlives the file, which is replaced rather than overwritten
+    path.unlink()
+    assert bytes(new_to.get_deserialized()[0].data) == b"x" * 1000
+    assert TransportableObject.deserialize(memoryview(to.serialize())) == to
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma", "bz2"])
+def test_transportable_object_compressed_archive(codec):
+    """Test that the data and the buffers of an archive can be compressed."""
+
+    to = TransportableObject([Buffer(bytearray(b"x" * 10000)), "y" * 10000])
+    data = to.serialize(codec=codec)
+
+    assert len(data) < len(to.serialize())
+    new_to = TransportableObject.deserialize(data)
+    assert new_to == to
+    assert new_to._header == to._header
+    assert bytes(new_to.get_deserialized()[0].data) == b"x" * 10000
+
+
+def test_transportable_object_compressed_header_only(mocker):
+    """Test that headers and strings are read without decompressing the data."""
+
+    decompress = mocker.Mock(side_effect=zlib.decompress)
+    register_codec("test_codec", zlib.compress, decompress)
+    to = TransportableObject("x" * 10000)
+    data = to.serialize(codec="test_codec")
+
+    assert TransportableObject.deserialize(data, header_only=True)._header == to._header
+    assert TransportableObject.deserialize(data, string_only=True).object_string == "x" * 10000
+    decompress.assert_not_called()
+
+    assert TransportableObject.deserialize(data) == to
+    decompress.assert_called_once()
+
+    with pytest.raises(ValueError):
+        to.serialize(codec="unknown")
+
+
+@pytest.fixture
+def deserialization_cache(mocker):
+    cache = _DeserializationCache(max_size=10**6)
+    mocker.patch("covalent._workflow.transportable_object._deserialization_cache", cache)
+    mocker.patch("covalent._workflow.transportable_object._deserialization_cache_configured", True)
+    return cache
+
+
+def test_transportable_object_deserialization_cache(deserialization_cache):
+    """Test that equal transportable objects share their deserialized object."""
+
+    to = TransportableObject({"a": [1, 2]})
+    loaded = TransportableObject.deserialize(to.serialize())
+
+    assert to.get_deserialized() is loaded.get_deserialized()
+    assert deserialization_cache.size == to.size
+
+    fresh = to.get_deserialized(use_cache=False)
+    assert fresh == to.get_deserialized()
+    assert fresh is not to.get_deserialized()
+
+
+def test_transportable_object_deserialization_cache_eviction(deserialization_cache):
+    """Test that the least recently used objects are evicted past the budget."""
+
+    to_1, to_2, to_3 = (TransportableObject(str(i) * 1000) for i in range(3))
+    deserialization_cache.max_size = to_1.size * 2
+
+    value_1 = to_1.get_deserialized()
+    to_2.get_deserialized()
+    assert to_1.get_deserialized() is value_1
+    to_3.get_deserialized()
+
+    assert to_1.get_deserialized() is value_1
+    assert deserialization_cache.size == to_1.size * 2
+    assert (to_2._object,) not in deserialization_cache._entries
+
+    large = TransportableObject("x" * 10000)
+    assert large.get_deserialized() is not large.get_deserialized()
+
+
+def test_transportable_object_deserialization_cache_disabled(mocker):
+    """Test that the deserialization cache is disabled by default."""
+
+    mocker.patch("covalent._workflow.transportable_object.get_config", return_value="0")
+    mocker.patch(
+        "covalent._workflow.transportable_object._deserialization_cache_configured", False
+    )
+    mocker.patch("covalent._workflow.transportable_object._deserialization_cache", None)
+
+    assert _get_deserialization_cache() is None
+    to = TransportableObject([1, 2])
+    assert to.get_deserialized() is not to.get_deserialized()
+
+
 def test_transportable_object_deserialize_list():
     """Test deserialization of a list of transportable objects."""
 
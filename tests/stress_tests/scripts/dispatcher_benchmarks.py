@@ -0,0 +1,302 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+# In-process benchmarks of the dispatcher throughput and latency over
+# several graph shapes:
+#
+# wide:             e e e ...
+#
+# deep:             e - e - e - ...
+#
+# diamond:          e < e e e ... > e
+#
+# random_dag:       each task depends on up to 3 random earlier tasks
+#
+# sublattice_tree:  s s s ... with each sublattice a wide workflow
+#
+# Tasks run on the no-op executor (see noop.py), so the measurements are
+# those of the dispatcher: submission latency, task throughput, the delay
+# between a task becoming ready and starting, per-phase timings, DB
+# statements and the peak RSS of the dispatcher process. Each trial runs
+# in a fresh process against its own SQLite DB and is written to
+# benchmark_results/dispatcher_benchmarks/current as a
+# WorkflowBenchmarkResult.
+#
+# Usage: python dispatcher_benchmarks.py [shape ...]
+
+import asyncio
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import noop
+from noop import NoopExecutor
+from sqlalchemy import event
+
+import covalent as ct
+from covalent._shared_files.metrics import PerformanceMetrics, WorkflowBenchmarkResult
+from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent.executor import _executor_manager
+from covalent_dispatcher._core import dispatcher
+from covalent_dispatcher._db import load
+from covalent_dispatcher._db.datastore import DataStore
+from covalent_dispatcher.entry_point import run_dispatcher
+
+benchmark_name = "dispatcher_benchmarks"
+benchmark_dir = f"benchmark_results/{benchmark_name}/current"
+
+size = int(os.environ.get("BENCHMARK_SIZE", 100))
+num_dispatches = int(os.environ.get("BENCHMARK_DISPATCHES", 1))
+num_trials = int(os.environ.get("BENCHMARK_TRIALS", 3))
+fanout = 4
+seed = 1234
+
+
+@ct.electron(executor=NoopExecutor())
+def task(*args):
+    return 1
+
+
+@ct.lattice(workflow_executor=NoopExecutor())
+def wide(n):
+    for i in range(n):
+        task(i)
+
+
+@ct.lattice(workflow_executor=NoopExecutor())
+def deep(n):
+    x = task(0)
+    for _ in range(n - 1):
+        x = task(x)
+    return x
+
+
+@ct.lattice(workflow_executor=NoopExecutor())
+def diamond(n):
+    source = task(0)
+    return task(*[task(source) for _ in range(n)])
+
+
+@ct.lattice(workflow_executor=NoopExecutor())
+def random_dag(n):
+    rng = random.Random(seed)
+    tasks = []
+    for _ in range(n):
+        parents = rng.sample(tasks, min(len(tasks), rng.randint(0, 3)))
+        tasks.append(task(*parents))
+
+
+wide_sublattice = ct.electron(wide, executor=NoopExecutor())
+
+
+@ct.lattice(workflow_executor=NoopExecutor())
+def sublattice_tree(n):
+    for _ in range(fanout):
+        wide_sublattice(n // fanout)
+
+
+shapes = {
+    "wide": wide,
+    "deep": deep,
+    "diamond": diamond,
+    "random_dag": random_dag,
+    "sublattice_tree": sublattice_tree,
+}
+
+
+def _naive_utc(timestamp: datetime) -> datetime:
+    # Timestamps loaded from the DB are naive UTC
+    return (
+        timestamp.astimezone(timezone.utc).replace(tzinfo=None) if timestamp.tzinfo else timestamp
+    )
+
+
+def _electron_latency(result_object) -> float:
+    """Mean time from a task becoming ready until it started running."""
+    tg = result_object.lattice.transport_graph
+    latencies = []
+    for node_id in tg._graph.nodes:
+        start_time = tg.get_node_value(node_id, "start_time")
+        if start_time is None:
+            continue
+        ready_time = max(
+            (tg.get_node_value(parent, "end_time") for parent in tg._graph.predecessors(node_id)),
+            default=result_object.start_time,
+        )
+        latencies.append((_naive_utc(start_time) - _naive_utc(ready_time)).total_seconds())
+    return sum(latencies) / len(latencies) if latencies else 0.0
+
+
+async def run_trial(lattice, db_counts: dict) -> dict:
+    phase_timings = {}
+
+    start = time.perf_counter()
+    lattice.build_graph(size)
+    json_lattice = lattice.serialize_to_json()
+    phase_timings["build"] = time.perf_counter() - start
+
+    futures = []
+
+    def run_dispatch(dispatch_id):
+        futures.append(dispatcher.run_dispatch(dispatch_id))
+        return futures[-1]
+
+    db_counts.update(reads=0, writes=0)
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+
+    start = time.perf_counter()
+    with patch("covalent_dispatcher._core.run_dispatch", run_dispatch):
+        dispatch_ids = await asyncio.gather(
+            *(run_dispatcher(json_lattice) for _ in range(num_dispatches))
+        )
+    phase_timings["submit"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*futures)
+    phase_timings["run"] = time.perf_counter() - start
+
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+    assert all(r.status == RESULT_STATUS.COMPLETED for r in results), [r.error for r in results]
+
+    # Sublattice dispatches have been finalized, so they are loaded from the DB
+    sub_dispatch_ids = set()
+    for r in results:
+        tg = r.lattice.transport_graph
+        sub_dispatch_ids.update(
+            tg.get_node_value(n, "sub_dispatch_id")
+            for n in tg._graph.nodes
+            if tg.get_node_value(n, "sub_dispatch_id")
+        )
+    results.extend(load.get_result_object_from_storage(d) for d in sub_dispatch_ids)
+    num_nodes = sum(len(r.lattice.transport_graph._graph.nodes) for r in results)
+
+    return {
+        "dispatch_ids": dispatch_ids,
+        "num_nodes": num_nodes,
+        "phase_timings": phase_timings,
+        "user_time": usage_end.ru_utime - usage_start.ru_utime,
+        "system_time": usage_end.ru_stime - usage_start.ru_stime,
+        "electron_latency": sum(_electron_latency(r) for r in results) / len(results),
+    }
+
+
+def _count_statements(db_counts: dict):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            db_counts["reads"] += 1
+        else:
+            db_counts["writes"] += 1
+
+    return before_cursor_execute
+
+
+def run_trial_sync(shape: str, run_id: int) -> WorkflowBenchmarkResult:
+    lattice = shapes[shape]
+    _executor_manager._populate_executor_map_from_module(noop)
+
+    start = time.perf_counter()
+    lattice(size)
+    workflow_runtime = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["COVALENT_DATA_DIR"] = tmpdir
+        db = DataStore(db_URL=f"sqlite+pysqlite:///{tmpdir}/db.sqlite", initialize_db=True)
+        db_counts = {"reads": 0, "writes": 0}
+        event.listen(db.engine, "before_cursor_execute", _count_statements(db_counts))
+
+        with patch("covalent_dispatcher._db.upsert.workflow_db", db), patch(
+            "covalent_dispatcher._db.write_result_to_db.workflow_db", db
+        ), patch("covalent_dispatcher._db.jobdb.workflow_db", db), patch(
+            "covalent_dispatcher._db.load.workflow_db", db
+        ), patch.object(
+            dispatcher.result_webhook, "send_update"
+        ):
+            trial = asyncio.run(run_trial(lattice, db_counts))
+
+    phase_timings = trial["phase_timings"]
+    covalent_runtime = phase_timings["submit"] + phase_timings["run"]
+    fraction_user_mode = trial["user_time"] / covalent_runtime
+    fraction_system_mode = trial["system_time"] / covalent_runtime
+
+    metrics = PerformanceMetrics(
+        workflow_runtime=workflow_runtime,
+        covalent_runtime=covalent_runtime,
+        covalent_speedup=workflow_runtime / covalent_runtime,
+        covalent_overhead=(covalent_runtime - workflow_runtime) / workflow_runtime,
+        covalent_fraction_idle=max(0.0, 1 - fraction_user_mode - fraction_system_mode),
+        covalent_fraction_user_mode=fraction_user_mode,
+        covalent_fraction_system_mode=fraction_system_mode,
+        covalent_dispatch_latency=phase_timings["submit"] / num_dispatches,
+        covalent_dispatch_throughput=num_dispatches / covalent_runtime,
+        covalent_total_db_reads=db_counts["reads"],
+        covalent_total_db_writes=db_counts["writes"],
+        covalent_electron_throughput=trial["num_nodes"] / phase_timings["run"],
+        covalent_electron_latency=trial["electron_latency"],
+        # Linux reports the maximum resident set size in KiB
+        covalent_peak_rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        covalent_phase_timings=phase_timings,
+    )
+
+    return WorkflowBenchmarkResult(
+        run_id=run_id,
+        workflow_name=shape,
+        parameters={
+            "size": size,
+            "num_dispatches": num_dispatches,
+            "num_nodes": trial["num_nodes"],
+        },
+        metrics=metrics,
+    )
+
+
+if __name__ == "__main__":
+    if not os.path.isdir(benchmark_dir):
+        os.makedirs(benchmark_dir)
+
+    for shape in sys.argv[1:] or shapes:
+        for run_id in range(num_trials):
+            # Run each trial in a fresh process so that the peak RSS and
+            # the DB are those of the trial alone
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                benchmark = pool.submit(run_trial_sync, shape, run_id).result()
+
+            outfile = f"{benchmark_dir}/{shape}_{size}_{run_id}.json"
+            with open(outfile, "w") as f:
+                f.write(benchmark.json())
+
+            metrics = benchmark.metrics
+            print(
+                "{} trial {}: {:.0f} tasks/s, dispatch latency {:.3f} s, "
+                "task latency {:.4f} s, {:.0f} DB writes, peak RSS {:.0f} MiB".format(
+                    shape,
+                    run_id,
+                    metrics.covalent_electron_throughput,
+                    metrics.covalent_dispatch_latency,
+                    metrics.covalent_electron_latency,
+                    metrics.covalent_total_db_writes,
+                    metrics.covalent_peak_rss,
+                )
+            )
@@ -0,0 +1,178 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+# Simulation of critical-path prioritization with a fake executor. The
+# workflow is a long chain of slow tasks next to many independent fast
+# tasks:
+#
+# f f f ... f    s
+#                |
+#                s
+#                |
+#               ...
+#
+# The fake executor sleeps for the simulated runtime of each task and
+# only `num_slots` tasks run concurrently. The makespan is compared for
+# FIFO submission and upward-rank prioritization, with and without
+# historical runtimes (collected by a warm-up run).
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import covalent as ct
+from covalent._results_manager import Result
+from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent._workflow.lattice import Lattice
+from covalent_dispatcher._core import data_manager as datasvc
+from covalent_dispatcher._core import dispatcher, runner
+from covalent_dispatcher._core.dispatcher_modules import planning
+from covalent_dispatcher._core.runner_modules.admission import AdmissionQueue
+
+benchmark_name = "dispatcher_critical_path"
+benchmark_dir = f"benchmark_results/{benchmark_name}/current"
+
+num_slots = 4
+chain_length = 20
+num_fast_tasks = 120
+runtimes = {"slow_task": 0.02, "fast_task": 0.01}
+modes = ["fifo", "upward_rank", "upward_rank_weighted"]
+
+
+@ct.electron
+def fast_task(x):
+    return x
+
+
+@ct.electron
+def slow_task(x):
+    return x
+
+
+@ct.lattice
+def pipeline(n_fast, n_chain):
+    for i in range(n_fast):
+        fast_task(i)
+    res = slow_task(0)
+    for _ in range(n_chain - 1):
+        res = slow_task(res)
+
+
+def build_result_object(dispatch_id: str) -> Result:
+    pipeline.build_graph(num_fast_tasks, chain_length)
+    lattice = Lattice.deserialize_from_json(pipeline.serialize_to_json())
+    result_object = Result(lattice, dispatch_id)
+    result_object._initialize_nodes()
+    return result_object
+
+
+async def simulated_task(dispatch_id, node_id, node_name, abstract_inputs, executor):
+    start_time = datetime.now(timezone.utc)
+    await asyncio.sleep(runtimes.get(node_name, 0))
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        start_time=start_time,
+        end_time=datetime.now(timezone.utc),
+        status=RESULT_STATUS.COMPLETED,
+        output=ct.TransportableObject(node_id),
+    )
+
+
+async def run_dispatch(dispatch_id: str, use_history: bool) -> float:
+    result_object = build_result_object(dispatch_id)
+    datasvc._register_result_object(result_object)
+    config = {
+        "dispatcher.status_batch_size": 1000,
+        "dispatcher.runtime_weighted_priorities": "true" if use_history else "false",
+    }
+
+    start = time.perf_counter()
+    with patch.object(dispatcher, "get_config", side_effect=config.get):
+        dispatcher._plan_workflow(result_object)
+        status_queue = datasvc.get_status_queue(dispatch_id)
+        await dispatcher._run_planned_workflow(result_object, status_queue)
+    makespan = time.perf_counter() - start
+
+    dispatcher._dependency_indices.pop(dispatch_id, None)
+    dispatcher._task_priorities.pop(dispatch_id, None)
+    datasvc.finalize_dispatch(dispatch_id)
+    return makespan
+
+
+async def run_trial(mode: str) -> dict:
+    runner._admission_queue = AdmissionQueue(default_limit=num_slots)
+
+    with patch.object(runner, "_run_abstract_task", simulated_task), patch(
+        "covalent_dispatcher._db.upsert.electron_data"
+    ), patch("covalent_dispatcher._db.upsert.lattice_data"), patch.object(
+        dispatcher.result_webhook, "send_update"
+    ):
+        if mode == "fifo":
+            with patch.object(
+                planning,
+                "compute_upward_ranks",
+                lambda dep_index, weights=None: [0.0] * dep_index.num_nodes,
+            ):
+                makespan = await run_dispatch(f"{benchmark_name}_{mode}", False)
+        elif mode == "upward_rank":
+            makespan = await run_dispatch(f"{benchmark_name}_{mode}", False)
+        else:
+            await run_dispatch(f"{benchmark_name}_warmup", True)
+            makespan = await run_dispatch(f"{benchmark_name}_{mode}", True)
+
+    critical_path = chain_length * runtimes["slow_task"]
+    return {
+        "test": benchmark_name,
+        "mode": mode,
+        "num_slots": num_slots,
+        "chain_length": chain_length,
+        "num_fast_tasks": num_fast_tasks,
+        "makespan": makespan,
+        "critical_path": critical_path,
+    }
+
+
+def run_trial_sync(mode: str) -> dict:
+    return asyncio.run(run_trial(mode))
+
+
+if __name__ == "__main__":
+    if not os.path.isdir(benchmark_dir):
+        os.makedirs(benchmark_dir)
+
+    for mode in modes:
+        # Run each trial in a fresh process so that the runtime history
+        # doesn't leak between trials
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            trial = pool.submit(run_trial_sync, mode).result()
+
+        outfile = f"{benchmark_dir}/{mode}.json"
+        with open(outfile, "w") as f:
+            json.dump(trial, f)
+        print(
+            "{}: makespan {:.3f}s (critical path {:.3f}s)".format(
+                mode, trial["makespan"], trial["critical_path"]
+            )
+        )
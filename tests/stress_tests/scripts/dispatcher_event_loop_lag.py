@@ -0,0 +1,158 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+# In-process benchmark of the event loop lag of the dispatcher while many
+# dispatches run concurrently
+# p p p ...
+# | | |
+# e e e ...
+#
+# Tasks complete instantly while node and lattice results are persisted to
+# a SQLite DB and the results directory, so the event loop is only blocked
+# by the dispatcher itself. The lag is the delay of a 1 ms timer which is
+# rescheduled for the whole run. Persistence either runs inline in the event
+# loop (0 workers) or in the persistence worker threads.
+
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import covalent as ct
+from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent_dispatcher._core import data_manager as datasvc
+from covalent_dispatcher._core import dispatcher
+from covalent_dispatcher._core.data_modules.persistence import PersistenceWorker
+from covalent_dispatcher._db.datastore import DataStore
+
+benchmark_name = "dispatcher_event_loop_lag"
+benchmark_dir = f"benchmark_results/{benchmark_name}/current"
+
+num_dispatches = int(os.environ.get("BENCHMARK_DISPATCHES", 20))
+width = int(os.environ.get("BENCHMARK_WIDTH", 50))
+worker_counts = [0, 4]
+timer_interval = 0.001
+
+
+@ct.electron
+def sample_task(x):
+    return x
+
+
+@ct.lattice
+def wide_workflow(n):
+    for i in range(n):
+        sample_task(i)
+
+
+async def instant_task(dispatch_id, node_id, node_name, abstract_inputs, executor):
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        status=RESULT_STATUS.COMPLETED,
+        output=ct.TransportableObject(node_id),
+    )
+
+
+async def monitor_lag(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(timer_interval)
+        lags.append(time.perf_counter() - start - timer_interval)
+
+
+async def run_trial(num_workers: int) -> dict:
+    wide_workflow.build_graph(width)
+    json_lattice = wide_workflow.serialize_to_json()
+
+    lags = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(lags, stop))
+
+    start = time.perf_counter()
+    dispatch_ids = await asyncio.gather(
+        *(datasvc.make_dispatch(json_lattice) for _ in range(num_dispatches))
+    )
+    results = await asyncio.gather(
+        *(dispatcher.run_workflow(datasvc.get_result_object(d)) for d in dispatch_ids)
+    )
+    runtime = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    lags.sort()
+
+    return {
+        "test": benchmark_name,
+        "num_dispatches": num_dispatches,
+        "width": width,
+        "persistence_workers": num_workers,
+        "all_completed": all(r.status == RESULT_STATUS.COMPLETED for r in results),
+        "runtime": runtime,
+        "mean_lag": statistics.mean(lags),
+        "p99_lag": lags[int(0.99 * (len(lags) - 1))],
+        "max_lag": lags[-1],
+    }
+
+
+def run_trial_sync(num_workers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["COVALENT_DATA_DIR"] = tmpdir
+        db = DataStore(db_URL=f"sqlite+pysqlite:///{tmpdir}/db.sqlite", initialize_db=True)
+        with patch("covalent_dispatcher._db.upsert.workflow_db", db), patch(
+            "covalent_dispatcher._db.write_result_to_db.workflow_db", db
+        ), patch("covalent_dispatcher._db.jobdb.workflow_db", db), patch(
+            "covalent_dispatcher._db.load.workflow_db", db
+        ), patch.object(
+            datasvc, "_persistence_worker", PersistenceWorker(num_workers)
+        ), patch.object(
+            dispatcher.runner, "_run_abstract_task", instant_task
+        ), patch.object(
+            dispatcher.result_webhook, "send_update"
+        ):
+            return asyncio.run(run_trial(num_workers))
+
+
+if __name__ == "__main__":
+    if not os.path.isdir(benchmark_dir):
+        os.makedirs(benchmark_dir)
+
+    for num_workers in worker_counts:
+        # Run each trial in a fresh process so that trials don't skew each other
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            trial = pool.submit(run_trial_sync, num_workers).result()
+
+        outfile = f"{benchmark_dir}/persistence_workers_{num_workers}.json"
+        with open(outfile, "w") as f:
+            json.dump(trial, f)
+        print(
+            "{} persistence workers: runtime {:.2f} s, mean lag {:.1f} ms, "
+            "p99 lag {:.1f} ms, max lag {:.1f} ms".format(
+                num_workers,
+                trial["runtime"],
+                1000 * trial["mean_lag"],
+                1000 * trial["p99_lag"],
+                1000 * trial["max_lag"],
+            )
+        )
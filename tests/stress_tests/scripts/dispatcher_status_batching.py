@@ -0,0 +1,135 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+# In-process benchmark of the dispatcher main loop on a wide graph
+# p p p ...
+# | | |
+# e e e ...
+#
+# Tasks complete instantly and DB writes are replaced by counters so that
+# only the dispatcher's own overhead is measured. A status batch size of 1
+# processes the status queue one message at a time.
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import covalent as ct
+from covalent._results_manager import Result
+from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent._workflow.lattice import Lattice
+from covalent_dispatcher._core import data_manager as datasvc
+from covalent_dispatcher._core import dispatcher
+
+benchmark_name = "dispatcher_status_batching"
+benchmark_dir = f"benchmark_results/{benchmark_name}/current"
+
+width = int(os.environ.get("BENCHMARK_WIDTH", 10000))
+batch_sizes = [1, 1000]
+
+
+@ct.electron
+def sample_task(x):
+    return x
+
+
+@ct.lattice
+def wide_workflow(n):
+    for i in range(n):
+        sample_task(i)
+
+
+def build_result_object(dispatch_id: str) -> Result:
+    wide_workflow.build_graph(width)
+    lattice = Lattice.deserialize_from_json(wide_workflow.serialize_to_json())
+    result_object = Result(lattice, dispatch_id)
+    result_object._initialize_nodes()
+    return result_object
+
+
+async def instant_task(dispatch_id, node_id, node_name, abstract_inputs, executor):
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=node_name,
+        status=RESULT_STATUS.COMPLETED,
+        output=ct.TransportableObject(node_id),
+    )
+
+
+async def run_trial(batch_size: int) -> dict:
+    dispatch_id = f"{benchmark_name}_{batch_size}"
+    result_object = build_result_object(dispatch_id)
+    datasvc._register_result_object(result_object)
+    db_writes = {"electron_data": 0}
+
+    def count_electron_data(result):
+        db_writes["electron_data"] += 1
+        result.lattice.transport_graph.dirty_nodes.clear()
+
+    with patch.object(dispatcher, "get_config", return_value=batch_size), patch.object(
+        dispatcher.runner, "_run_abstract_task", instant_task
+    ), patch("covalent_dispatcher._db.upsert.electron_data", count_electron_data), patch(
+        "covalent_dispatcher._db.upsert.lattice_data"
+    ), patch.object(
+        dispatcher.result_webhook, "send_update"
+    ):
+        start = time.perf_counter()
+        status_queue = datasvc.get_status_queue(dispatch_id)
+        result_object = await dispatcher._run_planned_workflow(result_object, status_queue)
+        runtime = time.perf_counter() - start
+
+    datasvc.finalize_dispatch(dispatch_id)
+    num_tasks = len(result_object.lattice.transport_graph._graph.nodes)
+
+    return {
+        "test": benchmark_name,
+        "width": width,
+        "status_batch_size": batch_size,
+        "num_tasks": num_tasks,
+        "runtime": runtime,
+        "tasks_per_second": num_tasks / runtime,
+        "electron_data_transactions": db_writes["electron_data"],
+    }
+
+
+def run_trial_sync(batch_size: int) -> dict:
+    return asyncio.run(run_trial(batch_size))
+
+
+if __name__ == "__main__":
+    if not os.path.isdir(benchmark_dir):
+        os.makedirs(benchmark_dir)
+
+    for batch_size in batch_sizes:
+        # Run each trial in a fresh process so that trials don't skew each other
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            trial = pool.submit(run_trial_sync, batch_size).result()
+
+        outfile = f"{benchmark_dir}/batch_size_{batch_size}.json"
+        with open(outfile, "w") as f:
+            json.dump(trial, f)
+        print(
+            "batch size {}: {:.0f} tasks/s, {} electron_data transactions".format(
+                batch_size, trial["tasks_per_second"], trial["electron_data_transactions"]
+            )
+        )
@@ -0,0 +1,149 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+# In-process benchmark of the dispatcher throughput with and without the
+# write-behind journal
+# p p p ...
+# | | |
+# e e e ...
+#
+# Tasks take a few milliseconds on a stubbed executor, so their RUNNING and
+# COMPLETED updates reach the dispatcher one by one while they are
+# persisted to a SQLite DB and the results directory. Without the journal,
+# every update is committed on its own; with the journal, the updates of
+# all dispatches are group-committed every 50 ms.
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import covalent as ct
+from covalent._shared_files.util_classes import RESULT_STATUS
+from covalent_dispatcher._core import data_manager as datasvc
+from covalent_dispatcher._core import dispatcher
+from covalent_dispatcher._db import journal
+from covalent_dispatcher._db.datastore import DataStore
+
+benchmark_name = "dispatcher_write_behind"
+benchmark_dir = f"benchmark_results/{benchmark_name}/current"
+
+num_dispatches = int(os.environ.get("BENCHMARK_DISPATCHES", 10))
+width = int(os.environ.get("BENCHMARK_WIDTH", 100))
+
+
+@ct.electron
+def sample_task(x):
+    return x
+
+
+@ct.lattice
+def wide_workflow(n):
+    for i in range(n):
+        sample_task(i)
+
+
+async def short_task(result_object, node_id, inputs, serialized_callable, *args, **kwargs):
+    await asyncio.sleep(random.uniform(0.001, 0.01))
+    return datasvc.generate_node_result(
+        node_id=node_id,
+        node_name=result_object.lattice.transport_graph.get_node_value(node_id, "name"),
+        status=RESULT_STATUS.COMPLETED,
+        output=ct.TransportableObject(node_id),
+    )
+
+
+async def run_trial() -> float:
+    wide_workflow.build_graph(width)
+    json_lattice = wide_workflow.serialize_to_json()
+    dispatch_ids = await asyncio.gather(
+        *(datasvc.make_dispatch(json_lattice) for _ in range(num_dispatches))
+    )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(dispatcher.run_workflow(datasvc.get_result_object(d)) for d in dispatch_ids)
+    )
+    runtime = time.perf_counter() - start
+
+    assert all(r.status == RESULT_STATUS.COMPLETED for r in results)
+    return runtime
+
+
+def run_trial_sync(write_behind: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["COVALENT_DATA_DIR"] = tmpdir
+        db = DataStore(db_URL=f"sqlite+pysqlite:///{tmpdir}/db.sqlite", initialize_db=True)
+        write_behind_journal = (
+            journal.WriteBehindJournal(f"{tmpdir}/journal.pkl", 0.05, 1000)
+            if write_behind
+            else None
+        )
+        with patch("covalent_dispatcher._db.upsert.workflow_db", db), patch(
+            "covalent_dispatcher._db.write_result_to_db.workflow_db", db
+        ), patch("covalent_dispatcher._db.jobdb.workflow_db", db), patch(
+            "covalent_dispatcher._db.load.workflow_db", db
+        ), patch.object(
+            journal, "_journal", write_behind_journal
+        ), patch.object(
+            journal, "_journal_initialized", True
+        ), patch.object(
+            dispatcher.runner, "_run_task", short_task
+        ), patch.object(
+            dispatcher.runner, "_gather_deps", return_value=([], [])
+        ), patch.object(
+            dispatcher.result_webhook, "send_update"
+        ):
+            runtime = asyncio.run(run_trial())
+            if write_behind_journal:
+                write_behind_journal.close()
+
+    num_tasks = num_dispatches * (2 * width + 1)
+    return {
+        "test": benchmark_name,
+        "num_dispatches": num_dispatches,
+        "width": width,
+        "write_behind": write_behind,
+        "runtime": runtime,
+        "tasks_per_second": num_tasks / runtime,
+    }
+
+
+if __name__ == "__main__":
+    if not os.path.isdir(benchmark_dir):
+        os.makedirs(benchmark_dir)
+
+    for write_behind in [False, True]:
+        # Run each trial in a fresh process so that trials don't skew each other
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            trial = pool.submit(run_trial_sync, write_behind).result()
+
+        outfile = f"{benchmark_dir}/write_behind_{str(write_behind).lower()}.json"
+        with open(outfile, "w") as f:
+            json.dump(trial, f)
+        print(
+            "write-behind {}: runtime {:.2f} s, {:.0f} tasks/s".format(
+                write_behind, trial["runtime"], trial["tasks_per_second"]
+            )
+        )
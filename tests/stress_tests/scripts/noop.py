@@ -0,0 +1,41 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+"""
+No-op executor plugin used to benchmark the dispatcher.
+
+Tasks are called directly on the dispatcher's event loop, so the measured
+times are those of the dispatcher and not of any executor backend.
+"""
+
+from typing import Callable, Dict, List
+
+from covalent.executor.base import AsyncBaseExecutor
+
+EXECUTOR_PLUGIN_NAME = "NoopExecutor"
+
+_EXECUTOR_PLUGIN_DEFAULTS = {"log_stdout": "", "log_stderr": ""}
+
+
+class NoopExecutor(AsyncBaseExecutor):
+    """Executor which runs tasks in-process without any scheduling or I/O."""
+
+    async def run(self, function: Callable, args: List, kwargs: Dict, task_metadata: Dict):
+        return function(*args, **kwargs)
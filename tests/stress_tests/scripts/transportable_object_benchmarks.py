@@ -0,0 +1,158 @@
+# Copyright 2023 Agnostiq Inc.
+#
+# This file is part of Covalent.
+#
+# Licensed under the GNU Affero General Public License 3.0 (the "License").
+# A copy of the License may be obtained with this software package or at
+#
+#      https://www.gnu.org/licenses/agpl-3.0.en.html
+#
+# Use of this file is prohibited except in compliance with the License. Any
+# modifications or derivative works of this file must retain this copyright
+# notice, and modified files must contain a notice indicating that they have
+# been altered from the originals.
+#
+# Covalent is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the License for more details.
+#
+# Relief from the License may be granted by purchasing a commercial license.
+
+# Benchmark of the TransportableObject round-trip on a large NumPy array:
+#
+# wrap:         TransportableObject(array)
+# archive:      to.serialize()
+# load:         TransportableObject.deserialize(archive)
+# unwrap:       to.get_deserialized()
+#
+# The round-trip is compared with the former representation, which held
+# the base64-encoded pickle as a str, and is emulated here. Each step is
+# timed and its peak of allocated memory is recorded with tracemalloc,
+# along with the size of the archive.
+#
+# Usage: python transportable_object_benchmarks.py
+
+import base64
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import cloudpickle
+import numpy as np
+
+from covalent._workflow.transportable_object import (
+    TransportableObject,
+    _TOArchive,
+    _TOArchiveUtils,
+)
+
+benchmark_name = "transportable_object_benchmarks"
+benchmark_dir = f"benchmark_results/{benchmark_name}/current"
+
+payload_mb = int(os.environ.get("BENCHMARK_PAYLOAD_MB", 100))
+num_trials = int(os.environ.get("BENCHMARK_TRIALS", 3))
+seed = 1234
+
+
+def _measure(step, results: dict):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = step()
+    results["times"][step.__name__] = time.perf_counter() - start
+    results["peak_memory"][step.__name__] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return value
+
+
+def _base64_round_trip(array, results: dict) -> bytes:
+    """Round-trip of the former base64 representation."""
+    header = json.dumps(TransportableObject(None)._header).encode("utf-8")
+
+    def wrap():
+        return base64.b64encode(cloudpickle.dumps(array)).decode("utf-8"), str(array)
+
+    b64object, object_string = _measure(wrap, results)
+
+    def archive():
+        data = b64object.encode("utf-8")
+        return _TOArchive(header, object_string.encode("utf-8"), data).cat()
+
+    data = _measure(archive, results)
+
+    def load():
+        return data[_TOArchiveUtils.data_offset(data) :].decode("utf-8")
+
+    loaded = _measure(load, results)
+
+    def unwrap():
+        return cloudpickle.loads(base64.b64decode(loaded.encode("utf-8")))
+
+    _measure(unwrap, results)
+    return data
+
+
+def _raw_round_trip(array, results: dict) -> bytes:
+    """Round-trip of the raw pickle representation."""
+
+    def wrap():
+        return TransportableObject(array)
+
+    to = _measure(wrap, results)
+
+    def archive():
+        return to.serialize()
+
+    data = _measure(archive, results)
+
+    def load():
+        return TransportableObject.deserialize(data)
+
+    loaded = _measure(load, results)
+
+    def unwrap():
+        return loaded.get_deserialized()
+
+    _measure(unwrap, results)
+    return data
+
+
+def run_trial(representation: str) -> dict:
+    array = np.random.default_rng(seed).random(payload_mb * 2**20 // 8)
+    round_trip = {"base64": _base64_round_trip, "raw": _raw_round_trip}[representation]
+
+    results = {"times": {}, "peak_memory": {}}
+    data = round_trip(array, results)
+
+    return {
+        "test": benchmark_name,
+        "representation": representation,
+        "payload_bytes": array.nbytes,
+        "archive_bytes": len(data),
+        **results,
+        "total_time": sum(results["times"].values()),
+    }
+
+
+if __name__ == "__main__":
+    if not os.path.isdir(benchmark_dir):
+        os.makedirs(benchmark_dir)
+
+    for representation in ["base64", "raw"]:
+        for run_id in range(num_trials):
+            # Run each trial in a fresh process so that trials don't skew each other
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                trial = pool.submit(run_trial, representation).result()
+
+            outfile = f"{benchmark_dir}/{representation}_{payload_mb}mb_{run_id}.json"
+            with open(outfile, "w") as f:
+                json.dump(trial, f)
+            print(
+                "{}: {:.2f} s, archive {:.0f} MB, peak {:.0f} MB".format(
+                    representation,
+                    trial["total_time"],
+                    trial["archive_bytes"] / 2**20,
+                    max(trial["peak_memory"].values()) / 2**20,
+                )
+            )